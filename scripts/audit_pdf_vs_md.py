@@ -9,7 +9,7 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(ROOT_DIR / "src"))
 
-from pdf_to_markdown_docling.audit_utils import audit_doc_vs_markdown, format_audit
+from pdf_to_markdown_docling.audit_utils import audit_document, format_audit
 from pdf_to_markdown_docling.conversion_utils import convert_pdf_to_doc
 from docling_core.types.doc.base import ImageRefMode
 
@@ -126,15 +126,12 @@ def main() -> None:
         quiet=True,
     )
 
-    metrics = audit_doc_vs_markdown(result.document, markdown)
+    audit = audit_document(result.document, markdown)
     print(f"Backend used: {backend_name}")
-    print(format_audit(metrics))
+    print(format_audit(audit.metrics))
 
     if args.per_page:
-        from pdf_to_markdown_docling.audit_utils import audit_doc_vs_markdown_per_page
-
-        page_audits = audit_doc_vs_markdown_per_page(result.document, markdown)
-        page_audits.sort(key=lambda p: p.token_coverage)
+        page_audits = sorted(audit.pages, key=lambda p: p.token_coverage)
         print(f"Top {min(args.top, len(page_audits))} pages by lowest token coverage:")
         for audit in page_audits[: args.top]:
             print(
@@ -0,0 +1,222 @@
+"""@fileoverview Benchmark the full conversion pipeline and gate on regressions.
+
+`run` converts the benchmark corpus (bundled reports + seeded synthetic PDFs) and writes
+per-stage time, peak RSS and pages/sec to JSON; `micro` times the model-free fixers and
+Markdown passes on recorded Docling JSON; `compare` diffs two reports of the same kind
+and exits non-zero when a stage, total time, throughput or memory regressed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from pdf_to_markdown_docling.benchmark import (
+    DEFAULT_MICRO_ITERATIONS,
+    DEFAULT_MICRO_MIN_SECONDS,
+    DEFAULT_MIN_RSS_MB,
+    DEFAULT_MIN_SECONDS,
+    DEFAULT_SYNTHETIC_PAGES,
+    DEFAULT_THRESHOLD,
+    build_corpus,
+    compare_benchmarks,
+    comparison_warnings,
+    format_regressions,
+    run_benchmark,
+    run_micro_benchmarks,
+)
+from pdf_to_markdown_docling.cli import parse_page_range
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the PDF-to-Markdown pipeline and compare against a baseline."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Benchmark the corpus and write a JSON report.")
+    run.add_argument("-o", "--output", required=True, help="JSON report to write.")
+    run.add_argument(
+        "--corpus-dir",
+        default=str(ROOT_DIR / ".cache" / "benchmark_corpus"),
+        help="Where synthetic PDFs are generated (default: .cache/benchmark_corpus).",
+    )
+    run.add_argument(
+        "--cases",
+        help="Comma-separated case names to run (default: all).",
+    )
+    run.add_argument(
+        "--synthetic-pages",
+        type=int,
+        default=DEFAULT_SYNTHETIC_PAGES,
+        help=f"Pages per synthetic PDF (default: {DEFAULT_SYNTHETIC_PAGES}).",
+    )
+    run.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="Measured runs per case; medians are reported (default: 1).",
+    )
+    run.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Include model loading in the numbers (skip the 1-page warm-up run).",
+    )
+    run.add_argument("--page-range", type=parse_page_range, help="Benchmark only these pages.")
+    run.add_argument("--ocr-mode", choices=("off", "on", "auto"), default="auto")
+    run.add_argument("--ocr-engine", default="tesseract")
+    run.add_argument("--ocr-lang", default="eng")
+    run.add_argument(
+        "--spacing-fix", choices=("off", "pymupdf", "docling", "ocr"), default="pymupdf"
+    )
+    run.add_argument(
+        "--pdf-backend", choices=("auto", "pypdfium2", "docling-parse-v4"), default="auto"
+    )
+    run.add_argument("--device", default="cpu")
+    run.add_argument("--quiet", action="store_true", help="Only print the final path.")
+
+    micro = commands.add_parser(
+        "micro", help="Time the model-free fixers and Markdown passes on Docling JSON."
+    )
+    micro.add_argument(
+        "docling_json",
+        nargs="*",
+        default=[str(ROOT_DIR / "examples" / "long_report.docling.json")],
+        help="Recorded Docling JSON documents (default: examples/long_report.docling.json).",
+    )
+    micro.add_argument("-o", "--output", help="Also write the JSON report here.")
+    micro.add_argument(
+        "--iterations",
+        type=int,
+        default=DEFAULT_MICRO_ITERATIONS,
+        help=f"Timed iterations per document (default: {DEFAULT_MICRO_ITERATIONS}).",
+    )
+    micro.add_argument("--quiet", action="store_true", help="Only print the final path.")
+
+    compare = commands.add_parser(
+        "compare", help="Fail when CURRENT regressed against BASELINE."
+    )
+    compare.add_argument("baseline", help="Baseline JSON report.")
+    compare.add_argument("current", help="JSON report of the run under test.")
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Allowed relative slowdown per metric (default: {DEFAULT_THRESHOLD}).",
+    )
+    compare.add_argument(
+        "--min-seconds",
+        type=float,
+        help=(
+            "Ignore time increases below this many seconds (default: "
+            f"{DEFAULT_MIN_SECONDS}, or {DEFAULT_MICRO_MIN_SECONDS} for micro reports)."
+        ),
+    )
+    compare.add_argument(
+        "--min-rss-mb",
+        type=float,
+        default=DEFAULT_MIN_RSS_MB,
+        help=f"Ignore peak RSS increases below this many MB (default: {DEFAULT_MIN_RSS_MB:g}).",
+    )
+    return parser
+
+
+def _run(args: argparse.Namespace) -> None:
+    if args.repeat < 1 or args.synthetic_pages < 1:
+        raise SystemExit("--repeat and --synthetic-pages must be at least 1.")
+    names = [name.strip() for name in args.cases.split(",")] if args.cases else None
+    try:
+        cases = build_corpus(
+            ROOT_DIR,
+            Path(args.corpus_dir).expanduser().resolve(),
+            synthetic_pages=args.synthetic_pages,
+            names=names,
+        )
+    except (ValueError, FileNotFoundError) as exc:
+        raise SystemExit(str(exc)) from exc
+
+    report = run_benchmark(
+        cases,
+        repeat=args.repeat,
+        warmup=not args.no_warmup,
+        quiet=args.quiet,
+        max_pages=None,
+        page_range=args.page_range,
+        ocr_mode=args.ocr_mode,
+        ocr_engine=args.ocr_engine,
+        ocr_lang=args.ocr_lang,
+        force_full_page_ocr=False,
+        spacing_fix=args.spacing_fix,
+        device=args.device,
+        pdf_backend=args.pdf_backend,
+    )
+    _write_report(report, args.output)
+
+
+def _micro(args: argparse.Namespace) -> None:
+    if args.iterations < 1:
+        raise SystemExit("--iterations must be at least 1.")
+    json_paths = [Path(value).expanduser().resolve() for value in args.docling_json]
+    for path in json_paths:
+        if not path.exists():
+            raise SystemExit(f"Docling JSON not found: {path}")
+    report = run_micro_benchmarks(json_paths, iterations=args.iterations, quiet=args.quiet)
+    if args.output:
+        _write_report(report, args.output)
+
+
+def _write_report(report: dict[str, object], output: str) -> None:
+    output_path = Path(output).expanduser().resolve()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Wrote benchmark report to {output_path}")
+
+
+def _compare(args: argparse.Namespace) -> None:
+    reports = []
+    for value in (args.baseline, args.current):
+        path = Path(value).expanduser().resolve()
+        if not path.exists():
+            raise SystemExit(f"Benchmark report not found: {path}")
+        reports.append(json.loads(path.read_text(encoding="utf-8")))
+    baseline, current = reports
+
+    if baseline.get("mode") != current.get("mode"):
+        raise SystemExit("Cannot compare a micro benchmark report with a pipeline report.")
+    min_seconds = args.min_seconds
+    if min_seconds is None:
+        # WHY: Micro stages run in milliseconds; the pipeline floor would hide them all.
+        micro = baseline.get("mode") == "micro"
+        min_seconds = DEFAULT_MICRO_MIN_SECONDS if micro else DEFAULT_MIN_SECONDS
+
+    for warning in comparison_warnings(baseline, current):
+        print(f"Warning: {warning}")
+    regressions = compare_benchmarks(
+        baseline,
+        current,
+        threshold=args.threshold,
+        min_seconds=min_seconds,
+        min_rss_mb=args.min_rss_mb,
+    )
+    print(format_regressions(regressions))
+    if regressions:
+        raise SystemExit(1)
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    if args.command == "run":
+        _run(args)
+    elif args.command == "micro":
+        _micro(args)
+    else:
+        _compare(args)
+
+
+if __name__ == "__main__":
+    main()
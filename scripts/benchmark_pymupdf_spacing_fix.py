@@ -0,0 +1,140 @@
+"""@fileoverview Benchmark PyMuPDF glyph extractions per page for the spacing fixer.
+
+Compares the page-glyph index against the previous per-bbox clipped extraction on a
+PDF plus its Docling JSON, and checks both produce the same document.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import fitz
+import numpy as np
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from docling_core.types.doc.document import DoclingDocument
+
+from pdf_to_markdown_docling import pymupdf_spacing_fix
+from pdf_to_markdown_docling.glyph_layout import glyph_array
+from pdf_to_markdown_docling.pymupdf_spacing_fix import (
+    TEXT_FLAGS,
+    fix_spaced_items_with_pymupdf_glyphs,
+)
+
+
+class _ClippedPageExtractor:
+    """Stand-in for PageGlyphIndex that re-extracts the page for every query (old behavior)."""
+
+    extractions = 0
+
+    def __init__(self, page: fitz.Page) -> None:
+        self.page = page
+        self.rect = page.rect
+        self.extractions = 0
+
+    def words(self, rect: fitz.Rect) -> list[tuple[str, int, int, int]]:
+        self.extractions += 1
+        words = self.page.get_text("words", clip=rect, flags=TEXT_FLAGS)
+        return [(word[4], int(word[5]), int(word[6]), int(word[7])) for word in words]
+
+    def chars(self, rect: fitz.Rect) -> list[tuple[str, fitz.Rect]]:
+        self.extractions += 1
+        raw = self.page.get_text("rawdict", clip=rect, flags=TEXT_FLAGS)
+        chars = []
+        for block in raw.get("blocks", []):
+            for line in block.get("lines", []):
+                for span in line.get("spans", []):
+                    for ch in span.get("chars", []):
+                        text = ch.get("c")
+                        bbox = ch.get("bbox")
+                        if text and bbox and len(bbox) == 4:
+                            chars.append((text, fitz.Rect(bbox)))
+        return chars
+
+    def clip_glyphs(
+        self, rects: list[Optional[fitz.Rect]]
+    ) -> tuple[np.ndarray, list[str], list[int]]:
+        glyphs: list[tuple[str, float, float, float, float]] = []
+        bounds = [0]
+        for rect in rects:
+            if rect is not None:
+                glyphs.extend((text, *bbox) for text, bbox in self.chars(rect))
+            bounds.append(len(glyphs))
+        boxes, texts = glyph_array(glyphs)
+        return boxes, texts, bounds
+
+
+def _run(doc: DoclingDocument, pdf_path: Path, index_class: type) -> tuple[dict, float, int, int]:
+    # WHY: The fixer builds its per-page helper through the module global, so swapping
+    # it measures the old per-clip path with the exact same query logic.
+    created: list[object] = []
+    original = pymupdf_spacing_fix.PageGlyphIndex
+
+    def factory(page: fitz.Page) -> object:
+        helper = index_class(page)
+        created.append(helper)
+        return helper
+
+    pymupdf_spacing_fix.PageGlyphIndex = factory
+    try:
+        started = time.perf_counter()
+        fix_spaced_items_with_pymupdf_glyphs(doc, pdf_path, pages_to_fix=None)
+        elapsed = time.perf_counter() - started
+    finally:
+        pymupdf_spacing_fix.PageGlyphIndex = original
+    extractions = sum(helper.extractions for helper in created)
+    return doc.export_to_dict(), elapsed, extractions, len(created)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the PyMuPDF spacing fixer: per-bbox clips vs one extraction per page."
+    )
+    parser.add_argument(
+        "--pdf",
+        default=str(ROOT_DIR / "examples" / "long_report.pdf"),
+        help="PDF to repair (default: examples/long_report.pdf).",
+    )
+    parser.add_argument(
+        "--docling-json",
+        default=str(ROOT_DIR / "examples" / "long_report.docling.json"),
+        help="Docling JSON export of the PDF (default: examples/long_report.docling.json).",
+    )
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    pdf_path = Path(args.pdf).expanduser().resolve()
+    json_path = Path(args.docling_json).expanduser().resolve()
+    for path in (pdf_path, json_path):
+        if not path.exists():
+            raise SystemExit(f"Input file not found: {path}")
+
+    base = DoclingDocument.load_from_json(json_path)
+    results = {}
+    for label, index_class in (
+        ("clipped", _ClippedPageExtractor),
+        ("indexed", pymupdf_spacing_fix.PageGlyphIndex),
+    ):
+        output, elapsed, extractions, pages = _run(copy.deepcopy(base), pdf_path, index_class)
+        results[label] = output
+        per_page = extractions / pages if pages else 0.0
+        print(
+            f"{label}: {elapsed:.3f}s, {extractions} extractions over {pages} pages "
+            f"({per_page:.1f}/page)"
+        )
+    if results["clipped"] != results["indexed"]:
+        raise SystemExit("Outputs differ between clipped and indexed extraction.")
+    print("Outputs identical.")
+
+
+if __name__ == "__main__":
+    main()
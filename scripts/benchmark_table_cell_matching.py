@@ -0,0 +1,138 @@
+"""@fileoverview Benchmark OCR-to-base table cell matching on a dense synthetic page.
+
+Builds one page with a base table of `--cells` cells and an OCR table whose shape does
+not match (so every cell goes through the bbox-overlap fallback), then times
+`merge_spaced_table_cells` / `merge_suspect_table_cells` with the per-page grid index
+against a linear scan over all OCR cells, and checks both produce the same document.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from docling_core.types.doc.base import BoundingBox, Size
+from docling_core.types.doc.document import (
+    DoclingDocument,
+    ProvenanceItem,
+    TableCell,
+    TableData,
+)
+
+from pdf_to_markdown_docling import table_fixes
+from pdf_to_markdown_docling.table_fixes import (
+    merge_spaced_table_cells,
+    merge_suspect_table_cells,
+)
+
+
+class _LinearCells:
+    """Stand-in for _CellGridIndex that offers every OCR cell as a candidate (old behavior)."""
+
+    def __init__(self, cells: list[tuple[BoundingBox, str, float]]) -> None:
+        self.cells = cells
+
+    def candidates(self, _bbox) -> list[tuple[BoundingBox, str, float]]:
+        return self.cells
+
+
+def _page_document(cells: int, *, ocr: bool, suspect: bool, seed: int) -> DoclingDocument:
+    rng = random.Random(seed)
+    cols = 20
+    rows = math.ceil(cells / cols) + (1 if ocr else 0)
+    doc = DoclingDocument(name="dense_page")
+    doc.add_page(page_no=1, size=Size(width=cols * 60 + 40, height=rows * 12 + 40))
+    table_cells = []
+    for row in range(rows):
+        for col in range(cols):
+            value = f"{rng.randint(1, 999)}.{rng.randint(100, 999)}"
+            if ocr:
+                text = value
+            elif suspect:
+                text = f".{value[1:]}" if rng.random() < 0.5 else value
+            else:
+                text = " ".join(value)
+            # WHY: OCR boxes drift a few points from the parsed ones, like real reruns.
+            jitter = rng.uniform(-2.5, 2.5) if ocr else 0.0
+            left = 20 + col * 60 + jitter
+            top = 20 + row * 12 + jitter
+            table_cells.append(
+                TableCell(
+                    bbox=BoundingBox(l=left, t=top, r=left + 56, b=top + 10),
+                    start_row_offset_idx=row,
+                    end_row_offset_idx=row + 1,
+                    start_col_offset_idx=col,
+                    end_col_offset_idx=col + 1,
+                    text=text,
+                )
+            )
+    doc.add_table(
+        data=TableData(num_rows=rows, num_cols=cols, table_cells=table_cells),
+        prov=ProvenanceItem(
+            page_no=1, bbox=BoundingBox(l=20, t=20, r=cols * 60, b=rows * 12), charspan=(0, 0)
+        ),
+    )
+    return doc
+
+
+def _run(merge, base: DoclingDocument, ocr: DoclingDocument, index_class: type) -> tuple:
+    # WHY: The merges build their per-page index through the module global, so swapping
+    # it measures the old linear scan with the exact same scoring logic.
+    original = table_fixes._CellGridIndex
+    table_fixes._CellGridIndex = index_class
+    try:
+        doc = base.model_copy(deep=True)
+        started = time.perf_counter()
+        merge(doc, ocr)
+        elapsed = time.perf_counter() - started
+    finally:
+        table_fixes._CellGridIndex = original
+    return doc.export_to_dict(), elapsed
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark OCR table cell matching: linear scan vs per-page grid index."
+    )
+    parser.add_argument(
+        "--cells",
+        type=int,
+        default=2000,
+        help="Base table cells on the synthetic page (default: 2000).",
+    )
+    parser.add_argument("--seed", type=int, default=7, help="Layout/text seed (default: 7).")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    if args.cells < 1:
+        raise SystemExit("--cells must be at least 1.")
+
+    for label, merge, suspect in (
+        ("spaced", merge_spaced_table_cells, False),
+        ("suspect", merge_suspect_table_cells, True),
+    ):
+        base = _page_document(args.cells, ocr=False, suspect=suspect, seed=args.seed)
+        ocr = _page_document(args.cells, ocr=True, suspect=suspect, seed=args.seed + 1)
+        linear_doc, linear_seconds = _run(merge, base, ocr, _LinearCells)
+        indexed_doc, indexed_seconds = _run(merge, base, ocr, table_fixes._CellGridIndex)
+        speedup = linear_seconds / indexed_seconds if indexed_seconds else float("inf")
+        print(
+            f"{label}: linear {linear_seconds:.3f}s, indexed {indexed_seconds:.3f}s "
+            f"({speedup:.1f}x) over {len(base.tables[0].data.table_cells)} cells"
+        )
+        if linear_doc != indexed_doc:
+            raise SystemExit(f"Outputs differ between linear and indexed matching ({label}).")
+    print("Outputs identical.")
+
+
+if __name__ == "__main__":
+    main()
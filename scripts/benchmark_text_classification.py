@@ -0,0 +1,173 @@
+"""@fileoverview Benchmark memoized spacing classification on recorded Docling JSON.
+
+Replays the predicate calls one conversion makes per string (page detection, table-cell
+repair selection, audit, both OCR merges, `_should_replace_text`) over every table cell
+and text item of `--docling-json`, once with per-predicate regex scans (the behavior
+before `classify_spacing`) and once through the memoized classifier, cold and warm, and
+checks that all three agree.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR / "src"))
+
+from docling_core.types.doc.document import DoclingDocument
+
+from pdf_to_markdown_docling import audit_utils
+from pdf_to_markdown_docling.audit_utils import (
+    classify_spacing,
+    is_multi_space_text,
+    is_spaced_text,
+    needs_spacing_fix,
+    needs_table_spacing_fix,
+)
+from pdf_to_markdown_docling.pymupdf_spacing_fix import _spacing_badness
+
+
+def _direct_collapsed(text: str) -> bool:
+    if audit_utils._RUNON_LETTERS_PATTERN.search(text):
+        return True
+    if audit_utils._RUNON_MERGED_ALNUM_PATTERN.search(text):
+        return True
+    if len(text) < 60:
+        return False
+    words = audit_utils._WORD_PATTERN.findall(text)
+    if not words:
+        return False
+    avg_word_length = sum(len(word) for word in words) / len(words)
+    long_words = sum(1 for word in words if len(word) >= 18)
+    return audit_utils._has_collapsed_shape(text, len(words), avg_word_length, long_words)
+
+
+def _direct_needs_spacing_fix(text: str) -> bool:
+    return audit_utils._is_spaced_text(text) or _direct_collapsed(text)
+
+
+def _direct_badness(text: str) -> float:
+    words = audit_utils._WORD_PATTERN.findall(text)
+    if not words:
+        return 0.0
+    badness = max(0.0, sum(len(word) for word in words) / len(words) - 6.0)
+    badness += sum(1 for word in words if len(word) >= 18) * 1.5
+    if audit_utils._RUNON_LETTERS_PATTERN.search(text):
+        badness += 4.0
+    if audit_utils._RUNON_MERGED_ALNUM_PATTERN.search(text):
+        badness += 3.0
+    if audit_utils._is_spaced_text(text):
+        badness += 4.0
+    return badness
+
+
+DIRECT = SimpleNamespace(
+    spaced=audit_utils._is_spaced_text,
+    multi_space=lambda text: bool(audit_utils._MULTI_SPACE_PATTERN.search(text)),
+    needs_fix=_direct_needs_spacing_fix,
+    needs_table_fix=lambda text: (
+        _direct_needs_spacing_fix(text) or audit_utils._has_short_letter_split(text)
+    ),
+    badness=_direct_badness,
+)
+MEMOIZED = SimpleNamespace(
+    spaced=is_spaced_text,
+    multi_space=is_multi_space_text,
+    needs_fix=needs_spacing_fix,
+    needs_table_fix=needs_table_spacing_fix,
+    badness=_spacing_badness,
+)
+
+
+def _replay(predicates: SimpleNamespace, cells: list[str], texts: list[str]) -> list[object]:
+    # WHY: One entry per call site, in the order a conversion reaches them.
+    cell_calls: list[Callable[[str], object]] = [
+        predicates.needs_table_fix,  # detect_spacing_pages
+        predicates.needs_table_fix,  # _needs_table_cell_repair
+        predicates.spaced,  # audit / document health
+        predicates.spaced,  # merge_spaced_table_cells: base cell
+        predicates.spaced,  # merge_spaced_table_cells: OCR candidate
+        predicates.needs_table_fix,  # _should_replace_text
+        predicates.needs_fix,
+        predicates.badness,
+    ]
+    text_calls: list[Callable[[str], object]] = [
+        predicates.needs_fix,  # detect_spacing_pages
+        predicates.needs_fix,  # audit / document health
+        predicates.multi_space,
+        predicates.needs_fix,  # _should_replace_text
+        predicates.badness,
+    ]
+    results = [call(text) for text in cells for call in cell_calls]
+    results.extend(call(text) for text in texts for call in text_calls)
+    return results
+
+
+def _time(run: Callable[[], list[object]], *, repeat: int, clear: bool) -> tuple:
+    best = float("inf")
+    results: list[object] = []
+    for _ in range(repeat):
+        if clear:
+            classify_spacing.cache_clear()
+        started = time.perf_counter()
+        results = run()
+        best = min(best, time.perf_counter() - started)
+    return results, best
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Benchmark spacing predicates: per-call regex scans vs memoized flags."
+    )
+    parser.add_argument(
+        "--docling-json",
+        default=str(ROOT_DIR / "examples" / "long_report.docling.json"),
+        help="Recorded Docling JSON (default: examples/long_report.docling.json).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed runs per mode; best is kept (default: 5)."
+    )
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    if args.repeat < 1:
+        raise SystemExit("--repeat must be at least 1.")
+    json_path = Path(args.docling_json).expanduser().resolve()
+    if not json_path.exists():
+        raise SystemExit(f"Docling JSON not found: {json_path}")
+
+    doc = DoclingDocument.load_from_json(json_path)
+    cells = [cell.text for table in doc.tables for cell in table.data.table_cells]
+    texts = [item.text for item in doc.texts if item.text]
+
+    direct, direct_seconds = _time(
+        lambda: _replay(DIRECT, cells, texts), repeat=args.repeat, clear=False
+    )
+    cold, cold_seconds = _time(
+        lambda: _replay(MEMOIZED, cells, texts), repeat=args.repeat, clear=True
+    )
+    warm, warm_seconds = _time(
+        lambda: _replay(MEMOIZED, cells, texts), repeat=args.repeat, clear=False
+    )
+    print(f"{len(cells)} cells, {len(texts)} text items, {len(direct)} predicate calls")
+    for label, seconds in (
+        ("per-call regex", direct_seconds),
+        ("memoized (cold)", cold_seconds),
+        ("memoized (warm)", warm_seconds),
+    ):
+        print(f"  {label}: {seconds * 1000:.1f} ms ({direct_seconds / seconds:.1f}x)")
+    print(f"  cache: {classify_spacing.cache_info()}")
+    if not direct == cold == warm:
+        raise SystemExit("Memoized classification disagrees with the per-call predicates.")
+    print("Results identical.")
+
+
+if __name__ == "__main__":
+    main()
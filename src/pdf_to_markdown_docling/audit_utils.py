@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Iterable
 
-from docling_core.types.doc import TableItem
-from docling_core.types.doc.document import DoclingDocument
+from docling_core.transforms.serializer.plain_text import PlainTextDocSerializer, PlainTextParams
+from docling_core.types.doc import TableItem, TextItem
+from docling_core.types.doc.document import DOCUMENT_TOKENS_EXPORT_LABELS, DoclingDocument
 from docling_core.types.doc.labels import DocItemLabel
 
 
@@ -46,6 +48,71 @@ class PageAudit:
     md_text_length: int
 
 
+@dataclass(frozen=True)
+class DocumentAudit:
+    metrics: AuditMetrics
+    pages: tuple[PageAudit, ...]
+
+
+@dataclass(frozen=True)
+class PageHealth:
+    """Spacing statistics for one page; `page_no` is None for items without provenance."""
+
+    page_no: int | None
+    text_chars: int
+    export_chars: int
+    total_table_cells: int
+    spaced_table_cells: int
+    spaced_toc_cells: int
+    total_text_items: int
+    spaced_text_items: int
+    collapsed_text_items: int
+    multi_space_text_items: int
+
+
+@dataclass(frozen=True)
+class DocumentHealth:
+    pages: tuple[PageHealth, ...]
+
+    @property
+    def export_chars(self) -> int:
+        """Length of the document's plain-text export (`export_to_text`)."""
+        pages = [page.export_chars for page in self.pages if page.export_chars]
+        return sum(pages) + len(_ITEM_DELIM) * max(len(pages) - 1, 0)
+
+    @property
+    def total_table_cells(self) -> int:
+        return sum(page.total_table_cells for page in self.pages)
+
+    @property
+    def spaced_table_cells(self) -> int:
+        return sum(page.spaced_table_cells for page in self.pages)
+
+    @property
+    def spaced_cell_ratio(self) -> float:
+        total = self.total_table_cells
+        return self.spaced_table_cells / total if total else 0.0
+
+    def spaced_table_pages(self) -> set[int] | None:
+        """Pages with letter-spaced table cells; None if such a table has no page."""
+        pages = {
+            page.page_no
+            for page in self.pages
+            if page.spaced_table_cells or page.spaced_toc_cells
+        }
+        if None in pages:
+            return None
+        return pages
+
+    def sparse_pages(self, min_chars: int) -> set[int]:
+        """Pages whose extracted text (text items plus table cells) is below `min_chars`."""
+        return {
+            page.page_no
+            for page in self.pages
+            if page.page_no is not None and page.text_chars < min_chars
+        }
+
+
 _SPACED_TEXT_PATTERN = re.compile(r"(?:\b\w\b\s+){1,}\b\w\b", flags=re.UNICODE)
 _SPACED_DIGIT_PATTERN = re.compile(r"(?:\b\d\b\s+){3,}\b\d\b")
 _SPLIT_WORD_PATTERN = re.compile(r"\b(\w{2,})\s+(\w)\s+(\w{2,})\b", flags=re.UNICODE)
@@ -67,10 +134,72 @@ _TRAILING_SINGLE_ALPHA_PATTERN = re.compile(
     flags=re.UNICODE,
 )
 _SOLD_SUFFIX_PATTERN = re.compile(r"\bSOLD\s+[CD]\b", flags=re.IGNORECASE)
+_WORD_PATTERN = re.compile(r"\w+", flags=re.UNICODE)
+# WHY: Every fixer sweeps all cells of the document in order, so an LRU smaller than
+# the document's distinct strings would miss on every pass; cell texts are short.
+SPACING_FLAGS_CACHE_SIZE = 65536
+
+
+@dataclass(frozen=True)
+class SpacingFlags:
+    """Spacing classification of one string, computed in a single scan."""
+
+    spaced: bool
+    collapsed: bool
+    multi_space: bool
+    short_split: bool
+    runon_letters: bool
+    merged_alnum: bool
+    word_count: int
+    avg_word_length: float
+    long_words: int
+
+    @property
+    def needs_spacing_fix(self) -> bool:
+        return self.spaced or self.collapsed
+
+    @property
+    def needs_table_spacing_fix(self) -> bool:
+        return self.spaced or self.collapsed or self.short_split
+
+
+@lru_cache(maxsize=SPACING_FLAGS_CACHE_SIZE)
+def classify_spacing(text: str) -> SpacingFlags:
+    """Compute every spacing predicate for `text` at once; results are memoized by text.
+
+    @example
+    flags = classify_spacing("V e n i t u r i")
+    assert flags.spaced and flags.needs_table_spacing_fix
+    """
+    words = _WORD_PATTERN.findall(text)
+    word_count = len(words)
+    avg_word_length = sum(len(word) for word in words) / word_count if words else 0.0
+    long_words = sum(1 for word in words if len(word) >= 18)
+    runon_letters = bool(_RUNON_LETTERS_PATTERN.search(text))
+    merged_alnum = bool(_RUNON_MERGED_ALNUM_PATTERN.search(text))
+    return SpacingFlags(
+        spaced=_is_spaced_text(text),
+        collapsed=(
+            runon_letters
+            or merged_alnum
+            or _has_collapsed_shape(text, word_count, avg_word_length, long_words)
+        ),
+        multi_space=bool(_MULTI_SPACE_PATTERN.search(text)),
+        short_split=_has_short_letter_split(text),
+        runon_letters=runon_letters,
+        merged_alnum=merged_alnum,
+        word_count=word_count,
+        avg_word_length=avg_word_length,
+        long_words=long_words,
+    )
 
 
 def is_spaced_text(text: str) -> bool:
     """Detect obvious spacing artifacts (split letters or digits) in extracted text."""
+    return classify_spacing(text).spaced
+
+
+def _is_spaced_text(text: str) -> bool:
     if _SPACED_DIGIT_PATTERN.search(text):
         return True
     if _SPACED_NUMBER_PATTERN.search(text):
@@ -121,26 +250,23 @@ def is_spaced_text(text: str) -> bool:
 
 def is_multi_space_text(text: str) -> bool:
     """Detect multiple spaces/tabs between tokens without other spacing artifacts."""
-    return bool(_MULTI_SPACE_PATTERN.search(text))
+    return classify_spacing(text).multi_space
 
 def is_collapsed_text(text: str) -> bool:
     """Detect run-on text where spaces are likely missing between words."""
-    if _RUNON_LETTERS_PATTERN.search(text):
-        return True
-    if _RUNON_MERGED_ALNUM_PATTERN.search(text):
-        return True
-    if len(text) < 60:
-        return False
-    tokens = [tok for tok in re.findall(r"\w+", text, flags=re.UNICODE) if tok]
-    if len(tokens) < 8:
+    return classify_spacing(text).collapsed
+
+
+def _has_collapsed_shape(
+    text: str, word_count: int, avg_word_length: float, long_words: int
+) -> bool:
+    if len(text) < 60 or word_count < 8:
         return False
-    avg_len = sum(len(tok) for tok in tokens) / len(tokens)
-    long_tokens = sum(1 for tok in tokens if len(tok) >= 18)
     space_ratio = text.count(" ") / max(len(text), 1)
 
-    if avg_len >= 9.0:
+    if avg_word_length >= 9.0:
         return True
-    if long_tokens >= 2:
+    if long_words >= 2:
         return True
     if len(text) > 120 and space_ratio < 0.05:
         return True
@@ -149,13 +275,15 @@ def is_collapsed_text(text: str) -> bool:
 
 def needs_spacing_fix(text: str) -> bool:
     """Decide if generic text should be routed through spacing repair."""
-    return is_spaced_text(text) or is_collapsed_text(text)
+    return classify_spacing(text).needs_spacing_fix
 
 
 def needs_table_spacing_fix(text: str) -> bool:
     """Decide if table cells need spacing repair (captures short letter splits)."""
-    if needs_spacing_fix(text):
-        return True
+    return classify_spacing(text).needs_table_spacing_fix
+
+
+def _has_short_letter_split(text: str) -> bool:
     if not text:
         return False
     has_digit = any(ch.isdigit() for ch in text)
@@ -227,17 +355,6 @@ def _markdown_table_count(markdown: str) -> int:
     return count
 
 
-def _docling_table_stats(doc: DoclingDocument) -> tuple[int, int]:
-    tables = []
-    for item, _level in doc.iterate_items():
-        if isinstance(item, TableItem):
-            if _is_toc_like_table(item):
-                continue
-            tables.append(item)
-    cell_count = sum(table.data.num_rows * table.data.num_cols for table in tables)
-    return len(tables), cell_count
-
-
 def _is_toc_like_table(table: TableItem) -> bool:
     if table.data.num_cols != 2 or table.data.num_rows < 6:
         return False
@@ -260,77 +377,206 @@ def _is_toc_like_table(table: TableItem) -> bool:
     return True
 
 
-def _docling_heading_count(doc: DoclingDocument) -> int:
-    heading_labels = {DocItemLabel.TITLE, DocItemLabel.SECTION_HEADER}
-    count = 0
-    for item, _level in doc.iterate_items():
-        if getattr(item, "label", None) in heading_labels:
-            count += 1
-    return count
+@dataclass
+class _DocumentScan:
+    """Per-page text buckets and item counts gathered in one document traversal."""
 
+    page_texts: dict[int | None, list[str]] = field(default_factory=dict)
+    table_count: int = 0
+    table_cells: int = 0
+    heading_count: int = 0
+    spaced_cells: int = 0
+    total_cells: int = 0
+    spaced_text_items: int = 0
+    multi_space_text_items: int = 0
+    total_text_items: int = 0
+
+
+# WHY: Plain-text export separates items (and so pages) with a blank line.
+_ITEM_DELIM = "\n\n"
 
-def audit_doc_vs_markdown(doc: DoclingDocument, markdown: str) -> AuditMetrics:
-    """Compare Docling text against Markdown to quantify extraction fidelity."""
-    pdf_text = doc.export_to_text()
-    pdf_tokens = _tokenize(pdf_text)
-    md_tokens = set(_tokenize(markdown))
 
-    numbers_pdf = _extract_numbers(pdf_text)
-    numbers_md = _extract_numbers(markdown)
+def _table_text(serializer: PlainTextDocSerializer, table: TableItem) -> str:
+    # WHY: `pdf_text_length` has always measured the plain-text export, whose tables are
+    # padded grids; serializing just the table keeps the numbers comparable.
+    return serializer.serialize(item=table).text
 
-    dates_pdf = _extract_dates(pdf_text)
-    dates_md = _extract_dates(markdown)
 
-    table_count_pdf, table_cells_pdf = _docling_table_stats(doc)
-    table_count_md = _markdown_table_count(markdown)
+def _exported_text(serializer: PlainTextDocSerializer, item: object) -> str:
+    """What `export_to_text` emits for one item; empty for items it leaves out."""
+    if getattr(item, "label", None) not in DOCUMENT_TOKENS_EXPORT_LABELS:
+        return ""
+    if isinstance(item, TableItem):
+        return _table_text(serializer, item)
+    if isinstance(item, TextItem):
+        return item.text or ""
+    return ""
 
-    heading_count_pdf = _docling_heading_count(doc)
-    heading_count_md = _markdown_heading_count(markdown)
 
-    spaced_cells = 0
-    total_cells = 0
-    spaced_text_items = 0
-    multi_space_text_items = 0
-    total_text_items = 0
+def _scan_document(doc: DoclingDocument) -> _DocumentScan:
+    heading_labels = {DocItemLabel.TITLE, DocItemLabel.SECTION_HEADER}
+    scan = _DocumentScan()
+    serializer = PlainTextDocSerializer(doc=doc, params=PlainTextParams())
     for item, _level in doc.iterate_items():
+        label = getattr(item, "label", None)
+        if label in heading_labels:
+            scan.heading_count += 1
+
+        exported = _exported_text(serializer, item)
         if isinstance(item, TableItem):
-            if _is_toc_like_table(item):
-                continue
-            for cell in item.data.table_cells:
-                total_cells += 1
-                if is_spaced_text(cell.text):
-                    spaced_cells += 1
+            if not _is_toc_like_table(item):
+                scan.table_count += 1
+                scan.table_cells += item.data.num_rows * item.data.num_cols
+                for cell in item.data.table_cells:
+                    scan.total_cells += 1
+                    if is_spaced_text(cell.text):
+                        scan.spaced_cells += 1
         else:
             text = getattr(item, "text", None)
             if not text:
                 continue
-            total_text_items += 1
-            if is_multi_space_text(text):
-                multi_space_text_items += 1
-            if needs_spacing_fix(text) and not (
-                is_multi_space_text(text)
-                and not is_spaced_text(text)
-                and not is_collapsed_text(text)
-            ):
-                spaced_text_items += 1
-
-    return AuditMetrics(
-        token_coverage=_coverage(pdf_tokens, md_tokens),
-        numeric_recall=_coverage(numbers_pdf, numbers_md),
-        date_recall=_coverage(dates_pdf, dates_md),
-        table_count_pdf=table_count_pdf,
-        table_count_md=table_count_md,
-        table_cells_pdf=table_cells_pdf,
-        heading_count_pdf=heading_count_pdf,
-        heading_count_md=heading_count_md,
-        pdf_text_length=len(pdf_text),
+            flags = classify_spacing(text)
+            scan.total_text_items += 1
+            scan.multi_space_text_items += flags.multi_space
+            scan.spaced_text_items += flags.needs_spacing_fix
+
+        if exported:
+            # WHY: Items are bucketed by the page they start on, so text that flows onto
+            # the next page is counted once in the document totals.
+            page_no = item.prov[0].page_no if item.prov else None
+            scan.page_texts.setdefault(page_no, []).append(exported)
+    return scan
+
+
+@dataclass
+class _PageHealthCounts:
+    text_chars: int = 0
+    export_chars: int = 0
+    total_table_cells: int = 0
+    spaced_table_cells: int = 0
+    spaced_toc_cells: int = 0
+    total_text_items: int = 0
+    spaced_text_items: int = 0
+    collapsed_text_items: int = 0
+    multi_space_text_items: int = 0
+
+
+def scan_document_health(doc: DoclingDocument) -> DocumentHealth:
+    """Count spacing artifacts and text sizes per page in one traversal.
+
+    Only tables are serialized (to size them as the plain-text export does); the rest
+    of the document is never exported.
+    """
+    counts = {page_no: _PageHealthCounts() for page_no in sorted(doc.pages)}
+    serializer = PlainTextDocSerializer(doc=doc, params=PlainTextParams())
+    for item, _level in doc.iterate_items():
+        prov = getattr(item, "prov", None)
+        page_no = prov[0].page_no if prov else None
+        page = counts.get(page_no)
+        if page is None:
+            page = counts[page_no] = _PageHealthCounts()
+        exported = _exported_text(serializer, item)
+        if exported:
+            page.export_chars += len(exported) + (len(_ITEM_DELIM) if page.export_chars else 0)
+
+        if isinstance(item, TableItem):
+            # WHY: TOC-like tables are left out of the ratio (their page numbers look
+            # spaced) but still mark the page, matching detect_spacing_pages.
+            toc_like = _is_toc_like_table(item)
+            for cell in item.data.table_cells:
+                page.text_chars += len(cell.text or "")
+                spaced = is_spaced_text(cell.text)
+                if toc_like:
+                    page.spaced_toc_cells += spaced
+                else:
+                    page.total_table_cells += 1
+                    page.spaced_table_cells += spaced
+            continue
+
+        text = getattr(item, "text", None)
+        if not text:
+            continue
+        page.text_chars += len(text)
+        flags = classify_spacing(text)
+        page.total_text_items += 1
+        page.spaced_text_items += flags.needs_spacing_fix
+        page.collapsed_text_items += flags.collapsed
+        page.multi_space_text_items += flags.multi_space
+
+    return DocumentHealth(
+        pages=tuple(
+            PageHealth(page_no=page_no, **vars(page)) for page_no, page in counts.items()
+        )
+    )
+
+
+def audit_document(
+    doc: DoclingDocument,
+    markdown: str,
+    page_break_placeholder: str = "<!-- page break -->",
+) -> DocumentAudit:
+    """Compute document-level and per-page audit stats from a single traversal."""
+    scan = _scan_document(doc)
+    md_pages = split_markdown_pages(markdown, page_break_placeholder=page_break_placeholder)
+
+    pdf_tokens: list[str] = []
+    numbers_pdf: set[str] = set()
+    dates_pdf: set[str] = set()
+    pdf_text_length = 0
+    page_audits: list[PageAudit] = []
+    page_nos = sorted(doc.pages.keys())
+    # WHY: Text without provenance still counts towards the document totals.
+    for page_no in [*page_nos, None]:
+        pdf_text = _ITEM_DELIM.join(scan.page_texts.get(page_no, ()))
+        tokens = _tokenize(pdf_text)
+        numbers = _extract_numbers(pdf_text)
+        dates = _extract_dates(pdf_text)
+        pdf_tokens.extend(tokens)
+        numbers_pdf |= numbers
+        dates_pdf |= dates
+        if pdf_text:
+            # WHY: The whole-document export also separates the last item of one page
+            # from the first of the next, so totals stay equal to its length.
+            pdf_text_length += len(pdf_text) + (len(_ITEM_DELIM) if pdf_text_length else 0)
+        if page_no is None:
+            continue
+
+        idx = len(page_audits)
+        md_text = md_pages[idx] if idx < len(md_pages) else ""
+        page_audits.append(
+            PageAudit(
+                page_no=page_no,
+                token_coverage=_coverage(tokens, set(_tokenize(md_text))),
+                numeric_recall=_coverage(numbers, _extract_numbers(md_text)),
+                date_recall=_coverage(dates, _extract_dates(md_text)),
+                pdf_text_length=len(pdf_text),
+                md_text_length=len(md_text),
+            )
+        )
+
+    metrics = AuditMetrics(
+        token_coverage=_coverage(pdf_tokens, set(_tokenize(markdown))),
+        numeric_recall=_coverage(numbers_pdf, _extract_numbers(markdown)),
+        date_recall=_coverage(dates_pdf, _extract_dates(markdown)),
+        table_count_pdf=scan.table_count,
+        table_count_md=_markdown_table_count(markdown),
+        table_cells_pdf=scan.table_cells,
+        heading_count_pdf=scan.heading_count,
+        heading_count_md=_markdown_heading_count(markdown),
+        pdf_text_length=pdf_text_length,
         md_text_length=len(markdown),
-        spaced_table_cells=spaced_cells,
-        total_table_cells=total_cells,
-        spaced_text_items=spaced_text_items,
-        multi_space_text_items=multi_space_text_items,
-        total_text_items=total_text_items,
+        spaced_table_cells=scan.spaced_cells,
+        total_table_cells=scan.total_cells,
+        spaced_text_items=scan.spaced_text_items,
+        multi_space_text_items=scan.multi_space_text_items,
+        total_text_items=scan.total_text_items,
     )
+    return DocumentAudit(metrics=metrics, pages=tuple(page_audits))
+
+
+def audit_doc_vs_markdown(doc: DoclingDocument, markdown: str) -> AuditMetrics:
+    """Compare Docling text against Markdown to quantify extraction fidelity."""
+    return audit_document(doc, markdown).metrics
 
 
 def split_markdown_pages(
@@ -349,34 +595,7 @@ def audit_doc_vs_markdown_per_page(
     page_break_placeholder: str = "<!-- page break -->",
 ) -> list[PageAudit]:
     """Compute per-page audit stats to localize low-fidelity regions."""
-    pages = sorted(doc.pages.keys())
-    md_pages = split_markdown_pages(markdown, page_break_placeholder=page_break_placeholder)
-
-    audits: list[PageAudit] = []
-    for idx, page_no in enumerate(pages):
-        page_doc = doc.filter(page_nrs={page_no})
-        pdf_text = page_doc.export_to_text()
-        md_text = md_pages[idx] if idx < len(md_pages) else ""
-
-        pdf_tokens = _tokenize(pdf_text)
-        md_tokens = set(_tokenize(md_text))
-        numbers_pdf = _extract_numbers(pdf_text)
-        numbers_md = _extract_numbers(md_text)
-        dates_pdf = _extract_dates(pdf_text)
-        dates_md = _extract_dates(md_text)
-
-        audits.append(
-            PageAudit(
-                page_no=page_no,
-                token_coverage=_coverage(pdf_tokens, md_tokens),
-                numeric_recall=_coverage(numbers_pdf, numbers_md),
-                date_recall=_coverage(dates_pdf, dates_md),
-                pdf_text_length=len(pdf_text),
-                md_text_length=len(md_text),
-            )
-        )
-
-    return audits
+    return list(audit_document(doc, markdown, page_break_placeholder).pages)
 
 
 def format_audit(metrics: AuditMetrics) -> str:
@@ -0,0 +1,122 @@
+"""@fileoverview Cheap backend probes that score raw PDF text layers without ML models.
+
+Auto backend selection used to run layout + TableFormer twice on page 1 just to pick a
+text backend; reading the text cells each backend exposes is enough to spot fragmented
+or duplicated text and costs milliseconds instead of seconds.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple, Type
+
+import pypdfium2
+
+from docling.backend.docling_parse_backend import ThreadedDoclingParseBackendOptions
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.document import InputDocument
+from docling.datamodel.settings import DocumentLimits
+
+from pdf_to_markdown_docling.document_merge import page_runs
+from pdf_to_markdown_docling.quality import QualityReport, score_markdown
+
+BACKEND_PROBE_MODES = ("text", "pipeline")
+DEFAULT_PROBE_PAGES = 3
+
+
+def pdf_page_count(input_path: Path) -> int:
+    """Count PDF pages without building a Docling backend."""
+    pdf = pypdfium2.PdfDocument(str(input_path))
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def sample_probe_pages(
+    page_count: int,
+    sample_size: int,
+    page_range: Optional[Tuple[int, int]] = None,
+) -> list[int]:
+    """Spread `sample_size` 1-based pages evenly over the range, always starting at its first page.
+
+    @example
+    sample_probe_pages(19, 3)  # [1, 10, 19]
+    """
+    first, last = page_range if page_range is not None else (1, page_count)
+    last = min(last, page_count)
+    if last < first:
+        return []
+    span = last - first + 1
+    sample_size = max(1, min(sample_size, span))
+    if sample_size == 1:
+        return [first]
+    step = (span - 1) / (sample_size - 1)
+    return sorted({first + round(index * step) for index in range(sample_size)})
+
+
+def _iter_page_backends(
+    input_path: Path, backend: Type, start: int, end: int
+) -> Iterator[tuple[int, object]]:
+    random_access = getattr(backend, "supports_random_page_access", True)
+    backend_options = None
+    if not random_access:
+        # WHY: The probe only reads text cells; skip page rasterization in docling-parse.
+        backend_options = ThreadedDoclingParseBackendOptions(render_pages=False)
+    in_doc = InputDocument(
+        path_or_stream=input_path,
+        format=InputFormat.PDF,
+        backend=backend,
+        backend_options=backend_options,
+        limits=DocumentLimits(page_range=(start, end)),
+    )
+    doc_backend = in_doc._backend
+    try:
+        if random_access:
+            pages = (
+                (page_no, doc_backend.load_page(page_no - 1))
+                for page_no in range(start, end + 1)
+            )
+        else:
+            # WHY: Threaded docling-parse only streams pages (possibly out of order);
+            # the limits above scope the run and each page reports its own number.
+            pages = ((page.page_no, page) for page in doc_backend.iter_pages())
+        for page_no, page in pages:
+            try:
+                yield page_no, page
+            finally:
+                page.unload()
+    finally:
+        doc_backend.unload()
+
+
+def extract_text_layer_lines(
+    input_path: Path, backend: Type, pages: Iterable[int]
+) -> dict[int, list[str]]:
+    """Return the raw text cells a backend exposes for each requested 1-based page."""
+    lines: dict[int, list[str]] = {}
+    for start, end in page_runs(pages):
+        for page_no, page in _iter_page_backends(input_path, backend, start, end):
+            lines[page_no] = [cell.text for cell in page.get_text_cells() if cell.text.strip()]
+    return lines
+
+
+def score_text_layer(page_lines: dict[int, list[str]]) -> QualityReport:
+    """Average per-page quality scores so long samples do not all floor at zero."""
+    reports = [score_markdown("\n".join(lines)) for lines in page_lines.values()]
+    if not reports:
+        return score_markdown("")
+    count = len(reports)
+    return QualityReport(
+        score=round(sum(report.score for report in reports) / count),
+        short_line_count=sum(report.short_line_count for report in reports),
+        repeated_line_count=sum(report.repeated_line_count for report in reports),
+        control_char_count=sum(report.control_char_count for report in reports),
+    )
+
+
+def probe_text_layer(
+    input_path: Path, backend: Type, pages: Iterable[int]
+) -> QualityReport:
+    """Score a backend from its text layer on the sampled pages (no layout/table models)."""
+    return score_text_layer(extract_text_layer_lines(input_path, backend, pages))
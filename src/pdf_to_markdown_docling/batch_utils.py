@@ -0,0 +1,327 @@
+"""@fileoverview Batch conversion of many PDFs while keeping Docling models warm.
+
+Nightly runs convert thousands of reports; reloading layout/TableFormer weights per file
+dominates wall time, so a batch shares converters across every document in the run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from docling.datamodel.document import ConversionStatus
+from docling_core.types.doc.base import ImageRefMode
+
+from pdf_to_markdown_docling.conversion_utils import convert_pdf_to_markdown
+from pdf_to_markdown_docling.converter_pool import ConverterPool, get_converter_pool
+from pdf_to_markdown_docling.scheduler import (
+    DEFAULT_SHARD_PAGES,
+    ScheduledConversion,
+    convert_documents_scheduled,
+)
+
+
+@dataclass(frozen=True)
+class BatchItemResult:
+    input_path: Path
+    output_path: Optional[Path]
+    status: str
+    backend: Optional[str]
+    seconds: float
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "input": str(self.input_path),
+            "output": str(self.output_path) if self.output_path else None,
+            "status": self.status,
+            "backend": self.backend,
+            "seconds": round(self.seconds, 3),
+            "error": self.error,
+        }
+
+
+def read_manifest(manifest_path: Path) -> list[Path]:
+    """Read PDF paths from a manifest (one per line, `#` comments, relative to the manifest)."""
+    base_dir = manifest_path.parent
+    paths: list[Path] = []
+    for line in manifest_path.read_text(encoding="utf-8").splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        path = Path(stripped).expanduser()
+        if not path.is_absolute():
+            path = base_dir / path
+        paths.append(path.resolve())
+    return paths
+
+
+def collect_batch_inputs(
+    *,
+    input_dir: Optional[Path] = None,
+    pattern: str = "*.pdf",
+    manifest: Optional[Path] = None,
+) -> list[Path]:
+    """Collect unique PDF inputs from a directory glob and/or a manifest file.
+
+    @example
+    collect_batch_inputs(input_dir=Path("reports"), pattern="**/*.pdf")
+    """
+    found: list[Path] = []
+    if input_dir is not None:
+        found.extend(path.resolve() for path in sorted(input_dir.glob(pattern)) if path.is_file())
+    if manifest is not None:
+        found.extend(read_manifest(manifest))
+
+    seen: set[Path] = set()
+    unique: list[Path] = []
+    for path in found:
+        if path in seen:
+            continue
+        seen.add(path)
+        unique.append(path)
+    return unique
+
+
+def batch_input_root(inputs: Iterable[Path]) -> Optional[Path]:
+    """Deepest directory holding every input; None when they share none (other drives)."""
+    parents = [str(path.parent) for path in inputs]
+    if not parents:
+        return None
+    try:
+        return Path(os.path.commonpath(parents))
+    except ValueError:
+        return None
+
+
+def batch_output_stem(input_path: Path, root: Optional[Path] = None) -> Path:
+    """Input path below `root` without its suffix, e.g. `2024/q3/report` (flat if no root)."""
+    relative = Path(input_path.name)
+    if root is not None and input_path.is_relative_to(root):
+        relative = input_path.relative_to(root)
+    return relative.with_name(input_path.stem)
+
+
+def ensure_unique_batch_outputs(inputs: Iterable[Path], root: Optional[Path]) -> None:
+    """Fail before converting anything if two inputs would write the same outputs."""
+    # WHY: Case-insensitive file systems treat REPORT.pdf and report.PDF as one output.
+    seen: dict[str, Path] = {}
+    for input_path in inputs:
+        key = batch_output_stem(input_path, root).as_posix().casefold()
+        if key in seen:
+            raise ValueError(
+                f"Batch inputs {seen[key]} and {input_path} map to the same output name."
+            )
+        seen[key] = input_path
+
+
+def resolve_batch_output_path(
+    input_path: Path, output_dir: Optional[Path], root: Optional[Path] = None
+) -> Path:
+    """Place batch Markdown next to the input, or inside `output_dir` mirroring its path
+    below `root` (flat when `root` is None).
+    """
+    if output_dir is None:
+        return input_path.with_suffix(".md")
+    stem = batch_output_stem(input_path, root)
+    return output_dir / stem.with_name(f"{stem.name}.md")
+
+
+def status_name(status: ConversionStatus) -> str:
+    """Lower-case status label used in summaries and job status (e.g. "success")."""
+    return str(getattr(status, "value", status)).lower()
+
+
+def _convert_batch_item(
+    input_path: Path,
+    *,
+    output_dir: Optional[Path],
+    image_mode: ImageRefMode,
+    images_dir: Optional[Path],
+    export_json_dir: Optional[Path],
+    converters: ConverterPool,
+    quiet: bool,
+    scheduled: Optional[ScheduledConversion],
+    conversion_options: dict[str, object],
+    root: Optional[Path] = None,
+) -> BatchItemResult:
+    output_path = resolve_batch_output_path(input_path, output_dir, root)
+    stem = batch_output_stem(input_path, root)
+    if scheduled is not None and scheduled.result is None:
+        return BatchItemResult(
+            input_path=input_path,
+            output_path=None,
+            status=status_name(scheduled.status) if scheduled.status else "error",
+            backend=scheduled.backend_name,
+            seconds=scheduled.seconds,
+            error=scheduled.error,
+        )
+
+    item_images_dir = None
+    if image_mode is ImageRefMode.REFERENCED:
+        # WHY: One assets folder per document keeps image names from colliding across files.
+        item_images_dir = (
+            images_dir / stem
+            if images_dir is not None
+            else output_path.parent / f"{output_path.stem}_assets"
+        )
+        item_images_dir.mkdir(parents=True, exist_ok=True)
+
+    started = time.perf_counter()
+    worker_seconds = scheduled.seconds if scheduled is not None else 0.0
+    try:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        converted = (
+            (scheduled.result, scheduled.backend_name) if scheduled is not None else None
+        )
+        result, backend_name = convert_pdf_to_markdown(
+            input_path=input_path,
+            output_path=output_path,
+            image_mode=image_mode,
+            images_dir=item_images_dir,
+            quiet=quiet,
+            converters=converters,
+            converted=converted,
+            **conversion_options,
+        )
+        status = status_name(result.status)
+        error = None
+        if result.status in {ConversionStatus.FAILURE, ConversionStatus.SKIPPED}:
+            error = f"Conversion failed with status: {result.status}"
+        elif export_json_dir is not None:
+            from pdf_to_markdown_docling.export_utils import save_docling_json
+
+            json_path = export_json_dir / stem.with_name(f"{stem.name}.docling.json")
+            json_path.parent.mkdir(parents=True, exist_ok=True)
+            save_docling_json(result.document, json_path)
+        return BatchItemResult(
+            input_path=input_path,
+            output_path=output_path if error is None else None,
+            status=status,
+            backend=backend_name,
+            seconds=worker_seconds + time.perf_counter() - started,
+            error=error,
+        )
+    except Exception as exc:
+        # WHY: A single corrupt PDF must not abort a nightly run of thousands of files.
+        if not quiet:
+            traceback.print_exc()
+        return BatchItemResult(
+            input_path=input_path,
+            output_path=None,
+            status="error",
+            backend=None,
+            seconds=worker_seconds + time.perf_counter() - started,
+            error=f"{type(exc).__name__}: {exc}",
+        )
+
+
+def convert_batch(
+    inputs: Iterable[Path],
+    *,
+    output_dir: Optional[Path],
+    image_mode: ImageRefMode,
+    images_dir: Optional[Path] = None,
+    export_json_dir: Optional[Path] = None,
+    summary_path: Optional[Path] = None,
+    converters: Optional[ConverterPool] = None,
+    quiet: bool = False,
+    processes: int = 1,
+    torch_threads: Optional[int] = None,
+    shard_pages: int = DEFAULT_SHARD_PAGES,
+    **conversion_options: object,
+) -> list[BatchItemResult]:
+    """Convert many PDFs with shared converters, streaming per-file status to a summary.
+
+    A failure on one document is recorded and the batch continues. Outputs mirror each
+    input's path below the inputs' common directory, so `a/report.pdf` and
+    `b/report.pdf` never overwrite each other; names that would still collide raise
+    `ValueError` before anything is converted.
+
+    @param conversion_options - Forwarded to `convert_pdf_to_markdown` (OCR, backend, device...).
+    @param summary_path - JSON Lines file that receives one status record per finished file.
+    @param processes - Above 1, the Docling pipeline runs on that many worker processes
+        (long documents split into `shard_pages` windows, see `scheduler`); repairs and
+        export stay in this process. Summary lines then follow completion order.
+
+    @example
+    results = convert_batch(
+        collect_batch_inputs(input_dir=Path("reports")),
+        output_dir=Path("out"),
+        image_mode=ImageRefMode.PLACEHOLDER,
+        max_pages=None, page_range=None, ocr_mode="off", ocr_engine="tesseract",
+        ocr_lang="eng", force_full_page_ocr=False, spacing_fix="pymupdf",
+        device="cpu", pdf_backend="auto",
+    )
+    """
+    inputs = list(inputs)
+    root = batch_input_root(inputs)
+    ensure_unique_batch_outputs(inputs, root)
+    if converters is None:
+        converters = get_converter_pool()
+    if output_dir is not None:
+        output_dir.mkdir(parents=True, exist_ok=True)
+    if summary_path is not None:
+        summary_path.parent.mkdir(parents=True, exist_ok=True)
+        summary_path.write_text("", encoding="utf-8")
+
+    work: Iterable[tuple[Path, Optional[ScheduledConversion]]]
+    if processes > 1:
+        scheduled_items = convert_documents_scheduled(
+            inputs,
+            processes=processes,
+            torch_threads=torch_threads,
+            shard_pages=shard_pages,
+            image_mode=image_mode,
+            quiet=quiet,
+            **conversion_options,
+        )
+        work = ((item.input_path, item) for item in scheduled_items)
+    else:
+        work = ((input_path, None) for input_path in inputs)
+
+    results: list[BatchItemResult] = []
+    for input_path, scheduled in work:
+        item = _convert_batch_item(
+            input_path,
+            output_dir=output_dir,
+            image_mode=image_mode,
+            images_dir=images_dir,
+            export_json_dir=export_json_dir,
+            converters=converters,
+            quiet=quiet,
+            scheduled=scheduled,
+            conversion_options=conversion_options,
+            root=root,
+        )
+        results.append(item)
+        if summary_path is not None:
+            with summary_path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(item.to_dict(), ensure_ascii=False) + "\n")
+        if not quiet:
+            print(f"[{len(results)}] {item.status}: {input_path.name} ({item.seconds:.1f}s)")
+
+    return results
+
+
+def batch_failed(results: Iterable[BatchItemResult]) -> list[BatchItemResult]:
+    """Return the batch items that did not produce Markdown."""
+    return [item for item in results if item.error is not None]
+
+
+def format_batch_summary(results: list[BatchItemResult]) -> str:
+    """Render a compact, CLI-friendly summary of a batch run."""
+    failed = batch_failed(results)
+    total_seconds = sum(item.seconds for item in results)
+    lines = [
+        f"Batch: {len(results) - len(failed)}/{len(results)} converted "
+        f"in {total_seconds:.1f}s"
+    ]
+    for item in failed:
+        lines.append(f"  {item.status}: {item.input_path} - {item.error}")
+    return "\n".join(lines)
@@ -0,0 +1,575 @@
+"""@fileoverview End-to-end pipeline benchmark: corpus, measurements and regression gate.
+
+The corpus is the two bundled reports plus synthetic PDFs drawn with PyMuPDF from fixed
+seeds (dense numeric tables, letter-spaced tables, chart-heavy pages, scanned pages), so
+every machine benchmarks the same page content. Each case runs in a fresh process with
+the conversion cache off; per-stage wall/CPU seconds come from `metrics.stage`, plus
+peak RSS and pages/sec. The micro mode replays recorded Docling JSON through the
+model-free repair passes and Markdown export many times, so they can be tuned without a
+GPU. Results are plain JSON so a baseline can be committed or kept as a CI artifact and
+compared against later runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import platform
+import random
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Sequence
+
+import fitz
+from docling.datamodel.document import ConversionStatus
+from docling_core.types.doc.base import ImageRefMode
+
+from docling_core.types.doc.document import DoclingDocument
+
+from pdf_to_markdown_docling.audit_utils import (
+    audit_doc_vs_markdown,
+    classify_spacing,
+    is_spaced_text,
+    needs_spacing_fix,
+    needs_table_spacing_fix,
+)
+from pdf_to_markdown_docling.backend_probe import pdf_page_count
+from pdf_to_markdown_docling.conversion_cache import file_sha256, pdf_page_hashes
+from pdf_to_markdown_docling.conversion_utils import (
+    build_export_labels,
+    convert_pdf_to_markdown_text,
+    detect_spacing_pages,
+    render_markdown,
+)
+from pdf_to_markdown_docling.fix_pipeline import default_fixers, run_fix_pipeline
+from pdf_to_markdown_docling.metrics import collect_metrics, stage
+from pdf_to_markdown_docling.table_fixes import find_suspect_table_cell_pages
+
+BENCHMARK_VERSION = 1
+SYNTHETIC_KINDS = ("dense_tables", "spaced_tables", "chart_pages", "scanned_pages")
+DEFAULT_SYNTHETIC_PAGES = 4
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_MIN_SECONDS = 0.05
+DEFAULT_MICRO_MIN_SECONDS = 0.002
+DEFAULT_MIN_RSS_MB = 50.0
+DEFAULT_MICRO_ITERATIONS = 20
+
+_PAGE_WIDTH = 595
+_PAGE_HEIGHT = 842
+_MONTHS = ("Ian", "Feb", "Mar", "Apr", "Mai", "Iun", "Iul", "Aug", "Sep", "Oct", "Noi", "Dec")
+_INDICATORS = (
+    "Venituri din dobanzi",
+    "Cheltuieli cu dobanzile",
+    "Venituri nete din comisioane",
+    "Rezultat operational",
+    "Cheltuieli administrative",
+    "Provizioane pentru credite",
+    "Profit inainte de impozitare",
+    "Impozit pe profit",
+    "Profit net",
+    "Total active",
+    "Credite nete",
+    "Depozite clienti",
+    "Capitaluri proprii",
+    "Rata solvabilitatii",
+)
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    name: str
+    pdf_path: Path
+
+
+@dataclass(frozen=True)
+class Regression:
+    case: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change versus the baseline (+0.30 = 30% worse for time/RSS)."""
+        if self.metric == "pages_per_second":
+            return self.baseline / self.current - 1 if self.current else float("inf")
+        return self.current / self.baseline - 1 if self.baseline else float("inf")
+
+
+def _amount(rng: random.Random) -> str:
+    # WHY: Romanian reports group thousands with '.' and use ',' for decimals; the
+    # numeric-cell fixers key off exactly this shape.
+    value = rng.randint(1_000, 9_999_999)
+    return f"{value:,}".replace(",", ".") + f",{rng.randint(0, 9)}"
+
+
+def _draw_table(
+    page: fitz.Page,
+    rng: random.Random,
+    *,
+    top: float,
+    rows: int,
+    columns: int,
+    write: Callable[[fitz.TextWriter, fitz.Point, str, float], None],
+) -> float:
+    left, right = 40.0, _PAGE_WIDTH - 40.0
+    first_width = 170.0
+    column_width = (right - left - first_width) / (columns - 1)
+    row_height = 16.0
+    for row in range(rows + 2):
+        y = top + row * row_height
+        page.draw_line((left, y), (right, y), width=0.4)
+    bottom = top + (rows + 1) * row_height
+    for x in [left, left + first_width] + [
+        left + first_width + column * column_width for column in range(1, columns)
+    ] + [right]:
+        page.draw_line((x, top), (x, bottom), width=0.4)
+    writer = fitz.TextWriter(page.rect)
+    headers = ["Indicator"] + [
+        f"{_MONTHS[rng.randrange(12)]} {2020 + column}" for column in range(columns - 1)
+    ]
+    for row in range(rows + 1):
+        baseline = top + row * row_height + 11.5
+        label = headers[0] if row == 0 else _INDICATORS[(row - 1) % len(_INDICATORS)]
+        write(writer, fitz.Point(left + 3, baseline), label, 7.5)
+        for column in range(1, columns):
+            text = headers[column] if row == 0 else _amount(rng)
+            x = left + first_width + (column - 1) * column_width + 3
+            write(writer, fitz.Point(x, baseline), text, 7.5)
+    # WHY: One TextWriter per table writes a single text object instead of one per cell.
+    writer.write_text(page)
+    return bottom
+
+
+def _plain_text(writer: fitz.TextWriter, point: fitz.Point, text: str, fontsize: float) -> None:
+    writer.append(point, text, fontsize=fontsize)
+
+
+def _tracked_text(writer: fitz.TextWriter, point: fitz.Point, text: str, fontsize: float) -> None:
+    # WHY: Glyphs placed one by one with wide tracking and no space glyphs reproduce the
+    # letter-spaced cells ("1 2 3 . 4") that the spacing fixers exist for.
+    x = point.x
+    for char in text:
+        writer.append((x, point.y), char, fontsize=fontsize)
+        x += fitz.get_text_length(char, fontsize=fontsize) + fontsize * 0.35
+
+
+def _write_dense_tables(page: fitz.Page, rng: random.Random, page_no: int) -> None:
+    page.insert_text((40, 50), f"Situatia pozitiei financiare - sectiunea {page_no}", fontsize=13)
+    bottom = _draw_table(page, rng, top=70, rows=18, columns=6, write=_plain_text)
+    _draw_table(page, rng, top=bottom + 30, rows=14, columns=5, write=_plain_text)
+
+
+def _write_spaced_tables(page: fitz.Page, rng: random.Random, page_no: int) -> None:
+    page.insert_text((40, 50), f"Indicatori financiari {page_no}", fontsize=13)
+    _draw_table(page, rng, top=70, rows=16, columns=5, write=_tracked_text)
+
+
+def _write_chart_page(page: fitz.Page, rng: random.Random, page_no: int) -> None:
+    page.insert_text((40, 50), f"Evolutia indicatorilor cheie - grafic {page_no}", fontsize=13)
+    for chart in range(2):
+        origin_x, origin_y = 70.0, 330.0 + chart * 330.0
+        page.draw_line((origin_x, origin_y), (origin_x + 460, origin_y), width=0.8)
+        page.draw_line((origin_x, origin_y), (origin_x, origin_y - 240), width=0.8)
+        for tick in range(6):
+            y = origin_y - tick * 45
+            page.draw_line((origin_x - 4, y), (origin_x, y), width=0.5)
+            page.insert_text((origin_x - 34, y + 3), f"{tick * 250}", fontsize=7)
+        for bar in range(12):
+            height = rng.uniform(20, 220)
+            x = origin_x + 10 + bar * 37
+            color = (0.1 + 0.05 * (bar % 4), 0.3, 0.6 - 0.04 * (bar % 5))
+            page.draw_rect(
+                fitz.Rect(x, origin_y - height, x + 24, origin_y), color=color, fill=color
+            )
+            page.insert_text((x - 2, origin_y + 12), f"{bar + 1:02d}.{2023 + chart}", fontsize=6.5)
+        page.insert_text(
+            (origin_x + 300, origin_y - 225),
+            f"{_amount(rng)} mil. lei",
+            fontsize=16,
+        )
+        page.insert_text((origin_x + 300, origin_y - 208), "+12,4% fata de 31.12.2024", fontsize=8)
+
+
+def _write_scanned_page(page: fitz.Page, rng: random.Random, page_no: int) -> None:
+    # WHY: Render a text page and embed only the bitmap, so the page has no text layer
+    # and exercises the OCR path exactly like a scanned annex would.
+    with fitz.open() as source:
+        text_page = source.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+        text_page.insert_text((40, 50), f"Anexa scanata {page_no}", fontsize=13)
+        for line in range(24):
+            words = " ".join(
+                _INDICATORS[rng.randrange(len(_INDICATORS))].lower() for _ in range(3)
+            )
+            text_page.insert_text((40, 80 + line * 14), f"{words} {_amount(rng)}", fontsize=9)
+        _draw_table(text_page, rng, top=440, rows=10, columns=4, write=_plain_text)
+        pixmap = text_page.get_pixmap(dpi=150, colorspace=fitz.csGRAY)
+    page.insert_image(page.rect, pixmap=pixmap)
+
+
+_WRITERS = {
+    "dense_tables": _write_dense_tables,
+    "spaced_tables": _write_spaced_tables,
+    "chart_pages": _write_chart_page,
+    "scanned_pages": _write_scanned_page,
+}
+
+
+def write_synthetic_pdf(kind: str, path: Path, pages: int = DEFAULT_SYNTHETIC_PAGES) -> Path:
+    """Draw a deterministic synthetic PDF of one corpus kind (see `SYNTHETIC_KINDS`).
+
+    @example
+    write_synthetic_pdf("spaced_tables", Path("corpus/spaced_tables.pdf"), pages=4)
+    """
+    if kind not in _WRITERS:
+        raise ValueError(f"Unknown synthetic corpus kind: {kind}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with fitz.open() as pdf:
+        for page_no in range(1, pages + 1):
+            page = pdf.new_page(width=_PAGE_WIDTH, height=_PAGE_HEIGHT)
+            _WRITERS[kind](page, random.Random(f"{kind}:{page_no}"), page_no)
+        pdf.save(path, garbage=3, deflate=True)
+    return path
+
+
+def build_corpus(
+    root_dir: Path,
+    corpus_dir: Path,
+    *,
+    synthetic_pages: int = DEFAULT_SYNTHETIC_PAGES,
+    names: Optional[Iterable[str]] = None,
+) -> list[BenchmarkCase]:
+    """Collect the bundled reports and (re)generate the synthetic PDFs in `corpus_dir`.
+
+    @param names - Restrict the corpus to these case names (default: every case).
+    """
+    cases = [
+        BenchmarkCase("long_report", root_dir / "examples" / "long_report.pdf"),
+        BenchmarkCase("report_t1_2025", root_dir / "report_t1_2025.pdf"),
+    ] + [BenchmarkCase(kind, corpus_dir / f"{kind}.pdf") for kind in SYNTHETIC_KINDS]
+    if names is not None:
+        wanted = set(names)
+        unknown = wanted - {case.name for case in cases}
+        if unknown:
+            raise ValueError(f"Unknown benchmark cases: {', '.join(sorted(unknown))}")
+        cases = [case for case in cases if case.name in wanted]
+    for case in cases:
+        if case.name in _WRITERS:
+            write_synthetic_pdf(case.name, case.pdf_path, synthetic_pages)
+        elif not case.pdf_path.exists():
+            raise FileNotFoundError(f"Benchmark input not found: {case.pdf_path}")
+    return cases
+
+
+def corpus_fingerprint(pdf_path: Path) -> str:
+    """Hash page content (not file bytes), so re-saved but identical PDFs compare equal."""
+    digest = hashlib.sha256()
+    for page_no, page_hash in sorted(pdf_page_hashes(pdf_path).items()):
+        digest.update(f"{page_no}:{page_hash}|".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # WHY: ru_maxrss is bytes on macOS and kilobytes on Linux.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _environment() -> dict[str, object]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": multiprocessing.cpu_count(),
+    }
+
+
+def _summarize_runs(
+    runs: Sequence[tuple[float, dict[str, dict[str, object]]]], pages: int
+) -> dict[str, object]:
+    # WHY: Medians (plus the best run) are far less sensitive to one noisy iteration
+    # than means, which keeps the regression gate from flapping.
+    wall_seconds = statistics.median(run[0] for run in runs)
+    stages: dict[str, dict[str, object]] = {}
+    for name in runs[0][1]:
+        samples = [summary[name] for _wall, summary in runs if name in summary]
+        stages[name] = {
+            "calls": samples[0]["calls"],
+            "wall_seconds": round(statistics.median(s["wall_seconds"] for s in samples), 6),
+            "min_wall_seconds": round(min(s["wall_seconds"] for s in samples), 6),
+            "cpu_seconds": round(statistics.median(s["cpu_seconds"] for s in samples), 6),
+            "counts": samples[0]["counts"],
+        }
+    return {
+        "pages": pages,
+        "wall_seconds": round(wall_seconds, 6),
+        "pages_per_second": round(pages / wall_seconds, 4) if wall_seconds else 0.0,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "stages": stages,
+    }
+
+
+def measure_case(
+    pdf_path: Path,
+    *,
+    repeat: int = 1,
+    warmup: bool = True,
+    convert: Callable[..., tuple] = convert_pdf_to_markdown_text,
+    **options: object,
+) -> dict[str, object]:
+    """Convert `pdf_path` `repeat` times and report medians of wall time and stage times.
+
+    With `warmup`, page 1 is converted first so model loading stays out of the numbers.
+    Options are forwarded to `convert` (cache off, quiet) and default to placeholder images.
+    """
+    options = {"image_mode": ImageRefMode.PLACEHOLDER, "images_dir": None, **options}
+    page_count = pdf_page_count(pdf_path)
+    if warmup:
+        convert(input_path=pdf_path, quiet=True, cache=None, **{**options, "page_range": (1, 1)})
+
+    runs: list[tuple[float, dict[str, dict[str, object]]]] = []
+    status = ConversionStatus.SUCCESS
+    for _ in range(repeat):
+        with collect_metrics() as metrics:
+            started = time.perf_counter()
+            result, _backend, _markdown = convert(
+                input_path=pdf_path, quiet=True, cache=None, **options
+            )
+            wall_seconds = time.perf_counter() - started
+        runs.append((wall_seconds, metrics.summary()))
+        status = result.status
+
+    requested = options.get("page_range")
+    pages = (
+        min(requested[1], page_count) - requested[0] + 1 if requested else page_count
+    )
+    return {"status": status.value, **_summarize_runs(runs, pages)}
+
+
+def run_benchmark(
+    cases: Sequence[BenchmarkCase],
+    *,
+    repeat: int = 1,
+    warmup: bool = True,
+    quiet: bool = False,
+    **options: object,
+) -> dict[str, object]:
+    """Measure every case in its own fresh process and return the JSON-ready report.
+
+    `options` are the `convert_pdf_to_markdown_text` conversion options (OCR, spacing
+    fix, backend, device, page range) and are recorded so comparisons can flag drift.
+    """
+    # WHY: A spawned process per case keeps peak RSS per document and stops warm
+    # caches from one case flattering the next.
+    context = multiprocessing.get_context("spawn")
+    results: dict[str, object] = {}
+    for case in cases:
+        if not quiet:
+            print(f"Benchmarking {case.name} ({case.pdf_path.name})...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            measured = pool.submit(
+                measure_case, case.pdf_path, repeat=repeat, warmup=warmup, **options
+            ).result()
+        measured["fingerprint"] = corpus_fingerprint(case.pdf_path)
+        results[case.name] = measured
+        if not quiet:
+            print(
+                f"  {measured['pages']} pages in {measured['wall_seconds']:.2f}s "
+                f"({measured['pages_per_second']:.2f} pages/s, "
+                f"peak RSS {measured['peak_rss_mb']:.0f} MB)"
+            )
+    return {
+        "version": BENCHMARK_VERSION,
+        "mode": "pipeline",
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "options": {
+            key: value.value if isinstance(value, ImageRefMode) else value
+            for key, value in options.items()
+        },
+        "repeat": repeat,
+        "cases": results,
+    }
+
+
+def _document_strings(doc: DoclingDocument) -> list[str]:
+    strings = [item.text for item in doc.texts]
+    for table in doc.tables:
+        strings.extend(cell.text for cell in table.data.table_cells)
+    return strings
+
+
+def _run_repair_passes(doc: DoclingDocument, export_labels: set) -> None:
+    strings = _document_strings(doc)
+    for name, predicate in (
+        ("text.is_spaced_text", is_spaced_text),
+        ("text.needs_spacing_fix", needs_spacing_fix),
+        ("text.needs_table_spacing_fix", needs_table_spacing_fix),
+    ):
+        with stage(name) as span:
+            span.count("flagged", sum(1 for text in strings if predicate(text)))
+    with stage("detect_spacing_pages"):
+        detect_spacing_pages(doc, needs_spacing_fix, table_predicate=needs_table_spacing_fix)
+    with stage("find_suspect_table_cell_pages"):
+        find_suspect_table_cell_pages(doc)
+    run_fix_pipeline(doc, default_fixers(kpi_ocr=False))
+    markdown = render_markdown(
+        doc, image_mode=ImageRefMode.PLACEHOLDER, export_labels=export_labels
+    )
+    with stage("audit"):
+        audit_doc_vs_markdown(doc, markdown)
+
+
+def measure_fixers(
+    json_path: Path,
+    *,
+    iterations: int = DEFAULT_MICRO_ITERATIONS,
+    warmup: bool = True,
+) -> dict[str, object]:
+    """Time the model-free repair passes and Markdown export on a recorded Docling JSON.
+
+    Each iteration runs spacing predicates, page detection, the fixer chain (KPI OCR
+    off), Markdown export with every post-processing pass and the audit on a fresh copy
+    of the document; stage times are medians per iteration, in the `measure_case` layout.
+
+    @example
+    measured = measure_fixers(Path("examples/long_report.docling.json"), iterations=50)
+    print(measured["stages"]["fix.cleaned_cells"]["wall_seconds"])
+    """
+    source = DoclingDocument.load_from_json(json_path)
+    export_labels = build_export_labels()
+    if warmup:
+        _run_repair_passes(source.model_copy(deep=True), export_labels)
+
+    runs: list[tuple[float, dict[str, dict[str, object]]]] = []
+    for _ in range(iterations):
+        # WHY: Fixers edit the document in place; copy outside the timed region so
+        # every iteration sees the recorded input.
+        doc = source.model_copy(deep=True)
+        # WHY: Spacing flags are memoized by text; a warm cache would time lookups only,
+        # while a conversion classifies each document's strings from cold.
+        classify_spacing.cache_clear()
+        with collect_metrics() as metrics:
+            started = time.perf_counter()
+            _run_repair_passes(doc, export_labels)
+            wall_seconds = time.perf_counter() - started
+        runs.append((wall_seconds, metrics.summary()))
+
+    return {
+        "status": "success",
+        "iterations": iterations,
+        **_summarize_runs(runs, max(len(source.pages), 1)),
+    }
+
+
+def run_micro_benchmarks(
+    json_paths: Sequence[Path],
+    *,
+    iterations: int = DEFAULT_MICRO_ITERATIONS,
+    quiet: bool = False,
+) -> dict[str, object]:
+    """Measure `measure_fixers` for each recorded document; `compare_benchmarks` reads it."""
+    results: dict[str, object] = {}
+    for json_path in json_paths:
+        name = json_path.name.removesuffix(".json").removesuffix(".docling")
+        if not quiet:
+            print(f"Micro-benchmarking {name} ({iterations} iterations)...")
+        measured = measure_fixers(json_path, iterations=iterations)
+        measured["fingerprint"] = file_sha256(json_path)
+        results[name] = measured
+        if not quiet:
+            slowest = sorted(
+                measured["stages"].items(), key=lambda item: item[1]["wall_seconds"], reverse=True
+            )[:5]
+            print(f"  {measured['wall_seconds'] * 1000:.1f}ms per iteration; slowest stages:")
+            for stage_name, entry in slowest:
+                print(f"    {stage_name}: {entry['wall_seconds'] * 1000:.2f}ms")
+    return {
+        "version": BENCHMARK_VERSION,
+        "mode": "micro",
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "options": {"iterations": iterations},
+        "cases": results,
+    }
+
+
+def compare_benchmarks(
+    baseline: dict[str, object],
+    current: dict[str, object],
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    min_seconds: float = DEFAULT_MIN_SECONDS,
+    min_rss_mb: float = DEFAULT_MIN_RSS_MB,
+) -> list[Regression]:
+    """List stages, totals, throughput and memory that got worse than `threshold`.
+
+    Time and RSS regressions also need an absolute increase of `min_seconds` /
+    `min_rss_mb`, so millisecond-scale stages do not fail the gate on timer noise.
+    """
+    regressions: list[Regression] = []
+
+    def check(case: str, metric: str, before: float, after: float, floor: float) -> None:
+        if after > before * (1 + threshold) and after - before >= floor:
+            regressions.append(Regression(case, metric, before, after))
+
+    for name, before in baseline["cases"].items():
+        after = current["cases"].get(name)
+        if after is None:
+            continue
+        check(name, "wall_seconds", before["wall_seconds"], after["wall_seconds"], min_seconds)
+        for stage_name, stage_before in before["stages"].items():
+            stage_after = after["stages"].get(stage_name)
+            if stage_after is not None:
+                check(
+                    name,
+                    f"stage:{stage_name}",
+                    stage_before["wall_seconds"],
+                    stage_after["wall_seconds"],
+                    min_seconds,
+                )
+        if after["pages_per_second"] < before["pages_per_second"] / (1 + threshold):
+            regressions.append(
+                Regression(
+                    name, "pages_per_second", before["pages_per_second"], after["pages_per_second"]
+                )
+            )
+        check(name, "peak_rss_mb", before["peak_rss_mb"], after["peak_rss_mb"], min_rss_mb)
+    return regressions
+
+
+def comparison_warnings(baseline: dict[str, object], current: dict[str, object]) -> list[str]:
+    """Explain why two reports may not be comparable (inputs, options, missing cases)."""
+    warnings = []
+    if baseline.get("options") != current.get("options"):
+        warnings.append("Conversion options differ between baseline and current run.")
+    if baseline.get("environment") != current.get("environment"):
+        warnings.append("Benchmarks ran on different environments.")
+    for name, before in baseline["cases"].items():
+        after = current["cases"].get(name)
+        if after is None:
+            warnings.append(f"Case {name} missing from current run.")
+        elif before.get("fingerprint") != after.get("fingerprint"):
+            warnings.append(f"Case {name} has different page content than the baseline.")
+        elif before.get("status") != after.get("status"):
+            warnings.append(f"Case {name} status changed: {before['status']} -> {after['status']}.")
+    return warnings
+
+
+def format_regressions(regressions: Sequence[Regression]) -> str:
+    """Render one line per regression, worst first."""
+    if not regressions:
+        return "No regressions."
+    lines = [f"{len(regressions)} regression(s):"]
+    for item in sorted(regressions, key=lambda item: item.change, reverse=True):
+        lines.append(
+            f"  {item.case} {item.metric}: {item.baseline:g} -> {item.current:g} "
+            f"({item.change:+.0%})"
+        )
+    return "\n".join(lines)
@@ -5,12 +5,22 @@ from __future__ import annotations
 import argparse
 import logging
 import os
+import sys
 from pathlib import Path
+from typing import Optional
 
 from docling.datamodel.document import ConversionStatus
 from docling_core.types.doc.base import ImageRefMode
 
-from pdf_to_markdown_docling.conversion_utils import _load_env_file, convert_pdf_to_markdown
+from pdf_to_markdown_docling.backend_probe import BACKEND_PROBE_MODES, DEFAULT_PROBE_PAGES
+from pdf_to_markdown_docling.conversion_cache import ConversionCache, default_cache_dir
+from pdf_to_markdown_docling.conversion_utils import (
+    _load_env_file,
+    convert_pdf_to_markdown,
+    convert_pdf_to_markdown_streaming,
+)
+from pdf_to_markdown_docling.metrics import collect_metrics, stage
+from pdf_to_markdown_docling.scheduler import DEFAULT_SHARD_PAGES, convert_pdf_sharded
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 ENV_PATH = ROOT_DIR / ".env"
@@ -58,16 +68,38 @@ def resolve_export_path(input_path: Path, export_arg: str) -> Path:
     return export_path
 
 
-def build_parser() -> argparse.ArgumentParser:
-    """Construct the CLI argument parser."""
+def build_parser(*, add_help: bool = True, exit_on_error: bool = True) -> argparse.ArgumentParser:
+    """Construct the CLI argument parser.
+
+    @param add_help - False drops `-h/--help`, e.g. for parsing service job options.
+    @param exit_on_error - False makes argparse raise instead of exiting where it can.
+    """
     parser = argparse.ArgumentParser(
-        description="Convert a PDF financial report into Markdown using Docling."
+        description="Convert a PDF financial report into Markdown using Docling.",
+        add_help=add_help,
+        exit_on_error=exit_on_error,
     )
     parser.add_argument("input", nargs="?", help="Path to the input PDF.")
     parser.add_argument(
         "-o",
         "--output",
-        help="Output Markdown file (default: <input>.md).",
+        help=(
+            "Output Markdown file (default: <input>.md). "
+            "In batch mode, the output directory."
+        ),
+    )
+    parser.add_argument(
+        "--input-dir",
+        help="Batch mode: convert every PDF in this directory (see --glob).",
+    )
+    parser.add_argument(
+        "--glob",
+        default="*.pdf",
+        help="Batch mode: file pattern inside --input-dir (default: *.pdf, use **/*.pdf to recurse).",
+    )
+    parser.add_argument(
+        "--manifest",
+        help="Batch mode: text file listing PDF paths, one per line.",
     )
     parser.add_argument(
         "--image-mode",
@@ -132,17 +164,92 @@ def build_parser() -> argparse.ArgumentParser:
             "glyph reconstruction. 'heuristic' is an alias for 'pymupdf'."
         ),
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used for per-page spacing repair (default: 1, in-process).",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help=(
+            "Docling worker processes, each with warm converters (default: 1, "
+            "in-process). Batch mode spreads documents and splits long ones by page "
+            "range; a single PDF is split into page windows converted in parallel "
+            "and merged. Meant for --device cpu nodes."
+        ),
+    )
+    parser.add_argument(
+        "--torch-threads",
+        type=int,
+        help="Torch threads per worker process (default: CPU count / --processes).",
+    )
+    parser.add_argument(
+        "--shard-pages",
+        type=int,
+        default=DEFAULT_SHARD_PAGES,
+        help=(
+            "Split documents into ceil(pages / N) work units with similar estimated "
+            f"cost (default: {DEFAULT_SHARD_PAGES})."
+        ),
+    )
+    parser.add_argument(
+        "--stream-window",
+        type=int,
+        help=(
+            "Convert N pages at a time and append their Markdown as they finish, "
+            "keeping memory flat on very long reports (not with --audit/--export-json)."
+        ),
+    )
     parser.add_argument(
         "--pdf-backend",
         choices=("auto", "pypdfium2", "docling-parse-v4"),
         default="auto",
         help="PDF text backend to use (default: auto).",
     )
+    parser.add_argument(
+        "--backend-probe",
+        choices=BACKEND_PROBE_MODES,
+        default="text",
+        help=(
+            "How --pdf-backend auto compares backends: 'text' scores raw text layers "
+            "(no models), 'pipeline' runs the full pipeline on the first page and "
+            "reuses it (default: text)."
+        ),
+    )
+    parser.add_argument(
+        "--probe-pages",
+        type=int,
+        default=DEFAULT_PROBE_PAGES,
+        help=f"Pages sampled by the text backend probe (default: {DEFAULT_PROBE_PAGES}).",
+    )
     parser.add_argument(
         "--device",
         default="cuda",
         help="Accelerator device: auto, cpu, mps, cuda, or cuda:N (default: cuda).",
     )
+    parser.add_argument(
+        "--converter-cache-size",
+        type=int,
+        help=(
+            "Maximum number of warm Docling converters (model sets) kept in memory "
+            "(default: CONVERTER_POOL_SIZE or 4)."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=(
+            "Directory for cached raw conversions keyed by PDF hash and pipeline options "
+            "(default: CONVERSION_CACHE_DIR or ~/.cache/pdf_to_markdown_docling/conversions)."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always run the Docling models instead of reusing cached conversions.",
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -157,6 +264,13 @@ def build_parser() -> argparse.ArgumentParser:
         "--export-json",
         help="Save Docling JSON (lossless) to a file or directory.",
     )
+    parser.add_argument(
+        "--metrics-json",
+        help=(
+            "Write per-stage wall/CPU time and item counts (with OpenTelemetry-style "
+            "spans) to this JSON file."
+        ),
+    )
     return parser
 
 
@@ -170,17 +284,182 @@ def _load_dotenv_into_environ() -> None:
             os.environ[key] = value
 
 
+IMAGE_MODE_MAP = {
+    "placeholder": ImageRefMode.PLACEHOLDER,
+    "embedded": ImageRefMode.EMBEDDED,
+    "referenced": ImageRefMode.REFERENCED,
+}
+
+
+def _resolve_ocr_mode(args: argparse.Namespace) -> str:
+    if args.ocr:
+        return "on"
+    return args.ocr_mode
+
+
+def _resolve_spacing_fix(args: argparse.Namespace) -> str:
+    spacing_fix = args.spacing_fix
+    if spacing_fix == "heuristic":
+        spacing_fix = "pymupdf"
+    if spacing_fix == "off" and args.fix_spaced_tables:
+        spacing_fix = "ocr"
+    return spacing_fix
+
+
+def build_conversion_cache(args: argparse.Namespace) -> Optional[ConversionCache]:
+    """Open the on-disk conversion cache unless --no-cache was given."""
+    if args.no_cache:
+        return None
+    cache_dir = (
+        Path(args.cache_dir).expanduser().resolve() if args.cache_dir else default_cache_dir()
+    )
+    return ConversionCache(cache_dir)
+
+
+def conversion_options_from_args(
+    args: argparse.Namespace, *, cache: Optional[ConversionCache] = None
+) -> dict[str, object]:
+    """Collect per-document conversion options shared by single and batch modes.
+
+    @param cache - Conversion cache for the run (see `build_conversion_cache`); the
+        service passes its own so jobs cannot choose where it writes.
+    """
+    return {
+        "max_pages": args.max_pages,
+        "page_range": args.page_range,
+        "ocr_mode": _resolve_ocr_mode(args),
+        "ocr_engine": args.ocr_engine,
+        "ocr_lang": args.ocr_lang,
+        "force_full_page_ocr": args.force_full_page_ocr,
+        "spacing_fix": _resolve_spacing_fix(args),
+        "device": args.device,
+        "pdf_backend": args.pdf_backend,
+        "backend_probe": args.backend_probe,
+        "probe_pages": args.probe_pages,
+        "cache": cache,
+        "spacing_workers": args.workers,
+    }
+
+
+def _run_batch(args: argparse.Namespace) -> None:
+    """Convert a directory/manifest of PDFs with warm converters shared across files."""
+    from pdf_to_markdown_docling.batch_utils import (
+        batch_failed,
+        batch_input_root,
+        collect_batch_inputs,
+        convert_batch,
+        ensure_unique_batch_outputs,
+        format_batch_summary,
+    )
+
+    input_dir = Path(args.input_dir).expanduser().resolve() if args.input_dir else None
+    manifest = Path(args.manifest).expanduser().resolve() if args.manifest else None
+    if input_dir is not None and not input_dir.is_dir():
+        raise SystemExit(f"Input directory not found: {input_dir}")
+    if manifest is not None and not manifest.exists():
+        raise SystemExit(f"Manifest not found: {manifest}")
+
+    inputs = collect_batch_inputs(input_dir=input_dir, pattern=args.glob, manifest=manifest)
+    if not inputs:
+        raise SystemExit("No input PDFs matched the batch selection.")
+
+    output_dir = Path(args.output).expanduser().resolve() if args.output else None
+    images_dir = Path(args.images_dir).expanduser().resolve() if args.images_dir else None
+    export_json_dir = (
+        Path(args.export_json).expanduser().resolve() if args.export_json else None
+    )
+    summary_root = output_dir or input_dir or manifest.parent
+    summary_path = summary_root / "batch_summary.jsonl"
+
+    try:
+        ensure_unique_batch_outputs(inputs, batch_input_root(inputs))
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
+    results = convert_batch(
+        inputs,
+        output_dir=output_dir,
+        image_mode=IMAGE_MODE_MAP[args.image_mode],
+        images_dir=images_dir,
+        export_json_dir=export_json_dir,
+        summary_path=summary_path,
+        quiet=args.quiet,
+        processes=args.processes,
+        torch_threads=args.torch_threads,
+        shard_pages=args.shard_pages,
+        **conversion_options_from_args(args, cache=build_conversion_cache(args)),
+    )
+    print(format_batch_summary(results))
+    print(f"Wrote batch summary to {summary_path}")
+    if batch_failed(results):
+        raise SystemExit(1)
+
+
 def main() -> None:
-    """Run the CLI conversion pipeline."""
+    """Run the CLI conversion pipeline (or the HTTP service for `serve`)."""
+    if sys.argv[1:2] == ["serve"]:
+        from pdf_to_markdown_docling.service import main as serve_main
+
+        _load_dotenv_into_environ()
+        serve_main(sys.argv[2:])
+        return
+
     args = build_parser().parse_args()
 
     _load_dotenv_into_environ()
 
+    if args.converter_cache_size is not None:
+        from pdf_to_markdown_docling.converter_pool import get_converter_pool
+
+        if args.converter_cache_size < 1:
+            raise SystemExit("--converter-cache-size must be at least 1.")
+        get_converter_pool().resize(args.converter_cache_size)
+
+    if args.workers < 1:
+        raise SystemExit("--workers must be at least 1.")
+    for flag, value in (
+        ("--processes", args.processes),
+        ("--torch-threads", args.torch_threads),
+        ("--shard-pages", args.shard_pages),
+    ):
+        if value is not None and value < 1:
+            raise SystemExit(f"{flag} must be at least 1.")
+    if args.stream_window is not None:
+        if args.stream_window < 1:
+            raise SystemExit("--stream-window must be at least 1.")
+        # WHY: Streaming never holds the whole document, which both options need.
+        if args.audit or args.export_json:
+            raise SystemExit("--stream-window cannot be combined with --audit or --export-json.")
+        if args.input_dir or args.manifest:
+            raise SystemExit("--stream-window is only supported for single-file conversions.")
+        if args.processes > 1:
+            raise SystemExit("--stream-window cannot be combined with --processes.")
+
+    if args.metrics_json is None:
+        _run_conversion(args)
+        return
+
+    metrics_path = Path(args.metrics_json).expanduser().resolve()
+    with collect_metrics() as metrics:
+        try:
+            _run_conversion(args)
+        finally:
+            # WHY: A failed run is the one most worth profiling; keep its partial spans.
+            metrics.write_json(metrics_path)
+            print(f"Wrote stage metrics to {metrics_path}")
+
+
+def _run_conversion(args: argparse.Namespace) -> None:
+    """Run batch, streaming or single-file conversion for validated arguments."""
+    log_level = logging.WARNING if args.quiet else logging.INFO
+    if args.input_dir or args.manifest:
+        logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
+        _run_batch(args)
+        return
+
     input_arg = args.input or os.environ.get("FIN_REPORT_PDF")
     if not input_arg:
         raise SystemExit("Input file not provided. Set FIN_REPORT_PDF in .env or pass a path.")
 
-    log_level = logging.WARNING if args.quiet else logging.INFO
     logging.basicConfig(level=log_level, format="%(levelname)s: %(message)s")
 
     input_path = Path(input_arg).expanduser().resolve()
@@ -195,43 +474,59 @@ def main() -> None:
         images_dir = Path(args.images_dir).expanduser().resolve()
         images_dir.mkdir(parents=True, exist_ok=True)
 
-    image_mode_map = {
-        "placeholder": ImageRefMode.PLACEHOLDER,
-        "embedded": ImageRefMode.EMBEDDED,
-        "referenced": ImageRefMode.REFERENCED,
-    }
-    image_mode = image_mode_map[args.image_mode]
+    image_mode = IMAGE_MODE_MAP[args.image_mode]
 
     if image_mode is ImageRefMode.REFERENCED and images_dir is None:
         # WHY: Default to a sibling assets folder to keep Markdown paths stable.
         images_dir = output_path.parent / f"{output_path.stem}_assets"
         images_dir.mkdir(parents=True, exist_ok=True)
 
-    ocr_mode = args.ocr_mode
-    if args.ocr:
-        ocr_mode = "on"
+    if args.stream_window is not None:
+        streamed = convert_pdf_to_markdown_streaming(
+            input_path=input_path,
+            output_path=output_path,
+            image_mode=image_mode,
+            images_dir=images_dir,
+            quiet=args.quiet,
+            window_pages=args.stream_window,
+            **conversion_options_from_args(args, cache=build_conversion_cache(args)),
+        )
+        if streamed.status in {ConversionStatus.FAILURE, ConversionStatus.SKIPPED}:
+            raise SystemExit(f"Conversion failed with status: {streamed.status}")
+        if streamed.status is ConversionStatus.PARTIAL_SUCCESS:
+            logging.warning("Conversion completed with partial success.")
+        print(
+            f"Wrote Markdown to {output_path} "
+            f"({streamed.pages} pages in {streamed.windows} windows)"
+        )
+        if args.pdf_backend == "auto":
+            print(f"Used PDF backend: {streamed.backend_name}")
+        return
 
-    spacing_fix = args.spacing_fix
-    if spacing_fix == "heuristic":
-        spacing_fix = "pymupdf"
-    if spacing_fix == "off" and args.fix_spaced_tables:
-        spacing_fix = "ocr"
+    conversion_options = conversion_options_from_args(args, cache=build_conversion_cache(args))
+    converted = None
+    if args.processes > 1:
+        sharded = convert_pdf_sharded(
+            input_path,
+            processes=args.processes,
+            torch_threads=args.torch_threads,
+            shard_pages=args.shard_pages,
+            image_mode=image_mode,
+            quiet=args.quiet,
+            **conversion_options,
+        )
+        if sharded.result is None:
+            raise SystemExit(f"Conversion failed: {sharded.error}")
+        converted = (sharded.result, sharded.backend_name)
 
     result, backend_name = convert_pdf_to_markdown(
         input_path=input_path,
         output_path=output_path,
         image_mode=image_mode,
         images_dir=images_dir,
-        max_pages=args.max_pages,
-        page_range=args.page_range,
-        ocr_mode=ocr_mode,
-        ocr_engine=args.ocr_engine,
-        ocr_lang=args.ocr_lang,
-        force_full_page_ocr=args.force_full_page_ocr,
-        spacing_fix=spacing_fix,
-        device=args.device,
-        pdf_backend=args.pdf_backend,
         quiet=args.quiet,
+        converted=converted,
+        **conversion_options,
     )
     if result.status in {ConversionStatus.FAILURE, ConversionStatus.SKIPPED}:
         raise SystemExit(f"Conversion failed with status: {result.status}")
@@ -244,28 +539,26 @@ def main() -> None:
         print(f"Used PDF backend: {backend_name}")
 
     if args.audit:
-        from pdf_to_markdown_docling.audit_utils import (
-            audit_doc_vs_markdown,
-            audit_doc_vs_markdown_per_page,
-            format_audit,
-        )
+        from pdf_to_markdown_docling.audit_utils import audit_document, format_audit
 
         markdown_text = output_path.read_text(encoding="utf-8")
-        metrics = audit_doc_vs_markdown(result.document, markdown_text)
-        print("Audit:", format_audit(metrics))
+        with stage("audit") as span:
+            audit = audit_document(result.document, markdown_text)
+            span.count("pages", len(audit.pages))
+        print("Audit:", format_audit(audit.metrics))
 
-        page_audits = audit_doc_vs_markdown_per_page(result.document, markdown_text)
-        page_audits.sort(key=lambda p: p.token_coverage)
+        page_audits = sorted(audit.pages, key=lambda p: p.token_coverage)
         worst = page_audits[:5]
         if worst:
             print("Worst pages by token coverage:")
-            for audit in worst:
+            for page_audit in worst:
                 print(
-                    f"  page {audit.page_no}: "
-                    f"token_coverage={audit.token_coverage:.2%}, "
-                    f"numeric_recall={audit.numeric_recall:.2%}, "
-                    f"date_recall={audit.date_recall:.2%}, "
-                    f"pdf_len={audit.pdf_text_length}, md_len={audit.md_text_length}"
+                    f"  page {page_audit.page_no}: "
+                    f"token_coverage={page_audit.token_coverage:.2%}, "
+                    f"numeric_recall={page_audit.numeric_recall:.2%}, "
+                    f"date_recall={page_audit.date_recall:.2%}, "
+                    f"pdf_len={page_audit.pdf_text_length}, "
+                    f"md_len={page_audit.md_text_length}"
                 )
 
     if args.export_json:
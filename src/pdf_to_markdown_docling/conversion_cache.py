@@ -0,0 +1,339 @@
+"""@fileoverview Content-addressed on-disk cache of raw Docling conversion output.
+
+Entries hold the pipeline's `DoclingDocument` before any repair/cleanup pass, keyed by
+PDF bytes + backend + pipeline options, so post-processing or export tweaks re-run in
+seconds without the layout/TableFormer/OCR models. Single pages are also cached under a
+hash of their content stream and resources, so a re-issued report with a few corrected
+pages only reconverts those pages.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from importlib import metadata
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import fitz
+
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.document import ConversionResult, ConversionStatus, InputDocument
+from docling.datamodel.pipeline_options import ThreadedPdfPipelineOptions
+from docling_core.types.doc.document import DoclingDocument, DocumentOrigin
+
+from pdf_to_markdown_docling.converter_pool import pipeline_options_fingerprint
+from pdf_to_markdown_docling.document_merge import (
+    pages_in_cross_page_groups,
+    renumber_pages,
+    split_document_pages,
+)
+
+ENV_CACHE_DIR = "CONVERSION_CACHE_DIR"
+ENV_CACHE_MAX_MB = "CONVERSION_CACHE_MAX_MB"
+DEFAULT_CACHE_MAX_MB = 2048
+CACHE_FORMAT_VERSION = 1
+_ENTRY_SUFFIX = ".json.gz"
+
+
+@dataclass(frozen=True)
+class CachedConversion:
+    document: DoclingDocument
+    backend_name: str
+    page_count: int
+
+    def to_conversion_result(self, input_path: Path, file_hash: str) -> ConversionResult:
+        """Wrap the cached document as a successful result (no per-page pipeline data)."""
+        # WHY: Validation would re-open the PDF through a backend; the cached entry is
+        # already trusted, so build the models directly.
+        input_doc = InputDocument.model_construct(
+            file=input_path,
+            document_hash=file_hash,
+            valid=True,
+            format=InputFormat.PDF,
+            filesize=input_path.stat().st_size,
+            page_count=self.page_count,
+        )
+        return ConversionResult.model_construct(
+            input=input_doc,
+            status=ConversionStatus.SUCCESS,
+            document=self.document,
+        )
+
+
+def default_cache_dir() -> Path:
+    """Resolve the cache directory from CONVERSION_CACHE_DIR or the user cache home."""
+    configured = os.environ.get(ENV_CACHE_DIR, "").strip()
+    if configured:
+        return Path(configured).expanduser()
+    cache_home = os.environ.get("XDG_CACHE_HOME", "").strip() or "~/.cache"
+    return Path(cache_home).expanduser() / "pdf_to_markdown_docling" / "conversions"
+
+
+def _cache_max_bytes_from_env() -> int:
+    value = os.environ.get(ENV_CACHE_MAX_MB, "").strip()
+    try:
+        max_mb = int(value) if value else DEFAULT_CACHE_MAX_MB
+    except ValueError:
+        max_mb = DEFAULT_CACHE_MAX_MB
+    return max(max_mb, 1) * 1024 * 1024
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """Hash file contents (not path/mtime) so renamed or re-published copies still hit."""
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def pdf_page_hashes(
+    input_path: Path, pages: Optional[Iterable[int]] = None
+) -> dict[int, str]:
+    """Hash each page's content stream plus the fonts/images/forms it draws.
+
+    Resources are hashed by their bytes rather than object numbers, so a re-issued PDF
+    whose untouched pages were re-serialized still maps to the same page hashes.
+    """
+    resource_hashes: dict[int, str] = {}
+
+    def resource_hash(pdf: fitz.Document, xref: int, kind: str) -> str:
+        if xref not in resource_hashes:
+            digest = hashlib.sha256(kind.encode("utf-8"))
+            if kind == "font":
+                _name, _ext, _type, buffer = pdf.extract_font(xref)
+                digest.update(buffer or pdf.xref_object(xref, compressed=True).encode("utf-8"))
+            else:
+                digest.update(pdf.xref_stream_raw(xref) or b"")
+            resource_hashes[xref] = digest.hexdigest()
+        return resource_hashes[xref]
+
+    hashes: dict[int, str] = {}
+    with fitz.open(input_path) as pdf:
+        page_numbers = range(1, pdf.page_count + 1) if pages is None else pages
+        for page_no in page_numbers:
+            if not 1 <= page_no <= pdf.page_count:
+                continue
+            page = pdf[page_no - 1]
+            digest = hashlib.sha256(page.read_contents())
+            digest.update(f"{tuple(page.rect)}|{page.rotation}".encode("utf-8"))
+            # WHY: The content stream refers to resources by name (/F1, /Im0); pair each
+            # name with the resource bytes so swapping a font or image changes the hash.
+            for font in page.get_fonts(full=True):
+                digest.update(f"|font:{font[4]}:{resource_hash(pdf, font[0], 'font')}".encode("utf-8"))
+            for image in page.get_images(full=True):
+                digest.update(f"|image:{image[7]}:{resource_hash(pdf, image[0], 'image')}".encode("utf-8"))
+            for xobject in page.get_xobjects():
+                digest.update(f"|form:{xobject[1]}:{resource_hash(pdf, xobject[0], 'form')}".encode("utf-8"))
+            hashes[page_no] = digest.hexdigest()
+    return hashes
+
+
+def _docling_version() -> str:
+    try:
+        return metadata.version("docling")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def conversion_cache_key(
+    *,
+    file_hash: str,
+    backend: str,
+    pipeline_options: ThreadedPdfPipelineOptions,
+    page_range: Optional[Tuple[int, int]] = None,
+    max_pages: Optional[int] = None,
+) -> str:
+    """Build the cache key for one pipeline run.
+
+    @param backend - Backend name, or the auto-selection spec (e.g. "auto:text:3").
+    """
+    raw = json.dumps(
+        {
+            "format": CACHE_FORMAT_VERSION,
+            # WHY: New Docling releases ship different models; never reuse their output.
+            "docling": _docling_version(),
+            "file": file_hash,
+            "backend": backend,
+            "options": pipeline_options_fingerprint(pipeline_options),
+            "page_range": list(page_range) if page_range is not None else None,
+            "max_pages": max_pages,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def page_cache_key(
+    *,
+    page_hash: str,
+    backend: str,
+    pipeline_options: ThreadedPdfPipelineOptions,
+) -> str:
+    """Build the cache key for one converted page (independent of its page number)."""
+    raw = json.dumps(
+        {
+            "format": CACHE_FORMAT_VERSION,
+            "kind": "page",
+            "docling": _docling_version(),
+            "page": page_hash,
+            "backend": backend,
+            "options": pipeline_options_fingerprint(pipeline_options),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ConversionCache:
+    """Size-bounded directory of gzipped Docling JSON; evicts least recently used entries."""
+
+    def __init__(self, cache_dir: Path, max_bytes: Optional[int] = None) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes if max_bytes is not None else _cache_max_bytes_from_env()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{_ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[CachedConversion]:
+        """Load a cached conversion, or None on a miss or unreadable entry."""
+        path = self._entry_path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                payload = json.load(handle)
+            document = DoclingDocument.model_validate(payload["document"])
+            entry = CachedConversion(
+                document=document,
+                backend_name=payload["backend"],
+                page_count=int(payload.get("page_count") or len(document.pages)),
+            )
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # WHY: A truncated or stale-format entry is just a miss; drop it so it is rebuilt.
+            self.misses += 1
+            path.unlink(missing_ok=True)
+            return None
+        # WHY: Eviction is by mtime; touching on read turns it into least-recently-used.
+        os.utime(path)
+        self.hits += 1
+        return entry
+
+    def put(
+        self,
+        key: str,
+        document: DoclingDocument,
+        backend_name: str,
+        page_count: int,
+        *,
+        evict: bool = True,
+    ) -> None:
+        """Store a raw conversion atomically, then evict old entries over the size cap."""
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "backend": backend_name,
+            "page_count": page_count,
+            "document": document.export_to_dict(),
+        }
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw_handle:
+                with gzip.open(raw_handle, "wt", encoding="utf-8", compresslevel=6) as handle:
+                    json.dump(payload, handle, ensure_ascii=False)
+            # WHY: Concurrent batch workers may race on one key; rename keeps readers safe.
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits `max_bytes`."""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self.cache_dir.glob(f"*/*{_ENTRY_SUFFIX}"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            removed = 0
+            for _mtime, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                removed += 1
+            return removed
+
+    def clear(self) -> None:
+        """Remove every cached conversion."""
+        with self._lock:
+            for path in self.cache_dir.glob(f"*/*{_ENTRY_SUFFIX}"):
+                path.unlink(missing_ok=True)
+
+
+def load_cached_pages(
+    cache: ConversionCache, page_keys: dict[int, str]
+) -> dict[int, CachedConversion]:
+    """Fetch cached single-page conversions, renumbered to where each page sits now."""
+    found: dict[int, CachedConversion] = {}
+    for page_no, key in page_keys.items():
+        entry = cache.get(key)
+        if entry is None or len(entry.document.pages) != 1:
+            continue
+        stored_page = next(iter(entry.document.pages))
+        if stored_page != page_no:
+            # WHY: Inserted/removed pages shift numbering in a re-issued report.
+            renumber_pages(entry.document, {stored_page: page_no})
+        found[page_no] = entry
+    return found
+
+
+def store_document_pages(
+    cache: ConversionCache,
+    document: DoclingDocument,
+    page_keys: dict[int, str],
+    backend_name: str,
+) -> int:
+    """Cache every page of `document` that has a key; returns the number stored.
+
+    Pages under a group that crosses a page break (e.g. a numbered list) are not
+    stored: merged back from single pages, the group would restart, so those pages
+    are always reconverted together.
+    """
+    stored = 0
+    pages = set(page_keys) - pages_in_cross_page_groups(document)
+    # WHY: One traversal for all pages; filtering page by page re-walks the whole
+    # document each time, which is quadratic on long reports.
+    page_docs = split_document_pages(document, pages)
+    for page_no, page_doc in page_docs.items():
+        cache.put(page_keys[page_no], page_doc, backend_name, page_count=1, evict=False)
+        stored += 1
+    if stored:
+        cache.evict()
+    return stored
+
+
+def stamp_document_origin(document: DoclingDocument, input_path: Path, file_hash: str) -> None:
+    """Point an assembled document at the current PDF, as Docling's own assembly does."""
+    document.name = input_path.stem
+    document.origin = DocumentOrigin(
+        mimetype="application/pdf",
+        filename=input_path.name,
+        binary_hash=file_hash,
+    )
@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 import os
+import uuid
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Tuple, Type
 
 from docling.backend.docling_parse_v4_backend import DoclingParseV4DocumentBackend
 from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
 from docling.datamodel.accelerator_options import AcceleratorOptions
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.document import ConversionResult
+from docling.datamodel.document import ConversionResult, ConversionStatus
 from docling.datamodel.layout_model_specs import DOCLING_LAYOUT_EGRET_LARGE
 from docling.datamodel.pipeline_options import (
     LayoutOptions,
@@ -22,42 +23,60 @@ from docling.datamodel.pipeline_options import (
     TableStructureOptions,
     ThreadedPdfPipelineOptions,
 )
-from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling_core.types.doc.base import ImageRefMode
-from docling_core.types.doc.document import ContentLayer, DEFAULT_EXPORT_LABELS
+from docling_core.types.doc.document import (
+    ContentLayer,
+    DEFAULT_EXPORT_LABELS,
+    DoclingDocument,
+)
 from docling_core.types.doc.labels import DocItemLabel
 from docling_core.types.doc import TableItem
 
 from pdf_to_markdown_docling.audit_utils import (
-    audit_doc_vs_markdown,
-    is_spaced_text,
+    DocumentHealth,
     needs_spacing_fix,
     needs_table_spacing_fix,
+    scan_document_health,
+)
+from pdf_to_markdown_docling.backend_probe import (
+    DEFAULT_PROBE_PAGES,
+    pdf_page_count,
+    probe_text_layer,
+    sample_probe_pages,
+)
+from pdf_to_markdown_docling.conversion_cache import (
+    CachedConversion,
+    ConversionCache,
+    conversion_cache_key,
+    file_sha256,
+    load_cached_pages,
+    page_cache_key,
+    pdf_page_hashes,
+    stamp_document_origin,
+    store_document_pages,
 )
-from pdf_to_markdown_docling.date_cleanup import (
-    remove_axis_text_inside_pictures,
-    remove_date_only_text_inside_pictures,
+from pdf_to_markdown_docling.converter_pool import ConverterPool, get_converter_pool
+from pdf_to_markdown_docling.document_merge import (
+    concatenate_documents_by_page,
+    filter_document_pages,
+    page_runs,
+    splice_document_pages,
 )
-from pdf_to_markdown_docling.picture_kpi_extract import add_picture_kpi_captions
 from pdf_to_markdown_docling.export_utils import (
-    add_visible_page_markers,
-    reduce_markdown_noise,
-    normalize_kpi_blocks,
-    remove_axis_like_lines,
-    remove_orphan_headings,
+    MarkdownPageStream,
+    postprocess_markdown,
+    write_text_atomic,
 )
+from pdf_to_markdown_docling.fix_pipeline import default_fixers, run_fix_pipeline
+from pdf_to_markdown_docling.metrics import stage
+from pdf_to_markdown_docling.pdf_resources import PdfResources
 from pdf_to_markdown_docling.pymupdf_spacing_fix import fix_spaced_items_with_pymupdf_glyphs
 from pdf_to_markdown_docling.spacing_fix import fix_spaced_items_with_word_cells
 from pdf_to_markdown_docling.table_fixes import (
-    collapse_document_table_groups,
-    clean_document_table_cells,
-    count_suspect_table_cells,
+    find_suspect_table_cell_pages,
     merge_spaced_table_cells,
     merge_suspect_table_cells,
-    normalize_document_table_currencies,
-    normalize_document_table_headers,
 )
-from pdf_to_markdown_docling.whitespace_fix import normalize_document_text_whitespace
 from pdf_to_markdown_docling.quality import QualityReport, format_report, score_markdown
 
 
@@ -71,6 +90,16 @@ SPACED_CELL_RATIO_THRESHOLD = 0.04
 ROOT_DIR = Path(__file__).resolve().parents[2]
 ENV_FILE = ROOT_DIR / ".env"
 ENV_KPI_OCR = "KPI_OCR"
+FIX_MESSAGES = (
+    ("collapsed_tables", "Collapsed header column groups in {count} tables."),
+    ("normalized_headers", "Normalized header labels in {count} table cells."),
+    ("cleaned_cells", "Cleaned {count} table cell values."),
+    ("normalized_currencies", "Normalized currency labels in {count} table cells."),
+    ("normalized_text", "Normalized whitespace in {count} text items."),
+    ("removed_dates", "Removed {count} date-only text items inside images."),
+    ("removed_axis_text", "Removed {count} axis-like text items inside images."),
+    ("added_kpis", "Added {count} KPI captions from images."),
+)
 
 
 def _load_env_file(path: Path) -> dict[str, str]:
@@ -182,16 +211,12 @@ def _probe_backend(
     backend: Type,
     pipeline_options: ThreadedPdfPipelineOptions,
     export_labels: set[DocItemLabel],
-) -> QualityReport:
-    converter = DocumentConverter(
-        format_options={
-            InputFormat.PDF: PdfFormatOption(
-                pipeline_options=pipeline_options,
-                backend=backend,
-            ),
-        }
-    )
-    result = converter.convert(input_path, page_range=(1, 1))
+    converters: Optional[ConverterPool] = None,
+    page_no: int = 1,
+) -> tuple[QualityReport, ConversionResult]:
+    pool = converters if converters is not None else get_converter_pool()
+    converter = pool.get(pipeline_options, backend)
+    result = converter.convert(input_path, page_range=(page_no, page_no))
     markdown = result.document.export_to_markdown(
         labels=export_labels,
         image_mode=ImageRefMode.PLACEHOLDER,
@@ -199,7 +224,7 @@ def _probe_backend(
         escape_underscores=True,
         included_content_layers={ContentLayer.BODY},
     )
-    return score_markdown(markdown)
+    return score_markdown(markdown), result
 
 
 def select_backend_auto(
@@ -208,24 +233,230 @@ def select_backend_auto(
     export_labels: set[DocItemLabel],
     *,
     quiet: bool,
-) -> tuple[str, Type, dict[str, QualityReport]]:
-    """Pick the cleaner PDF backend by probing a single page."""
+    converters: Optional[ConverterPool] = None,
+    probe_mode: str = "text",
+    probe_pages: int = DEFAULT_PROBE_PAGES,
+    page_range: Optional[Tuple[int, int]] = None,
+) -> tuple[str, Type, dict[str, QualityReport], Optional[ConversionResult]]:
+    """Pick the cleaner PDF backend from a probe of the document.
+
+    `text` mode scores each backend's raw text layer on up to `probe_pages` sampled
+    pages (no models). `pipeline` mode runs the full pipeline on the first page and
+    also returns the winner's probe result so the final conversion can reuse it.
+    """
     reports: dict[str, QualityReport] = {}
-    for name, backend in BACKEND_MAP.items():
-        reports[name] = _probe_backend(
-            input_path=input_path,
-            backend=backend,
-            pipeline_options=pipeline_options,
-            export_labels=export_labels,
-        )
+    probe_results: dict[str, ConversionResult] = {}
+    if probe_mode == "pipeline":
+        first_page = page_range[0] if page_range is not None else 1
+        for name, backend in BACKEND_MAP.items():
+            reports[name], probe_results[name] = _probe_backend(
+                input_path=input_path,
+                backend=backend,
+                pipeline_options=pipeline_options,
+                export_labels=export_labels,
+                converters=converters,
+                page_no=first_page,
+            )
+    else:
+        pages = sample_probe_pages(pdf_page_count(input_path), probe_pages, page_range)
+        for name, backend in BACKEND_MAP.items():
+            reports[name] = probe_text_layer(input_path, backend, pages)
 
     best = max(reports.items(), key=lambda item: item[1].score)[0]
     if not quiet:
         summary = ", ".join(
             f"{name}({format_report(report)})" for name, report in reports.items()
         )
-        print(f"Auto backend selection: {best}. {summary}")
-    return best, BACKEND_MAP[best], reports
+        print(f"Auto backend selection ({probe_mode} probe): {best}. {summary}")
+    return best, BACKEND_MAP[best], reports, probe_results.get(best)
+
+
+def _format_pages(pages: set[int]) -> str:
+    return ", ".join(
+        str(start) if start == end else f"{start}-{end}" for start, end in page_runs(pages)
+    )
+
+
+def detect_spacing_pages(doc, predicate, table_predicate=None) -> set[int] | None:
+    """Collect pages with spacing artifacts; None if a flagged item has no page."""
+    pages: set[int] = set()
+    has_unknown_page = False
+    for item, _level in doc.iterate_items():
+        if isinstance(item, TableItem):
+            page_no = item.prov[0].page_no if item.prov else None
+            if page_no is None:
+                has_unknown_page = True
+            for cell in item.data.table_cells:
+                # WHY: Table headers often split letters, so we allow a stricter predicate.
+                cell_predicate = table_predicate or predicate
+                if cell_predicate(cell.text):
+                    if page_no is not None:
+                        pages.add(page_no)
+                    break
+        else:
+            text = getattr(item, "text", None)
+            if not text or not predicate(text):
+                continue
+            page_no = item.prov[0].page_no if getattr(item, "prov", None) else None
+            if page_no is None:
+                has_unknown_page = True
+            else:
+                pages.add(page_no)
+    if has_unknown_page:
+        return None
+    return pages
+
+
+def select_ocr_retry_pages(
+    doc: DoclingDocument,
+    min_chars_per_page: int = 200,
+    health: DocumentHealth | None = None,
+) -> set[int] | None:
+    """Pick pages for an auto-OCR retry: sparse text layers or spaced-out table cells.
+
+    Returns None when the affected pages cannot be pinned down (whole-document rerun).
+    Pass `health` when the document was already scanned to skip a second traversal.
+    """
+    if health is None:
+        health = scan_document_health(doc)
+    spaced_pages = health.spaced_table_pages()
+    if spaced_pages is None:
+        return None
+    return (spaced_pages | health.sparse_pages(min_chars_per_page)) or None
+
+
+def _export_markdown(
+    document: DoclingDocument,
+    *,
+    image_mode: ImageRefMode,
+    export_labels: set[DocItemLabel],
+    output_path: Optional[Path],
+    images_dir: Optional[Path],
+) -> str:
+    if image_mode is ImageRefMode.REFERENCED:
+        if output_path is not None:
+            artifacts_dir, reference_path = document._get_output_paths(output_path, images_dir)
+        elif images_dir is not None:
+            artifacts_dir, reference_path = images_dir.resolve(), None
+        else:
+            raise ValueError("Referenced images need an output_path or images_dir.")
+        artifacts_dir.mkdir(parents=True, exist_ok=True)
+        # WHY: Same image handling as `save_as_markdown`, minus its Markdown file write.
+        document = document._make_copy_with_refmode(
+            artifacts_dir, image_mode, None, reference_path=reference_path
+        )
+    elif image_mode is ImageRefMode.EMBEDDED:
+        document = document._with_embedded_pictures()
+
+    markdown = document.export_to_markdown(
+        labels=export_labels,
+        image_mode=image_mode,
+        page_break_placeholder=f"\n\n{PAGE_BREAK_PLACEHOLDER}\n\n",
+        include_annotations=False,
+        escape_underscores=True,
+        included_content_layers={ContentLayer.BODY},
+    )
+    # WHY: The old disk round-trip read the file back with universal newlines.
+    return markdown.replace("\r\n", "\n").replace("\r", "\n")
+
+
+def render_markdown(
+    document: DoclingDocument,
+    *,
+    image_mode: ImageRefMode,
+    export_labels: set[DocItemLabel],
+    output_path: Optional[Path] = None,
+    images_dir: Optional[Path] = None,
+) -> str:
+    """Render and post-process Markdown in memory (only referenced images touch disk).
+
+    @param output_path - Where the Markdown will live; anchors relative image links in
+        `REFERENCED` mode, like `save_as_markdown` does.
+    """
+    with stage("markdown.export") as span:
+        markdown = _export_markdown(
+            document,
+            image_mode=image_mode,
+            export_labels=export_labels,
+            output_path=output_path,
+            images_dir=images_dir,
+        )
+        span.count("chars", len(markdown))
+    return postprocess_markdown(
+        markdown,
+        PAGE_BREAK_PLACEHOLDER,
+        remove_image_placeholders=image_mode is ImageRefMode.PLACEHOLDER,
+    )
+
+
+def convert_pdf_to_markdown_text(
+    *,
+    input_path: Path,
+    image_mode: ImageRefMode,
+    images_dir: Optional[Path],
+    max_pages: Optional[int],
+    page_range: Optional[Tuple[int, int]],
+    ocr_mode: str,
+    ocr_engine: str,
+    ocr_lang: str,
+    force_full_page_ocr: bool,
+    spacing_fix: str,
+    device: str,
+    pdf_backend: str,
+    quiet: bool,
+    converters: Optional[ConverterPool] = None,
+    backend_probe: str = "text",
+    probe_pages: int = DEFAULT_PROBE_PAGES,
+    cache: Optional[ConversionCache] = None,
+    spacing_workers: int = 1,
+    output_path: Optional[Path] = None,
+    converted: Optional[tuple[ConversionResult, str]] = None,
+) -> tuple[ConversionResult, str, str]:
+    """Convert a PDF and return `(result, backend_name, markdown)` without writing Markdown.
+
+    @param output_path - Only anchors relative image links in `REFERENCED` mode.
+    @param converted - Pipeline output to repair and export instead of converting
+        (see `convert_pdf_to_doc`).
+
+    @example
+    result, backend, markdown = convert_pdf_to_markdown_text(
+        input_path=Path("report.pdf"), image_mode=ImageRefMode.PLACEHOLDER,
+        images_dir=None, max_pages=None, page_range=None, ocr_mode="off",
+        ocr_engine="tesseract", ocr_lang="eng", force_full_page_ocr=False,
+        spacing_fix="pymupdf", device="cpu", pdf_backend="auto", quiet=True,
+    )
+    """
+    with stage("document", input=input_path.name) as span:
+        result, backend_name, export_labels = convert_pdf_to_doc(
+            input_path=input_path,
+            image_mode=image_mode,
+            max_pages=max_pages,
+            page_range=page_range,
+            ocr_mode=ocr_mode,
+            ocr_engine=ocr_engine,
+            ocr_lang=ocr_lang,
+            force_full_page_ocr=force_full_page_ocr,
+            spacing_fix=spacing_fix,
+            device=device,
+            pdf_backend=pdf_backend,
+            quiet=quiet,
+            converters=converters,
+            backend_probe=backend_probe,
+            probe_pages=probe_pages,
+            cache=cache,
+            spacing_workers=spacing_workers,
+            converted=converted,
+        )
+        markdown = render_markdown(
+            result.document,
+            image_mode=image_mode,
+            export_labels=export_labels,
+            output_path=output_path,
+            images_dir=images_dir,
+        )
+        span.set(backend=backend_name)
+        span.count("pages", len(result.document.pages))
+    return result, backend_name, markdown
 
 
 def convert_pdf_to_markdown(
@@ -244,11 +475,26 @@ def convert_pdf_to_markdown(
     device: str,
     pdf_backend: str,
     quiet: bool,
+    converters: Optional[ConverterPool] = None,
+    backend_probe: str = "text",
+    probe_pages: int = DEFAULT_PROBE_PAGES,
+    cache: Optional[ConversionCache] = None,
+    spacing_workers: int = 1,
+    converted: Optional[tuple[ConversionResult, str]] = None,
 ) -> tuple[ConversionResult, str]:
-    """Convert a PDF into Markdown with optional spacing repair and audit hooks."""
-    result, backend_name, export_labels = convert_pdf_to_doc(
+    """Convert a PDF into Markdown with optional spacing repair and audit hooks.
+
+    Converters come from `converters` or the process-wide pool, so models stay warm
+    across calls with the same pipeline configuration. With `pdf_backend="auto"`,
+    `backend_probe` picks a text-layer (`text`) or full-pipeline (`pipeline`) probe.
+    With a `cache`, raw pipeline output is reused and only the repair passes re-run.
+    `spacing_workers` > 1 spreads glyph/word-cell spacing repair over worker processes.
+    The Markdown is post-processed in memory and written once, atomically.
+    """
+    result, backend_name, markdown_text = convert_pdf_to_markdown_text(
         input_path=input_path,
         image_mode=image_mode,
+        images_dir=images_dir,
         max_pages=max_pages,
         page_range=page_range,
         ocr_mode=ocr_mode,
@@ -259,32 +505,150 @@ def convert_pdf_to_markdown(
         device=device,
         pdf_backend=pdf_backend,
         quiet=quiet,
+        converters=converters,
+        backend_probe=backend_probe,
+        probe_pages=probe_pages,
+        cache=cache,
+        spacing_workers=spacing_workers,
+        output_path=output_path,
+        converted=converted,
     )
+    with stage("markdown.write") as span:
+        write_text_atomic(output_path, markdown_text)
+        span.count("chars", len(markdown_text))
 
-    page_break_marker = f"\n\n{PAGE_BREAK_PLACEHOLDER}\n\n"
-    result.document.save_as_markdown(
-        output_path,
-        artifacts_dir=images_dir,
-        image_mode=image_mode,
-        labels=export_labels,
-        page_break_placeholder=page_break_marker,
-        include_annotations=False,
-        escaping_underscores=True,
-        included_content_layers={ContentLayer.BODY},
+    return result, backend_name
+
+
+@dataclass(frozen=True)
+class StreamedConversion:
+    """Outcome of a windowed conversion; documents are not kept, only the totals."""
+
+    status: ConversionStatus
+    backend_name: str
+    pages: int
+    windows: int
+
+
+def stream_windows(
+    first_page: int, last_page: int, window_pages: int
+) -> list[tuple[int, int]]:
+    """Split an inclusive 1-based page span into consecutive windows."""
+    window_pages = max(window_pages, 1)
+    return [
+        (start, min(start + window_pages - 1, last_page))
+        for start in range(first_page, last_page + 1, window_pages)
+    ]
+
+
+def convert_pdf_to_markdown_streaming(
+    *,
+    input_path: Path,
+    output_path: Path,
+    image_mode: ImageRefMode,
+    images_dir: Optional[Path],
+    max_pages: Optional[int],
+    page_range: Optional[Tuple[int, int]],
+    ocr_mode: str,
+    ocr_engine: str,
+    ocr_lang: str,
+    force_full_page_ocr: bool,
+    spacing_fix: str,
+    device: str,
+    pdf_backend: str,
+    quiet: bool,
+    window_pages: int,
+    converters: Optional[ConverterPool] = None,
+    backend_probe: str = "text",
+    probe_pages: int = DEFAULT_PROBE_PAGES,
+    cache: Optional[ConversionCache] = None,
+    spacing_workers: int = 1,
+    lookahead_pages: int = 16,
+) -> StreamedConversion:
+    """Convert, fix and export `window_pages` pages at a time, appending as they finish.
+
+    Only one window's document is alive at a time and the Markdown passes keep a
+    bounded look-ahead (`MarkdownPageStream`), so peak memory does not grow with the
+    page count. The file is assembled next to `output_path` and renamed into place
+    once every window succeeded. Cross-window effects are approximate: KPI captions
+    are de-duplicated per window and repeated headings are judged over a sliding window.
+
+    @example
+    summary = convert_pdf_to_markdown_streaming(
+        input_path=Path("annual.pdf"), output_path=Path("annual.md"),
+        image_mode=ImageRefMode.PLACEHOLDER, images_dir=None, max_pages=None,
+        page_range=None, ocr_mode="off", ocr_engine="tesseract", ocr_lang="eng",
+        force_full_page_ocr=False, spacing_fix="pymupdf", device="cpu",
+        pdf_backend="auto", quiet=True, window_pages=20,
     )
-    markdown_text = output_path.read_text(encoding="utf-8")
-    markdown_text = add_visible_page_markers(markdown_text, PAGE_BREAK_PLACEHOLDER)
-    markdown_text = reduce_markdown_noise(
-        markdown_text,
+    """
+    page_count = pdf_page_count(input_path)
+    first_page, last_page = page_range or (1, page_count)
+    last_page = min(last_page, page_count)
+    windows = stream_windows(first_page, last_page, window_pages)
+    stream = MarkdownPageStream(
         PAGE_BREAK_PLACEHOLDER,
         remove_image_placeholders=image_mode is ImageRefMode.PLACEHOLDER,
+        lookahead_pages=lookahead_pages,
     )
-    markdown_text = normalize_kpi_blocks(markdown_text, PAGE_BREAK_PLACEHOLDER)
-    markdown_text = remove_orphan_headings(markdown_text, PAGE_BREAK_PLACEHOLDER)
-    markdown_text = remove_axis_like_lines(markdown_text, PAGE_BREAK_PLACEHOLDER)
-    output_path.write_text(markdown_text, encoding="utf-8")
 
-    return result, backend_name
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f".{output_path.name}.{uuid.uuid4().hex}.tmp")
+    status = ConversionStatus.SUCCESS
+    backend_name = pdf_backend
+    pages_done = 0
+    try:
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            for index, window in enumerate(windows, start=1):
+                result, backend_name, export_labels = convert_pdf_to_doc(
+                    input_path=input_path,
+                    image_mode=image_mode,
+                    max_pages=max_pages,
+                    page_range=window,
+                    ocr_mode=ocr_mode,
+                    ocr_engine=ocr_engine,
+                    ocr_lang=ocr_lang,
+                    force_full_page_ocr=force_full_page_ocr,
+                    spacing_fix=spacing_fix,
+                    device=device,
+                    # WHY: Probe once; later windows stay on the first window's backend.
+                    pdf_backend=backend_name,
+                    quiet=quiet,
+                    converters=converters,
+                    backend_probe=backend_probe,
+                    probe_pages=probe_pages,
+                    cache=cache,
+                    spacing_workers=spacing_workers,
+                )
+                if result.status in {ConversionStatus.FAILURE, ConversionStatus.SKIPPED}:
+                    tmp_path.unlink(missing_ok=True)
+                    return StreamedConversion(result.status, backend_name, pages_done, index)
+                if result.status is ConversionStatus.PARTIAL_SUCCESS:
+                    status = ConversionStatus.PARTIAL_SUCCESS
+                with stage("markdown.export") as span:
+                    markdown = _export_markdown(
+                        result.document,
+                        image_mode=image_mode,
+                        export_labels=export_labels,
+                        output_path=output_path,
+                        images_dir=images_dir,
+                    )
+                    span.count("chars", len(markdown))
+                # WHY: Drop the window's document before the next one is converted.
+                del result
+                pages_done += window[1] - window[0] + 1
+                with stage("markdown.stream"):
+                    handle.write(stream.push(markdown))
+                handle.flush()
+                if not quiet:
+                    print(f"Streamed pages {window[0]}-{window[1]} ({index}/{len(windows)}).")
+            with stage("markdown.stream"):
+                handle.write(stream.finish())
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return StreamedConversion(status, backend_name, pages_done, len(windows))
 
 
 def convert_pdf_to_doc(
@@ -301,17 +665,57 @@ def convert_pdf_to_doc(
     device: str,
     pdf_backend: str,
     quiet: bool,
+    converters: Optional[ConverterPool] = None,
+    backend_probe: str = "text",
+    probe_pages: int = DEFAULT_PROBE_PAGES,
+    cache: Optional[ConversionCache] = None,
+    spacing_workers: int = 1,
+    repair: bool = True,
+    converted: Optional[tuple[ConversionResult, str]] = None,
 ) -> tuple[ConversionResult, str, set[DocItemLabel]]:
-    """Convert a PDF into a Docling document with optional repair steps."""
+    """Convert a PDF into a Docling document with optional repair steps.
+
+    @param repair - False stops after the (auto-OCR) conversion, for page shards that
+        are merged before the spacing, table and post-processing fixers run.
+    @param converted - `(result, backend_name)` to repair instead of running the
+        pipeline, e.g. a document merged from shards converted with `repair=False`.
+    """
     export_labels = build_export_labels()
     ocr_mode = ocr_mode.lower()
+    if converters is None:
+        converters = get_converter_pool()
+
+    file_hash: Optional[str] = None
 
     def run_conversion(
         do_ocr: bool,
         force_full: bool,
         do_cell_matching: bool,
         backend_override: str | None = None,
+        pages: Optional[Tuple[int, int]] = None,
     ) -> tuple[ConversionResult, str]:
+        requested = pages or page_range
+        with stage(
+            "run_conversion",
+            ocr=do_ocr,
+            force_full_page_ocr=force_full,
+            page_range=f"{requested[0]}:{requested[1]}" if requested else "all",
+        ) as span:
+            result, backend_name = convert_once(
+                do_ocr, force_full, do_cell_matching, backend_override, pages
+            )
+            span.set(backend=backend_name, status=result.status.value)
+            span.count("pages", len(result.document.pages))
+        return result, backend_name
+
+    def convert_once(
+        do_ocr: bool,
+        force_full: bool,
+        do_cell_matching: bool,
+        backend_override: str | None = None,
+        pages: Optional[Tuple[int, int]] = None,
+    ) -> tuple[ConversionResult, str]:
+        nonlocal file_hash
         pipeline_options = build_pdf_pipeline_options(
             image_mode=image_mode,
             do_ocr=do_ocr,
@@ -321,197 +725,313 @@ def convert_pdf_to_doc(
             force_full_page_ocr=force_full,
             do_cell_matching=do_cell_matching,
         )
+        if cache is None:
+            return run_pipeline(pipeline_options, backend_override, pages)
+
+        if file_hash is None:
+            file_hash = file_sha256(input_path)
+        backend_spec = backend_override or pdf_backend
+        if backend_spec == "auto":
+            # WHY: The auto winner depends on the probe settings, so they are part of the key.
+            backend_spec = f"auto:{backend_probe}:{probe_pages}"
+        cache_key = conversion_cache_key(
+            file_hash=file_hash,
+            backend=backend_spec,
+            pipeline_options=pipeline_options,
+            page_range=pages or page_range,
+            max_pages=max_pages,
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if not quiet:
+                print(f"Conversion cache hit ({cached.backend_name}).")
+            return cached.to_conversion_result(input_path, file_hash), cached.backend_name
+
+        result, backend_name = run_changed_pages(
+            pipeline_options, backend_override, pages, backend_spec
+        )
+        if result.status is ConversionStatus.SUCCESS:
+            cache.put(cache_key, result.document, backend_name, result.input.page_count)
+        return result, backend_name
+
+    def run_changed_pages(
+        pipeline_options: ThreadedPdfPipelineOptions,
+        backend_override: str | None,
+        pages: Optional[Tuple[int, int]],
+        backend_spec: str,
+    ) -> tuple[ConversionResult, str]:
+        # WHY: Re-issued reports usually differ in a few pages; pages whose content
+        # hash is cached are assembled from disk and only the rest hit the models.
+        page_count = pdf_page_count(input_path)
+        if max_pages is not None and page_count > max_pages:
+            return run_pipeline(pipeline_options, backend_override, pages)
+        requested = pages or page_range
+        page_numbers = range(requested[0], requested[1] + 1) if requested else None
+        page_keys = {
+            page_no: page_cache_key(
+                page_hash=page_hash, backend=backend_spec, pipeline_options=pipeline_options
+            )
+            for page_no, page_hash in pdf_page_hashes(input_path, page_numbers).items()
+        }
+        cached_pages = load_cached_pages(cache, page_keys)
+        if not cached_pages:
+            result, backend_name = run_pipeline(pipeline_options, backend_override, pages)
+            if result.status is ConversionStatus.SUCCESS:
+                store_document_pages(cache, result.document, page_keys, backend_name)
+            return result, backend_name
+
+        # WHY: Keep changed pages on the backend that produced the cached ones (this
+        # also skips the auto probe).
+        backend_name = backend_override or next(iter(cached_pages.values())).backend_name
+        missing = set(page_keys) - set(cached_pages)
+        if not quiet:
+            print(f"Page cache: reused {len(cached_pages)}/{len(page_keys)} pages.")
+        parts = [entry.document for entry in cached_pages.values()]
+        result = None
+        for run in page_runs(missing):
+            run_result, _backend = run_pipeline(pipeline_options, backend_name, run)
+            if run_result.status is not ConversionStatus.SUCCESS:
+                return run_result, backend_name
+            store_document_pages(cache, run_result.document, page_keys, backend_name)
+            parts.append(run_result.document)
+            result = run_result
+
+        merged = concatenate_documents_by_page(parts)
+        stamp_document_origin(merged, input_path, file_hash)
+        if result is None:
+            cached = CachedConversion(merged, backend_name, page_count)
+            return cached.to_conversion_result(input_path, file_hash), backend_name
+        result.document = merged
+        return result, backend_name
 
+    def run_pipeline(
+        pipeline_options: ThreadedPdfPipelineOptions,
+        backend_override: str | None,
+        pages: Optional[Tuple[int, int]],
+    ) -> tuple[ConversionResult, str]:
+        probe_result = None
         if backend_override is not None:
             backend_name = backend_override
             backend_cls = BACKEND_MAP[backend_override]
         elif pdf_backend == "auto":
-            backend_name, backend_cls, _reports = select_backend_auto(
-                input_path=input_path,
-                pipeline_options=pipeline_options,
-                export_labels=export_labels,
-                quiet=quiet,
-            )
+            with stage("backend_probe", mode=backend_probe) as span:
+                backend_name, backend_cls, _reports, probe_result = select_backend_auto(
+                    input_path=input_path,
+                    pipeline_options=pipeline_options,
+                    export_labels=export_labels,
+                    quiet=quiet,
+                    converters=converters,
+                    probe_mode=backend_probe,
+                    probe_pages=probe_pages,
+                    page_range=pages or page_range,
+                )
+                span.set(backend=backend_name)
         else:
             backend_name = pdf_backend
             backend_cls = BACKEND_MAP[pdf_backend]
 
-        converter = DocumentConverter(
-            format_options={
-                InputFormat.PDF: PdfFormatOption(
-                    pipeline_options=pipeline_options,
-                    backend=backend_cls,
-                ),
-            }
-        )
+        converter = converters.get(pipeline_options, backend_cls)
 
         convert_kwargs: dict[str, object] = {}
         if max_pages is not None:
             convert_kwargs["max_num_pages"] = max_pages
-        if page_range is not None:
-            convert_kwargs["page_range"] = page_range
+        requested_range = pages or page_range
+        if requested_range is not None:
+            convert_kwargs["page_range"] = requested_range
+
+        if probe_result is not None and probe_result.status is ConversionStatus.SUCCESS:
+            # WHY: The pipeline probe already converted the first page with these exact
+            # options and backend; convert only the remaining pages and stitch them on.
+            probe_page = min(probe_result.document.pages, default=None)
+            last_page = probe_result.input.page_count
+            if requested_range is not None:
+                last_page = min(last_page, requested_range[1])
+            if probe_page is not None and probe_page < last_page:
+                convert_kwargs["page_range"] = (probe_page + 1, last_page)
+                rest = converter.convert(input_path, **convert_kwargs)
+                if rest.status is ConversionStatus.SUCCESS:
+                    rest.document = concatenate_documents_by_page(
+                        [probe_result.document, rest.document]
+                    )
+                    return rest, backend_name
+                if requested_range is None:
+                    convert_kwargs.pop("page_range")
+                else:
+                    convert_kwargs["page_range"] = requested_range
+            elif probe_page is not None:
+                return probe_result, backend_name
 
         result = converter.convert(input_path, **convert_kwargs)
         return result, backend_name
 
-    if ocr_mode == "on":
+    ocr_doc: Optional[DoclingDocument] = None
+    ocr_pages_done: set[int] = set()
+
+    def run_ocr_pages(pages: Optional[set[int]]) -> DoclingDocument:
+        # WHY: Full-page OCR is the slowest step; convert only the affected pages (one
+        # conversion per contiguous run) and reuse pages an earlier repair already OCR'd.
+        nonlocal ocr_doc, ocr_pages_done
+        all_pages = set(result.document.pages)
+        if pages is None:
+            pages = all_pages
+        missing = (pages & all_pages) - ocr_pages_done
+        if not missing:
+            return ocr_doc
+        parts = [ocr_doc] if ocr_doc is not None else []
+        if missing == all_pages:
+            full_result, _backend = run_conversion(
+                True, True, True, backend_override=backend_name
+            )
+            parts.append(full_result.document)
+        else:
+            if not quiet:
+                print(f"OCR rerun limited to pages: {_format_pages(missing)}")
+            for run in page_runs(missing):
+                run_result, _backend = run_conversion(
+                    True, True, True, backend_override=backend_name, pages=run
+                )
+                parts.append(run_result.document)
+        ocr_pages_done |= missing
+        ocr_doc = concatenate_documents_by_page(parts)
+        return ocr_doc
+
+    if converted is not None:
+        result, backend_name = converted
+    elif ocr_mode == "on":
         result, backend_name = run_conversion(True, force_full_page_ocr, True)
     elif ocr_mode == "off":
         result, backend_name = run_conversion(False, False, False)
     else:
         # auto: run without OCR, retry with OCR only if text is sparse
         result, backend_name = run_conversion(False, False, False)
-    text = result.document.export_to_text()
-    page_count = max(len(result.document.pages), 1)
-    chars_per_page = len(text) / page_count
-    metrics = audit_doc_vs_markdown(result.document, "")
-    spaced_ratio = (
-        metrics.spaced_table_cells / metrics.total_table_cells
-        if metrics.total_table_cells
-        else 0.0
-    )
+    health = scan_document_health(result.document)
+    spaced_ratio = health.spaced_cell_ratio
 
-    if ocr_mode == "auto":
+    # WHY: Converted shards already made their own auto-OCR decision per page range.
+    if ocr_mode == "auto" and converted is None:
+        # WHY: The health scan already sizes the plain-text export (the measure the
+        # 200 chars/page threshold was set against) without building the whole string.
+        chars_per_page = health.export_chars / max(len(result.document.pages), 1)
         if chars_per_page < 200 or spaced_ratio >= SPACED_CELL_RATIO_THRESHOLD:
-            ocr_result, ocr_backend = run_conversion(
-                True, True, True, backend_override=backend_name
-            )
-            ocr_text = ocr_result.document.export_to_text()
-            ocr_metrics = audit_doc_vs_markdown(ocr_result.document, "")
-            ocr_spaced_ratio = (
-                ocr_metrics.spaced_table_cells / ocr_metrics.total_table_cells
-                if ocr_metrics.total_table_cells
-                else 0.0
-            )
+            auto_pages = select_ocr_retry_pages(result.document, health=health)
+            ocr_scope = run_ocr_pages(auto_pages)
+            scope_health = health
+            if auto_pages is not None:
+                # WHY: Judge the OCR rerun on the pages it replaced; untouched pages would
+                # dilute both the spaced-cell ratio and the text-gain comparison.
+                scope_health = scan_document_health(
+                    filter_document_pages(result.document, auto_pages)
+                )
+                ocr_scope = filter_document_pages(ocr_scope, auto_pages)
+            ocr_health = scan_document_health(ocr_scope)
 
-            if ocr_spaced_ratio < spaced_ratio * 0.5:
-                result = ocr_result
-                backend_name = ocr_backend
-                metrics = ocr_metrics
-                spaced_ratio = ocr_spaced_ratio
-                text = ocr_text
-                chars_per_page = len(text) / page_count
-            elif len(ocr_text) > len(text) * 1.2:
-                result = ocr_result
-                backend_name = ocr_backend
-                metrics = ocr_metrics
-                spaced_ratio = ocr_spaced_ratio
-
-    def detect_spacing_pages(doc, predicate, table_predicate=None) -> set[int] | None:
-        pages: set[int] = set()
-        has_unknown_page = False
-        for item, _level in doc.iterate_items():
-            if isinstance(item, TableItem):
-                page_no = item.prov[0].page_no if item.prov else None
-                if page_no is None:
-                    has_unknown_page = True
-                for cell in item.data.table_cells:
-                    # WHY: Table headers often split letters, so we allow a stricter predicate.
-                    cell_predicate = table_predicate or predicate
-                    if cell_predicate(cell.text):
-                        if page_no is not None:
-                            pages.add(page_no)
-                        break
-            else:
-                text = getattr(item, "text", None)
-                if not text or not predicate(text):
-                    continue
-                page_no = item.prov[0].page_no if getattr(item, "prov", None) else None
-                if page_no is None:
-                    has_unknown_page = True
+            if (
+                ocr_health.spaced_cell_ratio < scope_health.spaced_cell_ratio * 0.5
+                or ocr_health.export_chars > scope_health.export_chars * 1.2
+            ):
+                if auto_pages is None:
+                    result.document = ocr_scope
                 else:
-                    pages.add(page_no)
-        if has_unknown_page:
-            return None
-        return pages
+                    result.document = splice_document_pages(
+                        result.document, ocr_scope, auto_pages
+                    )
+                health = scan_document_health(result.document)
+                spaced_ratio = health.spaced_cell_ratio
+
+    if not repair:
+        return result, backend_name, export_labels
 
     spacing_fix = spacing_fix.lower()
-    ocr_table_doc = None
     if spacing_fix == "heuristic":
         spacing_fix = "pymupdf"
-    if spacing_fix == "ocr" and metrics.total_table_cells:
+    if spacing_fix == "ocr" and health.total_table_cells:
         if spaced_ratio >= SPACED_CELL_RATIO_THRESHOLD:
-            ocr_table_doc, _backend = run_conversion(
-                True, True, True, backend_override=backend_name
-            )
-            replaced, total_spaced = merge_spaced_table_cells(
-                result.document, ocr_table_doc.document
-            )
+            spaced_pages = health.spaced_table_pages()
+            with stage("table_ocr_merge") as span:
+                replaced, total_spaced = merge_spaced_table_cells(
+                    result.document, run_ocr_pages(spaced_pages)
+                )
+                span.count("replaced", replaced)
+                span.count("spaced_cells", total_spaced)
             if not quiet:
                 print(
                     f"Hybrid table fix: replaced {replaced}/{total_spaced} spaced cells."
                 )
 
-    if spacing_fix in {"pymupdf", "docling", "ocr"}:
-        pages_to_fix = detect_spacing_pages(
-            result.document, needs_spacing_fix, table_predicate=needs_table_spacing_fix
-        )
-        if spacing_fix == "docling":
-            report = fix_spaced_items_with_word_cells(
-                result.document, input_path, pages_to_fix=pages_to_fix
+    # WHY: The spacing fixer and the KPI pass read the same PDF; one handle and page
+    # cache serve both instead of each opening (and re-parsing) the file.
+    with PdfResources(input_path, memory_map=True) as resources:
+        if spacing_fix in {"pymupdf", "docling", "ocr"}:
+            pages_to_fix = detect_spacing_pages(
+                result.document, needs_spacing_fix, table_predicate=needs_table_spacing_fix
             )
-            if not quiet and (report.table_cells or report.text_items):
-                page_info = (
-                    "all-pages"
-                    if pages_to_fix is None
-                    else f"{report.pages_processed} pages"
-                )
-                print(
-                    "Docling spacing fix (word/char cells): "
-                    f"table_cells={report.table_cells}, "
-                    f"text_items={report.text_items}, {page_info}"
-                )
-        else:
-            report = fix_spaced_items_with_pymupdf_glyphs(
-                result.document, input_path, pages_to_fix=pages_to_fix
-            )
-            if not quiet and (report.table_cells or report.text_items):
-                page_info = (
-                    "all-pages"
-                    if pages_to_fix is None
-                    else f"{report.pages_processed} pages"
-                )
-                print(
-                    "PyMuPDF spacing fix (glyph reconstruction): "
-                    f"table_cells={report.table_cells}, "
-                    f"text_items={report.text_items}, {page_info}"
+            if spacing_fix == "docling":
+                with stage("spacing_fix", method=spacing_fix) as span:
+                    report = fix_spaced_items_with_word_cells(
+                        result.document,
+                        input_path,
+                        pages_to_fix=pages_to_fix,
+                        workers=spacing_workers,
+                        resources=resources,
+                    )
+                    span.count("table_cells", report.table_cells)
+                    span.count("text_items", report.text_items)
+                    span.count("pages", report.pages_processed)
+                if not quiet and (report.table_cells or report.text_items):
+                    page_info = (
+                        "all-pages"
+                        if pages_to_fix is None
+                        else f"{report.pages_processed} pages"
+                    )
+                    print(
+                        "Docling spacing fix (word/char cells): "
+                        f"table_cells={report.table_cells}, "
+                        f"text_items={report.text_items}, {page_info}"
+                    )
+            else:
+                with stage("spacing_fix", method=spacing_fix) as span:
+                    report = fix_spaced_items_with_pymupdf_glyphs(
+                        result.document,
+                        input_path,
+                        pages_to_fix=pages_to_fix,
+                        workers=spacing_workers,
+                        resources=resources,
+                    )
+                    span.count("table_cells", report.table_cells)
+                    span.count("text_items", report.text_items)
+                    span.count("pages", report.pages_processed)
+                if not quiet and (report.table_cells or report.text_items):
+                    page_info = (
+                        "all-pages"
+                        if pages_to_fix is None
+                        else f"{report.pages_processed} pages"
+                    )
+                    print(
+                        "PyMuPDF spacing fix (glyph reconstruction): "
+                        f"table_cells={report.table_cells}, "
+                        f"text_items={report.text_items}, {page_info}"
+                    )
+
+        # WHY: One walk yields both the gate and the OCR scope (None = unknown page).
+        suspect_pages = find_suspect_table_cell_pages(result.document)
+        if suspect_pages is None or suspect_pages:
+            with stage("suspect_cell_repair") as span:
+                repaired = merge_suspect_table_cells(
+                    result.document, run_ocr_pages(suspect_pages)
                 )
+                span.count("repaired", repaired)
+            if not quiet and repaired:
+                print(f"Repaired {repaired} suspect numeric table cells via OCR.")
 
-    suspect_cells = count_suspect_table_cells(result.document)
-    if suspect_cells:
-        if ocr_table_doc is None:
-            ocr_table_doc, _backend = run_conversion(
-                True, True, True, backend_override=backend_name
-            )
-        repaired = merge_suspect_table_cells(result.document, ocr_table_doc.document)
-        if not quiet and repaired:
-            print(f"Repaired {repaired} suspect numeric table cells via OCR.")
-
-    collapsed_tables = collapse_document_table_groups(result.document)
-    normalized_headers = normalize_document_table_headers(result.document)
-    cleaned_cells = clean_document_table_cells(result.document)
-    normalized_currencies = normalize_document_table_currencies(result.document)
-    removed_dates = remove_date_only_text_inside_pictures(result.document)
-    removed_axis_text = remove_axis_text_inside_pictures(result.document)
-    added_kpis = 0
-    if _kpi_ocr_enabled():
-        added_kpis = add_picture_kpi_captions(result.document, input_path)
-    normalized_text = normalize_document_text_whitespace(result.document)
-    if not quiet and collapsed_tables:
-        print(f"Collapsed header column groups in {collapsed_tables} tables.")
-    if not quiet and normalized_headers:
-        print(f"Normalized header labels in {normalized_headers} table cells.")
-    if not quiet and cleaned_cells:
-        print(f"Cleaned {cleaned_cells} table cell values.")
-    if not quiet and normalized_currencies:
-        print(f"Normalized currency labels in {normalized_currencies} table cells.")
-    if not quiet and normalized_text:
-        print(f"Normalized whitespace in {normalized_text} text items.")
-    if not quiet and removed_dates:
-        print(f"Removed {removed_dates} date-only text items inside images.")
-    if not quiet and removed_axis_text:
-        print(f"Removed {removed_axis_text} axis-like text items inside images.")
-    if not quiet and added_kpis:
-        print(f"Added {added_kpis} KPI captions from images.")
+        fix_report = run_fix_pipeline(
+            result.document,
+            default_fixers(kpi_ocr=_kpi_ocr_enabled()),
+            pdf_path=input_path,
+            resources=resources,
+        )
+        if not quiet:
+            for name, message in FIX_MESSAGES:
+                if fix_report.count(name):
+                    print(message.format(count=fix_report.count(name)))
 
     return result, backend_name, export_labels
@@ -0,0 +1,143 @@
+"""@fileoverview Process-wide LRU pool of Docling converters keyed by pipeline options.
+
+One document can need several converters (two backend probes, the main run and an OCR
+rerun) and batches repeat the same configurations; reusing warm converters avoids
+reloading layout/TableFormer/OCR weights while the cap bounds resident model memory.
+"""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Type
+
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import ThreadedPdfPipelineOptions
+from docling.document_converter import DocumentConverter, PdfFormatOption
+
+ENV_CONVERTER_POOL_SIZE = "CONVERTER_POOL_SIZE"
+DEFAULT_POOL_SIZE = 4
+
+
+def pipeline_options_fingerprint(pipeline_options: ThreadedPdfPipelineOptions) -> str:
+    """Serialize pipeline options (including the concrete OCR options type) for hashing."""
+    try:
+        # WHY: OCR options are declared as a base type; serialize the concrete subclass fields.
+        payload = pipeline_options.model_dump_json(serialize_as_any=True)
+    except Exception:
+        payload = json.dumps(pipeline_options.model_dump(mode="json"), sort_keys=True, default=str)
+    return f"{type(pipeline_options.ocr_options).__name__}|{payload}"
+
+
+def pipeline_options_key(
+    pipeline_options: ThreadedPdfPipelineOptions, backend: Type
+) -> str:
+    """Identify a converter configuration so warm model stacks can be reused."""
+    fingerprint = pipeline_options_fingerprint(pipeline_options)
+    raw = f"{backend.__module__}.{backend.__qualname__}|{fingerprint}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def build_converter(
+    pipeline_options: ThreadedPdfPipelineOptions, backend: Type
+) -> DocumentConverter:
+    """Create a PDF-only Docling converter for the given options and backend."""
+    return DocumentConverter(
+        format_options={
+            InputFormat.PDF: PdfFormatOption(
+                pipeline_options=pipeline_options,
+                backend=backend,
+            ),
+        }
+    )
+
+
+class ConverterPool:
+    """Bounded LRU cache of warm converters; evicts the least recently used model set."""
+
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE) -> None:
+        self._max_size = max(1, max_size)
+        self._converters: OrderedDict[str, DocumentConverter] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def resize(self, max_size: int) -> None:
+        """Change the cap on resident model sets, evicting extras immediately."""
+        with self._lock:
+            self._max_size = max(1, max_size)
+            self._evict_locked()
+
+    def get(
+        self, pipeline_options: ThreadedPdfPipelineOptions, backend: Type
+    ) -> DocumentConverter:
+        """Return a warm converter for the configuration, building it on first use."""
+        key = pipeline_options_key(pipeline_options, backend)
+        with self._lock:
+            converter = self._converters.get(key)
+            if converter is not None:
+                self._converters.move_to_end(key)
+                self.hits += 1
+                return converter
+            self.misses += 1
+            converter = build_converter(pipeline_options, backend)
+            self._converters[key] = converter
+            self._evict_locked()
+            return converter
+
+    def clear(self) -> None:
+        """Drop every cached converter and release its models."""
+        with self._lock:
+            while self._converters:
+                _key, converter = self._converters.popitem(last=False)
+                _release_converter(converter)
+        gc.collect()
+
+    def __len__(self) -> int:
+        return len(self._converters)
+
+    def _evict_locked(self) -> None:
+        evicted = False
+        while len(self._converters) > self._max_size:
+            _key, converter = self._converters.popitem(last=False)
+            _release_converter(converter)
+            evicted = True
+        if evicted:
+            gc.collect()
+
+
+def _release_converter(converter: DocumentConverter) -> None:
+    # WHY: Pipelines hold the model weights; clearing them lets GC free memory even if
+    # a caller still references the converter object.
+    pipelines = getattr(converter, "initialized_pipelines", None)
+    if isinstance(pipelines, dict):
+        pipelines.clear()
+
+
+def _pool_size_from_env() -> int:
+    value = os.environ.get(ENV_CONVERTER_POOL_SIZE, "").strip()
+    try:
+        return int(value) if value else DEFAULT_POOL_SIZE
+    except ValueError:
+        return DEFAULT_POOL_SIZE
+
+
+_DEFAULT_POOL: Optional[ConverterPool] = None
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+
+def get_converter_pool() -> ConverterPool:
+    """Return the process-wide converter pool (size from CONVERTER_POOL_SIZE, default 4)."""
+    global _DEFAULT_POOL
+    with _DEFAULT_POOL_LOCK:
+        if _DEFAULT_POOL is None:
+            _DEFAULT_POOL = ConverterPool(_pool_size_from_env())
+        return _DEFAULT_POOL
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import re
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Optional
 
 from docling_core.types.doc import TableItem
 from docling_core.types.doc.base import BoundingBox, CoordOrigin
@@ -70,10 +70,10 @@ def _axis_like(text: str) -> bool:
     return False
 
 
-def remove_date_only_text_inside_pictures(doc, *, overlap_ratio: float = 0.6) -> int:
-    """Remove date-only text items that sit inside picture regions."""
+def collect_picture_boxes(items: Iterable[object]) -> dict[int, list[BoundingBox]]:
+    """Group picture bounding boxes by page for the given document items."""
     pictures_by_page: dict[int, list[BoundingBox]] = {}
-    for item, _level in doc.iterate_items():
+    for item in items:
         if not isinstance(item, PictureItem):
             continue
         if not item.prov:
@@ -83,100 +83,105 @@ def remove_date_only_text_inside_pictures(doc, *, overlap_ratio: float = 0.6) ->
         if page_no is None or bbox is None:
             continue
         pictures_by_page.setdefault(page_no, []).append(bbox)
+    return pictures_by_page
 
-    if not pictures_by_page:
-        return 0
 
-    page_heights = {
+def document_page_heights(doc) -> dict[int, float]:
+    """Map page numbers to page heights (used to align bbox origins)."""
+    return {
         page_no: page.size.height
         for page_no, page in doc.pages.items()
         if page.size is not None
     }
 
-    to_delete = []
-    for item, _level in doc.iterate_items():
-        if isinstance(item, (TableItem, PictureItem)):
-            continue
-        text = getattr(item, "text", None)
-        if not text or not _date_only(text):
-            continue
-        if not getattr(item, "prov", None):
-            continue
-        prov = item.prov[0]
-        page_no = prov.page_no
-        if page_no is None:
-            continue
-        picture_boxes = pictures_by_page.get(page_no)
-        if not picture_boxes:
-            continue
-        if prov.bbox is None:
-            continue
-        page_height = page_heights.get(page_no)
-        text_bbox = _bbox_to_top_left(prov.bbox, page_height)
-        for pic_bbox in picture_boxes:
-            aligned_pic = _bbox_to_top_left(pic_bbox, page_height)
-            if _overlap_ratio(text_bbox, aligned_pic) >= overlap_ratio:
-                to_delete.append(item)
-                break
-
-    if not to_delete:
-        return 0
 
-    doc.delete_items(node_items=to_delete)
-    return len(to_delete)
+def _text_inside_pictures(
+    item,
+    predicate: Callable[[str], bool],
+    pictures_by_page: dict[int, list[BoundingBox]],
+    page_heights: dict[int, float],
+    overlap_ratio: float,
+) -> bool:
+    if isinstance(item, (TableItem, PictureItem)):
+        return False
+    text = getattr(item, "text", None)
+    if not text or not predicate(text):
+        return False
+    if not getattr(item, "prov", None):
+        return False
+    prov = item.prov[0]
+    page_no = prov.page_no
+    if page_no is None:
+        return False
+    picture_boxes = pictures_by_page.get(page_no)
+    if not picture_boxes:
+        return False
+    if prov.bbox is None:
+        return False
+    page_height = page_heights.get(page_no)
+    text_bbox = _bbox_to_top_left(prov.bbox, page_height)
+    for pic_bbox in picture_boxes:
+        aligned_pic = _bbox_to_top_left(pic_bbox, page_height)
+        if _overlap_ratio(text_bbox, aligned_pic) >= overlap_ratio:
+            return True
+    return False
 
 
-def remove_axis_text_inside_pictures(doc, *, overlap_ratio: float = 0.6) -> int:
-    """Remove axis/legend-like text items that sit inside picture regions."""
-    pictures_by_page: dict[int, list[BoundingBox]] = {}
-    for item, _level in doc.iterate_items():
-        if not isinstance(item, PictureItem):
-            continue
-        if not item.prov:
-            continue
-        page_no = item.prov[0].page_no
-        bbox = item.prov[0].bbox
-        if page_no is None or bbox is None:
-            continue
-        pictures_by_page.setdefault(page_no, []).append(bbox)
-
+def is_date_text_inside_pictures(
+    item,
+    pictures_by_page: dict[int, list[BoundingBox]],
+    page_heights: dict[int, float],
+    *,
+    overlap_ratio: float = 0.6,
+) -> bool:
+    """Whether a text item is a bare date sitting inside a picture region."""
+    return _text_inside_pictures(
+        item, _date_only, pictures_by_page, page_heights, overlap_ratio
+    )
+
+
+def is_axis_text_inside_pictures(
+    item,
+    pictures_by_page: dict[int, list[BoundingBox]],
+    page_heights: dict[int, float],
+    *,
+    overlap_ratio: float = 0.6,
+) -> bool:
+    """Whether a text item is axis/legend-like text sitting inside a picture region."""
+    return _text_inside_pictures(
+        item, _axis_like, pictures_by_page, page_heights, overlap_ratio
+    )
+
+
+def _remove_text_inside_pictures(
+    doc,
+    predicate: Callable[[str], bool],
+    overlap_ratio: float,
+) -> int:
+    pictures_by_page = collect_picture_boxes(item for item, _level in doc.iterate_items())
     if not pictures_by_page:
         return 0
 
-    page_heights = {
-        page_no: page.size.height
-        for page_no, page in doc.pages.items()
-        if page.size is not None
-    }
-
-    to_delete = []
-    for item, _level in doc.iterate_items():
-        if isinstance(item, (TableItem, PictureItem)):
-            continue
-        text = getattr(item, "text", None)
-        if not text or not _axis_like(text):
-            continue
-        if not getattr(item, "prov", None):
-            continue
-        prov = item.prov[0]
-        page_no = prov.page_no
-        if page_no is None:
-            continue
-        picture_boxes = pictures_by_page.get(page_no)
-        if not picture_boxes:
-            continue
-        if prov.bbox is None:
-            continue
-        page_height = page_heights.get(page_no)
-        text_bbox = _bbox_to_top_left(prov.bbox, page_height)
-        for pic_bbox in picture_boxes:
-            aligned_pic = _bbox_to_top_left(pic_bbox, page_height)
-            if _overlap_ratio(text_bbox, aligned_pic) >= overlap_ratio:
-                to_delete.append(item)
-                break
-
+    page_heights = document_page_heights(doc)
+    to_delete = [
+        item
+        for item, _level in doc.iterate_items()
+        if _text_inside_pictures(
+            item, predicate, pictures_by_page, page_heights, overlap_ratio
+        )
+    ]
     if not to_delete:
         return 0
 
     doc.delete_items(node_items=to_delete)
     return len(to_delete)
+
+
+def remove_date_only_text_inside_pictures(doc, *, overlap_ratio: float = 0.6) -> int:
+    """Remove date-only text items that sit inside picture regions."""
+    return _remove_text_inside_pictures(doc, _date_only, overlap_ratio)
+
+
+def remove_axis_text_inside_pictures(doc, *, overlap_ratio: float = 0.6) -> int:
+    """Remove axis/legend-like text items that sit inside picture regions."""
+    return _remove_text_inside_pictures(doc, _axis_like, overlap_ratio)
@@ -0,0 +1,237 @@
+"""@fileoverview Merge and splice Docling documents page-wise without losing page numbers.
+
+Targeted re-runs (OCR on a few bad pages, page windows) produce partial documents;
+these helpers stitch them back in page order so provenance still points at real pages.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Iterable, Optional, Sequence
+
+from docling_core.types.doc.document import (
+    ContentLayer,
+    DocItem,
+    DoclingDocument,
+    FloatingItem,
+    FormItem,
+    GroupItem,
+    KeyValueItem,
+    NodeItem,
+    RefItem,
+    RichTableCell,
+    TableItem,
+)
+
+
+def page_runs(pages: Iterable[int]) -> list[tuple[int, int]]:
+    """Group page numbers into inclusive contiguous ranges (e.g. {1,2,3,7} -> [(1,3),(7,7)])."""
+    runs: list[tuple[int, int]] = []
+    for page_no in sorted(set(pages)):
+        if runs and page_no == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], page_no)
+        else:
+            runs.append((page_no, page_no))
+    return runs
+
+
+def _doc_items_with_prov(doc: DoclingDocument) -> Iterable[object]:
+    for key in ("texts", "tables", "pictures", "key_value_items", "form_items", "field_regions", "field_items"):
+        yield from getattr(doc, key, None) or []
+
+
+def renumber_pages(doc: DoclingDocument, mapping: dict[int, int]) -> None:
+    """Move pages (and every item's provenance) to new numbers in place."""
+    for item in _doc_items_with_prov(doc):
+        for prov in getattr(item, "prov", None) or []:
+            prov.page_no = mapping.get(prov.page_no, prov.page_no)
+    pages = {}
+    for page_no, page in doc.pages.items():
+        new_no = mapping.get(page_no, page_no)
+        page.page_no = new_no
+        pages[new_no] = page
+    doc.pages = dict(sorted(pages.items()))
+
+
+def filter_document_pages(doc: DoclingDocument, page_nrs: set[int]) -> DoclingDocument:
+    """Copy the given pages of `doc`, keeping their original page numbers."""
+    pages = {page_no for page_no in page_nrs if page_no in doc.pages}
+    filtered = doc.filter(page_nrs=pages)
+    # WHY: `filter` re-bases numbering on the source's first page (page_range conversions
+    # start above 1); the shift is uniform, so sorted order maps back exactly.
+    filtered_pages = sorted(filtered.pages)
+    original_pages = sorted(pages)
+    if filtered_pages != original_pages:
+        renumber_pages(filtered, dict(zip(filtered_pages, original_pages)))
+    return filtered
+
+
+class _PagePart:
+    """One page's share of a document being split, built up in traversal order."""
+
+    def __init__(self, source: DoclingDocument, page_no: int) -> None:
+        self.source = source
+        self.doc = DoclingDocument(name=source.name)
+        self.doc.body = GroupItem(**source.body.model_dump(exclude={"children"}))
+        self.doc.pages = {page_no: copy.deepcopy(source.pages[page_no])}
+        self.refs: dict[str, str] = {"#/body": "#/body"}
+
+    def _parent_ref(self, item: NodeItem) -> str:
+        # WHY: Like `filter`, an item whose parent sits on another page hangs off its
+        # nearest ancestor on this page; groups on the way are copied on first use.
+        parent = item.parent
+        while parent is not None:
+            if parent.cref in self.refs:
+                return self.refs[parent.cref]
+            node = parent.resolve(self.source)
+            if not isinstance(node, DocItem):
+                return self.add(node)
+            parent = node.parent
+        return "#/body"
+
+    def add(self, item: NodeItem) -> str:
+        parent_ref = self._parent_ref(item)
+        key = item.self_ref.split("/")[1]
+        items = getattr(self.doc, key)
+        new_ref = f"#/{key}/{len(items)}"
+        self.refs[item.self_ref] = new_ref
+
+        new_item = copy.deepcopy(item)
+        new_item.children = []
+        new_item.self_ref = new_ref
+        new_item.parent = RefItem(cref=parent_ref)
+        items.append(new_item)
+
+        parent_item = RefItem(cref=parent_ref).resolve(self.doc)
+        if isinstance(parent_item, TableItem):
+            for cell in parent_item.data.table_cells:
+                if isinstance(cell, RichTableCell) and cell.ref.cref == item.self_ref:
+                    cell.ref.cref = new_ref
+                    break
+        parent_item.children.append(RefItem(cref=new_ref))
+        return new_ref
+
+    def finish(self) -> DoclingDocument:
+        """Point captions, footnotes and graph cells at the copies kept on this page."""
+        for item in _doc_items_with_prov(self.doc):
+            if isinstance(item, FloatingItem):
+                for field in ("captions", "references", "footnotes"):
+                    setattr(item, field, self._kept_refs(getattr(item, field)))
+            if isinstance(item, KeyValueItem | FormItem):
+                for cell in item.graph.cells:
+                    if cell.item_ref is not None:
+                        mapped = self.refs.get(cell.item_ref.cref)
+                        cell.item_ref = RefItem(cref=mapped) if mapped is not None else None
+        return self.doc
+
+    def _kept_refs(self, refs: list[RefItem]) -> list[RefItem]:
+        return [RefItem(cref=self.refs[ref.cref]) for ref in refs if ref.cref in self.refs]
+
+
+def split_document_pages(
+    doc: DoclingDocument, page_nrs: Optional[set[int]] = None
+) -> dict[int, DoclingDocument]:
+    """Cut `doc` into single-page documents in one traversal, keeping page numbers.
+
+    Each part holds what `filter_document_pages(doc, {page})` would, minus groups with
+    nothing on that page, without re-walking the whole document for every page.
+    """
+    wanted = set(doc.pages) if page_nrs is None else set(page_nrs) & set(doc.pages)
+    parts = {page_no: _PagePart(doc, page_no) for page_no in sorted(wanted)}
+    if not parts:
+        return {}
+    for item, _stack in doc._iterate_items_with_stack(
+        with_groups=True, traverse_pictures=True, included_content_layers=set(ContentLayer)
+    ):
+        if not isinstance(item, DocItem):
+            continue
+        for page_no in dict.fromkeys(prov.page_no for prov in item.prov):
+            part = parts.get(page_no)
+            if part is not None:
+                part.add(item)
+    return {page_no: part.finish() for page_no, part in parts.items()}
+
+
+def pages_in_cross_page_groups(doc: DoclingDocument) -> set[int]:
+    """Pages covered by a group (e.g. a numbered list) whose items sit on several pages.
+
+    Cutting such a group at a page break and merging the parts back yields two groups,
+    so a list would restart its numbering; callers keep these pages together instead.
+    """
+    group_pages: dict[str, set[int]] = {}
+    for item in _doc_items_with_prov(doc):
+        pages = {prov.page_no for prov in item.prov}
+        if not pages:
+            continue
+        parent = item.parent
+        while parent is not None and parent.cref != "#/body":
+            node = parent.resolve(doc)
+            if isinstance(node, GroupItem):
+                group_pages.setdefault(parent.cref, set()).update(pages)
+            parent = node.parent
+    covered: set[int] = set()
+    for pages in group_pages.values():
+        if len(pages) > 1:
+            covered.update(range(min(pages), max(pages) + 1))
+    return covered
+
+
+def concatenate_documents_by_page(docs: Sequence[DoclingDocument]) -> DoclingDocument:
+    """Merge page-disjoint documents in page order, keeping original page numbers.
+
+    Each input is cut into contiguous page runs so interleaved inputs (e.g. OCR of
+    pages 3 and 10 plus a later OCR of page 5) still come out in reading order.
+
+    @throws ValueError if two inputs contain the same page.
+    """
+    docs = [doc for doc in docs if doc.pages]
+    if not docs:
+        raise ValueError("No pages to merge.")
+    if len(docs) == 1:
+        return docs[0]
+
+    owners: dict[int, DoclingDocument] = {}
+    for doc in docs:
+        for page_no in doc.pages:
+            if page_no in owners:
+                raise ValueError(f"Page {page_no} is present in more than one document.")
+            owners[page_no] = doc
+
+    segments: list[tuple[int, DoclingDocument, set[int]]] = []
+    for doc in docs:
+        for start, end in page_runs(doc.pages):
+            segments.append((start, doc, {p for p in doc.pages if start <= p <= end}))
+    segments.sort(key=lambda segment: segment[0])
+
+    parts = [
+        doc if pages == set(doc.pages) else filter_document_pages(doc, pages)
+        for _start, doc, pages in segments
+    ]
+    merged = DoclingDocument.concatenate(parts)
+
+    # WHY: `concatenate` re-bases page numbers to follow the previous part; the order is
+    # preserved, so zipping sorted page lists restores the original numbering.
+    original_pages = sorted(owners)
+    merged_pages = sorted(merged.pages)
+    if merged_pages != original_pages:
+        renumber_pages(merged, dict(zip(merged_pages, original_pages)))
+    merged.name = docs[0].name
+    merged.origin = docs[0].origin
+    return merged
+
+
+def splice_document_pages(
+    base: DoclingDocument, replacement: DoclingDocument, page_nrs: set[int]
+) -> DoclingDocument:
+    """Return `base` with the given pages taken from `replacement` (e.g. an OCR rerun)."""
+    swap = {page_no for page_no in page_nrs if page_no in replacement.pages and page_no in base.pages}
+    if not swap:
+        return base
+    keep = set(base.pages) - swap
+    parts = [filter_document_pages(replacement, swap)]
+    if keep:
+        parts.append(filter_document_pages(base, keep))
+    merged = concatenate_documents_by_page(parts)
+    merged.name = base.name
+    merged.origin = base.origin
+    return merged
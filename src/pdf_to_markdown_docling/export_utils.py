@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+import uuid
+from collections import deque
 from pathlib import Path
 
 from docling_core.types.doc.document import DoclingDocument
 
+from pdf_to_markdown_docling.metrics import stage
+
 _HTML_PAGE_MARKER_PATTERN = re.compile(r"<!--\s*page:\s*(\d+)\s*-->")
 _MD_PAGE_MARKER_PATTERN = re.compile(r"\[//\]:\s*#\s*\(\s*page:\s*(\d+)\s*\)")
 _VISIBLE_PAGE_MARKER_PATTERN = re.compile(
@@ -41,24 +46,58 @@ def _strip_page_markers(markdown: str) -> str:
     return _PAGE_MARKER_PATTERN.sub("", markdown)
 
 
-def add_visible_page_markers(markdown: str, page_break_placeholder: str) -> str:
-    """Insert visible `[Page N]` markers before each page chunk."""
-    markdown = _strip_page_markers(markdown)
-
+def _split_pages(markdown: str, page_break_placeholder: str) -> list[str]:
     if page_break_placeholder not in markdown:
-        if not markdown.strip():
-            return markdown
-        return f"**[Page 1]**\n\n{markdown.strip()}"
+        return [markdown]
+    return markdown.split(page_break_placeholder)
+
+
+def _join_pages(parts: list[str], page_break_placeholder: str) -> str:
+    if len(parts) == 1:
+        return parts[0]
+    return f"\n\n{page_break_placeholder}\n\n".join(parts)
+
+
+def _is_blank(parts: list[str]) -> bool:
+    # WHY: With page breaks the joined text always contains the placeholder, so only a
+    # single unbroken part can be "empty markdown" that the passes leave untouched.
+    return len(parts) == 1 and not parts[0].strip()
+
+
+def _rejoined(parts: list[str]) -> list[str]:
+    # WHY: Each pass used to re-split the text the previous pass joined with
+    # "\n\n<placeholder>\n\n"; padding pages the same way keeps output byte-identical.
+    if len(parts) <= 1:
+        return parts
+    last = len(parts) - 1
+    return [
+        ("\n\n" if index else "") + part + ("\n\n" if index < last else "")
+        for index, part in enumerate(parts)
+    ]
+
+
+def _visible_page_marker_parts(parts: list[str]) -> list[str]:
+    parts = [_strip_page_markers(part) for part in parts]
+    if len(parts) == 1:
+        if not parts[0].strip():
+            return parts
+        return [f"**[Page 1]**\n\n{parts[0].strip()}"]
 
-    parts = [part.strip() for part in markdown.split(page_break_placeholder)]
     out: list[str] = []
     page_no = 1
     for part in parts:
+        part = part.strip()
         if not part:
             continue
         out.append(f"**[Page {page_no}]**\n\n{part}")
         page_no += 1
-    return f"\n\n{page_break_placeholder}\n\n".join(out)
+    return out or [""]
+
+
+def add_visible_page_markers(markdown: str, page_break_placeholder: str) -> str:
+    """Insert visible `[Page N]` markers before each page chunk."""
+    parts = _split_pages(markdown, page_break_placeholder)
+    return _join_pages(_visible_page_marker_parts(parts), page_break_placeholder)
 
 
 def add_page_markers(markdown: str, page_break_placeholder: str) -> str:
@@ -85,6 +124,103 @@ def _normalize_heading(text: str) -> str:
     return " ".join(text.split()).casefold()
 
 
+def _first_heading(part: str) -> str | None:
+    for line in part.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if _IMAGE_PLACEHOLDER_PATTERN.match(stripped):
+            continue
+        if _PAGE_MARKER_PATTERN.match(stripped):
+            continue
+        match = _HEADING_PATTERN.match(stripped)
+        return match.group(2) if match else None
+    return None
+
+
+def _frequent_headings(
+    first_headings: list[str | None],
+    *,
+    repeated_heading_ratio: float,
+    min_repeated_heading_count: int,
+) -> set[str]:
+    total_pages = len(first_headings)
+    if total_pages <= 1:
+        return set()
+    counts: dict[str, int] = {}
+    for heading in first_headings:
+        if not heading:
+            continue
+        key = _normalize_heading(heading)
+        counts[key] = counts.get(key, 0) + 1
+    threshold = max(
+        min_repeated_heading_count,
+        int(total_pages * repeated_heading_ratio + 0.999),
+    )
+    return {key for key, count in counts.items() if count >= threshold}
+
+
+def _noise_free_page(
+    part: str,
+    heading: str | None,
+    frequent: set[str],
+    kept_once: set[str],
+    *,
+    remove_image_placeholders: bool,
+) -> str:
+    heading_key = _normalize_heading(heading) if heading else None
+    lines_out: list[str] = []
+    removed_heading = False
+    for line in part.splitlines():
+        stripped = line.strip()
+        if remove_image_placeholders and _IMAGE_PLACEHOLDER_PATTERN.match(stripped):
+            continue
+        if (
+            not removed_heading
+            and heading
+            and heading_key in frequent
+            and stripped
+            and _HEADING_PATTERN.match(stripped)
+            and _normalize_heading(_HEADING_PATTERN.match(stripped).group(2))
+            == heading_key
+        ):
+            if heading_key in kept_once:
+                removed_heading = True
+                continue
+            kept_once.add(heading_key)
+        lines_out.append(line)
+    return "\n".join(lines_out)
+
+
+def _noise_free_parts(
+    raw_parts: list[str],
+    *,
+    remove_image_placeholders: bool = False,
+    repeated_heading_ratio: float = 0.3,
+    min_repeated_heading_count: int = 3,
+) -> list[str]:
+    if _is_blank(raw_parts):
+        return raw_parts
+
+    first_headings = [_first_heading(part) for part in raw_parts]
+    frequent = _frequent_headings(
+        first_headings,
+        repeated_heading_ratio=repeated_heading_ratio,
+        min_repeated_heading_count=min_repeated_heading_count,
+    )
+    kept_once: set[str] = set()
+    return [
+        _noise_free_page(
+            part,
+            heading,
+            frequent,
+            kept_once,
+            remove_image_placeholders=remove_image_placeholders,
+        )
+        for part, heading in zip(raw_parts, first_headings)
+    ]
+
+
 def reduce_markdown_noise(
     markdown: str,
     page_break_placeholder: str,
@@ -94,76 +230,13 @@ def reduce_markdown_noise(
     min_repeated_heading_count: int = 3,
 ) -> str:
     """Remove noisy image placeholders and repeated top-of-page headings."""
-    if not markdown.strip():
-        return markdown
-
-    has_breaks = page_break_placeholder in markdown
-    raw_parts = markdown.split(page_break_placeholder) if has_breaks else [markdown]
-
-    first_headings: list[str | None] = []
-    for part in raw_parts:
-        heading = None
-        for line in part.splitlines():
-            stripped = line.strip()
-            if not stripped:
-                continue
-            if _IMAGE_PLACEHOLDER_PATTERN.match(stripped):
-                continue
-            if _PAGE_MARKER_PATTERN.match(stripped):
-                continue
-            match = _HEADING_PATTERN.match(stripped)
-            if match:
-                heading = match.group(2)
-            break
-        first_headings.append(heading)
-
-    total_pages = len(raw_parts)
-    if total_pages <= 1:
-        frequent = set()
-    else:
-        counts: dict[str, int] = {}
-        for heading in first_headings:
-            if not heading:
-                continue
-            key = _normalize_heading(heading)
-            counts[key] = counts.get(key, 0) + 1
-        threshold = max(
-            min_repeated_heading_count,
-            int(total_pages * repeated_heading_ratio + 0.999),
-        )
-        frequent = {key for key, count in counts.items() if count >= threshold}
-
-    kept_once: set[str] = set()
-    cleaned_parts: list[str] = []
-    for part, heading in zip(raw_parts, first_headings):
-        heading_key = _normalize_heading(heading) if heading else None
-        lines_out: list[str] = []
-        removed_heading = False
-        for line in part.splitlines():
-            stripped = line.strip()
-            if remove_image_placeholders and _IMAGE_PLACEHOLDER_PATTERN.match(stripped):
-                continue
-            if (
-                not removed_heading
-                and heading
-                and heading_key in frequent
-                and stripped
-                and _HEADING_PATTERN.match(stripped)
-                and _normalize_heading(_HEADING_PATTERN.match(stripped).group(2))
-                == heading_key
-            ):
-                if heading_key in kept_once:
-                    removed_heading = True
-                    continue
-                kept_once.add(heading_key)
-            lines_out.append(line)
-        cleaned_parts.append("\n".join(lines_out))
-
-    if not has_breaks:
-        return cleaned_parts[0]
-
-    separator = f"\n\n{page_break_placeholder}\n\n"
-    return separator.join(cleaned_parts)
+    parts = _noise_free_parts(
+        _split_pages(markdown, page_break_placeholder),
+        remove_image_placeholders=remove_image_placeholders,
+        repeated_heading_ratio=repeated_heading_ratio,
+        min_repeated_heading_count=min_repeated_heading_count,
+    )
+    return _join_pages(parts, page_break_placeholder)
 
 
 def _is_kpi_label(text: str) -> bool:
@@ -220,44 +293,41 @@ def _is_heading_like_line(text: str) -> bool:
     return True
 
 
+def _kpi_block_page(part: str) -> str:
+    blocks = [block for block in re.split(r"\n{2,}", part) if block.strip()]
+    out_blocks: list[str] = []
+    i = 0
+    while i < len(blocks):
+        block = blocks[i].strip()
+        if _is_kpi_label(block):
+            merged = block
+            consumed = 1
+            for j in range(i + 1, min(i + 3, len(blocks))):
+                candidate = blocks[j].strip()
+                if _is_kpi_value(candidate):
+                    merged = f"{merged} {' '.join(candidate.split())}"
+                    consumed += 1
+                else:
+                    break
+            if consumed > 1:
+                out_blocks.append(merged)
+                i += consumed
+                continue
+        out_blocks.append(block)
+        i += 1
+    return "\n\n".join(out_blocks)
+
+
+def _kpi_block_parts(raw_parts: list[str]) -> list[str]:
+    if _is_blank(raw_parts):
+        return raw_parts
+    return [_kpi_block_page(part) for part in raw_parts]
+
+
 def normalize_kpi_blocks(markdown: str, page_break_placeholder: str) -> str:
     """Join short KPI label/value blocks into a single line."""
-    if not markdown.strip():
-        return markdown
-
-    has_breaks = page_break_placeholder in markdown
-    raw_parts = markdown.split(page_break_placeholder) if has_breaks else [markdown]
-    cleaned_parts: list[str] = []
-
-    for part in raw_parts:
-        blocks = [block for block in re.split(r"\n{2,}", part) if block.strip()]
-        out_blocks: list[str] = []
-        i = 0
-        while i < len(blocks):
-            block = blocks[i].strip()
-            if _is_kpi_label(block):
-                merged = block
-                consumed = 1
-                for j in range(i + 1, min(i + 3, len(blocks))):
-                    candidate = blocks[j].strip()
-                    if _is_kpi_value(candidate):
-                        merged = f"{merged} {' '.join(candidate.split())}"
-                        consumed += 1
-                    else:
-                        break
-                if consumed > 1:
-                    out_blocks.append(merged)
-                    i += consumed
-                    continue
-            out_blocks.append(block)
-            i += 1
-        cleaned_parts.append("\n\n".join(out_blocks))
-
-    if not has_breaks:
-        return cleaned_parts[0]
-
-    separator = f"\n\n{page_break_placeholder}\n\n"
-    return separator.join(cleaned_parts)
+    parts = _kpi_block_parts(_split_pages(markdown, page_break_placeholder))
+    return _join_pages(parts, page_break_placeholder)
 
 
 def _is_axis_like_line(text: str) -> bool:
@@ -279,101 +349,277 @@ def _is_axis_like_line(text: str) -> bool:
     return False
 
 
-def remove_axis_like_lines(markdown: str, page_break_placeholder: str) -> str:
-    """Remove standalone axis-like lines that often come from charts."""
-    if not markdown.strip():
-        return markdown
-
-    has_breaks = page_break_placeholder in markdown
-    raw_parts = markdown.split(page_break_placeholder) if has_breaks else [markdown]
-    cleaned_parts: list[str] = []
-
-    for part in raw_parts:
-        lines_out: list[str] = []
-        for line in part.splitlines():
-            stripped = line.strip()
-            if not stripped:
-                lines_out.append(line)
-                continue
-            if _PAGE_MARKER_PATTERN.match(stripped):
-                lines_out.append(line)
-                continue
-            if _IMAGE_PLACEHOLDER_PATTERN.match(stripped):
-                lines_out.append(line)
-                continue
-            if _HEADING_PATTERN.match(stripped):
-                lines_out.append(line)
-                continue
-            if "|" in stripped:
-                lines_out.append(line)
-                continue
-            if _is_axis_like_line(stripped):
-                continue
+def _axis_free_page(part: str) -> str:
+    lines_out: list[str] = []
+    for line in part.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            lines_out.append(line)
+            continue
+        if _PAGE_MARKER_PATTERN.match(stripped):
+            lines_out.append(line)
+            continue
+        if _IMAGE_PLACEHOLDER_PATTERN.match(stripped):
+            lines_out.append(line)
+            continue
+        if _HEADING_PATTERN.match(stripped):
             lines_out.append(line)
-        cleaned_parts.append("\n".join(lines_out))
+            continue
+        if "|" in stripped:
+            lines_out.append(line)
+            continue
+        if _is_axis_like_line(stripped):
+            continue
+        lines_out.append(line)
+    return "\n".join(lines_out)
 
-    if not has_breaks:
-        return cleaned_parts[0]
 
-    separator = f"\n\n{page_break_placeholder}\n\n"
-    return separator.join(cleaned_parts)
+def _axis_free_parts(raw_parts: list[str]) -> list[str]:
+    if _is_blank(raw_parts):
+        return raw_parts
+    return [_axis_free_page(part) for part in raw_parts]
 
 
-def remove_orphan_headings(markdown: str, page_break_placeholder: str) -> str:
-    """Remove headings that end a page but have no content on the next page."""
-    if not markdown.strip():
-        return markdown
-
-    has_breaks = page_break_placeholder in markdown
-    raw_parts = markdown.split(page_break_placeholder) if has_breaks else [markdown]
-    cleaned_parts: list[str] = []
-
-    def _next_meaningful_line(start_index: int) -> str | None:
-        for part_index in range(start_index, len(raw_parts)):
-            for line in raw_parts[part_index].splitlines():
-                stripped_line = line.strip()
-                if not stripped_line:
-                    continue
-                if _PAGE_MARKER_PATTERN.match(stripped_line):
-                    continue
-                if _IMAGE_PLACEHOLDER_PATTERN.match(stripped_line):
-                    continue
-                return stripped_line
-        return None
-
-    for idx, part in enumerate(raw_parts):
-        lines = part.splitlines()
-        last_idx = None
-        for line_idx in range(len(lines) - 1, -1, -1):
-            if lines[line_idx].strip():
-                last_idx = line_idx
-                break
-        if last_idx is None:
-            cleaned_parts.append(part)
+def remove_axis_like_lines(markdown: str, page_break_placeholder: str) -> str:
+    """Remove standalone axis-like lines that often come from charts."""
+    parts = _axis_free_parts(_split_pages(markdown, page_break_placeholder))
+    return _join_pages(parts, page_break_placeholder)
+
+
+def _first_meaningful_line(part: str) -> str | None:
+    for line in part.splitlines():
+        stripped_line = line.strip()
+        if not stripped_line:
+            continue
+        if _PAGE_MARKER_PATTERN.match(stripped_line):
             continue
+        if _IMAGE_PLACEHOLDER_PATTERN.match(stripped_line):
+            continue
+        return stripped_line
+    return None
+
 
-        stripped = lines[last_idx].strip()
-        heading_match = _HEADING_PATTERN.match(stripped)
-        if heading_match:
-            heading_level = len(heading_match.group(1))
-            next_line = _next_meaningful_line(idx + 1)
-            if next_line is None:
+def _orphan_free_page(part: str, next_line: str | None) -> str:
+    lines = part.splitlines()
+    last_idx = None
+    for line_idx in range(len(lines) - 1, -1, -1):
+        if lines[line_idx].strip():
+            last_idx = line_idx
+            break
+    if last_idx is None:
+        return part
+
+    stripped = lines[last_idx].strip()
+    heading_match = _HEADING_PATTERN.match(stripped)
+    if heading_match:
+        heading_level = len(heading_match.group(1))
+        if next_line is None:
+            lines[last_idx] = ""
+            part = "\n".join(lines).rstrip()
+        else:
+            next_match = _HEADING_PATTERN.match(next_line)
+            is_superseding_heading = (
+                next_match is not None
+                and len(next_match.group(1)) <= heading_level
+            )
+            if is_superseding_heading or _is_heading_like_line(next_line):
                 lines[last_idx] = ""
                 part = "\n".join(lines).rstrip()
-            else:
-                next_match = _HEADING_PATTERN.match(next_line)
-                is_superseding_heading = (
-                    next_match is not None
-                    and len(next_match.group(1)) <= heading_level
-                )
-                if is_superseding_heading or _is_heading_like_line(next_line):
-                    lines[last_idx] = ""
-                    part = "\n".join(lines).rstrip()
-
-        cleaned_parts.append(part)
-
-    if not has_breaks:
-        return cleaned_parts[0]
-
-    separator = f"\n\n{page_break_placeholder}\n\n"
-    return separator.join(cleaned_parts)
+    return part
+
+
+def _orphan_free_parts(raw_parts: list[str]) -> list[str]:
+    if _is_blank(raw_parts):
+        return raw_parts
+
+    # WHY: One backward scan gives every page its next meaningful line instead of
+    # rescanning the rest of the document per page.
+    next_lines: list[str | None] = []
+    next_line: str | None = None
+    for part in reversed(raw_parts):
+        next_lines.append(next_line)
+        next_line = _first_meaningful_line(part) or next_line
+    next_lines.reverse()
+    return [
+        _orphan_free_page(part, next_line)
+        for part, next_line in zip(raw_parts, next_lines)
+    ]
+
+
+def remove_orphan_headings(markdown: str, page_break_placeholder: str) -> str:
+    """Remove headings that end a page but have no content on the next page."""
+    parts = _orphan_free_parts(_split_pages(markdown, page_break_placeholder))
+    return _join_pages(parts, page_break_placeholder)
+
+
+def postprocess_markdown(
+    markdown: str,
+    page_break_placeholder: str,
+    *,
+    remove_image_placeholders: bool = False,
+) -> str:
+    """Run the page-marker, noise, KPI, orphan-heading and axis passes with one page split.
+
+    Same output as chaining the string helpers, without re-splitting the whole
+    document on the placeholder for every pass.
+
+    @example
+    markdown = postprocess_markdown(doc.export_to_markdown(...), "<!-- page break -->")
+    """
+    passes = (
+        ("markers", _visible_page_marker_parts),
+        (
+            "noise",
+            lambda parts: _noise_free_parts(
+                parts, remove_image_placeholders=remove_image_placeholders
+            ),
+        ),
+        ("kpi", _kpi_block_parts),
+        ("orphan", _orphan_free_parts),
+        ("axis", _axis_free_parts),
+    )
+    parts = _split_pages(markdown, page_break_placeholder)
+    for index, (name, page_pass) in enumerate(passes):
+        with stage(f"markdown.{name}") as span:
+            if index:
+                parts = _rejoined(parts)
+            parts = page_pass(parts)
+            span.count("pages", len(parts))
+    return _join_pages(parts, page_break_placeholder)
+
+
+class MarkdownPageStream:
+    """Incremental `postprocess_markdown` for pages that arrive in document order.
+
+    Only a bounded window of pages is held: repeated top-of-page headings are counted
+    over the last `2 * lookahead_pages + 1` pages, and a page-final heading waits at most
+    `lookahead_pages` pages for the next content line (and is kept if none shows up).
+    Documents of up to `lookahead_pages` pages produce exactly `postprocess_markdown`
+    output.
+
+    @example
+    stream = MarkdownPageStream("<!-- page break -->", remove_image_placeholders=True)
+    for window_markdown in rendered_windows:
+        handle.write(stream.push(window_markdown))
+    handle.write(stream.finish())
+    """
+
+    def __init__(
+        self,
+        page_break_placeholder: str,
+        *,
+        remove_image_placeholders: bool = False,
+        lookahead_pages: int = 16,
+        repeated_heading_ratio: float = 0.3,
+        min_repeated_heading_count: int = 3,
+    ) -> None:
+        self.page_break_placeholder = page_break_placeholder
+        self.remove_image_placeholders = remove_image_placeholders
+        self.lookahead_pages = max(lookahead_pages, 1)
+        self.repeated_heading_ratio = repeated_heading_ratio
+        self.min_repeated_heading_count = min_repeated_heading_count
+        self._page_no = 0
+        self._held: str | None = None
+        self._headings: deque[str | None] = deque(maxlen=2 * self.lookahead_pages + 1)
+        self._noise_queue: deque[tuple[str, str | None, bool, bool]] = deque()
+        self._kept_once: set[str] = set()
+        self._orphan_queue: deque[tuple[str, bool, bool]] = deque()
+        self._emitted = 0
+        self._out: list[str] = []
+
+    def push(self, markdown: str) -> str:
+        """Feed rendered Markdown for the next page(s); return text ready to append."""
+        for part in _split_pages(markdown, self.page_break_placeholder):
+            part = _strip_page_markers(part).strip()
+            if not part:
+                continue
+            # WHY: A page's trailing padding depends on whether another page follows,
+            # so each page is held until the next one (or `finish`) arrives.
+            if self._held is not None:
+                self._to_noise(self._held, last=False)
+            self._page_no += 1
+            self._held = f"**[Page {self._page_no}]**\n\n{part}"
+        return self._drain()
+
+    def finish(self) -> str:
+        """Flush every held page; return the remaining text."""
+        if self._held is not None:
+            self._to_noise(self._held, last=True)
+            self._held = None
+        while self._noise_queue:
+            self._noise_step()
+        while self._orphan_queue:
+            self._orphan_step(None)
+        return self._drain()
+
+    def _drain(self) -> str:
+        text = "".join(self._out)
+        self._out.clear()
+        return text
+
+    def _to_noise(self, page: str, *, last: bool) -> None:
+        first = self._page_no == 1
+        page = self._padded(page, first, last)
+        heading = _first_heading(page)
+        self._headings.append(heading)
+        self._noise_queue.append((page, heading, first, last))
+        if len(self._noise_queue) > self.lookahead_pages:
+            self._noise_step()
+
+    def _noise_step(self) -> None:
+        page, heading, first, last = self._noise_queue.popleft()
+        frequent = _frequent_headings(
+            list(self._headings),
+            repeated_heading_ratio=self.repeated_heading_ratio,
+            min_repeated_heading_count=self.min_repeated_heading_count,
+        )
+        page = _noise_free_page(
+            page,
+            heading,
+            frequent,
+            self._kept_once,
+            remove_image_placeholders=self.remove_image_placeholders,
+        )
+        page = _kpi_block_page(self._padded(page, first, last))
+        page = self._padded(page, first, last)
+        line = _first_meaningful_line(page)
+        if line is not None:
+            while self._orphan_queue:
+                self._orphan_step(line)
+        self._orphan_queue.append((page, first, last))
+        if len(self._orphan_queue) > self.lookahead_pages:
+            # WHY: Nothing meaningful within the look-ahead; keep the heading rather
+            # than hold an unbounded run of empty pages.
+            page, first, last = self._orphan_queue.popleft()
+            self._emit(_axis_free_page(self._padded(page, first, last)))
+
+    def _orphan_step(self, next_line: str | None) -> None:
+        # WHY: A page with a meaningful line flushes the queue before joining it, so
+        # only the head can have content and the others share its next line.
+        page, first, last = self._orphan_queue.popleft()
+        page = _orphan_free_page(page, next_line)
+        self._emit(_axis_free_page(self._padded(page, first, last)))
+
+    def _padded(self, page: str, first: bool, last: bool) -> str:
+        if first and last:
+            return page
+        return ("" if first else "\n\n") + page + ("" if last else "\n\n")
+
+    def _emit(self, page: str) -> None:
+        if self._emitted:
+            self._out.append(f"\n\n{self.page_break_placeholder}\n\n")
+        self._out.append(page)
+        self._emitted += 1
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write text via a sibling temp file and rename, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # WHY: A plain open (not mkstemp) keeps the usual umask permissions on the result.
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,284 @@
+"""@fileoverview Single-pass post-processing engine for Docling documents.
+
+Each cleanup used to walk `doc.iterate_items()` on its own (two walks for the picture
+cleanups). The engine walks the tree once, buckets tables/texts/pictures, and feeds each
+bucket to registered fixers in order, recording per-fixer counts and timings.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Sequence
+
+from docling_core.types.doc import TableItem
+from docling_core.types.doc.base import BoundingBox
+from docling_core.types.doc.document import DoclingDocument, PictureItem
+
+from pdf_to_markdown_docling.date_cleanup import (
+    collect_picture_boxes,
+    document_page_heights,
+    is_axis_text_inside_pictures,
+    is_date_text_inside_pictures,
+)
+from pdf_to_markdown_docling.metrics import stage
+from pdf_to_markdown_docling.pdf_resources import PdfResources, borrow_resources
+from pdf_to_markdown_docling.picture_kpi_extract import (
+    attach_picture_caption,
+    collect_picture_kpi_captions,
+)
+from pdf_to_markdown_docling.table_fixes import (
+    clean_table_cells,
+    collapse_table_header_groups,
+    normalize_table_currency_columns,
+    normalize_table_header_text,
+)
+from pdf_to_markdown_docling.whitespace_fix import normalize_item_text_whitespace
+
+ITEM_KINDS = ("table", "text", "picture")
+
+
+@dataclass
+class FixContext:
+    """Items bucketed by one tree walk plus shared lookups for fixers."""
+
+    doc: DoclingDocument
+    pdf_path: Optional[Path]
+    tables: list[TableItem]
+    texts: list[object]
+    pictures: list[PictureItem]
+    pictures_by_page: dict[int, list[BoundingBox]]
+    page_heights: dict[int, float]
+    resources: Optional[PdfResources] = None
+    state: dict[str, object] = field(default_factory=dict)
+    _removed: set[int] = field(default_factory=set)
+    _pending_removals: list[object] = field(default_factory=list)
+
+    def items(self, kind: str) -> Iterator[object]:
+        bucket = {"table": self.tables, "text": self.texts, "picture": self.pictures}[kind]
+        for item in bucket:
+            if id(item) not in self._removed:
+                yield item
+
+    def remove(self, item: object) -> None:
+        """Schedule an item for deletion; later fixers no longer see it."""
+        self._removed.add(id(item))
+        self._pending_removals.append(item)
+
+    def flush_removals(self) -> None:
+        # WHY: One delete_items call per fixer, like the standalone cleanups did.
+        if self._pending_removals:
+            self.doc.delete_items(node_items=self._pending_removals)
+            self._pending_removals = []
+
+
+@dataclass(frozen=True)
+class ItemFixer:
+    """A post-processing plug-in applied to every item of one kind.
+
+    `fix` returns how many changes it made to the item; `prepare`/`finish` run once
+    around the item loop (e.g. to open resources).
+    """
+
+    name: str
+    kind: str
+    fix: Callable[[object, FixContext], int]
+    prepare: Optional[Callable[[FixContext], None]] = None
+    finish: Optional[Callable[[FixContext], None]] = None
+
+
+@dataclass(frozen=True)
+class FixReport:
+    counts: dict[str, int]
+    timings: dict[str, float]
+    walk_seconds: float
+
+    def count(self, name: str) -> int:
+        return self.counts.get(name, 0)
+
+
+def build_fix_context(
+    doc: DoclingDocument,
+    pdf_path: Optional[Path] = None,
+    resources: Optional[PdfResources] = None,
+) -> FixContext:
+    """Walk the document once and bucket the items fixers dispatch on."""
+    tables: list[TableItem] = []
+    texts: list[object] = []
+    pictures: list[PictureItem] = []
+    for item, _level in doc.iterate_items():
+        if isinstance(item, TableItem):
+            tables.append(item)
+        elif isinstance(item, PictureItem):
+            pictures.append(item)
+        elif getattr(item, "text", None) is not None:
+            texts.append(item)
+    return FixContext(
+        doc=doc,
+        pdf_path=pdf_path,
+        tables=tables,
+        texts=texts,
+        pictures=pictures,
+        pictures_by_page=collect_picture_boxes(pictures),
+        page_heights=document_page_heights(doc),
+        resources=resources,
+    )
+
+
+def run_fix_pipeline(
+    doc: DoclingDocument,
+    fixers: Sequence[ItemFixer],
+    *,
+    pdf_path: Optional[Path] = None,
+    resources: Optional[PdfResources] = None,
+) -> FixReport:
+    """Apply fixers in order over a single walk of the document.
+
+    @param resources - The document's shared PDF handle and page cache, reused by
+        fixers that read the PDF; None lets them open `pdf_path` themselves.
+
+    @example
+    report = run_fix_pipeline(doc, default_fixers(kpi_ocr=False))
+    print(format_fix_report(report))
+    """
+    started = time.perf_counter()
+    with stage("fix.walk"):
+        context = build_fix_context(doc, pdf_path, resources)
+    walk_seconds = time.perf_counter() - started
+
+    counts: dict[str, int] = {}
+    timings: dict[str, float] = {}
+    for fixer in fixers:
+        if fixer.kind not in ITEM_KINDS:
+            raise ValueError(f"Unknown fixer kind for {fixer.name}: {fixer.kind}")
+        fixer_started = time.perf_counter()
+        with stage(f"fix.{fixer.name}", kind=fixer.kind) as span:
+            if fixer.prepare is not None:
+                fixer.prepare(context)
+            try:
+                count = 0
+                for item in context.items(fixer.kind):
+                    count += fixer.fix(item, context)
+            finally:
+                if fixer.finish is not None:
+                    fixer.finish(context)
+            context.flush_removals()
+            span.count("changed", count)
+        counts[fixer.name] = counts.get(fixer.name, 0) + count
+        timings[fixer.name] = timings.get(fixer.name, 0.0) + (
+            time.perf_counter() - fixer_started
+        )
+    return FixReport(counts=counts, timings=timings, walk_seconds=walk_seconds)
+
+
+def format_fix_report(report: FixReport) -> str:
+    """Render per-fixer counts and timings on one line."""
+    parts = [
+        f"{name}={report.counts[name]} ({report.timings[name] * 1000:.1f}ms)"
+        for name in report.counts
+    ]
+    return f"Fix pass (walk {report.walk_seconds * 1000:.1f}ms): " + ", ".join(parts)
+
+
+def _remove_if(predicate: Callable[[object, FixContext], bool]) -> Callable[[object, FixContext], int]:
+    def fix(item: object, context: FixContext) -> int:
+        if not context.pictures_by_page or not predicate(item, context):
+            return 0
+        context.remove(item)
+        return 1
+
+    return fix
+
+
+def _date_inside_picture(item: object, context: FixContext) -> bool:
+    return is_date_text_inside_pictures(item, context.pictures_by_page, context.page_heights)
+
+
+def _axis_inside_picture(item: object, context: FixContext) -> bool:
+    return is_axis_text_inside_pictures(item, context.pictures_by_page, context.page_heights)
+
+
+def _kpi_prepare(max_added: int, ocr_workers: Optional[int]) -> Callable[[FixContext], None]:
+    def prepare(context: FixContext) -> None:
+        # WHY: Dedupe against the text left after table fixes and removals, as before.
+        doc_text = context.doc.export_to_text().casefold()
+        # WHY: Captions are gathered up front so every picture needing OCR shares one
+        # batched tesseract pass instead of a subprocess per picture.
+        with borrow_resources(context.resources, context.pdf_path) as resources:
+            captions = collect_picture_kpi_captions(
+                context.doc,
+                list(context.items("picture")),
+                resources,
+                doc_text,
+                max_captions=max_added,
+                ocr_workers=ocr_workers,
+            )
+        context.state["kpi_captions"] = {id(item): caption for item, caption in captions}
+
+    return prepare
+
+
+def _kpi_finish(context: FixContext) -> None:
+    context.state.pop("kpi_captions", None)
+
+
+def _kpi_caption_fixer(item: object, context: FixContext) -> int:
+    caption = context.state["kpi_captions"].get(id(item))
+    if caption is None:
+        return 0
+    # WHY: The caption did not exist when the document was bucketed; later text fixers
+    # (whitespace normalization) must still see it, as they did after the old KPI pass.
+    context.texts.append(attach_picture_caption(context.doc, item, caption))
+    return 1
+
+
+def default_fixers(
+    *,
+    kpi_ocr: bool,
+    max_kpi_captions: int = 30,
+    kpi_ocr_workers: Optional[int] = None,
+) -> list[ItemFixer]:
+    """The standard cleanup chain run after conversion and repairs, in order.
+
+    @param kpi_ocr_workers - Concurrent tesseract processes for picture KPI OCR
+        (default: KPI_OCR_WORKERS or up to 4).
+    """
+    fixers = [
+        ItemFixer(
+            "collapsed_tables",
+            "table",
+            lambda table, _context: int(collapse_table_header_groups(table)),
+        ),
+        ItemFixer(
+            "normalized_headers",
+            "table",
+            lambda table, _context: normalize_table_header_text(table),
+        ),
+        ItemFixer("cleaned_cells", "table", lambda table, _context: clean_table_cells(table)),
+        ItemFixer(
+            "normalized_currencies",
+            "table",
+            lambda table, _context: normalize_table_currency_columns(table),
+        ),
+        ItemFixer("removed_dates", "text", _remove_if(_date_inside_picture)),
+        ItemFixer("removed_axis_text", "text", _remove_if(_axis_inside_picture)),
+    ]
+    if kpi_ocr and max_kpi_captions > 0:
+        fixers.append(
+            ItemFixer(
+                "added_kpis",
+                "picture",
+                _kpi_caption_fixer,
+                prepare=_kpi_prepare(max_kpi_captions, kpi_ocr_workers),
+                finish=_kpi_finish,
+            )
+        )
+    fixers.append(
+        ItemFixer(
+            "normalized_text",
+            "text",
+            lambda item, _context: normalize_item_text_whitespace(item),
+        )
+    )
+    return fixers
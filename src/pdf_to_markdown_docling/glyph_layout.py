@@ -0,0 +1,237 @@
+"""@fileoverview Vectorized line grouping and word-gap clustering for glyph reconstruction.
+
+Glyph (or word) boxes live in a NumPy struct array with the text in a parallel list, so
+the spacing fixers reconstruct every clip of a page in one batched call: boxes are
+grouped into lines, gaps measured and split into kerning vs word breaks by a 1-D
+2-means per line, with no per-glyph Python work beyond joining the final strings.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+
+GLYPH_DTYPE = np.dtype(
+    [
+        ("x0", "f8"),
+        ("y0", "f8"),
+        ("x1", "f8"),
+        ("y1", "f8"),
+        ("length", "i4"),
+        ("space", "?"),
+    ]
+)
+_KMEANS_ITERATIONS = 8
+_KMEANS_TOLERANCE = 1e-3
+
+
+def glyph_array(
+    glyphs: Iterable[tuple[str, float, float, float, float]],
+) -> tuple[np.ndarray, list[str]]:
+    """Pack (text, x0, y0, x1, y1) boxes in top-left coordinates into a struct array.
+
+    @example
+    boxes, texts = glyph_array([("V", 10, 5, 16, 15), ("e", 16.5, 5, 22, 15)])
+    """
+    rows = list(glyphs)
+    boxes = np.empty(len(rows), dtype=GLYPH_DTYPE)
+    if not rows:
+        return boxes, []
+    texts, x0, y0, x1, y1 = zip(*rows)
+    # WHY: Filling whole columns is several times faster than a list of struct tuples.
+    boxes["x0"], boxes["y0"], boxes["x1"], boxes["y1"] = x0, y0, x1, y1
+    boxes["length"] = [len(text) for text in texts]
+    boxes["space"] = [text.isspace() for text in texts]
+    return boxes, list(texts)
+
+
+def _grouped_median(
+    values: np.ndarray, groups: np.ndarray, n_groups: int, default: float
+) -> np.ndarray:
+    """Median of `values` per group id (like `statistics.median`); `default` if empty."""
+    counts = np.bincount(groups, minlength=n_groups)
+    medians = np.full(n_groups, default, dtype=np.float64)
+    if not len(values):
+        return medians
+    ordered = values[np.lexsort((values, groups))]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    low = (starts + (counts - 1) // 2)[present]
+    high = (starts + counts // 2)[present]
+    medians[present] = (ordered[low] + ordered[high]) / 2
+    return medians
+
+
+def _gap_thresholds(
+    gaps: np.ndarray,
+    gap_lines: np.ndarray,
+    n_lines: int,
+    median_char_widths: np.ndarray,
+    fallback_ratio: float,
+) -> np.ndarray:
+    """Word-break threshold per line from a 1-D 2-means over that line's gaps."""
+    # WHY: Clustering gaps separates intra-word kerning from actual word breaks.
+    fallback = median_char_widths * fallback_ratio
+    counts = np.bincount(gap_lines, minlength=n_lines)
+    clustered = counts >= 2
+    if not clustered.any():
+        return fallback
+
+    c1 = np.full(n_lines, np.inf)
+    c2 = np.full(n_lines, -np.inf)
+    np.minimum.at(c1, gap_lines, gaps)
+    np.maximum.at(c2, gap_lines, gaps)
+    c1[counts == 0] = 0.0
+    c2[counts == 0] = 0.0
+    has1 = np.zeros(n_lines, dtype=bool)
+    has2 = np.zeros(n_lines, dtype=bool)
+    active = clustered.copy()
+    for _ in range(_KMEANS_ITERATIONS):
+        in1 = np.abs(gaps - c1[gap_lines]) <= np.abs(gaps - c2[gap_lines])
+        n1 = np.bincount(gap_lines, weights=in1, minlength=n_lines)
+        n2 = counts - n1
+        sum1 = np.bincount(gap_lines, weights=np.where(in1, gaps, 0.0), minlength=n_lines)
+        sum2 = np.bincount(gap_lines, weights=np.where(in1, 0.0, gaps), minlength=n_lines)
+        new1 = np.where(n1 > 0, sum1 / np.maximum(n1, 1), c1)
+        new2 = np.where(n2 > 0, sum2 / np.maximum(n2, 1), c2)
+        has1 = np.where(active, n1 > 0, has1)
+        has2 = np.where(active, n2 > 0, has2)
+        # WHY: A converged line keeps the centers its final assignment was made with.
+        moving = active & (
+            (np.abs(new1 - c1) >= _KMEANS_TOLERANCE) | (np.abs(new2 - c2) >= _KMEANS_TOLERANCE)
+        )
+        c1 = np.where(moving, new1, c1)
+        c2 = np.where(moving, new2, c2)
+        active = moving
+        if not active.any():
+            break
+
+    separated = (
+        clustered & has1 & has2 & (np.abs(c2 - c1) >= median_char_widths * 0.3)
+    )
+    return np.where(separated, (c1 + c2) / 2, fallback)
+
+
+def _line_starts(
+    y_center: np.ndarray, segments: np.ndarray, bounds: np.ndarray, tol: np.ndarray
+) -> np.ndarray:
+    """Flag the first box of every line; a line spans boxes within `tol` of its first box."""
+    starts = bounds[:-1]
+    ends = bounds[1:]
+    flags = np.zeros(len(y_center), dtype=bool)
+    flags[starts] = True
+    anchors = starts.copy()
+    active = np.ones(len(starts), dtype=bool)
+    while True:
+        # WHY: Boxes are sorted by center within each clip, so the boxes beyond the
+        # current line form a suffix and the next line starts at end - len(suffix).
+        beyond = (y_center - y_center[anchors][segments]) > tol[segments]
+        following = ends - np.add.reduceat(beyond, starts, dtype=np.intp)
+        active &= following < ends
+        if not active.any():
+            return flags
+        flags[following[active]] = True
+        anchors = np.where(active, following, anchors)
+
+
+def reconstruct_runs(
+    glyphs: np.ndarray,
+    texts: Sequence[str],
+    bounds: Sequence[int],
+    *,
+    gap_ratio: float,
+    line_ratio: float,
+    space_width_ratio: float = 0.0,
+    word_boxes: bool = False,
+) -> list[str]:
+    """Rebuild the text of every clip `glyphs[bounds[i]:bounds[i + 1]]` in one pass.
+
+    Boxes are grouped into lines by vertical center, ordered left to right and joined
+    with a space where the gap beats the line's clustered threshold, or where a
+    whitespace glyph at least `space_width_ratio` median glyphs wide sat between them.
+    With `word_boxes` the boxes are words and the median width is per character.
+
+    @example
+    boxes, texts = glyph_array(chars)
+    [cell_text] = reconstruct_runs(boxes, texts, [0, len(texts)], gap_ratio=0.35,
+                                   line_ratio=0.6, space_width_ratio=0.6)
+    """
+    bounds = np.asarray(bounds, dtype=np.intp)
+    results = [""] * (len(bounds) - 1)
+    counts = np.diff(bounds)
+    filled = np.flatnonzero(counts > 0)
+    if not len(filled):
+        return results
+    # WHY: Empty clips would break reduceat; they stay "" and the rest are renumbered.
+    glyphs = np.concatenate([glyphs[bounds[i] : bounds[i + 1]] for i in filled])
+    texts = [text for i in filled for text in texts[bounds[i] : bounds[i + 1]]]
+    counts = counts[filled]
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    segments = np.repeat(np.arange(len(filled)), counts)
+
+    x0 = glyphs["x0"]
+    y_center = (glyphs["y0"] + glyphs["y1"]) / 2
+    heights = glyphs["y1"] - glyphs["y0"]
+    tol = _grouped_median(heights, segments, len(filled), 1.0) * line_ratio
+
+    order = np.lexsort((x0, y_center, segments))
+    line_flags = _line_starts(y_center[order], segments[order], bounds, tol)
+    lines = np.cumsum(line_flags) - 1
+    n_lines = int(lines[-1]) + 1
+    order = order[np.lexsort((x0[order], lines))]
+    glyphs = glyphs[order]
+    line_segments = segments[order][line_flags]
+
+    x0 = glyphs["x0"]
+    x1 = glyphs["x1"]
+    widths = x1 - x0
+    space = glyphs["space"]
+    if word_boxes:
+        char_widths = widths / np.maximum(glyphs["length"], 1)
+        median_widths = _grouped_median(char_widths, lines, n_lines, 1.0)
+    else:
+        median_widths = _grouped_median(widths[~space], lines[~space], n_lines, 1.0)
+
+    gaps = x0[1:] - x1[:-1]
+    in_line = (lines[1:] == lines[:-1]) & (gaps >= 0)
+    thresholds = _gap_thresholds(
+        gaps[in_line], lines[1:][in_line], n_lines, median_widths, gap_ratio
+    )
+
+    # WHY: Whitespace glyphs since the previous visible glyph (or the line start) form
+    # a group with the next visible glyph; the widest one decides the explicit space.
+    group_flags = np.concatenate(([True], ~space[:-1])) | (lines != np.roll(lines, 1))
+    groups = np.cumsum(group_flags) - 1
+    group_starts = np.flatnonzero(group_flags)
+    group_spaces = np.add.reduceat(space, group_starts) > 0
+    group_space_width = np.maximum.reduceat(np.where(space, widths, 0.0), group_starts)
+
+    visible = np.flatnonzero(~space)
+    visible_lines = lines[visible]
+    visible_groups = groups[visible]
+    pending = group_spaces[visible_groups]
+    wide_space = group_space_width[visible_groups] >= (
+        median_widths[visible_lines] * space_width_ratio
+    )
+    previous = np.concatenate(([False], visible_lines[1:] == visible_lines[:-1]))
+    gap_before = np.zeros(len(visible))
+    gap_before[1:] = x0[visible[1:]] - x1[visible[:-1]]
+    separated = np.where(
+        pending, wide_space, previous & (gap_before > thresholds[visible_lines])
+    )
+
+    ordered_texts = [texts[i] for i in order[visible].tolist()]
+    pieces = [
+        " " + text if split else text
+        for text, split in zip(ordered_texts, separated.tolist())
+    ]
+    line_texts: list[list[str]] = [[] for _ in range(len(filled))]
+    line_bounds = np.searchsorted(visible_lines, np.arange(n_lines + 1)).tolist()
+    for line, segment in enumerate(line_segments.tolist()):
+        text = "".join(pieces[line_bounds[line] : line_bounds[line + 1]]).strip()
+        if text:
+            line_texts[segment].append(text)
+    for segment, original in enumerate(filled.tolist()):
+        results[original] = " ".join(line_texts[segment]).strip()
+    return results
@@ -0,0 +1,227 @@
+"""@fileoverview Per-stage wall/CPU timings and counters for conversions.
+
+Pipeline code wraps its stages in `stage(...)`; the spans land in the collector opened
+by `collect_metrics()` for the current context. Without one, `stage` costs a context
+lookup and records nothing, so library calls stay uninstrumented unless the CLI asks
+for `--metrics-json`. Nested stages form a span tree in the OpenTelemetry layout
+(trace/span/parent ids, unix-nano timestamps, attributes), and are mirrored to the
+OpenTelemetry API when it is installed. Worker processes record into their own
+collector (`worker_metrics`) and ship the spans back with their result, where
+`merge_worker_spans` adds them to the parent's report.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+try:
+    from opentelemetry import trace as _otel_trace
+except ImportError:  # WHY: Optional; spans still land in the JSON report without it.
+    _otel_trace = None
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    end_ns: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    counts: dict[str, int] = field(default_factory=dict)
+    attributes: dict[str, object] = field(default_factory=dict)
+
+    def count(self, key: str, amount: int = 1) -> None:
+        """Add to a named counter on this stage (e.g. items changed)."""
+        self.counts[key] = self.counts.get(key, 0) + int(amount)
+
+    def set(self, **attributes: object) -> None:
+        """Attach attributes learned while the stage ran (e.g. cache hit, backend)."""
+        self.attributes.update(attributes)
+
+    def to_dict(self, trace_id: str) -> dict[str, object]:
+        return {
+            "name": self.name,
+            "trace_id": trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "counts": dict(self.counts),
+            "attributes": dict(self.attributes),
+        }
+
+
+class _NullSpan:
+    def count(self, key: str, amount: int = 1) -> None:
+        return None
+
+    def set(self, **attributes: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class StageMetrics:
+    """Spans recorded for one run, summarised per stage name for the JSON report."""
+
+    def __init__(self) -> None:
+        self.trace_id = uuid.uuid4().hex
+        self.spans: list[Span] = []
+
+    def summary(self) -> dict[str, dict[str, object]]:
+        """Aggregate calls, wall/CPU seconds and counters by stage name, in first-seen order."""
+        stages: dict[str, dict[str, object]] = {}
+        for span in self.spans:
+            entry = stages.setdefault(
+                span.name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "counts": {}}
+            )
+            entry["calls"] += 1
+            entry["wall_seconds"] += span.wall_seconds
+            entry["cpu_seconds"] += span.cpu_seconds
+            for key, value in span.counts.items():
+                entry["counts"][key] = entry["counts"].get(key, 0) + value
+        for entry in stages.values():
+            entry["wall_seconds"] = round(entry["wall_seconds"], 6)
+            entry["cpu_seconds"] = round(entry["cpu_seconds"], 6)
+        return stages
+
+    def to_dict(self) -> dict[str, object]:
+        ordered = sorted(self.spans, key=lambda span: span.start_ns)
+        return {
+            "trace_id": self.trace_id,
+            "stages": self.summary(),
+            "spans": [span.to_dict(self.trace_id) for span in ordered],
+        }
+
+    def write_json(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+
+_ACTIVE: ContextVar[Optional[StageMetrics]] = ContextVar("stage_metrics", default=None)
+_PARENT: ContextVar[Optional[Span]] = ContextVar("stage_parent", default=None)
+
+
+@contextmanager
+def collect_metrics() -> Iterator[StageMetrics]:
+    """Record every `stage` entered in this context (and nested calls) into a new report.
+
+    @example
+    with collect_metrics() as metrics:
+        convert_pdf_to_markdown(...)
+    metrics.write_json(Path("report.metrics.json"))
+    """
+    metrics = StageMetrics()
+    token = _ACTIVE.set(metrics)
+    parent_token = _PARENT.set(None)
+    try:
+        yield metrics
+    finally:
+        _PARENT.reset(parent_token)
+        _ACTIVE.reset(token)
+
+
+@contextmanager
+def stage(name: str, **attributes: object) -> Iterator[Span | _NullSpan]:
+    """Time a pipeline stage (wall and process CPU) and collect its counters.
+
+    @example
+    with stage("spacing_fix", method="pymupdf") as span:
+        report = fix_spaced_items_with_pymupdf_glyphs(doc, pdf_path)
+        span.count("text_items", report.text_items)
+    """
+    metrics = _ACTIVE.get()
+    if metrics is None:
+        yield _NULL_SPAN
+        return
+
+    parent = _PARENT.get()
+    span = Span(
+        name=name,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=parent.span_id if parent is not None else None,
+        start_ns=time.time_ns(),
+        attributes=dict(attributes),
+    )
+    token = _PARENT.set(span)
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    otel_span = (
+        _otel_trace.get_tracer(__name__).start_as_current_span(name)
+        if _otel_trace is not None
+        else None
+    )
+    live = otel_span.__enter__() if otel_span is not None else None
+    exc_info: tuple[object, object, object] = (None, None, None)
+    try:
+        yield span
+    except BaseException as exc:
+        span.set(error=f"{type(exc).__name__}: {exc}")
+        # WHY: The OpenTelemetry span records the exception and marks itself as failed.
+        exc_info = (type(exc), exc, exc.__traceback__)
+        raise
+    finally:
+        span.wall_seconds = time.perf_counter() - wall_started
+        span.cpu_seconds = time.process_time() - cpu_started
+        span.end_ns = time.time_ns()
+        _PARENT.reset(token)
+        metrics.spans.append(span)
+        if otel_span is not None:
+            for key, value in {**span.attributes, **span.counts}.items():
+                if not isinstance(value, (bool, int, float, str)):
+                    value = str(value)
+                live.set_attribute(key, value)
+            otel_span.__exit__(*exc_info)
+
+
+def metrics_enabled() -> bool:
+    """Whether stages in this context are recorded, e.g. to tell worker processes to record."""
+    return _ACTIVE.get() is not None
+
+
+@contextmanager
+def worker_metrics(enabled: bool) -> Iterator[list[Span]]:
+    """Record the stages of a worker-process task into a list returned with its result.
+
+    Context variables do not cross process boundaries, so the parent passes
+    `metrics_enabled()` along with the task and merges the spans it gets back.
+
+    @example
+    def work(job, record):
+        with worker_metrics(record) as spans:
+            result = run(job)
+        return result, spans
+    """
+    if not enabled:
+        yield []
+        return
+    with collect_metrics() as metrics:
+        yield metrics.spans
+
+
+def merge_worker_spans(spans: Iterable[Span]) -> None:
+    """Add spans recorded by `worker_metrics` to this context's report.
+
+    The worker's top-level spans are re-parented under the stage open here, so they
+    sit in one tree with the parent's own stages.
+    """
+    metrics = _ACTIVE.get()
+    if metrics is None:
+        return
+    parent = _PARENT.get()
+    for span in spans:
+        if span.parent_id is None and parent is not None:
+            span.parent_id = parent.span_id
+        metrics.spans.append(span)
@@ -0,0 +1,156 @@
+"""@fileoverview Document-scoped PDF handles and a bounded page cache shared by the fixers.
+
+The spacing fixers and the picture KPI pass each used to open the PDF on their own (and
+the docling-parse fixer loaded it a second time). One `PdfResources` per document opens
+each parser once, optionally from a single memory-mapped buffer, and keeps loaded pages
+and per-page text indexes in a bounded LRU so later fixers reuse earlier extraction.
+"""
+
+from __future__ import annotations
+
+import io
+import mmap
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar
+
+import fitz
+from docling_parse.pdf_parser import DoclingPdfParser, PdfDocument
+
+DEFAULT_PAGE_CACHE_SIZE = 32
+
+T = TypeVar("T")
+
+
+class PdfResources:
+    """One PDF opened once per document, with loaded pages kept in a bounded LRU.
+
+    Both parsers open lazily on first use, so a document whose fixers never touch the
+    PDF costs nothing. Close it (or use it as a context manager) when the document is
+    done; pages and indexes handed out before that must not be used afterwards.
+
+    @example
+    with PdfResources(pdf_path, memory_map=True) as resources:
+        fix_spaced_items_with_pymupdf_glyphs(doc, pdf_path, resources=resources)
+        add_picture_kpi_captions(doc, pdf_path, resources=resources)
+    """
+
+    def __init__(
+        self,
+        pdf_path: Optional[Path] = None,
+        *,
+        memory_map: bool = False,
+        page_cache_size: int = DEFAULT_PAGE_CACHE_SIZE,
+        data: Optional[bytes] = None,
+    ) -> None:
+        if pdf_path is None and data is None:
+            raise ValueError("PdfResources needs a pdf_path or data.")
+        self.pdf_path = pdf_path
+        self._memory_map = memory_map and data is None
+        self._data: Optional[bytes | memoryview] = data
+        self._mapping: Optional[mmap.mmap] = None
+        self._pdf: Optional[fitz.Document] = None
+        self._parsed: Optional[PdfDocument] = None
+        self._cache_size = max(1, page_cache_size)
+        self._cache: OrderedDict[tuple[str, int], object] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, *, page_cache_size: int = DEFAULT_PAGE_CACHE_SIZE
+    ) -> PdfResources:
+        """Resources over an in-memory PDF (e.g. an upload or a generated document)."""
+        return cls(data=data, page_cache_size=page_cache_size)
+
+    def __enter__(self) -> PdfResources:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def _buffer(self) -> Optional[bytes | memoryview]:
+        if self._data is None and self._memory_map:
+            with open(self.pdf_path, "rb") as handle:
+                self._mapping = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            # WHY: PyMuPDF reads straight from the mapping; a view avoids copying the file.
+            self._data = memoryview(self._mapping)
+        return self._data
+
+    @property
+    def pdf(self) -> fitz.Document:
+        """The PyMuPDF document, opened on first access."""
+        if self._pdf is None:
+            data = self._buffer()
+            if data is None:
+                self._pdf = fitz.open(self.pdf_path)
+            else:
+                self._pdf = fitz.open(stream=data, filetype="pdf")
+        return self._pdf
+
+    @property
+    def parsed_pdf(self) -> PdfDocument:
+        """The docling-parse document, loaded on first access from the same buffer."""
+        if self._parsed is None:
+            data = self._buffer()
+            source = str(self.pdf_path) if data is None else io.BytesIO(data)
+            self._parsed = DoclingPdfParser(loglevel="fatal").load(path_or_stream=source)
+        return self._parsed
+
+    @property
+    def page_count(self) -> int:
+        return self.pdf.page_count
+
+    def page(self, page_no: int) -> fitz.Page:
+        """1-based page, loaded once while it stays in the cache."""
+        return self._cached(("page", page_no), lambda: self.pdf.load_page(page_no - 1))
+
+    def page_resource(self, page_no: int, kind: str, build: Callable[[fitz.Page], T]) -> T:
+        """Object derived from a page (e.g. a glyph index), built once while cached.
+
+        @param kind - Cache namespace; every caller building the same object must agree.
+        """
+        # WHY: Derived objects outlive the page they were built from, so the page itself
+        # is not cached alongside them and does not take a second slot.
+        return self._cached((kind, page_no), lambda: build(self.pdf.load_page(page_no - 1)))
+
+    def _cached(self, key: tuple[str, int], load: Callable[[], T]) -> T:
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return self._cache[key]
+        self.misses += 1
+        value = load()
+        self._cache[key] = value
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+    def close(self) -> None:
+        """Drop cached pages and close both parsers and the mapping."""
+        self._cache.clear()
+        if self._pdf is not None:
+            self._pdf.close()
+            self._pdf = None
+        if self._parsed is not None:
+            self._parsed.unload()
+            self._parsed = None
+        if self._mapping is not None:
+            # WHY: The mapping cannot close while the view exported from it is alive.
+            self._data.release()
+            self._data = None
+            self._mapping.close()
+            self._mapping = None
+
+
+@contextmanager
+def borrow_resources(
+    resources: Optional[PdfResources], pdf_path: Path
+) -> Iterator[PdfResources]:
+    """Yield the caller's shared resources, or open (and close) private ones for `pdf_path`."""
+    if resources is not None:
+        yield resources
+        return
+    with PdfResources(pdf_path) as owned:
+        yield owned
@@ -3,23 +3,27 @@
 from __future__ import annotations
 
 import re
-import shutil
-import subprocess
-import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
 import fitz
 
 from docling_core.types.doc.base import BoundingBox, CoordOrigin
 from docling_core.types.doc.document import DoclingDocument
 from docling_core.types.doc.labels import DocItemLabel
-from docling_core.types.doc import PictureItem
+from docling_core.types.doc import PictureItem, TextItem
 
+from pdf_to_markdown_docling.kpi_ocr import (
+    DEFAULT_OCR_BATCH_SIZE,
+    available_tesseract_lang,
+    ocr_images,
+    render_crop,
+)
+from pdf_to_markdown_docling.pdf_resources import PdfResources, borrow_resources
+from pdf_to_markdown_docling.pymupdf_spacing_fix import PageGlyphIndex, page_glyph_index
 from pdf_to_markdown_docling.text_normalize import normalize_ligatures, normalize_mojibake_text
 
 
-_TEXT_FLAGS = fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE
 _NUM_TOKEN = re.compile(r"\d{1,3}(?:[.,]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?")
 _CURRENCY_TOKEN = re.compile(r"\b(?:RON|EUR|USD|LEI)\b", flags=re.IGNORECASE)
 _PERCENT_TOKEN = re.compile(r"%")
@@ -28,7 +32,6 @@ _KEYWORD_TOKEN = re.compile(
     r"\b(?:profit\w*|cifr\w*|venit\w*|active\w*|ebitda\w*|marj\w*|rezultat\w*|capital\w*)\b",
     flags=re.IGNORECASE,
 )
-_TESS_LANG_CACHE: Optional[str] = None
 
 
 def _bbox_to_top_left(bbox: BoundingBox, page_height: Optional[float]) -> BoundingBox:
@@ -37,25 +40,26 @@ def _bbox_to_top_left(bbox: BoundingBox, page_height: Optional[float]) -> Boundi
     return bbox.to_top_left_origin(page_height)
 
 
-def _clip_rect(page: fitz.Page, bbox: BoundingBox, pad: float) -> Optional[fitz.Rect]:
+def _clip_rect(page_rect: fitz.Rect, bbox: BoundingBox, pad: float) -> Optional[fitz.Rect]:
     rect = fitz.Rect(bbox.l, bbox.t, bbox.r, bbox.b)
     rect = fitz.Rect(rect.x0 - pad, rect.y0 - pad, rect.x1 + pad, rect.y1 + pad)
-    rect = rect & page.rect
+    rect = rect & page_rect
     if rect.is_empty:
         return None
     return rect
 
 
-def _extract_picture_text(page: fitz.Page, bbox: BoundingBox) -> str:
-    clip = _clip_rect(page, bbox, pad=2.0)
+def _extract_picture_text(index: PageGlyphIndex, bbox: BoundingBox) -> str:
+    clip = _clip_rect(index.rect, bbox, pad=2.0)
     if clip is None:
         return ""
-    words = page.get_text("words", clip=clip, flags=_TEXT_FLAGS)
+    # WHY: The page's glyph index answers like clipped "words" extraction and is shared
+    # with the spacing fixer, so a page both passes read is only parsed once.
+    words = index.words(clip)
     if not words:
         return ""
     lines: dict[tuple[int, int], list[tuple[int, str]]] = {}
-    for word in words:
-        _x0, _y0, _x1, _y1, text, block_no, line_no, word_no = word
+    for text, block_no, line_no, word_no in words:
         if not text:
             continue
         lines.setdefault((block_no, line_no), []).append((word_no, text))
@@ -69,54 +73,14 @@ def _extract_picture_text(page: fitz.Page, bbox: BoundingBox) -> str:
     return "\n".join(out_lines).strip()
 
 
-def _available_tesseract_lang() -> Optional[str]:
-    global _TESS_LANG_CACHE
-    if _TESS_LANG_CACHE is not None:
-        return _TESS_LANG_CACHE
-    if shutil.which("tesseract") is None:
-        _TESS_LANG_CACHE = ""
-        return None
-    try:
-        result = subprocess.run(
-            ["tesseract", "--list-langs"],
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-    except (OSError, subprocess.CalledProcessError):
-        _TESS_LANG_CACHE = ""
-        return None
-    langs = {line.strip() for line in result.stdout.splitlines() if line.strip()}
-    if "ron" in langs and "eng" in langs:
-        _TESS_LANG_CACHE = "ron+eng"
-    elif "ron" in langs:
-        _TESS_LANG_CACHE = "ron"
-    elif "eng" in langs:
-        _TESS_LANG_CACHE = "eng"
-    else:
-        _TESS_LANG_CACHE = ""
-    return _TESS_LANG_CACHE or None
-
-
 def _ocr_picture_text(page: fitz.Page, bbox: BoundingBox) -> str:
-    lang = _available_tesseract_lang()
+    lang = available_tesseract_lang()
     if not lang:
         return ""
-    clip = _clip_rect(page, bbox, pad=2.0)
+    clip = _clip_rect(page.rect, bbox, pad=2.0)
     if clip is None:
         return ""
-    pix = page.get_pixmap(clip=clip, dpi=300)
-    with tempfile.TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir) / "kpi.png"
-        pix.save(str(temp_path))
-        result = subprocess.run(
-            ["tesseract", str(temp_path), "stdout", "-l", lang, "--psm", "6"],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            return ""
-        return result.stdout.strip()
+    return ocr_images([render_crop(page, clip)], lang=lang, workers=1)[0]
 
 
 def _normalize_kpi_caption(text: str) -> str:
@@ -193,58 +157,177 @@ def _is_kpi_text(text: str) -> bool:
     return True
 
 
+def _picture_region(
+    doc: DoclingDocument, item: PictureItem, resources: PdfResources
+) -> Optional[tuple[int, BoundingBox]]:
+    if item.captions:
+        return None
+    if not item.prov:
+        return None
+    prov = item.prov[0]
+    if prov.page_no is None or prov.bbox is None:
+        return None
+    if prov.page_no < 1 or prov.page_no > resources.page_count:
+        return None
+    page_height = doc.pages[prov.page_no].size.height if prov.page_no in doc.pages and doc.pages[prov.page_no].size else None
+    return prov.page_no, _bbox_to_top_left(prov.bbox, page_height)
+
+
+def _clean_kpi_text(raw: str) -> str:
+    return _normalize_kpi_caption(normalize_ligatures(normalize_mojibake_text(raw)))
+
+
+def _text_layer_kpi(index: PageGlyphIndex, bbox: BoundingBox) -> Optional[str]:
+    raw = _extract_picture_text(index, bbox)
+    if raw:
+        raw = _clean_kpi_text(raw)
+    return raw if raw and _is_kpi_text(raw) else None
+
+
+def _ocr_kpi(ocr_raw: str) -> Optional[str]:
+    if not ocr_raw:
+        return None
+    ocr_raw = _clean_kpi_text(ocr_raw)
+    return ocr_raw if _is_kpi_text(ocr_raw) else None
+
+
+def _unless_in_document(caption: str, doc_text: str) -> Optional[str]:
+    normalized = caption.casefold()
+    if normalized and normalized in doc_text:
+        return None
+    return caption
+
+
+def extract_picture_kpi_caption(
+    doc: DoclingDocument,
+    item: PictureItem,
+    resources: PdfResources,
+    doc_text: str,
+) -> Optional[str]:
+    """Return a KPI caption for an uncaptioned picture, or None if nothing new is found.
+
+    @param doc_text - Casefolded document text, used to skip KPIs already in the body.
+    """
+    region = _picture_region(doc, item, resources)
+    if region is None:
+        return None
+    page_no, bbox = region
+    raw = _text_layer_kpi(page_glyph_index(resources, page_no), bbox)
+    if raw is None:
+        raw = _ocr_kpi(_ocr_picture_text(resources.page(page_no), bbox))
+        if raw is None:
+            return None
+    return _unless_in_document(raw, doc_text)
+
+
+def collect_picture_kpi_captions(
+    doc: DoclingDocument,
+    pictures: Iterable[PictureItem],
+    resources: PdfResources,
+    doc_text: str,
+    *,
+    max_captions: int,
+    ocr_workers: Optional[int] = None,
+    ocr_batch_size: int = DEFAULT_OCR_BATCH_SIZE,
+) -> list[tuple[PictureItem, str]]:
+    """KPI captions for the first `max_captions` pictures that yield one, in document order.
+
+    Same result as calling `extract_picture_kpi_caption` per picture, but every picture
+    that needs OCR goes through one batched, bounded-concurrency tesseract pass.
+    """
+    if max_captions <= 0:
+        return []
+    # WHY: Text-layer captions are cheap and decide how many pictures still need OCR.
+    candidates: list[tuple[PictureItem, int, BoundingBox, Optional[str]]] = []
+    for item in pictures:
+        region = _picture_region(doc, item, resources)
+        if region is None:
+            continue
+        page_no, bbox = region
+        raw = _text_layer_kpi(page_glyph_index(resources, page_no), bbox)
+        candidates.append((item, page_no, bbox, raw))
+
+    ocr_regions: list[tuple[fitz.Page, fitz.Rect]] = []
+    ocr_slots: dict[int, int] = {}
+    lang = available_tesseract_lang()
+    settled = 0
+    for index, (item, page_no, bbox, raw) in enumerate(candidates):
+        if settled >= max_captions:
+            break
+        if raw is not None:
+            if _unless_in_document(raw, doc_text) is not None:
+                settled += 1
+            continue
+        page = resources.page(page_no)
+        clip = _clip_rect(page.rect, bbox, pad=2.0) if lang else None
+        if clip is not None:
+            ocr_slots[index] = len(ocr_regions)
+            ocr_regions.append((page, clip))
+
+    ocr_texts: list[str] = []
+    if ocr_regions:
+        # WHY: Rendering uses the fitz document and is not thread-safe; the generator
+        # runs in this thread while tesseract batches run in the pool.
+        ocr_texts = ocr_images(
+            (render_crop(page, clip) for page, clip in ocr_regions),
+            lang=lang,
+            workers=ocr_workers,
+            batch_size=ocr_batch_size,
+        )
+
+    captions: list[tuple[PictureItem, str]] = []
+    for index, (item, _page_no, _bbox, raw) in enumerate(candidates):
+        if len(captions) >= max_captions:
+            break
+        if raw is None and index in ocr_slots:
+            raw = _ocr_kpi(ocr_texts[ocr_slots[index]])
+        if raw is None:
+            continue
+        caption = _unless_in_document(raw, doc_text)
+        if caption is not None:
+            captions.append((item, caption))
+    return captions
+
+
+def attach_picture_caption(doc: DoclingDocument, item: PictureItem, text: str) -> TextItem:
+    """Add `text` as a caption child of the picture and return the new caption item."""
+    caption = doc.add_text(
+        label=DocItemLabel.CAPTION,
+        text=text,
+        parent=item,
+    )
+    item.captions.append(caption.get_ref())
+    return caption
+
+
 def add_picture_kpi_captions(
     doc: DoclingDocument,
     pdf_path: Path,
     *,
     max_added: int = 30,
+    ocr_workers: Optional[int] = None,
+    resources: Optional[PdfResources] = None,
 ) -> int:
-    """Extract KPI-like text from picture areas and attach as captions."""
+    """Extract KPI-like text from picture areas and attach as captions.
+
+    @param resources - The document's shared PDF handle and page cache; None opens the
+        PDF for this call only.
+    """
     if max_added <= 0:
         return 0
     doc_text = doc.export_to_text().casefold()
-    added = 0
-
-    with fitz.open(pdf_path) as pdf:
-        for item, _level in doc.iterate_items():
-            if not isinstance(item, PictureItem):
-                continue
-            if item.captions:
-                continue
-            if not item.prov:
-                continue
-            prov = item.prov[0]
-            if prov.page_no is None or prov.bbox is None:
-                continue
-            if prov.page_no < 1 or prov.page_no > pdf.page_count:
-                continue
-            page = pdf.load_page(prov.page_no - 1)
-            page_height = doc.pages[prov.page_no].size.height if prov.page_no in doc.pages and doc.pages[prov.page_no].size else None
-            bbox = _bbox_to_top_left(prov.bbox, page_height)
-            raw = _extract_picture_text(page, bbox)
-            if raw:
-                raw = normalize_ligatures(normalize_mojibake_text(raw))
-                raw = _normalize_kpi_caption(raw)
-            if not raw or not _is_kpi_text(raw):
-                ocr_raw = _ocr_picture_text(page, bbox)
-                if not ocr_raw:
-                    continue
-                ocr_raw = normalize_ligatures(normalize_mojibake_text(ocr_raw))
-                ocr_raw = _normalize_kpi_caption(ocr_raw)
-                if not _is_kpi_text(ocr_raw):
-                    continue
-                raw = ocr_raw
-            normalized = raw.casefold()
-            if normalized and normalized in doc_text:
-                continue
-            caption = doc.add_text(
-                label=DocItemLabel.CAPTION,
-                text=raw,
-                parent=item,
-            )
-            item.captions.append(caption.get_ref())
-            added += 1
-            if added >= max_added:
-                break
-
-    return added
+    pictures = [
+        item for item, _level in doc.iterate_items() if isinstance(item, PictureItem)
+    ]
+    with borrow_resources(resources, pdf_path) as pdf_resources:
+        captions = collect_picture_kpi_captions(
+            doc,
+            pictures,
+            pdf_resources,
+            doc_text,
+            max_captions=max_added,
+            ocr_workers=ocr_workers,
+        )
+    for item, caption in captions:
+        attach_picture_caption(doc, item, caption)
+    return len(captions)
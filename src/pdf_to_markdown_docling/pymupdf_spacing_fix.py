@@ -3,28 +3,32 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Iterable, Optional
 import re
-import statistics
 
 import fitz
+import numpy as np
 
-from docling_core.types.doc import TableItem
 from docling_core.types.doc.base import BoundingBox, CoordOrigin
 
 from pdf_to_markdown_docling.audit_utils import (
+    classify_spacing,
     is_spaced_text,
     needs_spacing_fix,
     needs_table_spacing_fix,
 )
+from pdf_to_markdown_docling.glyph_layout import glyph_array, reconstruct_runs
+from pdf_to_markdown_docling.pdf_resources import PdfResources
+from pdf_to_markdown_docling.spacing_workers import (
+    SpacingWorkUnit,
+    collect_spacing_work,
+    run_page_repairs,
+)
 
 
 TEXT_FLAGS = fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE
-_RUNON_LETTERS = re.compile(r"(?:[^\W\d_]{20,})", flags=re.UNICODE)
-_MERGED_ALNUM = re.compile(
-    r"(?:[^\W\d_]{6,}\d{2,}[^\W\d_]{2,}|\d{2,}[^\W\d_]{6,})", flags=re.UNICODE
-)
 _NUMERIC_ONLY = re.compile(r"[0-9\s.,/%()-]+")
 _SUSPICIOUS_NUMERIC = re.compile(r"^[.,]?\d[.,]?$")
 _TRAILING_ALPHA = re.compile(r"[A-Za-zĂÂÎăâîșșțȚȘ]$", flags=re.UNICODE)
@@ -37,42 +41,7 @@ class SpacingFixReport:
     table_cells: int
     text_items: int
     pages_processed: int
-
-
-def _median(values: Iterable[float], default: float = 1.0) -> float:
-    values = list(values)
-    if not values:
-        return default
-    return statistics.median(values)
-
-
-def _gap_threshold(
-    gaps: list[float],
-    *,
-    median_char_width: float,
-    fallback_ratio: float,
-) -> float:
-    # WHY: Clustering gaps separates intra-word kerning from actual word breaks.
-    if len(gaps) < 2:
-        return median_char_width * fallback_ratio
-
-    c1, c2 = min(gaps), max(gaps)
-    for _ in range(8):
-        cluster1 = [g for g in gaps if abs(g - c1) <= abs(g - c2)]
-        cluster2 = [g for g in gaps if abs(g - c1) > abs(g - c2)]
-        new_c1 = statistics.mean(cluster1) if cluster1 else c1
-        new_c2 = statistics.mean(cluster2) if cluster2 else c2
-        if abs(new_c1 - c1) < 1e-3 and abs(new_c2 - c2) < 1e-3:
-            break
-        c1, c2 = new_c1, new_c2
-
-    if not cluster1 or not cluster2:
-        return median_char_width * fallback_ratio
-
-    if abs(c2 - c1) < median_char_width * 0.3:
-        return median_char_width * fallback_ratio
-
-    return (c1 + c2) / 2
+    page_extractions: int = 0
 
 
 def _bbox_to_top_left(bbox: BoundingBox, page_height: float) -> BoundingBox:
@@ -81,41 +50,140 @@ def _bbox_to_top_left(bbox: BoundingBox, page_height: float) -> BoundingBox:
     return bbox.to_top_left_origin(page_height)
 
 
-def _clip_rect(page: fitz.Page, bbox: BoundingBox, pad: float) -> Optional[fitz.Rect]:
+def _clip_rect(page_rect: fitz.Rect, bbox: BoundingBox, pad: float) -> Optional[fitz.Rect]:
     rect = fitz.Rect(bbox.l, bbox.t, bbox.r, bbox.b)
     rect = fitz.Rect(rect.x0 - pad, rect.y0 - pad, rect.x1 + pad, rect.y1 + pad)
-    rect = rect & page.rect
+    rect = rect & page_rect
     if rect.is_empty:
         return None
     return rect
 
 
-def _extract_words(page: fitz.Page, rect: fitz.Rect) -> list[tuple[str, int, int, int]]:
-    words = page.get_text("words", clip=rect, flags=TEXT_FLAGS)
-    out: list[tuple[str, int, int, int]] = []
-    for word in words:
-        if len(word) < 8:
-            continue
-        _x0, _y0, _x1, _y1, text, block_no, line_no, word_no = word
-        if not text:
-            continue
-        out.append((text, block_no, line_no, word_no))
-    return out
+def _is_word_delimiter(text: str) -> bool:
+    code = ord(text)
+    return code <= 32 or code == 160 or 0x202A <= code <= 0x202E
+
+
+def _is_rtl_char(text: str) -> bool:
+    return 0x590 <= ord(text) <= 0x900
+
+
+class PageGlyphIndex:
+    """All glyphs of one page, extracted once and bucketed on a grid for bbox queries.
+
+    Queries mirror `page.get_text(..., clip=rect)`: a glyph is included when its box
+    intersects the clip, and words split the way PyMuPDF's word extraction does.
+    """
+
+    def __init__(self, page: fitz.Page, *, cell_size: float = 32.0) -> None:
+        self.rect = fitz.Rect(page.rect)
+        self.extractions = 1
+        self._cell_size = cell_size
+        # (char, x0, y0, x1, y1, block_no, line_no) in content order.
+        self._glyphs: list[tuple[str, float, float, float, float, int, int]] = []
+        self._grid: dict[tuple[int, int], list[int]] = {}
+        raw = page.get_text("rawdict", flags=TEXT_FLAGS)
+        for block_no, block in enumerate(raw.get("blocks", [])):
+            for line_no, line in enumerate(block.get("lines", [])):
+                for span in line.get("spans", []):
+                    for ch in span.get("chars", []):
+                        text = ch.get("c")
+                        bbox = ch.get("bbox")
+                        if not text or not bbox or len(bbox) != 4:
+                            continue
+                        x0, y0, x1, y1 = bbox
+                        if x0 >= x1 or y0 >= y1:
+                            # WHY: An empty box never intersects a clip, so clipped
+                            # extraction would never return this glyph.
+                            continue
+                        glyph_id = len(self._glyphs)
+                        self._glyphs.append((text, x0, y0, x1, y1, block_no, line_no))
+                        for key in self._cells(x0, y0, x1, y1):
+                            self._grid.setdefault(key, []).append(glyph_id)
+        self._boxes, self._texts = glyph_array(glyph[:5] for glyph in self._glyphs)
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+    def _cells(self, x0: float, y0: float, x1: float, y1: float) -> Iterable[tuple[int, int]]:
+        size = self._cell_size
+        for gx in range(int(x0 // size), int(x1 // size) + 1):
+            for gy in range(int(y0 // size), int(y1 // size) + 1):
+                yield gx, gy
+
+    def _query_ids(self, rect: fitz.Rect) -> list[int]:
+        ids: set[int] = set()
+        for key in self._cells(rect.x0, rect.y0, rect.x1, rect.y1):
+            ids.update(self._grid.get(key, ()))
+        hits = []
+        for glyph_id in sorted(ids):
+            _text, x0, y0, x1, y1, _block, _line = self._glyphs[glyph_id]
+            if max(x0, rect.x0) < min(x1, rect.x1) and max(y0, rect.y0) < min(y1, rect.y1):
+                hits.append(glyph_id)
+        return hits
+
+    def _query(self, rect: fitz.Rect) -> list[tuple[str, float, float, float, float, int, int]]:
+        return [self._glyphs[glyph_id] for glyph_id in self._query_ids(rect)]
+
+    def chars(self, rect: fitz.Rect) -> list[tuple[str, fitz.Rect]]:
+        """Glyphs intersecting `rect`, like clipped `rawdict` extraction."""
+        return [
+            (text, fitz.Rect(x0, y0, x1, y1))
+            for text, x0, y0, x1, y1, _block, _line in self._query(rect)
+        ]
+
+    def clip_glyphs(
+        self, rects: list[Optional[fitz.Rect]]
+    ) -> tuple[np.ndarray, list[str], list[int]]:
+        """Glyph boxes of every rect back to back, with offsets; None rects are empty."""
+        ids: list[int] = []
+        bounds = [0]
+        for rect in rects:
+            if rect is not None:
+                ids.extend(self._query_ids(rect))
+            bounds.append(len(ids))
+        return self._boxes[ids], [self._texts[glyph_id] for glyph_id in ids], bounds
+
+    def words(self, rect: fitz.Rect) -> list[tuple[str, int, int, int]]:
+        """Words built from glyphs intersecting `rect`, like clipped `words` extraction."""
+        out: list[tuple[str, int, int, int]] = []
+        current_line: Optional[tuple[int, int]] = None
+        buffer: list[str] = []
+        word_no = 0
+        last_rtl = False
+
+        def flush() -> None:
+            nonlocal word_no
+            if buffer:
+                out.append(("".join(buffer), current_line[0], current_line[1], word_no))
+                word_no += 1
+                buffer.clear()
+
+        for text, _x0, _y0, _x1, _y1, block_no, line_no in self._query(rect):
+            if (block_no, line_no) != current_line:
+                flush()
+                current_line = (block_no, line_no)
+                word_no = 0
+            if not buffer and text == "\u200d":
+                continue
+            delimiter = _is_word_delimiter(text)
+            rtl = _is_rtl_char(text)
+            if delimiter or rtl != last_rtl:
+                flush()
+                if delimiter:
+                    continue
+            buffer.append(text)
+            last_rtl = rtl
+        flush()
+        return out
+
 
+def _extract_words(index: PageGlyphIndex, rect: fitz.Rect) -> list[tuple[str, int, int, int]]:
+    return index.words(rect)
 
-def _extract_chars(page: fitz.Page, rect: fitz.Rect) -> list[tuple[str, fitz.Rect]]:
-    raw = page.get_text("rawdict", clip=rect, flags=TEXT_FLAGS)
-    chars: list[tuple[str, fitz.Rect]] = []
-    for block in raw.get("blocks", []):
-        for line in block.get("lines", []):
-            for span in line.get("spans", []):
-                for ch in span.get("chars", []):
-                    text = ch.get("c")
-                    bbox = ch.get("bbox")
-                    if not text or not bbox or len(bbox) != 4:
-                        continue
-                    chars.append((text, fitz.Rect(bbox)))
-    return chars
+
+def _extract_chars(index: PageGlyphIndex, rect: fitz.Rect) -> list[tuple[str, fitz.Rect]]:
+    return index.chars(rect)
 
 
 def _reconstruct_from_words(words: list[tuple[str, int, int, int]]) -> str:
@@ -142,91 +210,57 @@ def _reconstruct_from_chars(
     line_ratio: float,
     space_width_ratio: float,
 ) -> str:
-    if not chars:
-        return ""
-
-    heights = [bbox.height for _text, bbox in chars]
-    line_tol = _median(heights) * line_ratio
-
-    chars.sort(key=lambda item: ((item[1].y0 + item[1].y1) / 2, item[1].x0))
-
-    lines: list[dict[str, object]] = []
-    for text, bbox in chars:
-        y_center = (bbox.y0 + bbox.y1) / 2
-        if not lines or abs(y_center - lines[-1]["y"]) > line_tol:
-            lines.append({"y": y_center, "chars": []})
-        lines[-1]["chars"].append((bbox.x0, text, bbox))
-
-    line_texts: list[str] = []
-    for line in lines:
-        items = sorted(line["chars"], key=lambda item: item[0])
-        non_space_widths = [bbox.width for _x, text, bbox in items if not text.isspace()]
-        median_char_width = _median(non_space_widths)
-        gaps = []
-        for idx in range(1, len(items)):
-            gap = items[idx][2].x0 - items[idx - 1][2].x1
-            if gap >= 0:
-                gaps.append(gap)
-        gap_threshold = _gap_threshold(
-            gaps,
-            median_char_width=median_char_width,
-            fallback_ratio=gap_ratio,
-        )
-
-        out = ""
-        prev_bbox: Optional[fitz.Rect] = None
-        pending_space = False
-        pending_space_width = 0.0
-        for _x, text, bbox in items:
-            if text.isspace():
-                pending_space = True
-                pending_space_width = max(pending_space_width, bbox.width)
-                continue
-            if prev_bbox is None:
-                if pending_space and pending_space_width >= median_char_width * space_width_ratio:
-                    out += " "
-                pending_space = False
-                pending_space_width = 0.0
-                out += text
-                prev_bbox = bbox
-                continue
-            if pending_space:
-                if pending_space_width >= median_char_width * space_width_ratio:
-                    out += " "
-                pending_space = False
-                pending_space_width = 0.0
-            else:
-                gap = bbox.x0 - prev_bbox.x1
-                if gap > gap_threshold:
-                    out += " "
-            out += text
-            prev_bbox = bbox
+    boxes, texts = glyph_array(
+        (text, bbox.x0, bbox.y0, bbox.x1, bbox.y1) for text, bbox in chars
+    )
+    [text] = reconstruct_runs(
+        boxes,
+        texts,
+        [0, len(texts)],
+        gap_ratio=gap_ratio,
+        line_ratio=line_ratio,
+        space_width_ratio=space_width_ratio,
+    )
+    return text
 
-        if out.strip():
-            line_texts.append(out.strip())
 
-    return " ".join(line_texts).strip()
+def _reconstruct_clips(
+    page: PageGlyphIndex,
+    clips: list[Optional[fitz.Rect]],
+    *,
+    gap_ratio: float,
+    line_ratio: float,
+    space_width_ratio: float,
+) -> list[str]:
+    """Glyph reconstruction of every clip on the page in one batched call."""
+    boxes, texts, bounds = page.clip_glyphs(clips)
+    return reconstruct_runs(
+        boxes,
+        texts,
+        bounds,
+        gap_ratio=gap_ratio,
+        line_ratio=line_ratio,
+        space_width_ratio=space_width_ratio,
+    )
 
 
 def _spacing_badness(text: str) -> float:
-    tokens = re.findall(r"\w+", text, flags=re.UNICODE)
-    if not tokens:
+    flags = classify_spacing(text)
+    if not flags.word_count:
         return 0.0
-    avg_len = sum(len(t) for t in tokens) / len(tokens)
-    long_tokens = sum(1 for t in tokens if len(t) >= 18)
-    badness = max(0.0, avg_len - 6.0)
-    badness += long_tokens * 1.5
-    if _RUNON_LETTERS.search(text):
+    badness = max(0.0, flags.avg_word_length - 6.0)
+    badness += flags.long_words * 1.5
+    if flags.runon_letters:
         badness += 4.0
-    if _MERGED_ALNUM.search(text):
+    if flags.merged_alnum:
         badness += 3.0
-    if is_spaced_text(text):
+    if flags.spaced:
         badness += 4.0
     return badness
 
 
 def _expand_suffix_with_pad(
-    page: fitz.Page,
+    page: PageGlyphIndex,
     bbox: BoundingBox,
     *,
     pad: float,
@@ -237,7 +271,7 @@ def _expand_suffix_with_pad(
 ) -> str:
     if not _needs_suffix_completion(base_text):
         return base_text
-    clip = _clip_rect(page, bbox, pad * 3.0)
+    clip = _clip_rect(page.rect, bbox, pad * 3.0)
     if clip is None:
         return base_text
     words = _extract_words(page, clip)
@@ -362,6 +396,147 @@ def _should_replace_text(old: str, new: str, *, table_mode: bool = False) -> boo
     return _spacing_badness(new) + 0.5 < _spacing_badness(old)
 
 
+def _table_cell_from_words(
+    page: PageGlyphIndex,
+    bbox: BoundingBox,
+    clip: fitz.Rect,
+    original_text: str,
+    **suffix_options: float,
+) -> tuple[bool, Optional[str]]:
+    """Word-level repair; `(False, None)` defers the cell to glyph reconstruction."""
+    words = _extract_words(page, clip)
+    reconstructed = _compact_numeric_spacing(_reconstruct_from_words(words))
+    if reconstructed and not needs_spacing_fix(reconstructed):
+        reconstructed = _expand_suffix_with_pad(
+            page, bbox, base_text=reconstructed, **suffix_options
+        )
+        if _should_replace_text(original_text, reconstructed, table_mode=True):
+            return True, reconstructed
+    return False, None
+
+
+def _table_cell_from_glyphs(
+    page: PageGlyphIndex,
+    bbox: BoundingBox,
+    original_text: str,
+    char_text: str,
+    **suffix_options: float,
+) -> Optional[str]:
+    reconstructed = _compact_numeric_spacing(char_text)
+    if reconstructed:
+        reconstructed = _expand_suffix_with_pad(
+            page, bbox, base_text=reconstructed, **suffix_options
+        )
+    if reconstructed and _should_replace_text(original_text, reconstructed, table_mode=True):
+        return reconstructed
+
+    if _needs_suffix_completion(original_text):
+        # WHY: Expand bbox padding to capture trailing glyphs for clipped words.
+        reconstructed = _expand_suffix_with_pad(
+            page, bbox, base_text=original_text, **suffix_options
+        )
+        if reconstructed and _should_replace_text(
+            original_text, reconstructed, table_mode=True
+        ):
+            return reconstructed
+    return None
+
+
+def _text_item_from_words(
+    page: PageGlyphIndex,
+    bbox: BoundingBox,
+    clip: fitz.Rect,
+    text: str,
+    **_suffix_options: float,
+) -> tuple[bool, Optional[str]]:
+    """Word-level repair; `(False, None)` defers the item to glyph reconstruction."""
+    words = _extract_words(page, clip)
+    reconstructed = _compact_numeric_spacing(_reconstruct_from_words(words))
+    if reconstructed and not needs_spacing_fix(reconstructed):
+        return True, reconstructed if _should_replace_text(text, reconstructed) else None
+    return False, None
+
+
+def _text_item_from_glyphs(
+    _page: PageGlyphIndex,
+    _bbox: BoundingBox,
+    text: str,
+    char_text: str,
+    **_suffix_options: float,
+) -> Optional[str]:
+    reconstructed = _compact_numeric_spacing(char_text)
+    if reconstructed and _should_replace_text(text, reconstructed):
+        return reconstructed
+    return None
+
+
+def page_glyph_index(resources: PdfResources, page_no: int) -> PageGlyphIndex:
+    """Glyph index of a 1-based page, built once per document through its page cache."""
+    return resources.page_resource(page_no, "glyph_index", PageGlyphIndex)
+
+
+def _open_pdf(pdf_path: Path) -> PdfResources:
+    return PdfResources(pdf_path)
+
+
+def _close_pdf(resources: PdfResources) -> None:
+    resources.close()
+
+
+def _repair_page(
+    resources: PdfResources,
+    page_no: int,
+    units: list[SpacingWorkUnit],
+    *,
+    pad: float,
+    gap_ratio: float,
+    line_ratio: float,
+    space_width_ratio: float,
+) -> list[tuple[int, str]]:
+    """Repair one page's units against a single glyph index; runs in pool workers too."""
+    if page_no < 1 or page_no > resources.page_count:
+        return []
+    # WHY: Dense tables query hundreds of cell boxes per page; extracting glyphs once
+    # per page and answering clips from an index avoids re-parsing the content stream.
+    page = page_glyph_index(resources, page_no)
+    options = {
+        "pad": pad,
+        "gap_ratio": gap_ratio,
+        "line_ratio": line_ratio,
+        "space_width_ratio": space_width_ratio,
+    }
+    results: list[Optional[str]] = [None] * len(units)
+    deferred: list[tuple[int, BoundingBox, fitz.Rect]] = []
+    for position, unit in enumerate(units):
+        bbox = _bbox_to_top_left(unit.bbox, page.rect.height)
+        clip = _clip_rect(page.rect, bbox, pad)
+        if clip is None:
+            continue
+        from_words = _table_cell_from_words if unit.table_cell else _text_item_from_words
+        resolved, results[position] = from_words(page, bbox, clip, unit.text, **options)
+        if not resolved:
+            deferred.append((position, bbox, clip))
+
+    # WHY: Glyph reconstruction is vectorized, so every unit the word path could not
+    # settle is rebuilt from glyphs in one batched call per page.
+    char_texts = _reconstruct_clips(
+        page,
+        [clip for _position, _bbox, clip in deferred],
+        gap_ratio=gap_ratio,
+        line_ratio=line_ratio,
+        space_width_ratio=space_width_ratio,
+    )
+    for (position, bbox, _clip), char_text in zip(deferred, char_texts):
+        unit = units[position]
+        from_glyphs = _table_cell_from_glyphs if unit.table_cell else _text_item_from_glyphs
+        results[position] = from_glyphs(page, bbox, unit.text, char_text, **options)
+    return [
+        (unit.target, reconstructed)
+        for unit, reconstructed in zip(units, results)
+        if reconstructed is not None
+    ]
+
+
 def fix_spaced_items_with_pymupdf_glyphs(
     doc,
     pdf_path: Path,
@@ -371,143 +546,45 @@ def fix_spaced_items_with_pymupdf_glyphs(
     gap_ratio: float = 0.35,
     line_ratio: float = 0.6,
     space_width_ratio: float = 0.6,
+    workers: int = 1,
+    resources: Optional[PdfResources] = None,
 ) -> SpacingFixReport:
-    """Repair spaced table/text items using PyMuPDF glyph reconstruction."""
+    """Repair spaced table/text items using PyMuPDF glyph reconstruction.
+
+    @param workers - Processes repairing pages in parallel; 1 repairs in-process.
+    @param resources - The document's shared PDF handle and page cache for in-process
+        repair; None opens the PDF for this call only.
+    """
     if pages_to_fix is not None and not pages_to_fix:
         return SpacingFixReport(0, 0, 0)
 
-    table_replaced = 0
-    text_replaced = 0
-
-    with fitz.open(pdf_path) as pdf:
-        def get_page(page_no: int) -> Optional[fitz.Page]:
-            if page_no < 1 or page_no > pdf.page_count:
-                return None
-            return pdf.load_page(page_no - 1)
-
-        for item, _level in doc.iterate_items():
-            if isinstance(item, TableItem):
-                page_no = item.prov[0].page_no if item.prov else None
-                if page_no is None or (pages_to_fix and page_no not in pages_to_fix):
-                    continue
-                page = get_page(page_no)
-                if page is None:
-                    continue
-                for cell in item.data.table_cells:
-                    if cell.bbox is None or not _needs_table_cell_repair(cell.text):
-                        continue
-                    bbox = _bbox_to_top_left(cell.bbox, page.rect.height)
-                    original_text = cell.text
-                    replaced = False
-
-                    clip = _clip_rect(page, bbox, pad)
-                    if clip is None:
-                        continue
-                    words = _extract_words(page, clip)
-                    reconstructed = _compact_numeric_spacing(
-                        _reconstruct_from_words(words)
-                    )
-                    if reconstructed and not needs_spacing_fix(reconstructed):
-                        reconstructed = _expand_suffix_with_pad(
-                            page,
-                            bbox,
-                            pad=pad,
-                            gap_ratio=gap_ratio,
-                            line_ratio=line_ratio,
-                            space_width_ratio=space_width_ratio,
-                            base_text=reconstructed,
-                        )
-                        if _should_replace_text(original_text, reconstructed, table_mode=True):
-                            cell.text = reconstructed
-                            table_replaced += 1
-                            replaced = True
-                        else:
-                            reconstructed = ""
-                    if not replaced:
-                        chars = _extract_chars(page, clip)
-                        reconstructed = _compact_numeric_spacing(
-                            _reconstruct_from_chars(
-                                chars,
-                                gap_ratio=gap_ratio,
-                                line_ratio=line_ratio,
-                                space_width_ratio=space_width_ratio,
-                            )
-                        )
-                        if reconstructed:
-                            reconstructed = _expand_suffix_with_pad(
-                                page,
-                                bbox,
-                                pad=pad,
-                                gap_ratio=gap_ratio,
-                                line_ratio=line_ratio,
-                                space_width_ratio=space_width_ratio,
-                                base_text=reconstructed,
-                            )
-                        if reconstructed and _should_replace_text(
-                            original_text, reconstructed, table_mode=True
-                        ):
-                            cell.text = reconstructed
-                            table_replaced += 1
-                            replaced = True
-
-                    if not replaced and _needs_suffix_completion(original_text):
-                        # WHY: Expand bbox padding to capture trailing glyphs for clipped words.
-                        reconstructed = _expand_suffix_with_pad(
-                            page,
-                            bbox,
-                            pad=pad,
-                            gap_ratio=gap_ratio,
-                            line_ratio=line_ratio,
-                            space_width_ratio=space_width_ratio,
-                            base_text=original_text,
-                        )
-                        if reconstructed and _should_replace_text(
-                            original_text, reconstructed, table_mode=True
-                        ):
-                            cell.text = reconstructed
-                            table_replaced += 1
-            else:
-                text = getattr(item, "text", None)
-                if not text or not needs_spacing_fix(text):
-                    continue
-                if not getattr(item, "prov", None):
-                    continue
-                page_no = item.prov[0].page_no
-                if page_no is None or (pages_to_fix and page_no not in pages_to_fix):
-                    continue
-                bbox = item.prov[0].bbox
-                if bbox is None:
-                    continue
-                page = get_page(page_no)
-                if page is None:
-                    continue
-                bbox = _bbox_to_top_left(bbox, page.rect.height)
-                clip = _clip_rect(page, bbox, pad)
-                if clip is None:
-                    continue
-                words = _extract_words(page, clip)
-                reconstructed = _compact_numeric_spacing(_reconstruct_from_words(words))
-                if reconstructed and not needs_spacing_fix(reconstructed):
-                    if _should_replace_text(text, reconstructed):
-                        item.text = reconstructed
-                        text_replaced += 1
-                    continue
-                chars = _extract_chars(page, clip)
-                reconstructed = _compact_numeric_spacing(
-                    _reconstruct_from_chars(
-                        chars,
-                        gap_ratio=gap_ratio,
-                        line_ratio=line_ratio,
-                        space_width_ratio=space_width_ratio,
-                    )
-                )
-                if reconstructed and _should_replace_text(text, reconstructed):
-                    item.text = reconstructed
-                    text_replaced += 1
+    work = collect_spacing_work(
+        doc,
+        pages_to_fix=pages_to_fix,
+        cell_predicate=_needs_table_cell_repair,
+        text_predicate=needs_spacing_fix,
+    )
+    replacements = run_page_repairs(
+        pdf_path,
+        work.units_by_page,
+        open_handle=_open_pdf,
+        close_handle=_close_pdf,
+        repair_page=partial(
+            _repair_page,
+            pad=pad,
+            gap_ratio=gap_ratio,
+            line_ratio=line_ratio,
+            space_width_ratio=space_width_ratio,
+        ),
+        workers=workers,
+        handle=resources,
+    )
+    table_replaced, text_replaced = work.apply(replacements)
 
     pages_processed = 0 if pages_to_fix is None else len(pages_to_fix)
     return SpacingFixReport(
         table_cells=table_replaced,
         text_items=text_replaced,
         pages_processed=pages_processed,
+        page_extractions=len(work.units_by_page),
     )
@@ -0,0 +1,416 @@
+"""@fileoverview Multi-process conversion scheduling for CPU-only nodes.
+
+On CPU one conversion keeps only a few cores busy, so a node finishes a batch sooner
+with several worker processes, each holding its own warm converters and a fixed torch
+thread count. Documents (or page shards of long ones) are costed by a cheap PyMuPDF
+pre-scan and dispatched most expensive first, so the long tail does not start last.
+Workers only run the Docling pipeline; the shards of a document are merged in page
+order and the caller runs the spacing, table and post-processing fixers on the result.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+import fitz
+from docling.datamodel.document import ConversionResult, ConversionStatus
+from docling_core.types.doc.document import DoclingDocument
+
+from pdf_to_markdown_docling.backend_probe import DEFAULT_PROBE_PAGES
+from pdf_to_markdown_docling.conversion_cache import (
+    CachedConversion,
+    ConversionCache,
+    file_sha256,
+    stamp_document_origin,
+)
+from pdf_to_markdown_docling.conversion_utils import (
+    build_export_labels,
+    build_pdf_pipeline_options,
+    convert_pdf_to_doc,
+    select_backend_auto,
+)
+from pdf_to_markdown_docling.document_merge import concatenate_documents_by_page
+from pdf_to_markdown_docling.metrics import (
+    Span,
+    merge_worker_spans,
+    metrics_enabled,
+    stage,
+    worker_metrics,
+)
+
+DEFAULT_SHARD_PAGES = 40
+PICTURE_COST = 0.5
+DRAWING_COST = 1 / 250
+MAX_DRAWINGS_PER_PAGE = 1000
+_FAILED_STATUSES = {ConversionStatus.FAILURE, ConversionStatus.SKIPPED}
+
+_WORKER_CACHE: Optional[ConversionCache] = None
+
+
+@dataclass(frozen=True)
+class DocumentCost:
+    input_path: Path
+    page_costs: dict[int, float]
+
+    @property
+    def pages(self) -> int:
+        return len(self.page_costs)
+
+    @property
+    def cost(self) -> float:
+        return sum(self.page_costs.values())
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    input_path: Path
+    page_range: Tuple[int, int]
+    cost: float
+    pdf_backend: str
+
+
+@dataclass(frozen=True)
+class ShardResult:
+    unit: WorkUnit
+    status: ConversionStatus
+    backend_name: str
+    document: Optional[DoclingDocument]
+    page_count: int
+    seconds: float
+    spans: tuple[Span, ...] = ()
+
+
+@dataclass(frozen=True)
+class ScheduledConversion:
+    """One document's merged pipeline output, ready for `convert_pdf_to_doc(converted=...)`."""
+
+    input_path: Path
+    result: Optional[ConversionResult]
+    backend_name: Optional[str]
+    status: Optional[ConversionStatus]
+    # WHY: Summed worker time of the shards; wall time means little with overlap.
+    seconds: float
+    error: Optional[str] = None
+
+
+def default_torch_threads(processes: int) -> int:
+    """Split the node's cores evenly across worker processes."""
+    return max(1, (os.cpu_count() or 1) // max(processes, 1))
+
+
+def estimate_document_cost(
+    input_path: Path, page_range: Optional[Tuple[int, int]] = None
+) -> DocumentCost:
+    """Cost pages from a PyMuPDF pre-scan: a base unit plus pictures and vector paths.
+
+    Pictures drive OCR/KPI work and dense vector paths mark tables and charts, which
+    are what make TableFormer and the layout model slow.
+    """
+    page_costs: dict[int, float] = {}
+    with fitz.open(input_path) as pdf:
+        first, last = page_range or (1, pdf.page_count)
+        for page_no in range(first, min(last, pdf.page_count) + 1):
+            page = pdf[page_no - 1]
+            pictures = len(page.get_images())
+            drawings = min(len(page.get_cdrawings()), MAX_DRAWINGS_PER_PAGE)
+            page_costs[page_no] = 1.0 + PICTURE_COST * pictures + DRAWING_COST * drawings
+    return DocumentCost(input_path=input_path, page_costs=page_costs)
+
+
+def _balanced_windows(page_costs: dict[int, float], shards: int) -> list[list[int]]:
+    pages = sorted(page_costs)
+    shards = max(1, min(shards, len(pages)))
+    total = sum(page_costs[page_no] for page_no in pages)
+    windows: list[list[int]] = [[]]
+    cumulative = 0.0
+    for index, page_no in enumerate(pages):
+        windows[-1].append(page_no)
+        cumulative += page_costs[page_no]
+        cut = total * len(windows) / shards
+        pages_left = len(pages) - index - 1
+        shards_left = shards - len(windows)
+        # WHY: Cut once this window carries its share of the cost, but never leave
+        # fewer pages than windows still to fill.
+        if shards_left and pages_left and (cumulative >= cut or pages_left == shards_left):
+            windows.append([])
+    return windows
+
+
+def plan_work_units(
+    costs: Iterable[DocumentCost],
+    *,
+    shard_pages: int = DEFAULT_SHARD_PAGES,
+    shards_per_document: int = 1,
+    pdf_backend: str = "auto",
+) -> list[WorkUnit]:
+    """Cut documents into contiguous page windows of similar cost, most expensive first.
+
+    Each document gets `ceil(pages / shard_pages)` windows, or `shards_per_document`
+    if that is more.
+
+    @example
+    units = plan_work_units([estimate_document_cost(path) for path in paths], shard_pages=40)
+    """
+    shard_pages = max(shard_pages, 1)
+    units: list[WorkUnit] = []
+    for doc_cost in costs:
+        if not doc_cost.pages:
+            continue
+        shards = max(-(-doc_cost.pages // shard_pages), shards_per_document)
+        for window in _balanced_windows(doc_cost.page_costs, shards):
+            units.append(
+                WorkUnit(
+                    input_path=doc_cost.input_path,
+                    page_range=(window[0], window[-1]),
+                    cost=sum(doc_cost.page_costs[page_no] for page_no in window),
+                    pdf_backend=pdf_backend,
+                )
+            )
+    # WHY: Greedy longest-first onto whichever worker frees up is the classic LPT
+    # schedule; it keeps one huge report from starting after everything else.
+    units.sort(key=lambda unit: unit.cost, reverse=True)
+    return units
+
+
+def _resolve_shared_backend(doc_cost: DocumentCost, options: dict[str, object]) -> str:
+    # WHY: Shards probing on their own could pick different backends for one document;
+    # the text probe is model-free, so the parent decides once for all shards.
+    pipeline_options = build_pdf_pipeline_options(
+        image_mode=options["image_mode"],
+        do_ocr=False,
+        device=str(options["device"]),
+        ocr_engine=str(options["ocr_engine"]),
+        ocr_lang=str(options["ocr_lang"]),
+        force_full_page_ocr=False,
+        do_cell_matching=False,
+    )
+    pages = sorted(doc_cost.page_costs)
+    best, _backend, _reports, _probe = select_backend_auto(
+        input_path=doc_cost.input_path,
+        pipeline_options=pipeline_options,
+        export_labels=build_export_labels(),
+        quiet=True,
+        probe_mode="text",
+        probe_pages=int(options.get("probe_pages", DEFAULT_PROBE_PAGES)),
+        page_range=(pages[0], pages[-1]),
+    )
+    return best
+
+
+def _init_worker(torch_threads: int, cache_dir: Optional[Path], cache_max_bytes: int) -> None:
+    global _WORKER_CACHE
+    os.environ["OMP_NUM_THREADS"] = str(torch_threads)
+    import torch
+
+    torch.set_num_threads(torch_threads)
+    if cache_dir is not None:
+        _WORKER_CACHE = ConversionCache(cache_dir, cache_max_bytes)
+
+
+def _convert_unit(
+    unit: WorkUnit, options: dict[str, object], record_metrics: bool = False
+) -> ShardResult:
+    started = time.perf_counter()
+    first, last = unit.page_range
+    with worker_metrics(record_metrics) as spans:
+        with stage("shard", input=unit.input_path.name, pages=f"{first}-{last}") as span:
+            result, backend_name, _labels = convert_pdf_to_doc(
+                input_path=unit.input_path,
+                page_range=unit.page_range,
+                quiet=True,
+                cache=_WORKER_CACHE,
+                repair=False,
+                **{**options, "pdf_backend": unit.pdf_backend},
+            )
+            span.set(backend=backend_name)
+    ok = result.status not in _FAILED_STATUSES
+    return ShardResult(
+        unit=unit,
+        status=result.status,
+        backend_name=backend_name,
+        # WHY: Only the document crosses the process boundary; the result also holds
+        # backend handles that cannot be pickled.
+        document=result.document if ok else None,
+        page_count=result.input.page_count,
+        seconds=time.perf_counter() - started,
+        spans=tuple(spans),
+    )
+
+
+def _merge_shards(input_path: Path, shards: list[ShardResult]) -> ConversionResult:
+    with stage("merge_shards", input=input_path.name) as span:
+        merged = concatenate_documents_by_page(
+            [shard.document for shard in sorted(shards, key=lambda shard: shard.unit.page_range)]
+        )
+        span.count("shards", len(shards))
+        span.count("pages", len(merged.pages))
+    file_hash = file_sha256(input_path)
+    stamp_document_origin(merged, input_path, file_hash)
+    result = CachedConversion(
+        merged, shards[0].backend_name, shards[0].page_count
+    ).to_conversion_result(input_path, file_hash)
+    if any(shard.status is ConversionStatus.PARTIAL_SUCCESS for shard in shards):
+        result.status = ConversionStatus.PARTIAL_SUCCESS
+    return result
+
+
+def convert_documents_scheduled(
+    inputs: Sequence[Path],
+    *,
+    processes: int,
+    torch_threads: Optional[int] = None,
+    shard_pages: int = DEFAULT_SHARD_PAGES,
+    shards_per_document: int = 1,
+    page_range: Optional[Tuple[int, int]] = None,
+    cache: Optional[ConversionCache] = None,
+    quiet: bool = False,
+    **options: object,
+) -> Iterator[ScheduledConversion]:
+    """Run the Docling pipeline for `inputs` on `processes` workers, yielding merged documents.
+
+    Documents are yielded as soon as all of their shards finish, so the caller's
+    repairs and export overlap with conversions still running in the pool.
+
+    @param options - `convert_pdf_to_doc` keywords shared by every document (OCR,
+        backend, device...); the page range and cache are handled here.
+
+    @example
+    for item in convert_documents_scheduled(paths, processes=4, **options):
+        result, backend, labels = convert_pdf_to_doc(
+            input_path=item.input_path, converted=(item.result, item.backend_name), ...
+        )
+    """
+    pdf_backend = str(options.get("pdf_backend", "auto"))
+    units: list[WorkUnit] = []
+    unscheduled: list[ScheduledConversion] = []
+    for path in inputs:
+        # WHY: One unreadable PDF must fail on its own, as it does without the pool,
+        # instead of aborting the scan (and the batch summary) for every document.
+        try:
+            doc_cost = estimate_document_cost(path, page_range)
+            doc_units = plan_work_units(
+                [doc_cost],
+                shard_pages=shard_pages,
+                shards_per_document=shards_per_document,
+                pdf_backend=pdf_backend,
+            )
+            if len(doc_units) > 1 and pdf_backend == "auto":
+                shared = _resolve_shared_backend(doc_cost, options)
+                doc_units = [replace(unit, pdf_backend=shared) for unit in doc_units]
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            unscheduled.append(ScheduledConversion(path, None, None, None, 0.0, error=error))
+            continue
+        if not doc_cost.pages:
+            unscheduled.append(
+                ScheduledConversion(path, None, None, None, 0.0, error="No pages to convert.")
+            )
+            continue
+        units.extend(doc_units)
+    units.sort(key=lambda unit: unit.cost, reverse=True)
+    remaining = {path: 0 for path in inputs}
+    for unit in units:
+        remaining[unit.input_path] += 1
+    if not quiet:
+        print(
+            f"Scheduling {len(units)} work units from {len(inputs)} documents "
+            f"on {processes} processes."
+        )
+
+    yield from unscheduled
+
+    threads = torch_threads or default_torch_threads(processes)
+    cache_dir = cache.cache_dir if cache is not None else None
+    cache_max_bytes = cache.max_bytes if cache is not None else 0
+    shards: dict[Path, list[ShardResult]] = {path: [] for path in inputs}
+    errors: dict[Path, str] = {}
+    with ProcessPoolExecutor(
+        max_workers=max(processes, 1),
+        initializer=_init_worker,
+        initargs=(threads, cache_dir, cache_max_bytes),
+    ) as pool:
+        record_metrics = metrics_enabled()
+        pending: dict[Future, WorkUnit] = {
+            pool.submit(_convert_unit, unit, options, record_metrics): unit for unit in units
+        }
+        while pending:
+            done, _not_done = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                unit = pending.pop(future)
+                path = unit.input_path
+                try:
+                    shard = future.result()
+                except Exception as exc:
+                    errors.setdefault(path, f"{type(exc).__name__}: {exc}")
+                else:
+                    merge_worker_spans(shard.spans)
+                    if shard.status in _FAILED_STATUSES:
+                        errors.setdefault(path, f"Conversion failed with status: {shard.status}")
+                    shards[path].append(shard)
+                remaining[path] -= 1
+                if remaining[path]:
+                    continue
+                seconds = sum(shard.seconds for shard in shards[path])
+                if path in errors:
+                    failed = next(
+                        (shard for shard in shards[path] if shard.status in _FAILED_STATUSES),
+                        None,
+                    )
+                    yield ScheduledConversion(
+                        path,
+                        None,
+                        failed.backend_name if failed else None,
+                        failed.status if failed else None,
+                        seconds,
+                        error=errors[path],
+                    )
+                else:
+                    result = _merge_shards(path, shards[path])
+                    yield ScheduledConversion(
+                        path, result, shards[path][0].backend_name, result.status, seconds
+                    )
+                # WHY: Drop the shard documents once merged; only one copy stays alive.
+                shards[path] = []
+
+
+def convert_pdf_sharded(
+    input_path: Path,
+    *,
+    processes: int,
+    torch_threads: Optional[int] = None,
+    shard_pages: int = DEFAULT_SHARD_PAGES,
+    page_range: Optional[Tuple[int, int]] = None,
+    cache: Optional[ConversionCache] = None,
+    quiet: bool = False,
+    **options: object,
+) -> ScheduledConversion:
+    """Convert one PDF as cost-balanced page windows on `processes` workers and merge them.
+
+    Cuts latency on very long reports: the result goes to `convert_pdf_to_doc` (or
+    `convert_pdf_to_markdown`) as `converted=(item.result, item.backend_name)` so the
+    spacing and table fixers and the export run once on the merged document.
+
+    @example
+    item = convert_pdf_sharded(Path("annual.pdf"), processes=8, **options)
+    """
+    # WHY: Two windows per worker leave slack for cost-estimate errors: a worker that
+    # finishes early picks up the next window instead of idling behind the slowest.
+    items = list(
+        convert_documents_scheduled(
+            [input_path],
+            processes=processes,
+            torch_threads=torch_threads,
+            shard_pages=shard_pages,
+            shards_per_document=2 * max(processes, 1),
+            page_range=page_range,
+            cache=cache,
+            quiet=quiet,
+            **options,
+        )
+    )
+    return items[0]
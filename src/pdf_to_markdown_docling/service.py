@@ -0,0 +1,495 @@
+"""@fileoverview Local HTTP conversion service backed by an asyncio job queue.
+
+Integrations that shell out to the CLI pay the Python/torch/Docling import and the model
+load for every document. `serve` keeps one process alive with warm converters (the
+process-wide `ConverterPool`) and accepts jobs over plain HTTP/1.1. It uses only the
+standard library, so it runs fully offline.
+
+Endpoints:
+- `POST /jobs` with a JSON body of CLI options (`{"input": "report.pdf", "page_range": "1:10"}`)
+  -> 202 and the job; 400 for invalid options; 429 when the queue is full.
+- `GET /jobs/<id>` -> job status.
+- `GET /jobs/<id>/result` -> the Markdown once the job is done (409 before that).
+- `GET /health` -> queue depth and worker count.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import shutil
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from docling.datamodel.document import ConversionStatus
+from docling_core.types.doc.base import ImageRefMode
+
+from pdf_to_markdown_docling.batch_utils import status_name
+from pdf_to_markdown_docling.cli import (
+    IMAGE_MODE_MAP,
+    build_conversion_cache,
+    build_parser,
+    conversion_options_from_args,
+)
+from pdf_to_markdown_docling.conversion_cache import ConversionCache
+from pdf_to_markdown_docling.conversion_utils import convert_pdf_to_markdown
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 16
+MAX_BODY_BYTES = 1 << 20
+RETRY_AFTER_SECONDS = 5
+DEFAULT_JOB_TTL_SECONDS = 3600.0
+DEFAULT_MAX_FINISHED_JOBS = 256
+_ACTIVE_STATUSES = {"queued", "running"}
+# WHY: Output location, batch selection and process-wide knobs belong to the service,
+# not to a single job; jobs always run quietly since their output is the job status.
+# The conversion cache writes and evicts files, so only the operator may place it.
+_SERVICE_OWNED_OPTIONS = {
+    "quiet",
+    "cache_dir",
+    "no_cache",
+    "output",
+    "input_dir",
+    "glob",
+    "manifest",
+    "images_dir",
+    "converter_cache_size",
+    "processes",
+    "torch_threads",
+    "shard_pages",
+    "audit",
+    "export_json",
+    "stream_window",
+    "metrics_json",
+}
+_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    429: "Too Many Requests",
+}
+
+
+class JobOptionsError(ValueError):
+    """Raised when a submitted job body does not describe a valid conversion."""
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the bounded job queue cannot take another job."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    args: argparse.Namespace
+    output_path: Path
+    status: str = "queued"
+    backend: Optional[str] = None
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.time)
+    seconds: Optional[float] = None
+    finished: Optional[float] = None
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "id": self.job_id,
+            "input": self.args.input,
+            "status": self.status,
+            "backend": self.backend,
+            "error": self.error,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+        }
+
+
+def _raise_options_error(message: str) -> None:
+    raise JobOptionsError(message)
+
+
+def parse_job_options(options: object) -> argparse.Namespace:
+    """Validate a JSON job body with the CLI parser (same flags, snake_case keys).
+
+    @example
+    args = parse_job_options({"input": "report.pdf", "ocr_mode": "auto", "workers": 2})
+    """
+    if not isinstance(options, dict):
+        raise JobOptionsError("Job body must be a JSON object.")
+    input_arg = options.get("input")
+    if not isinstance(input_arg, str) or not input_arg:
+        raise JobOptionsError("Job needs an 'input' PDF path.")
+
+    # WHY: argparse reports errors (and --help) by printing and exiting the process,
+    # which inside the service would stop the event loop instead of failing one job.
+    parser = build_parser(add_help=False, exit_on_error=False)
+    parser.error = _raise_options_error
+    argv = [input_arg]
+    for key, value in options.items():
+        if key == "input" or value is None:
+            continue
+        if key in _SERVICE_OWNED_OPTIONS:
+            raise JobOptionsError(f"Option '{key}' is not supported per job.")
+        flag = f"--{key.replace('_', '-')}"
+        if flag not in parser._option_string_actions:
+            raise JobOptionsError(f"Unknown option '{key}'.")
+        if value is True:
+            argv.append(flag)
+        elif value is False:
+            negated = f"--no-{key.replace('_', '-')}"
+            if negated in parser._option_string_actions:
+                argv.append(negated)
+        else:
+            # WHY: The `=` form keeps a value such as "--audit" from parsing as a flag.
+            argv.append(f"{flag}={value}")
+
+    try:
+        args = parser.parse_args(argv)
+    except argparse.ArgumentError as exc:
+        raise JobOptionsError(str(exc)) from exc
+    except SystemExit as exc:
+        raise JobOptionsError("Invalid job options.") from exc
+    if args.workers < 1:
+        raise JobOptionsError("'workers' must be at least 1.")
+    input_path = Path(args.input).expanduser().resolve()
+    if not input_path.is_file():
+        raise JobOptionsError(f"Input file not found: {input_path}")
+    args.input = str(input_path)
+    return args
+
+
+class ConversionService:
+    """Bounded asyncio job queue drained by worker tasks that convert on a thread pool.
+
+    `workers` jobs convert concurrently; all of them share the process-wide converter
+    pool, so models load once and stay warm across jobs. Finished jobs (and their output
+    folders) are dropped after `job_ttl` seconds or beyond `max_finished_jobs`. All jobs
+    share `cache`, configured once when the service starts.
+    """
+
+    def __init__(
+        self,
+        *,
+        output_dir: Path,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        workers: int = 1,
+        convert: Callable[..., tuple[object, str]] = convert_pdf_to_markdown,
+        job_ttl: float = DEFAULT_JOB_TTL_SECONDS,
+        max_finished_jobs: int = DEFAULT_MAX_FINISHED_JOBS,
+        cache: Optional[ConversionCache] = None,
+    ) -> None:
+        self.output_dir = output_dir
+        self.cache = cache
+        self.workers = max(workers, 1)
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max(max_finished_jobs, 0)
+        self.jobs: dict[str, Job] = {}
+        self._queue: asyncio.Queue[Job] = asyncio.Queue(maxsize=max(queue_size, 1))
+        self._convert = convert
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="convert"
+        )
+        self._tasks: list[asyncio.Task] = []
+
+    def submit(self, options: object) -> Job:
+        """Queue a conversion; raises `JobOptionsError` or `QueueFullError`."""
+        self.prune_jobs()
+        args = parse_job_options(options)
+        job_id = uuid.uuid4().hex
+        input_path = Path(args.input)
+        job = Job(
+            job_id=job_id,
+            args=args,
+            output_path=self.output_dir / job_id / f"{input_path.stem}.md",
+        )
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull as exc:
+            raise QueueFullError("Job queue is full.") from exc
+        self.jobs[job_id] = job
+        return job
+
+    def prune_jobs(self, now: Optional[float] = None) -> int:
+        """Forget expired finished jobs and the oldest ones above the cap; returns the count."""
+        now = time.time() if now is None else now
+        finished = sorted(
+            (job for job in self.jobs.values() if job.status not in _ACTIVE_STATUSES),
+            key=lambda job: job.finished or job.submitted,
+        )
+        excess = len(finished) - self.max_finished_jobs
+        evicted = 0
+        for position, job in enumerate(finished):
+            expired = now - (job.finished or job.submitted) > self.job_ttl
+            if position >= excess and not expired:
+                continue
+            del self.jobs[job.job_id]
+            shutil.rmtree(job.output_path.parent, ignore_errors=True)
+            evicted += 1
+        return evicted
+
+    def health(self) -> dict[str, object]:
+        running = sum(1 for job in self.jobs.values() if job.status == "running")
+        return {
+            "queued": self._queue.qsize(),
+            "queue_size": self._queue.maxsize,
+            "running": running,
+            "workers": self.workers,
+        }
+
+    async def start(self) -> None:
+        """Spawn the worker tasks; call from inside the running event loop."""
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def _worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            job.status = "running"
+            started = time.perf_counter()
+            try:
+                await loop.run_in_executor(self._executor, self._run_job, job)
+            except Exception as exc:
+                logging.error("Job %s failed:\n%s", job.job_id, traceback.format_exc())
+                job.status = "error"
+                job.error = f"{type(exc).__name__}: {exc}"
+            finally:
+                job.seconds = time.perf_counter() - started
+                job.finished = time.time()
+                self._queue.task_done()
+
+    def _run_job(self, job: Job) -> None:
+        args = job.args
+        image_mode = IMAGE_MODE_MAP[args.image_mode]
+        images_dir = None
+        if image_mode is ImageRefMode.REFERENCED:
+            images_dir = job.output_path.parent / f"{job.output_path.stem}_assets"
+            images_dir.mkdir(parents=True, exist_ok=True)
+        job.output_path.parent.mkdir(parents=True, exist_ok=True)
+        result, backend_name = self._convert(
+            input_path=Path(args.input),
+            output_path=job.output_path,
+            image_mode=image_mode,
+            images_dir=images_dir,
+            quiet=True,
+            **conversion_options_from_args(args, cache=self.cache),
+        )
+        job.backend = backend_name
+        job.status = status_name(result.status)
+        if result.status in {ConversionStatus.FAILURE, ConversionStatus.SKIPPED}:
+            job.error = f"Conversion failed with status: {result.status}"
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one HTTP/1.1 request per connection."""
+        try:
+            status, body, content_type = await self._dispatch(reader)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            status, body, content_type = _json_body(400, {"error": "Malformed request."})
+        headers = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            "Connection: close",
+        ]
+        if status == 429:
+            headers.append(f"Retry-After: {RETRY_AFTER_SECONDS}")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _dispatch(self, reader: asyncio.StreamReader) -> tuple[int, bytes, str]:
+        method, path, body = await _read_request(reader)
+        parts = [part for part in urlsplit(path).path.split("/") if part]
+        if parts == ["health"] and method == "GET":
+            return _json_body(200, self.health())
+        if parts == ["jobs"]:
+            if method != "POST":
+                return _json_body(405, {"error": "Use POST to submit a job."})
+            try:
+                options = json.loads(body or b"{}")
+                job = self.submit(options)
+            except json.JSONDecodeError:
+                return _json_body(400, {"error": "Job body must be JSON."})
+            except JobOptionsError as exc:
+                return _json_body(400, {"error": str(exc)})
+            except QueueFullError as exc:
+                return _json_body(429, {"error": str(exc)})
+            return _json_body(202, job.to_dict())
+        if len(parts) in {2, 3} and parts[0] == "jobs" and method == "GET":
+            self.prune_jobs()
+            job = self.jobs.get(parts[1])
+            if job is None:
+                return _json_body(404, {"error": "Unknown job."})
+            if len(parts) == 2:
+                return _json_body(200, job.to_dict())
+            if parts[2] == "result":
+                if job.status not in {"success", "partial_success"}:
+                    return _json_body(409, job.to_dict())
+                markdown = job.output_path.read_bytes()
+                return 200, markdown, "text/markdown; charset=utf-8"
+        return _json_body(404, {"error": "Not found."})
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, bytes]:
+    request_line = (await reader.readline()).decode("latin-1").split()
+    if len(request_line) != 3:
+        raise ValueError("Bad request line.")
+    method, target, _version = request_line
+    headers: dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in {b"\r\n", b"\n", b""}:
+            break
+        name, _sep, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0") or 0)
+    if length < 0 or length > MAX_BODY_BYTES:
+        raise ValueError("Request body too large.")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, body
+
+
+def _json_body(status: int, payload: object) -> tuple[int, bytes, str]:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    return status, body, "application/json"
+
+
+async def serve(
+    service: ConversionService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+) -> None:
+    """Run the HTTP front end until cancelled."""
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def build_serve_parser() -> argparse.ArgumentParser:
+    """Construct the `serve` sub-command parser."""
+    parser = argparse.ArgumentParser(
+        prog="pdf-to-markdown serve",
+        description="Run a local HTTP conversion service with warm Docling converters.",
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Bind address; keep it local (default: {DEFAULT_HOST}).",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"TCP port (default: {DEFAULT_PORT}).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Documents converted concurrently (default: 1).",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f"Waiting jobs accepted before answering 429 (default: {DEFAULT_QUEUE_SIZE}).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default="service_output",
+        help="Directory for job Markdown, one sub-folder per job (default: service_output).",
+    )
+    parser.add_argument(
+        "--converter-cache-size",
+        type=int,
+        help="Maximum number of warm Docling converters kept in memory.",
+    )
+    parser.add_argument(
+        "--job-ttl",
+        type=float,
+        default=DEFAULT_JOB_TTL_SECONDS,
+        help=(
+            "Seconds a finished job and its output stay retrievable "
+            f"(default: {DEFAULT_JOB_TTL_SECONDS:.0f})."
+        ),
+    )
+    parser.add_argument(
+        "--max-finished-jobs",
+        type=int,
+        default=DEFAULT_MAX_FINISHED_JOBS,
+        help=(
+            "Finished jobs kept before the oldest are dropped "
+            f"(default: {DEFAULT_MAX_FINISHED_JOBS})."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help=(
+            "Directory for cached raw conversions shared by all jobs "
+            "(default: CONVERSION_CACHE_DIR or ~/.cache/pdf_to_markdown_docling/conversions)."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always run the Docling models instead of reusing cached conversions.",
+    )
+    parser.add_argument("--quiet", action="store_true", help="Reduce logging noise.")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the conversion service."""
+    args = build_serve_parser().parse_args(argv)
+    if args.jobs < 1:
+        raise SystemExit("--jobs must be at least 1.")
+    if args.queue_size < 1:
+        raise SystemExit("--queue-size must be at least 1.")
+    if args.job_ttl <= 0:
+        raise SystemExit("--job-ttl must be positive.")
+    if args.max_finished_jobs < 0:
+        raise SystemExit("--max-finished-jobs must not be negative.")
+    if args.converter_cache_size is not None:
+        from pdf_to_markdown_docling.converter_pool import get_converter_pool
+
+        if args.converter_cache_size < 1:
+            raise SystemExit("--converter-cache-size must be at least 1.")
+        get_converter_pool().resize(args.converter_cache_size)
+
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format="%(levelname)s: %(message)s",
+    )
+    output_dir = Path(args.output_dir).expanduser().resolve()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    service = ConversionService(
+        output_dir=output_dir,
+        queue_size=args.queue_size,
+        workers=args.jobs,
+        job_ttl=args.job_ttl,
+        max_finished_jobs=args.max_finished_jobs,
+        cache=build_conversion_cache(args),
+    )
+    print(f"Serving conversions on http://{args.host}:{args.port} (output: {output_dir})")
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
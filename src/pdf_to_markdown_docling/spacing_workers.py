@@ -0,0 +1,190 @@
+"""@fileoverview Per-page work units and a process pool for the spacing fixers.
+
+Spacing repair of one page never reads another page, so the fixers detach the candidate
+cells/items into picklable units grouped by page, repair each page against a PDF handle
+(one per worker process), and apply the returned text in the parent document.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Callable, Optional
+
+from docling_core.types.doc import TableItem
+from docling_core.types.doc.base import BoundingBox
+
+from pdf_to_markdown_docling.metrics import (
+    Span,
+    merge_worker_spans,
+    metrics_enabled,
+    stage,
+    worker_metrics,
+)
+
+# WHY: Set by the pool initializer; each worker process keeps its own open PDF handle.
+_WORKER_HANDLE: object = None
+
+
+@dataclass(frozen=True)
+class SpacingWorkUnit:
+    """One table cell or text item to repair, detached from the document."""
+
+    target: int
+    table_cell: bool
+    bbox: BoundingBox
+    text: str
+
+
+@dataclass
+class SpacingWork:
+    """Candidate units grouped by page plus the document objects they write back to."""
+
+    targets: list[tuple[object, bool]]
+    units_by_page: dict[int, list[SpacingWorkUnit]]
+
+    def apply(self, replacements: list[tuple[int, str]]) -> tuple[int, int]:
+        """Write repaired text back; returns (table_cells, text_items) replaced."""
+        table_cells = 0
+        text_items = 0
+        for target, text in replacements:
+            obj, table_cell = self.targets[target]
+            obj.text = text
+            if table_cell:
+                table_cells += 1
+            else:
+                text_items += 1
+        return table_cells, text_items
+
+
+def collect_spacing_work(
+    doc,
+    *,
+    pages_to_fix: Optional[set[int]],
+    cell_predicate: Callable[[str], bool],
+    text_predicate: Callable[[str], bool],
+) -> SpacingWork:
+    """Group table cells and text items needing repair by their first provenance page.
+
+    @param pages_to_fix - Pages to scan; None scans every page.
+    """
+    targets: list[tuple[object, bool]] = []
+    units_by_page: dict[int, list[SpacingWorkUnit]] = {}
+
+    def add(page_no: int, obj: object, table_cell: bool, bbox: BoundingBox, text: str) -> None:
+        units_by_page.setdefault(page_no, []).append(
+            SpacingWorkUnit(target=len(targets), table_cell=table_cell, bbox=bbox, text=text)
+        )
+        targets.append((obj, table_cell))
+
+    for item, _level in doc.iterate_items():
+        if isinstance(item, TableItem):
+            page_no = item.prov[0].page_no if item.prov else None
+            if page_no is None or (pages_to_fix is not None and page_no not in pages_to_fix):
+                continue
+            for cell in item.data.table_cells:
+                if cell.bbox is None or not cell_predicate(cell.text):
+                    continue
+                add(page_no, cell, True, cell.bbox, cell.text)
+        else:
+            text = getattr(item, "text", None)
+            if not text or not text_predicate(text):
+                continue
+            if not getattr(item, "prov", None):
+                continue
+            page_no = item.prov[0].page_no
+            if page_no is None or (pages_to_fix is not None and page_no not in pages_to_fix):
+                continue
+            bbox = item.prov[0].bbox
+            if bbox is None:
+                continue
+            add(page_no, item, False, bbox, text)
+    return SpacingWork(targets=targets, units_by_page=units_by_page)
+
+
+def _init_worker(open_handle: Callable[[Path], object], pdf_path: Path) -> None:
+    global _WORKER_HANDLE
+    _WORKER_HANDLE = open_handle(pdf_path)
+
+
+def _repair_page_staged(
+    repair_page: Callable[[object, int, list[SpacingWorkUnit]], list[tuple[int, str]]],
+    handle: object,
+    page_no: int,
+    units: list[SpacingWorkUnit],
+) -> list[tuple[int, str]]:
+    with stage("spacing_fix.page", page=page_no) as span:
+        replacements = repair_page(handle, page_no, units)
+        span.count("units", len(units))
+        span.count("replaced", len(replacements))
+    return replacements
+
+
+def _repair_in_worker(
+    repair_page: Callable[[object, int, list[SpacingWorkUnit]], list[tuple[int, str]]],
+    record_metrics: bool,
+    job: tuple[int, list[SpacingWorkUnit]],
+) -> tuple[list[tuple[int, str]], list[Span]]:
+    page_no, units = job
+    with worker_metrics(record_metrics) as spans:
+        replacements = _repair_page_staged(repair_page, _WORKER_HANDLE, page_no, units)
+    return replacements, spans
+
+
+def run_page_repairs(
+    pdf_path: Path,
+    units_by_page: dict[int, list[SpacingWorkUnit]],
+    *,
+    open_handle: Callable[[Path], object],
+    close_handle: Callable[[object], None],
+    repair_page: Callable[[object, int, list[SpacingWorkUnit]], list[tuple[int, str]]],
+    workers: int = 1,
+    handle: Optional[object] = None,
+) -> list[tuple[int, str]]:
+    """Repair every page's units, in-process or across `workers` processes.
+
+    `open_handle`/`repair_page` must be module-level functions (or partials of them) so
+    they pickle into worker processes.
+
+    @param handle - Already open handle (owned by the caller) for in-process repair,
+        e.g. from the document's shared `PdfResources`; workers still open their own.
+
+    @example
+    replacements = run_page_repairs(
+        pdf_path, work.units_by_page,
+        open_handle=fitz.open, close_handle=fitz.Document.close,
+        repair_page=repair, workers=4,
+    )
+    """
+    jobs = sorted(units_by_page.items())
+    workers = min(workers, len(jobs))
+    replacements: list[tuple[int, str]] = []
+    if workers <= 1:
+        if not jobs:
+            return replacements
+        if handle is not None:
+            for page_no, units in jobs:
+                replacements.extend(_repair_page_staged(repair_page, handle, page_no, units))
+            return replacements
+        handle = open_handle(pdf_path)
+        try:
+            for page_no, units in jobs:
+                replacements.extend(_repair_page_staged(repair_page, handle, page_no, units))
+        finally:
+            close_handle(handle)
+        return replacements
+
+    # WHY: Handles are not picklable and re-opening per page costs a full xref parse;
+    # the initializer opens one handle per worker for all the pages it receives.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(open_handle, pdf_path),
+    ) as pool:
+        repair = partial(_repair_in_worker, repair_page, metrics_enabled())
+        for page_replacements, spans in pool.map(repair, jobs):
+            replacements.extend(page_replacements)
+            merge_worker_spans(spans)
+    return replacements
@@ -4,10 +4,10 @@ from __future__ import annotations
 
 from collections import defaultdict
 import re
-from typing import Iterable
+from typing import Iterable, Iterator
 
 from docling_core.types.doc import TableItem
-from docling_core.types.doc.base import BoundingBox
+from docling_core.types.doc.base import BoundingBox, CoordOrigin
 from docling_core.types.doc.document import TableCell
 
 from pdf_to_markdown_docling.audit_utils import is_spaced_text
@@ -54,6 +54,7 @@ _CURRENCY_TRAILING_SHORT_PATTERN = re.compile(
 _PARENS_SPACE_OPEN_PATTERN = re.compile(r"\(\s+(?=\d)")
 _PARENS_SPACE_CLOSE_PATTERN = re.compile(r"(?<=\d)\s+\)")
 _NEGATIVE_SPACE_PATTERN = re.compile(r"(?<!\w)-\s+(?=\d)")
+_MIN_TABLE_IOU = 0.5
 
 
 def _is_numericish(text: str) -> bool:
@@ -269,17 +270,17 @@ def _tables_by_page(items: Iterable[TableItem]) -> dict[int, list[TableItem]]:
     return pages
 
 
+def _cell_key(cell: TableCell) -> tuple[int, int, int, int]:
+    return (
+        cell.start_row_offset_idx,
+        cell.end_row_offset_idx,
+        cell.start_col_offset_idx,
+        cell.end_col_offset_idx,
+    )
+
+
 def _table_cells_by_key(table: TableItem) -> dict[tuple[int, int, int, int], str]:
-    mapping: dict[tuple[int, int, int, int], str] = {}
-    for cell in table.data.table_cells:
-        key = (
-            cell.start_row_offset_idx,
-            cell.end_row_offset_idx,
-            cell.start_col_offset_idx,
-            cell.end_col_offset_idx,
-        )
-        mapping[key] = cell.text
-    return mapping
+    return {_cell_key(cell): cell.text for cell in table.data.table_cells}
 
 
 def _bbox_area(bbox) -> float:
@@ -298,17 +299,157 @@ def _bbox_intersection_area(a, b) -> float:
     return width * height
 
 
-def _collect_cells_by_page(items: Iterable[TableItem]) -> dict[int, list[tuple[object, str]]]:
-    pages: dict[int, list[tuple[object, str]]] = defaultdict(list)
+class _CellGridIndex:
+    """Uniform grid over one page's OCR cell bboxes for overlap candidate lookups.
+
+    The grid pitch is the median cell size, so a base cell only visits the handful of
+    buckets it spans instead of every OCR cell on the page. Candidates come back in
+    insertion order, which keeps first-best tie-breaking identical to a linear scan.
+    """
+
+    def __init__(self, cells: list[tuple[BoundingBox, str, float]]) -> None:
+        self.cells = cells
+        widths = sorted(bbox.r - bbox.l for bbox, _text, _area in cells)
+        heights = sorted(bbox.b - bbox.t for bbox, _text, _area in cells)
+        self.pitch_x = max(widths[len(widths) // 2], 1.0) if widths else 1.0
+        self.pitch_y = max(heights[len(heights) // 2], 1.0) if heights else 1.0
+        self.buckets: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for index, (bbox, _text, _area) in enumerate(cells):
+            for key in self._keys(bbox):
+                self.buckets[key].append(index)
+
+    def _keys(self, bbox) -> Iterable[tuple[int, int]]:
+        x0, x1 = int(bbox.l // self.pitch_x), int(bbox.r // self.pitch_x)
+        y0, y1 = int(bbox.t // self.pitch_y), int(bbox.b // self.pitch_y)
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                yield gx, gy
+
+    def candidates(self, bbox) -> list[tuple[BoundingBox, str, float]]:
+        # WHY: Two boxes with positive overlap share an interior point, hence a bucket.
+        found: set[int] = set()
+        for key in self._keys(bbox):
+            found.update(self.buckets.get(key, ()))
+        return [self.cells[index] for index in sorted(found)]
+
+
+def _ocr_cell_indexes(items: Iterable[TableItem]) -> dict[int, _CellGridIndex]:
+    """Index usable OCR cells (text present, not spaced, positive area) per page."""
+    pages: dict[int, list[tuple[BoundingBox, str, float]]] = defaultdict(list)
     for table in items:
         page_no = _table_page_no(table)
         if page_no is None:
             continue
         for cell in table.data.table_cells:
-            if cell.bbox is None:
+            if cell.bbox is None or not cell.text or is_spaced_text(cell.text):
                 continue
-            pages[page_no].append((cell.bbox, cell.text))
-    return pages
+            area = _bbox_area(cell.bbox)
+            if area > 0:
+                pages[page_no].append((cell.bbox, cell.text, area))
+    return {page_no: _CellGridIndex(cells) for page_no, cells in pages.items()}
+
+
+def _same_shape(base_table: TableItem, ocr_table: TableItem) -> bool:
+    return (
+        base_table.data.num_rows == ocr_table.data.num_rows
+        and base_table.data.num_cols == ocr_table.data.num_cols
+    )
+
+
+def _table_iou(base_table: TableItem, ocr_table: TableItem, ocr_doc) -> float:
+    base_bbox = base_table.prov[0].bbox
+    ocr_bbox = ocr_table.prov[0].bbox
+    if ocr_bbox.coord_origin != base_bbox.coord_origin:
+        page = ocr_doc.pages.get(ocr_table.prov[0].page_no)
+        if page is None:
+            return 0.0
+        page_height = page.size.height
+        ocr_bbox = (
+            ocr_bbox.to_top_left_origin(page_height)
+            if base_bbox.coord_origin is CoordOrigin.TOPLEFT
+            else ocr_bbox.to_bottom_left_origin(page_height)
+        )
+    return base_bbox.intersection_over_union(ocr_bbox)
+
+
+def _align_page_tables(
+    base_tables: list[TableItem], ocr_tables: list[TableItem], ocr_doc
+) -> dict[int, TableItem]:
+    """Pair base tables (by index) with the OCR table covering the same region.
+
+    Greedy by IoU (equal shape breaks ties), so a table whose row/column count moved
+    under OCR still finds its partner, and two same-shaped tables are never crossed.
+    """
+    scored = []
+    for base_idx, base_table in enumerate(base_tables):
+        for ocr_idx, ocr_table in enumerate(ocr_tables):
+            iou = _table_iou(base_table, ocr_table, ocr_doc)
+            if iou >= _MIN_TABLE_IOU:
+                same_shape = _same_shape(base_table, ocr_table)
+                scored.append((-iou, not same_shape, base_idx, ocr_idx))
+    scored.sort()
+    pairs: dict[int, TableItem] = {}
+    used: set[int] = set()
+    for _score, _shape, base_idx, ocr_idx in scored:
+        if base_idx in pairs or ocr_idx in used:
+            continue
+        pairs[base_idx] = ocr_tables[ocr_idx]
+        used.add(ocr_idx)
+    return pairs
+
+
+def _align_tables(
+    base_by_page: dict[int, list[TableItem]],
+    ocr_by_page: dict[int, list[TableItem]],
+    ocr_doc,
+) -> dict[int, dict[int, TableItem]]:
+    return {
+        page_no: _align_page_tables(base_page_tables, ocr_by_page[page_no], ocr_doc)
+        for page_no, base_page_tables in base_by_page.items()
+        if ocr_by_page.get(page_no)
+    }
+
+
+def _fallback_indexes(
+    base_by_page: dict[int, list[TableItem]],
+    ocr_tables: list[TableItem],
+    alignments: dict[int, dict[int, TableItem]],
+) -> Iterator[tuple[TableItem, _CellGridIndex]]:
+    """Yield each base table with the OCR cell index its bbox fallback should search.
+
+    Aligned tables search only their partner's cells; unaligned ones (and partners with
+    no usable cells) search every OCR cell on the page.
+    """
+    page_indexes = _ocr_cell_indexes(ocr_tables)
+    for page_no, base_page_tables in base_by_page.items():
+        page_index = page_indexes.get(page_no)
+        if page_index is None:
+            continue
+        pairs = alignments.get(page_no, {})
+        for base_idx, base_table in enumerate(base_page_tables):
+            index = page_index
+            if base_idx in pairs:
+                index = _ocr_cell_indexes([pairs[base_idx]]).get(page_no, page_index)
+            yield base_table, index
+
+
+def _best_overlapping_text(index: _CellGridIndex, bbox, base_area: float) -> str:
+    """OCR text whose cell best covers `bbox` (>=50% of base, >=15% of OCR cell)."""
+    best_text = ""
+    best_score = 0.0
+    for ocr_bbox, ocr_text, ocr_area in index.candidates(bbox):
+        inter_area = _bbox_intersection_area(bbox, ocr_bbox)
+        if inter_area <= 0:
+            continue
+        base_cover = inter_area / base_area
+        ocr_cover = inter_area / ocr_area
+        if base_cover < 0.5 or ocr_cover < 0.15:
+            continue
+        score = base_cover * 0.7 + ocr_cover * 0.3
+        if score > best_score:
+            best_score = score
+            best_text = ocr_text
+    return best_text
 
 
 def _header_column_groups(table: TableItem) -> list[tuple[int, int]] | None:
@@ -605,16 +746,23 @@ def normalize_document_table_headers(doc) -> int:
     return updated
 
 
+def clean_table_cells(table: TableItem) -> int:
+    """Normalize numeric/percent quirks in one table's cells."""
+    updated = 0
+    for cell in table.data.table_cells:
+        cleaned = _clean_table_cell_text(cell.text)
+        if cleaned != cell.text:
+            cell.text = cleaned
+            updated += 1
+    return updated
+
+
 def clean_document_table_cells(doc) -> int:
     """Normalize numeric/percent quirks in table cells after repairs."""
     updated = 0
     for item, _level in doc.iterate_items():
         if isinstance(item, TableItem):
-            for cell in item.data.table_cells:
-                cleaned = _clean_table_cell_text(cell.text)
-                if cleaned != cell.text:
-                    cell.text = cleaned
-                    updated += 1
+            updated += clean_table_cells(item)
     return updated
 
 
@@ -692,6 +840,24 @@ def count_suspect_table_cells(doc) -> int:
     return count
 
 
+def find_suspect_table_cell_pages(doc) -> set[int] | None:
+    """Return pages holding truncated currency cells (None if a table has no page)."""
+    pages: set[int] = set()
+    for item, _level in doc.iterate_items():
+        if not isinstance(item, TableItem):
+            continue
+        for cell in item.data.table_cells:
+            if not cell.text:
+                continue
+            if _is_suspect_currency_cell(_clean_table_cell_text(cell.text)):
+                page_no = _table_page_no(item)
+                if page_no is None:
+                    return None
+                pages.add(page_no)
+                break
+    return pages
+
+
 def merge_suspect_table_cells(base_doc, ocr_doc) -> int:
     """Replace suspect numeric table cells with higher-quality OCR versions."""
     base_tables = [item for item, _ in base_doc.iterate_items() if isinstance(item, TableItem)]
@@ -699,85 +865,39 @@ def merge_suspect_table_cells(base_doc, ocr_doc) -> int:
 
     base_by_page = _tables_by_page(base_tables)
     ocr_by_page = _tables_by_page(ocr_tables)
+    alignments = _align_tables(base_by_page, ocr_by_page, ocr_doc)
 
     replaced = 0
 
-    for page_no, base_page_tables in base_by_page.items():
-        ocr_page_tables = ocr_by_page.get(page_no, [])
-        if not ocr_page_tables:
-            continue
-
-        used = set()
-        for base_table in base_page_tables:
-            match_idx = None
-            for idx, ocr_table in enumerate(ocr_page_tables):
-                if idx in used:
-                    continue
-                if (
-                    base_table.data.num_rows == ocr_table.data.num_rows
-                    and base_table.data.num_cols == ocr_table.data.num_cols
-                ):
-                    match_idx = idx
-                    break
-            if match_idx is None:
+    for page_no, pairs in alignments.items():
+        for base_idx, ocr_table in pairs.items():
+            base_table = base_by_page[page_no][base_idx]
+            if not _same_shape(base_table, ocr_table):
                 continue
-            used.add(match_idx)
-            ocr_table = ocr_page_tables[match_idx]
-
             ocr_cells = _table_cells_by_key(ocr_table)
             for cell in base_table.data.table_cells:
                 if not cell.text:
                     continue
-                key = (
-                    cell.start_row_offset_idx,
-                    cell.end_row_offset_idx,
-                    cell.start_col_offset_idx,
-                    cell.end_col_offset_idx,
-                )
-                ocr_text = ocr_cells.get(key, "")
+                ocr_text = ocr_cells.get(_cell_key(cell), "")
                 if not ocr_text:
                     continue
                 if _should_replace_numeric_cell(cell.text, ocr_text):
                     cell.text = ocr_text
                     replaced += 1
 
-    ocr_cells_by_page = _collect_cells_by_page(ocr_tables)
-    for page_no, base_page_tables in base_by_page.items():
-        ocr_cells = ocr_cells_by_page.get(page_no, [])
-        if not ocr_cells:
-            continue
-        for base_table in base_page_tables:
-            for cell in base_table.data.table_cells:
-                if not cell.text or cell.bbox is None:
-                    continue
+    for base_table, ocr_index in _fallback_indexes(base_by_page, ocr_tables, alignments):
+        for cell in base_table.data.table_cells:
+            if not cell.text or cell.bbox is None:
+                continue
 
-                base_area = _bbox_area(cell.bbox)
-                if base_area <= 0:
-                    continue
+            base_area = _bbox_area(cell.bbox)
+            if base_area <= 0:
+                continue
 
-                best_text = ""
-                best_score = 0.0
-                for ocr_bbox, ocr_text in ocr_cells:
-                    if not ocr_text or is_spaced_text(ocr_text):
-                        continue
-                    inter_area = _bbox_intersection_area(cell.bbox, ocr_bbox)
-                    if inter_area <= 0:
-                        continue
-                    ocr_area = _bbox_area(ocr_bbox)
-                    if ocr_area <= 0:
-                        continue
-                    base_cover = inter_area / base_area
-                    ocr_cover = inter_area / ocr_area
-                    if base_cover < 0.5 or ocr_cover < 0.15:
-                        continue
-                    score = base_cover * 0.7 + ocr_cover * 0.3
-                    if score > best_score:
-                        best_score = score
-                        best_text = ocr_text
-
-                if best_text and _should_replace_numeric_cell(cell.text, best_text):
-                    cell.text = best_text
-                    replaced += 1
+            best_text = _best_overlapping_text(ocr_index, cell.bbox, base_area)
+            if best_text and _should_replace_numeric_cell(cell.text, best_text):
+                cell.text = best_text
+                replaced += 1
 
     return replaced
 
@@ -789,9 +909,6 @@ def merge_spaced_table_cells(
     base_tables = [item for item, _ in base_doc.iterate_items() if isinstance(item, TableItem)]
     ocr_tables = [item for item, _ in ocr_doc.iterate_items() if isinstance(item, TableItem)]
 
-    base_by_page = _tables_by_page(base_tables)
-    ocr_by_page = _tables_by_page(ocr_tables)
-
     replaced = 0
     total_spaced = 0
 
@@ -803,82 +920,40 @@ def merge_spaced_table_cells(
     if ratio_only:
         return replaced, total_spaced
 
-    for page_no, base_page_tables in base_by_page.items():
-        ocr_page_tables = ocr_by_page.get(page_no, [])
-        if not ocr_page_tables:
-            continue
+    base_by_page = _tables_by_page(base_tables)
+    ocr_by_page = _tables_by_page(ocr_tables)
+    alignments = _align_tables(base_by_page, ocr_by_page, ocr_doc)
 
-        used = set()
-        for base_table in base_page_tables:
-            match_idx = None
-            for idx, ocr_table in enumerate(ocr_page_tables):
-                if idx in used:
-                    continue
-                if (
-                    base_table.data.num_rows == ocr_table.data.num_rows
-                    and base_table.data.num_cols == ocr_table.data.num_cols
-                ):
-                    match_idx = idx
-                    break
-            if match_idx is None:
+    for page_no, pairs in alignments.items():
+        for base_idx, ocr_table in pairs.items():
+            base_table = base_by_page[page_no][base_idx]
+            if not _same_shape(base_table, ocr_table):
                 continue
-            used.add(match_idx)
-            ocr_table = ocr_page_tables[match_idx]
-
             ocr_cells = _table_cells_by_key(ocr_table)
             for cell in base_table.data.table_cells:
                 if not is_spaced_text(cell.text):
                     continue
-                key = (
-                    cell.start_row_offset_idx,
-                    cell.end_row_offset_idx,
-                    cell.start_col_offset_idx,
-                    cell.end_col_offset_idx,
-                )
-                ocr_text = ocr_cells.get(key, "")
+                ocr_text = ocr_cells.get(_cell_key(cell), "")
                 if ocr_text and not is_spaced_text(ocr_text):
                     cell.text = ocr_text
                     replaced += 1
 
-    # WHY: Some OCR tables cannot be matched by shape; use spatial overlap as fallback.
-    ocr_cells_by_page = _collect_cells_by_page(ocr_tables)
-    for page_no, base_page_tables in base_by_page.items():
-        ocr_cells = ocr_cells_by_page.get(page_no, [])
-        if not ocr_cells:
-            continue
-        for base_table in base_page_tables:
-            for cell in base_table.data.table_cells:
-                if not is_spaced_text(cell.text):
-                    continue
-                if cell.bbox is None:
-                    continue
+    # WHY: Tables whose shape changed under OCR (or found no partner) still match
+    # cell by cell through bbox overlap.
+    for base_table, ocr_index in _fallback_indexes(base_by_page, ocr_tables, alignments):
+        for cell in base_table.data.table_cells:
+            if not is_spaced_text(cell.text):
+                continue
+            if cell.bbox is None:
+                continue
 
-                base_area = _bbox_area(cell.bbox)
-                if base_area <= 0:
-                    continue
+            base_area = _bbox_area(cell.bbox)
+            if base_area <= 0:
+                continue
 
-                best_text = ""
-                best_score = 0.0
-                for ocr_bbox, ocr_text in ocr_cells:
-                    if not ocr_text or is_spaced_text(ocr_text):
-                        continue
-                    inter_area = _bbox_intersection_area(cell.bbox, ocr_bbox)
-                    if inter_area <= 0:
-                        continue
-                    ocr_area = _bbox_area(ocr_bbox)
-                    if ocr_area <= 0:
-                        continue
-                    base_cover = inter_area / base_area
-                    ocr_cover = inter_area / ocr_area
-                    if base_cover < 0.5 or ocr_cover < 0.15:
-                        continue
-                    score = base_cover * 0.7 + ocr_cover * 0.3
-                    if score > best_score:
-                        best_score = score
-                        best_text = ocr_text
-
-                if best_text:
-                    cell.text = best_text
-                    replaced += 1
+            best_text = _best_overlapping_text(ocr_index, cell.bbox, base_area)
+            if best_text:
+                cell.text = best_text
+                replaced += 1
 
     return replaced, total_spaced
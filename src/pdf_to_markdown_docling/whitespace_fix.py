@@ -20,19 +20,25 @@ def normalize_text_whitespace(text: str) -> str:
     return normalized
 
 
+def normalize_item_text_whitespace(item) -> int:
+    """Normalize whitespace, mojibake and ligatures in one text item; returns 1 if changed."""
+    text = getattr(item, "text", None)
+    if not text:
+        return 0
+    normalized = normalize_text_whitespace(text)
+    normalized = normalize_mojibake_text(normalized)
+    normalized = normalize_ligatures(normalized)
+    if normalized == text:
+        return 0
+    item.text = normalized
+    return 1
+
+
 def normalize_document_text_whitespace(doc) -> int:
     """Normalize extra whitespace for non-table text items in a document."""
     updated = 0
     for item, _level in doc.iterate_items():
         if isinstance(item, TableItem):
             continue
-        text = getattr(item, "text", None)
-        if not text:
-            continue
-        normalized = normalize_text_whitespace(text)
-        normalized = normalize_mojibake_text(normalized)
-        normalized = normalize_ligatures(normalized)
-        if normalized != text:
-            item.text = normalized
-            updated += 1
+        updated += normalize_item_text_whitespace(item)
     return updated
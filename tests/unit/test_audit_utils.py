@@ -6,12 +6,23 @@ import unittest
 
 from pdf_to_markdown_docling.audit_utils import (
     _is_toc_like_table,
+    audit_document,
+    classify_spacing,
     is_multi_space_text,
     is_spaced_text,
     needs_spacing_fix,
     needs_table_spacing_fix,
+    scan_document_health,
 )
-from docling_core.types.doc.document import TableCell, TableData, TableItem
+from docling_core.types.doc.base import BoundingBox, Size
+from docling_core.types.doc.document import (
+    DoclingDocument,
+    ProvenanceItem,
+    TableCell,
+    TableData,
+    TableItem,
+)
+from docling_core.types.doc.labels import DocItemLabel
 
 
 class AuditUtilsTests(unittest.TestCase):
@@ -151,6 +162,129 @@ class AuditUtilsTests(unittest.TestCase):
         # Assert
         self.assertFalse(result)
 
+    def test_classify_spacing_flags_table_splits_once_per_text(self) -> None:
+        # Arrange
+        text = "Venituri totale d in exploatare"
+        classify_spacing.cache_clear()
+
+        # Act
+        flags = classify_spacing(text)
+        needs_table_spacing_fix(text)
+        needs_spacing_fix(text)
+
+        # Assert
+        self.assertTrue(flags.needs_table_spacing_fix)
+        self.assertEqual(flags.needs_spacing_fix, needs_spacing_fix(text))
+        self.assertEqual(classify_spacing.cache_info().misses, 1)
+
+
+class AuditDocumentTests(unittest.TestCase):
+    def test_page_rows_and_document_metrics_share_one_pass(self) -> None:
+        # Arrange
+        doc = DoclingDocument(name="audit")
+        for page_no, text in ((1, "Revenue grew 27% on 30.09.2025"), (2, "Net profit 1.250")):
+            doc.add_page(page_no=page_no, size=Size(width=600, height=800))
+            doc.add_text(
+                label=DocItemLabel.TEXT,
+                text=text,
+                prov=ProvenanceItem(
+                    page_no=page_no,
+                    bbox=BoundingBox(l=10, t=10, r=200, b=30),
+                    charspan=(0, len(text)),
+                ),
+            )
+        markdown = "Revenue grew 27% on 30.09.2025\n\n<!-- page break -->\n\nNet profit"
+
+        # Act
+        audit = audit_document(doc, markdown)
+
+        # Assert
+        self.assertEqual([page.page_no for page in audit.pages], [1, 2])
+        self.assertEqual(audit.pages[0].token_coverage, 1.0)
+        self.assertEqual(audit.pages[1].numeric_recall, 0.0)
+        self.assertAlmostEqual(audit.pages[1].token_coverage, 2 / 4)
+        self.assertAlmostEqual(audit.metrics.token_coverage, 9 / 11)
+        self.assertAlmostEqual(audit.metrics.numeric_recall, 3 / 4)
+        self.assertEqual(audit.metrics.date_recall, 1.0)
+
+    def test_text_lengths_match_plain_text_export(self) -> None:
+        # Arrange
+        doc = DoclingDocument(name="audit")
+        for page_no in (1, 2):
+            doc.add_page(page_no=page_no, size=Size(width=600, height=800))
+            prov = ProvenanceItem(
+                page_no=page_no, bbox=BoundingBox(l=10, t=10, r=200, b=30), charspan=(0, 1)
+            )
+            doc.add_text(label=DocItemLabel.TEXT, text=f"Pagina {page_no}", prov=prov)
+            data = TableData(num_rows=2, num_cols=2)
+            for row, values in enumerate((("Indicator", "2025"), ("Venituri totale", "1"))):
+                for col, value in enumerate(values):
+                    data.table_cells.append(
+                        TableCell(
+                            text=value,
+                            start_row_offset_idx=row,
+                            end_row_offset_idx=row + 1,
+                            start_col_offset_idx=col,
+                            end_col_offset_idx=col + 1,
+                        )
+                    )
+            doc.add_table(data=data, prov=prov)
+
+        # Act
+        audit = audit_document(doc, "")
+
+        # Assert
+        # WHY: Lengths must stay comparable with reports produced from the padded export.
+        self.assertEqual(
+            [page.pdf_text_length for page in audit.pages],
+            [len(doc.export_to_text(page_no=page_no)) for page_no in (1, 2)],
+        )
+        self.assertEqual(audit.metrics.pdf_text_length, len(doc.export_to_text()))
+
+
+class ScanDocumentHealthTests(unittest.TestCase):
+    def test_counts_spacing_per_page_for_ocr_targeting(self) -> None:
+        # Arrange
+        doc = DoclingDocument(name="health")
+        for page_no in (1, 2, 3):
+            doc.add_page(page_no=page_no, size=Size(width=600, height=800))
+        cells = [
+            TableCell(
+                start_row_offset_idx=0,
+                end_row_offset_idx=1,
+                start_col_offset_idx=col,
+                end_col_offset_idx=col + 1,
+                text=text,
+            )
+            for col, text in enumerate(("V e n i t u r i", "245.140.981"))
+        ]
+        doc.add_table(
+            data=TableData(num_rows=1, num_cols=2, table_cells=cells),
+            prov=ProvenanceItem(
+                page_no=2, bbox=BoundingBox(l=10, t=10, r=300, b=40), charspan=(0, 0)
+            ),
+        )
+        text = "Cifra de afaceri a crescut  semnificativ in perioada analizata." * 4
+        doc.add_text(
+            label=DocItemLabel.TEXT,
+            text=text,
+            prov=ProvenanceItem(
+                page_no=3, bbox=BoundingBox(l=10, t=10, r=300, b=40), charspan=(0, len(text))
+            ),
+        )
+
+        # Act
+        health = scan_document_health(doc)
+
+        # Assert
+        self.assertEqual([page.page_no for page in health.pages], [1, 2, 3])
+        self.assertEqual(health.pages[1].spaced_table_cells, 1)
+        self.assertEqual(health.pages[2].multi_space_text_items, 1)
+        self.assertEqual(health.spaced_cell_ratio, 0.5)
+        self.assertEqual(health.spaced_table_pages(), {2})
+        self.assertEqual(health.sparse_pages(200), {1, 2})
+        self.assertEqual(health.export_chars, len(doc.export_to_text()))
+
 
 if __name__ == "__main__":
     unittest.main()
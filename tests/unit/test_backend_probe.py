@@ -0,0 +1,57 @@
+"""@fileoverview Unit tests for the model-free text-layer backend probe."""
+
+from __future__ import annotations
+
+import unittest
+
+from pdf_to_markdown_docling.backend_probe import sample_probe_pages, score_text_layer
+
+
+class BackendProbeTests(unittest.TestCase):
+    def test_samples_spread_over_document(self) -> None:
+        # Act
+        pages = sample_probe_pages(19, 3)
+
+        # Assert
+        self.assertEqual(pages, [1, 10, 19])
+
+    def test_samples_stay_inside_page_range(self) -> None:
+        # Act
+        pages = sample_probe_pages(19, 5, page_range=(4, 6))
+
+        # Assert
+        self.assertEqual(pages, [4, 5, 6])
+
+    def test_single_page_sample_uses_first_page(self) -> None:
+        # Act
+        pages = sample_probe_pages(10, 1, page_range=(3, 8))
+
+        # Assert
+        self.assertEqual(pages, [3])
+
+    def test_fragmented_text_layer_scores_lower(self) -> None:
+        # Arrange
+        clean = {1: ["Revenue grew 12% year over year", "Net profit 4.2m RON"]}
+        fragmented = {1: ["Rev", "enue", "grew", "12%", "Net", "profit"]}
+
+        # Act
+        clean_report = score_text_layer(clean)
+        fragmented_report = score_text_layer(fragmented)
+
+        # Assert
+        self.assertGreater(clean_report.score, fragmented_report.score)
+        self.assertEqual(fragmented_report.short_line_count, 4)
+
+    def test_score_averages_pages(self) -> None:
+        # Arrange
+        page_lines = {1: ["Clean line of text"], 2: ["ab"] * 4}
+
+        # Act
+        report = score_text_layer(page_lines)
+
+        # Assert
+        self.assertEqual(report.score, 90)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""@fileoverview Unit tests for batch input discovery and per-file status reporting."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from docling_core.types.doc.base import ImageRefMode
+
+from pdf_to_markdown_docling.batch_utils import (
+    batch_failed,
+    collect_batch_inputs,
+    convert_batch,
+    ensure_unique_batch_outputs,
+    resolve_batch_output_path,
+)
+
+
+class BatchUtilsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_collect_inputs_merges_dir_and_manifest_without_duplicates(self) -> None:
+        # Arrange
+        (self.root / "a.pdf").write_bytes(b"%PDF")
+        (self.root / "b.pdf").write_bytes(b"%PDF")
+        (self.root / "notes.txt").write_text("skip", encoding="utf-8")
+        manifest = self.root / "list.txt"
+        manifest.write_text("# nightly\nb.pdf\n\nc.pdf\n", encoding="utf-8")
+
+        # Act
+        inputs = collect_batch_inputs(input_dir=self.root, manifest=manifest)
+
+        # Assert
+        self.assertEqual([path.name for path in inputs], ["a.pdf", "b.pdf", "c.pdf"])
+
+    def test_output_path_flattens_into_output_dir(self) -> None:
+        # Arrange
+        input_path = self.root / "sub" / "report.pdf"
+
+        # Act
+        result = resolve_batch_output_path(input_path, self.root / "out")
+
+        # Assert
+        self.assertEqual(result, self.root / "out" / "report.md")
+
+    def test_same_named_inputs_mirror_their_directories(self) -> None:
+        # Arrange
+        inputs = [self.root / "in" / "a" / "report.pdf", self.root / "in" / "b" / "report.pdf"]
+        out = self.root / "out"
+        converted = mock.Mock()
+        converted.status = mock.Mock(value="success")
+
+        # WHY: Stub the ML pipeline; this test covers where each file's outputs land.
+        with mock.patch(
+            "pdf_to_markdown_docling.batch_utils.convert_pdf_to_markdown",
+            return_value=(converted, "pypdfium2"),
+        ) as patched, mock.patch(
+            "pdf_to_markdown_docling.export_utils.save_docling_json"
+        ) as saved:
+            # Act
+            results = convert_batch(
+                inputs,
+                output_dir=out,
+                image_mode=ImageRefMode.REFERENCED,
+                images_dir=self.root / "assets",
+                export_json_dir=self.root / "json",
+                quiet=True,
+            )
+
+        # Assert
+        self.assertEqual(
+            [item.output_path for item in results],
+            [out / "a" / "report.md", out / "b" / "report.md"],
+        )
+        self.assertEqual(
+            [call.kwargs["images_dir"] for call in patched.call_args_list],
+            [self.root / "assets" / "a" / "report", self.root / "assets" / "b" / "report"],
+        )
+        self.assertEqual(
+            [call.args[1] for call in saved.call_args_list],
+            [
+                self.root / "json" / "a" / "report.docling.json",
+                self.root / "json" / "b" / "report.docling.json",
+            ],
+        )
+
+    def test_colliding_output_names_fail_before_conversion(self) -> None:
+        # Arrange
+        inputs = [self.root / "report.pdf", self.root / "REPORT.PDF"]
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            ensure_unique_batch_outputs(inputs, self.root)
+        with mock.patch(
+            "pdf_to_markdown_docling.batch_utils.convert_pdf_to_markdown"
+        ) as patched, self.assertRaises(ValueError):
+            convert_batch(
+                inputs,
+                output_dir=self.root / "out",
+                image_mode=ImageRefMode.PLACEHOLDER,
+                quiet=True,
+            )
+        patched.assert_not_called()
+
+    def test_failed_document_is_recorded_and_batch_continues(self) -> None:
+        """A crash on one PDF is reported in the summary while later PDFs still convert.
+
+        WHY: Nightly runs must not lose thousands of conversions to one corrupt file.
+        """
+        # Arrange
+        inputs = [self.root / "bad.pdf", self.root / "good.pdf"]
+        summary_path = self.root / "out" / "batch_summary.jsonl"
+        converted = mock.Mock()
+        converted.status = mock.Mock(value="success")
+
+        def fake_convert(**kwargs):
+            if kwargs["input_path"].name == "bad.pdf":
+                raise RuntimeError("broken xref")
+            return converted, "pypdfium2"
+
+        # WHY: Stub the ML pipeline; this test covers batch bookkeeping only.
+        with mock.patch(
+            "pdf_to_markdown_docling.batch_utils.convert_pdf_to_markdown",
+            side_effect=fake_convert,
+        ) as patched:
+            # Act
+            results = convert_batch(
+                inputs,
+                output_dir=self.root / "out",
+                image_mode=ImageRefMode.PLACEHOLDER,
+                summary_path=summary_path,
+                quiet=True,
+            )
+
+        # Assert
+        self.assertEqual([item.status for item in results], ["error", "success"])
+        self.assertEqual([item.input_path.name for item in batch_failed(results)], ["bad.pdf"])
+        records = [json.loads(line) for line in summary_path.read_text().splitlines()]
+        self.assertEqual(len(records), 2)
+        # WHY: Every call must receive the same converter dict so models stay warm.
+        shared = {id(call.kwargs["converters"]) for call in patched.call_args_list}
+        self.assertEqual(len(shared), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""@fileoverview Unit tests for the pipeline benchmark corpus, measurements and gate."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import fitz
+from docling.datamodel.document import ConversionStatus
+
+from pdf_to_markdown_docling.audit_utils import is_spaced_text
+from pdf_to_markdown_docling.benchmark import (
+    compare_benchmarks,
+    comparison_warnings,
+    corpus_fingerprint,
+    measure_case,
+    measure_fixers,
+    write_synthetic_pdf,
+)
+from pdf_to_markdown_docling.metrics import stage
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def _report(*, wall: float, stage_wall: float, pages_per_second: float, rss: float) -> dict:
+    return {
+        "options": {"ocr_mode": "auto"},
+        "cases": {
+            "dense_tables": {
+                "fingerprint": "abc",
+                "status": "success",
+                "wall_seconds": wall,
+                "pages_per_second": pages_per_second,
+                "peak_rss_mb": rss,
+                "stages": {
+                    "run_conversion": {"wall_seconds": stage_wall},
+                    "markdown.axis": {"wall_seconds": 0.001},
+                },
+            }
+        },
+    }
+
+
+class SyntheticCorpusTests(unittest.TestCase):
+    def test_synthetic_kinds_have_the_intended_text_layers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            spaced = write_synthetic_pdf("spaced_tables", Path(tmp_dir) / "spaced.pdf", pages=1)
+            scanned = write_synthetic_pdf("scanned_pages", Path(tmp_dir) / "scan.pdf", pages=1)
+
+            # Act
+            with fitz.open(spaced) as pdf:
+                spaced_lines = pdf[0].get_text().splitlines()
+            with fitz.open(scanned) as pdf:
+                scanned_text = pdf[0].get_text().strip()
+                scanned_images = pdf[0].get_images()
+
+        # Assert
+        self.assertTrue(any(is_spaced_text(line) for line in spaced_lines))
+        self.assertEqual(scanned_text, "")
+        self.assertEqual(len(scanned_images), 1)
+
+    def test_regenerated_corpus_keeps_its_fingerprint(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            path = Path(tmp_dir) / "dense.pdf"
+            write_synthetic_pdf("dense_tables", path, pages=2)
+            first = corpus_fingerprint(path)
+
+            # Act
+            write_synthetic_pdf("dense_tables", path, pages=2)
+
+            # Assert
+            self.assertEqual(corpus_fingerprint(path), first)
+
+
+class MeasureCaseTests(unittest.TestCase):
+    def test_reports_stage_times_throughput_and_warmup_scope(self) -> None:
+        # Arrange
+        calls: list[object] = []
+
+        def fake_convert(*, input_path: Path, page_range=None, **_options):
+            # WHY: No models in CI; record the requested scope and emit one stage.
+            calls.append(page_range)
+            with stage("run_conversion") as span:
+                span.count("pages", 3)
+            return SimpleNamespace(status=ConversionStatus.SUCCESS), "pypdfium2", ""
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = write_synthetic_pdf("chart_pages", Path(tmp_dir) / "charts.pdf", pages=3)
+
+            # Act
+            measured = measure_case(path, repeat=2, convert=fake_convert, page_range=None)
+
+        # Assert
+        self.assertEqual(calls, [(1, 1), None, None])
+        self.assertEqual(measured["pages"], 3)
+        self.assertEqual(measured["status"], "success")
+        self.assertEqual(measured["stages"]["run_conversion"]["counts"], {"pages": 3})
+        self.assertGreater(measured["pages_per_second"], 0)
+        self.assertGreater(measured["peak_rss_mb"], 0)
+
+
+class MeasureFixersTests(unittest.TestCase):
+    def test_micro_mode_times_fixers_on_a_fresh_copy_each_iteration(self) -> None:
+        # Arrange
+        json_path = ROOT_DIR / "examples" / "long_report.docling.json"
+
+        # Act
+        measured = measure_fixers(json_path, iterations=2, warmup=False)
+
+        # Assert
+        stages = measured["stages"]
+        for name in ("text.is_spaced_text", "fix.cleaned_cells", "markdown.export", "audit"):
+            self.assertEqual(stages[name]["calls"], 1)
+        # WHY: A second pass over an already fixed document would report no changes.
+        self.assertGreater(stages["fix.cleaned_cells"]["counts"]["changed"], 0)
+        self.assertEqual(measured["iterations"], 2)
+
+
+class CompareBenchmarksTests(unittest.TestCase):
+    def test_flags_regressions_beyond_threshold_only(self) -> None:
+        # Arrange
+        baseline = _report(wall=10.0, stage_wall=8.0, pages_per_second=1.0, rss=900.0)
+        current = _report(wall=11.0, stage_wall=10.5, pages_per_second=0.7, rss=920.0)
+        current["cases"]["dense_tables"]["stages"]["markdown.axis"]["wall_seconds"] = 0.004
+
+        # Act
+        regressions = compare_benchmarks(baseline, current, threshold=0.25)
+
+        # Assert
+        self.assertEqual(
+            sorted(item.metric for item in regressions),
+            ["pages_per_second", "stage:run_conversion"],
+        )
+
+    def test_warns_when_inputs_differ(self) -> None:
+        # Arrange
+        baseline = _report(wall=1.0, stage_wall=1.0, pages_per_second=1.0, rss=1.0)
+        current = _report(wall=1.0, stage_wall=1.0, pages_per_second=1.0, rss=1.0)
+        current["cases"]["dense_tables"]["fingerprint"] = "changed"
+
+        # Act
+        warnings = comparison_warnings(baseline, current)
+
+        # Assert
+        self.assertEqual(
+            warnings, ["Case dense_tables has different page content than the baseline."]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,347 @@
+"""@fileoverview Unit tests for the content-addressed conversion cache."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+from docling.datamodel.document import ConversionStatus
+from docling_core.types.doc.base import BoundingBox, ImageRefMode, Size
+from docling_core.types.doc.document import DoclingDocument, ProvenanceItem
+from docling_core.types.doc.labels import DocItemLabel
+
+from pdf_to_markdown_docling.conversion_cache import (
+    ConversionCache,
+    conversion_cache_key,
+    file_sha256,
+    load_cached_pages,
+    store_document_pages,
+)
+from pdf_to_markdown_docling.conversion_utils import (
+    build_pdf_pipeline_options,
+    convert_pdf_to_doc,
+)
+
+
+def _options(*, do_ocr: bool = False):
+    return build_pdf_pipeline_options(
+        image_mode=ImageRefMode.PLACEHOLDER,
+        do_ocr=do_ocr,
+        device="cpu",
+        ocr_engine="tesseract",
+        ocr_lang="eng",
+        force_full_page_ocr=do_ocr,
+        do_cell_matching=do_ocr,
+    )
+
+
+def _document(text: str) -> DoclingDocument:
+    doc = DoclingDocument(name="cached")
+    doc.add_text(label=DocItemLabel.TEXT, text=text)
+    return doc
+
+
+class ConversionCacheTests(unittest.TestCase):
+    def test_key_tracks_content_backend_options_and_range(self) -> None:
+        # Arrange
+        base = dict(file_hash="a" * 64, backend="pypdfium2", pipeline_options=_options())
+
+        # Act
+        key = conversion_cache_key(**base)
+        same = conversion_cache_key(**base)
+        other_file = conversion_cache_key(**{**base, "file_hash": "b" * 64})
+        other_backend = conversion_cache_key(**{**base, "backend": "docling-parse-v4"})
+        other_options = conversion_cache_key(**{**base, "pipeline_options": _options(do_ocr=True)})
+        other_range = conversion_cache_key(**base, page_range=(2, 3))
+
+        # Assert
+        self.assertEqual(key, same)
+        self.assertEqual(
+            len({key, other_file, other_backend, other_options, other_range}), 5
+        )
+
+    def test_file_hash_ignores_path(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Arrange
+            first = Path(tmp) / "a.pdf"
+            second = Path(tmp) / "renamed.pdf"
+            first.write_bytes(b"%PDF-1.7 same bytes")
+            second.write_bytes(b"%PDF-1.7 same bytes")
+
+            # Act / Assert
+            self.assertEqual(file_sha256(first), file_sha256(second))
+
+    def test_round_trip_returns_fresh_document(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Arrange
+            cache = ConversionCache(Path(tmp))
+            pdf_path = Path(tmp) / "report.pdf"
+            pdf_path.write_bytes(b"%PDF-1.7")
+            cache.put("ab" * 32, _document("Revenue 100"), "pypdfium2", page_count=1)
+
+            # Act
+            missing = cache.get("cd" * 32)
+            entry = cache.get("ab" * 32)
+            result = entry.to_conversion_result(pdf_path, "ab" * 32)
+
+            # Assert
+            self.assertIsNone(missing)
+            self.assertEqual(entry.backend_name, "pypdfium2")
+            self.assertEqual(result.status, ConversionStatus.SUCCESS)
+            self.assertEqual(result.document.texts[0].text, "Revenue 100")
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_eviction_drops_least_recently_used(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Arrange
+            cache = ConversionCache(Path(tmp), max_bytes=10**9)
+            old_key, new_key = "aa" * 32, "bb" * 32
+            cache.put(old_key, _document("old"), "pypdfium2", page_count=1)
+            cache.put(new_key, _document("new"), "pypdfium2", page_count=1)
+            old_path = cache._entry_path(old_key)
+            # WHY: mtime resolution can be coarse; age the first entry explicitly.
+            os.utime(old_path, (1, 1))
+            cache.max_bytes = cache._entry_path(new_key).stat().st_size
+
+            # Act
+            removed = cache.evict()
+
+            # Assert
+            self.assertEqual(removed, 1)
+            self.assertFalse(old_path.exists())
+            self.assertIsNotNone(cache.get(new_key))
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class _FakeConverter:
+    """Builds one text item per page from the PDF text layer and records requested ranges."""
+
+    def __init__(self) -> None:
+        self.ranges: list[object] = []
+
+    def convert(self, input_path: Path, page_range=None, **_kwargs):
+        import fitz
+
+        self.ranges.append(page_range)
+        doc = DoclingDocument(name=input_path.stem)
+        with fitz.open(input_path) as pdf:
+            first, last = page_range or (1, pdf.page_count)
+            for page_no in range(first, last + 1):
+                page = pdf[page_no - 1]
+                doc.add_page(page_no=page_no, size=Size(width=page.rect.width, height=page.rect.height))
+                text = page.get_text().strip()
+                doc.add_text(
+                    label=DocItemLabel.TEXT,
+                    text=text,
+                    prov=ProvenanceItem(
+                        page_no=page_no,
+                        bbox=BoundingBox(l=10, t=10, r=20, b=20),
+                        charspan=(0, len(text)),
+                    ),
+                )
+            page_count = pdf.page_count
+        return SimpleNamespace(
+            status=ConversionStatus.SUCCESS,
+            document=doc,
+            input=SimpleNamespace(page_count=page_count),
+        )
+
+
+class _ListConverter(_FakeConverter):
+    """Like `_FakeConverter`, but lines starting with "item" join one numbered list."""
+
+    def convert(self, input_path: Path, page_range=None, **_kwargs):
+        import fitz
+
+        self.ranges.append(page_range)
+        doc = DoclingDocument(name=input_path.stem)
+        group = None
+        with fitz.open(input_path) as pdf:
+            first, last = page_range or (1, pdf.page_count)
+            for page_no in range(first, last + 1):
+                page = pdf[page_no - 1]
+                doc.add_page(page_no=page_no, size=Size(width=300, height=200))
+                prov = ProvenanceItem(
+                    page_no=page_no, bbox=BoundingBox(l=10, t=10, r=20, b=20), charspan=(0, 1)
+                )
+                text = page.get_text().strip()
+                if not text.startswith("item"):
+                    doc.add_text(label=DocItemLabel.TEXT, text=text, prov=prov)
+                    continue
+                group = group or doc.add_list_group()
+                for line in text.splitlines():
+                    doc.add_list_item(text=line, enumerated=True, parent=group, prov=prov)
+            page_count = pdf.page_count
+        return SimpleNamespace(
+            status=ConversionStatus.SUCCESS,
+            document=doc,
+            input=SimpleNamespace(page_count=page_count),
+        )
+
+
+def _write_pdf(path: Path, texts: list[str]) -> None:
+    import fitz
+
+    with fitz.open() as pdf:
+        for text in texts:
+            page = pdf.new_page()
+            page.insert_text((72, 72), text)
+        pdf.save(path)
+
+
+class PageCacheTests(unittest.TestCase):
+    def test_long_document_pages_are_stored_in_one_pass(self) -> None:
+        # Arrange
+        pages = 300
+        doc = DoclingDocument(name="long")
+        for page_no in range(1, pages + 1):
+            doc.add_page(page_no=page_no, size=Size(width=100, height=100))
+            for line in range(3):
+                doc.add_text(
+                    label=DocItemLabel.TEXT,
+                    text=f"page {page_no} line {line}",
+                    prov=ProvenanceItem(
+                        page_no=page_no,
+                        bbox=BoundingBox(l=10, t=10, r=20, b=20),
+                        charspan=(0, 1),
+                    ),
+                )
+        keys = {page_no: f"{page_no:064x}" for page_no in doc.pages}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ConversionCache(Path(tmp))
+
+            # Act
+            # WHY: A per-page `filter` walks the whole document each time (quadratic).
+            with mock.patch.object(DoclingDocument, "filter", side_effect=AssertionError):
+                stored = store_document_pages(cache, doc, keys, "pypdfium2")
+            found = load_cached_pages(cache, {page_no + 1: key for page_no, key in keys.items()})
+
+        # Assert
+        self.assertEqual(stored, pages)
+        self.assertEqual(len(found), pages)
+        self.assertEqual(
+            [item.text for item in found[pages + 1].document.texts],
+            [f"page {pages} line {line}" for line in range(3)],
+        )
+        self.assertEqual(list(found[pages + 1].document.pages), [pages + 1])
+
+    def test_auto_ocr_decision_reuses_health_scan_text_counts(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Arrange
+            pdf_path = Path(tmp) / "scan.pdf"
+            _write_pdf(pdf_path, ["Sparse page", "Another sparse page"])
+            converter = _FakeConverter()
+            converters = SimpleNamespace(get=lambda *_args: converter)
+
+            # Act
+            # WHY: Sizing the text must not export the whole document to a string.
+            with mock.patch.object(DoclingDocument, "export_to_text", side_effect=AssertionError):
+                result, _backend, _labels = convert_pdf_to_doc(
+                    input_path=pdf_path,
+                    image_mode=ImageRefMode.PLACEHOLDER,
+                    max_pages=None,
+                    page_range=None,
+                    ocr_mode="auto",
+                    ocr_engine="tesseract",
+                    ocr_lang="eng",
+                    force_full_page_ocr=False,
+                    spacing_fix="off",
+                    device="cpu",
+                    pdf_backend="pypdfium2",
+                    quiet=True,
+                    converters=converters,
+                    repair=False,
+                )
+
+            # Assert
+            # The sparse text triggers one OCR rerun; it gains nothing, so it is discarded.
+            self.assertEqual(converter.ranges, [None, None])
+            self.assertEqual(
+                [item.text for item in result.document.texts],
+                ["Sparse page", "Another sparse page"],
+            )
+
+    def test_list_crossing_a_page_break_is_reconverted_whole(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Arrange
+            original = Path(tmp) / "report.pdf"
+            reissued = Path(tmp) / "report_v2.pdf"
+            pages = ["item 1\nitem 2", "item 3\nitem 4", "Page three", "Page four"]
+            _write_pdf(original, pages)
+            _write_pdf(reissued, [*pages[:3], "Page four corrected"])
+            converter = _ListConverter()
+            options = dict(
+                image_mode=ImageRefMode.PLACEHOLDER,
+                max_pages=None,
+                page_range=None,
+                ocr_mode="off",
+                ocr_engine="tesseract",
+                ocr_lang="eng",
+                force_full_page_ocr=False,
+                spacing_fix="off",
+                device="cpu",
+                pdf_backend="pypdfium2",
+                quiet=True,
+                converters=SimpleNamespace(get=lambda *_args: converter),
+                cache=ConversionCache(Path(tmp) / "cache"),
+            )
+
+            # Act
+            convert_pdf_to_doc(input_path=original, **options)
+            result, _backend, _labels = convert_pdf_to_doc(input_path=reissued, **options)
+
+            # Assert
+            # WHY: Pages 1-2 share a list, so they are never cached one page at a time.
+            self.assertEqual(converter.ranges, [None, (1, 2), (4, 4)])
+            self.assertIn(
+                "1. item 1\n2. item 2\n3. item 3\n4. item 4",
+                result.document.export_to_markdown(),
+            )
+
+    def test_reissued_pdf_only_reconverts_changed_pages(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            # Arrange
+            original = Path(tmp) / "report.pdf"
+            reissued = Path(tmp) / "report_v2.pdf"
+            _write_pdf(original, ["Page one", "Page two", "Page three"])
+            _write_pdf(reissued, ["Page one", "Page two corrected", "Page three"])
+            cache = ConversionCache(Path(tmp) / "cache")
+            converter = _FakeConverter()
+            # WHY: No ML models here; a fake converter keeps the cache flow observable.
+            converters = SimpleNamespace(get=lambda *_args: converter)
+            options = dict(
+                image_mode=ImageRefMode.PLACEHOLDER,
+                max_pages=None,
+                page_range=None,
+                ocr_mode="off",
+                ocr_engine="tesseract",
+                ocr_lang="eng",
+                force_full_page_ocr=False,
+                spacing_fix="off",
+                device="cpu",
+                pdf_backend="pypdfium2",
+                quiet=True,
+                converters=converters,
+                cache=cache,
+            )
+
+            # Act
+            convert_pdf_to_doc(input_path=original, **options)
+            result, backend_name, _labels = convert_pdf_to_doc(input_path=reissued, **options)
+
+            # Assert
+            self.assertEqual(converter.ranges, [None, (2, 2)])
+            self.assertEqual(backend_name, "pypdfium2")
+            self.assertEqual(
+                [item.text for item in result.document.texts],
+                ["Page one", "Page two corrected", "Page three"],
+            )
+            self.assertEqual(result.document.origin.filename, "report_v2.pdf")
@@ -0,0 +1,85 @@
+"""@fileoverview Unit tests for the warm converter pool (keying and LRU eviction)."""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from docling.backend.docling_parse_v4_backend import DoclingParseV4DocumentBackend
+from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+from docling_core.types.doc.base import ImageRefMode
+
+from pdf_to_markdown_docling.conversion_utils import build_pdf_pipeline_options
+from pdf_to_markdown_docling.converter_pool import ConverterPool, pipeline_options_key
+
+
+def _options(*, do_ocr: bool = False, engine: str = "tesseract"):
+    return build_pdf_pipeline_options(
+        image_mode=ImageRefMode.PLACEHOLDER,
+        do_ocr=do_ocr,
+        device="cpu",
+        ocr_engine=engine,
+        ocr_lang="eng",
+        force_full_page_ocr=do_ocr,
+        do_cell_matching=do_ocr,
+    )
+
+
+class ConverterPoolTests(unittest.TestCase):
+    def test_key_is_stable_for_equal_options(self) -> None:
+        # Arrange
+        first = _options()
+        second = _options()
+
+        # Act
+        key_a = pipeline_options_key(first, PyPdfiumDocumentBackend)
+        key_b = pipeline_options_key(second, PyPdfiumDocumentBackend)
+
+        # Assert
+        self.assertEqual(key_a, key_b)
+
+    def test_key_differs_by_backend_and_ocr_engine(self) -> None:
+        # Arrange
+        base = pipeline_options_key(_options(do_ocr=True), PyPdfiumDocumentBackend)
+
+        # Act
+        other_backend = pipeline_options_key(
+            _options(do_ocr=True), DoclingParseV4DocumentBackend
+        )
+        other_engine = pipeline_options_key(
+            _options(do_ocr=True, engine="rapidocr"), PyPdfiumDocumentBackend
+        )
+
+        # Assert
+        self.assertNotEqual(base, other_backend)
+        self.assertNotEqual(base, other_engine)
+
+    def test_pool_reuses_and_evicts_least_recently_used(self) -> None:
+        # Arrange
+        pool = ConverterPool(max_size=2)
+        plain, ocr = _options(), _options(do_ocr=True)
+
+        # WHY: Stub converter construction; a sentinel per build is enough to observe
+        # reuse vs rebuild without touching Docling internals.
+        with mock.patch(
+            "pdf_to_markdown_docling.converter_pool.build_converter",
+            side_effect=lambda *_args: object(),
+        ):
+            # Act
+            first = pool.get(plain, PyPdfiumDocumentBackend)
+            again = pool.get(plain, PyPdfiumDocumentBackend)
+            first_ocr = pool.get(ocr, PyPdfiumDocumentBackend)
+            pool.get(plain, PyPdfiumDocumentBackend)
+            pool.get(plain, DoclingParseV4DocumentBackend)
+            rebuilt_ocr = pool.get(ocr, PyPdfiumDocumentBackend)
+
+        # Assert
+        self.assertIs(first, again)
+        self.assertEqual(len(pool), 2)
+        # WHY: `plain` was touched after `ocr`, so `ocr` was the LRU entry and got rebuilt.
+        self.assertIsNot(first_ocr, rebuilt_ocr)
+        self.assertEqual((pool.hits, pool.misses), (2, 4))
+
+
+if __name__ == "__main__":
+    unittest.main()
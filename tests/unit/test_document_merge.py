@@ -0,0 +1,155 @@
+"""@fileoverview Unit tests for page-wise document merge/splice used by targeted OCR reruns."""
+
+from __future__ import annotations
+
+import unittest
+
+from docling_core.types.doc.base import BoundingBox, Size
+from docling_core.types.doc.document import DoclingDocument, ProvenanceItem, TableData
+from docling_core.types.doc.labels import DocItemLabel
+
+from pdf_to_markdown_docling.document_merge import (
+    concatenate_documents_by_page,
+    filter_document_pages,
+    page_runs,
+    splice_document_pages,
+    split_document_pages,
+)
+
+
+def _doc(pages: dict[int, str]) -> DoclingDocument:
+    doc = DoclingDocument(name="test")
+    for page_no, text in sorted(pages.items()):
+        doc.add_page(page_no=page_no, size=Size(width=100, height=100))
+        doc.add_text(
+            label=DocItemLabel.TEXT,
+            text=text,
+            prov=ProvenanceItem(
+                page_no=page_no,
+                bbox=BoundingBox(l=10, t=10, r=20, b=20),
+                charspan=(0, len(text)),
+            ),
+        )
+    return doc
+
+
+def _texts_by_page(doc: DoclingDocument) -> list[tuple[int, str]]:
+    return [
+        (item.prov[0].page_no, item.text)
+        for item, _level in doc.iterate_items()
+        if getattr(item, "text", None)
+    ]
+
+
+class DocumentMergeTests(unittest.TestCase):
+    def test_page_runs_groups_contiguous_pages(self) -> None:
+        # Act
+        runs = page_runs({7, 1, 3, 2, 9, 8})
+
+        # Assert
+        self.assertEqual(runs, [(1, 3), (7, 9)])
+
+    def test_filter_keeps_original_page_numbers(self) -> None:
+        # Arrange
+        doc = _doc({4: "four", 5: "five", 6: "six"})
+
+        # Act
+        filtered = filter_document_pages(doc, {5, 6})
+
+        # Assert
+        self.assertEqual(sorted(filtered.pages), [5, 6])
+        self.assertEqual(_texts_by_page(filtered), [(5, "five"), (6, "six")])
+
+    def test_split_matches_per_page_filter(self) -> None:
+        # Arrange
+        doc = _doc({1: "one", 2: "two", 3: "three"})
+        prov = ProvenanceItem(
+            page_no=2, bbox=BoundingBox(l=10, t=10, r=20, b=20), charspan=(0, 1)
+        )
+        group = doc.add_list_group()
+        doc.add_list_item(text="a", prov=prov, parent=group)
+        caption = doc.add_text(label=DocItemLabel.CAPTION, text="Tabel 1", prov=prov)
+        doc.add_table(data=TableData(num_rows=1, num_cols=1), prov=prov, caption=caption)
+
+        # Act
+        parts = split_document_pages(doc)
+
+        # Assert
+        self.assertEqual(sorted(parts), [1, 2, 3])
+        for page_no, part in parts.items():
+            self.assertEqual(
+                part.export_to_markdown(),
+                filter_document_pages(doc, {page_no}).export_to_markdown(),
+            )
+        self.assertEqual(parts[2].tables[0].captions[0].resolve(parts[2]).text, "Tabel 1")
+        self.assertEqual(parts[1].groups, [])
+
+    def test_concatenate_orders_interleaved_parts_by_page(self) -> None:
+        # Arrange
+        first = _doc({1: "one", 4: "four"})
+        second = _doc({2: "two", 3: "three"})
+
+        # Act
+        merged = concatenate_documents_by_page([first, second])
+
+        # Assert
+        self.assertEqual(sorted(merged.pages), [1, 2, 3, 4])
+        self.assertEqual(
+            _texts_by_page(merged),
+            [(1, "one"), (2, "two"), (3, "three"), (4, "four")],
+        )
+
+    def test_concatenate_rebases_table_and_picture_refs(self) -> None:
+        # Arrange
+        def shard(page_no: int) -> DoclingDocument:
+            doc = DoclingDocument(name="shard")
+            doc.add_page(page_no=page_no, size=Size(width=100, height=100))
+            prov = ProvenanceItem(
+                page_no=page_no, bbox=BoundingBox(l=10, t=10, r=20, b=20), charspan=(0, 1)
+            )
+            doc.add_table(data=TableData(num_rows=1, num_cols=1), prov=prov)
+            picture = doc.add_picture(prov=prov)
+            doc.add_text(
+                label=DocItemLabel.CAPTION, text=f"chart {page_no}", prov=prov, parent=picture
+            )
+            return doc
+
+        # Act
+        merged = concatenate_documents_by_page([shard(3), shard(1), shard(2)])
+
+        # Assert
+        self.assertEqual([table.prov[0].page_no for table in merged.tables], [1, 2, 3])
+        self.assertEqual(
+            [(text.text, text.parent.resolve(merged).prov[0].page_no) for text in merged.texts],
+            [("chart 1", 1), ("chart 2", 2), ("chart 3", 3)],
+        )
+        self.assertEqual(
+            [child.cref for child in merged.body.children][:2], ["#/tables/0", "#/pictures/0"]
+        )
+
+    def test_concatenate_rejects_overlapping_pages(self) -> None:
+        # Arrange
+        first = _doc({1: "one", 2: "two"})
+        second = _doc({2: "again"})
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            concatenate_documents_by_page([first, second])
+
+    def test_splice_replaces_only_requested_pages(self) -> None:
+        # Arrange
+        base = _doc({1: "one", 2: "t w o", 3: "three"})
+        ocr = _doc({2: "two"})
+
+        # Act
+        spliced = splice_document_pages(base, ocr, {2})
+
+        # Assert
+        self.assertEqual(
+            _texts_by_page(spliced), [(1, "one"), (2, "two"), (3, "three")]
+        )
+        self.assertEqual(spliced.name, base.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
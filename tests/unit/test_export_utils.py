@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import tempfile
 import unittest
+from pathlib import Path
 
 from pdf_to_markdown_docling.export_utils import (
+    MarkdownPageStream,
     add_visible_page_markers,
+    postprocess_markdown,
     reduce_markdown_noise,
     normalize_kpi_blocks,
     remove_axis_like_lines,
     remove_orphan_headings,
+    write_text_atomic,
 )
 
 
@@ -156,6 +161,95 @@ class ExportUtilsTests(unittest.TestCase):
         result = remove_axis_like_lines(markdown, PAGE_BREAK)
         self.assertNotIn("74% 9L 2025", result)
 
+    def test_postprocess_matches_chained_passes(self) -> None:
+        # Arrange
+        markdown = (
+            f"## Raport\n\nPROFIT NET\n\nRON 42 mil.\n\n<!-- image -->\n\n## Orphan"
+            f"\n\n{PAGE_BREAK}\n\n\n\n{PAGE_BREAK}\n\n## Raport\n\n0 10 20 30\n\nBody text."
+            f"\n\n{PAGE_BREAK}\n\n## Raport\n\n| a | b |\n\n## Next Section"
+        )
+        expected = add_visible_page_markers(markdown, PAGE_BREAK)
+        expected = reduce_markdown_noise(expected, PAGE_BREAK, remove_image_placeholders=True)
+        expected = normalize_kpi_blocks(expected, PAGE_BREAK)
+        expected = remove_orphan_headings(expected, PAGE_BREAK)
+        expected = remove_axis_like_lines(expected, PAGE_BREAK)
+
+        # Act
+        result = postprocess_markdown(markdown, PAGE_BREAK, remove_image_placeholders=True)
+
+        # Assert
+        self.assertEqual(result, expected)
+
+    def test_postprocess_keeps_blank_markdown(self) -> None:
+        # Act
+        result = postprocess_markdown("  \n", PAGE_BREAK)
+
+        # Assert
+        self.assertEqual(result, "  \n")
+
+    def test_page_stream_matches_postprocess_within_lookahead(self) -> None:
+        # Arrange
+        pages = [
+            "## Raport\n\nPROFIT NET\n\nRON 42 mil.\n\n<!-- image -->\n\n## Orphan",
+            "",
+            "## Raport\n\n0 10 20 30\n\nBody text.",
+            "## Raport\n\n| a | b |\n\n## Next Section",
+            "Closing Remarks For Investors",
+        ]
+        markdown = f"\n\n{PAGE_BREAK}\n\n".join(pages)
+        stream = MarkdownPageStream(PAGE_BREAK, remove_image_placeholders=True)
+
+        # Act
+        streamed = "".join(
+            stream.push(f"\n\n{PAGE_BREAK}\n\n".join(pages[start : start + 2]))
+            for start in range(0, len(pages), 2)
+        )
+        streamed += stream.finish()
+
+        # Assert
+        expected = postprocess_markdown(markdown, PAGE_BREAK, remove_image_placeholders=True)
+        self.assertEqual(streamed, expected)
+
+    def test_page_stream_emits_pages_beyond_lookahead(self) -> None:
+        # Arrange
+        stream = MarkdownPageStream(PAGE_BREAK, lookahead_pages=2)
+
+        # Act
+        early = "".join(stream.push(f"## Raport\n\nBody of page {page_no}.") for page_no in range(1, 7))
+        rest = stream.finish()
+
+        # Assert
+        self.assertIn("Body of page 1.", early)
+        self.assertNotIn("Body of page 6.", early)
+        self.assertEqual((early + rest).count("## Raport"), 1)
+
+    def test_page_stream_keeps_heading_without_content_in_lookahead(self) -> None:
+        # Arrange
+        stream = MarkdownPageStream(PAGE_BREAK, lookahead_pages=1)
+
+        # Act
+        result = stream.push(
+            f"Intro text.\n\n## Outlook\n\n{PAGE_BREAK}\n\n<!-- image -->"
+            f"\n\n{PAGE_BREAK}\n\n<!-- image -->\n\n{PAGE_BREAK}\n\nLater body."
+        )
+        result += stream.finish()
+
+        # Assert
+        self.assertIn("## Outlook", result)
+
+    def test_write_text_atomic_replaces_without_leftovers(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "out" / "report.md"
+            write_text_atomic(path, "old")
+
+            # Act
+            write_text_atomic(path, "new")
+
+            # Assert
+            self.assertEqual(path.read_text(encoding="utf-8"), "new")
+            self.assertEqual(list(path.parent.iterdir()), [path])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,101 @@
+"""@fileoverview Unit tests for the single-pass post-processing engine."""
+
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from docling_core.types.doc.base import BoundingBox
+from docling_core.types.doc.document import DoclingDocument, ProvenanceItem
+from docling_core.types.doc.labels import DocItemLabel
+
+from pdf_to_markdown_docling import fix_pipeline
+from pdf_to_markdown_docling.fix_pipeline import (
+    ItemFixer,
+    default_fixers,
+    run_fix_pipeline,
+)
+
+
+def _prov(page_no: int, bbox: BoundingBox) -> ProvenanceItem:
+    return ProvenanceItem(page_no=page_no, bbox=bbox, charspan=(0, 0))
+
+
+def _doc_with_chart() -> DoclingDocument:
+    doc = DoclingDocument(name="test")
+    doc.add_picture(prov=_prov(1, BoundingBox(l=0, t=0, r=100, b=100)))
+    doc.add_text(
+        label=DocItemLabel.TEXT,
+        text="31.12.2024",
+        prov=_prov(1, BoundingBox(l=10, t=10, r=20, b=20)),
+    )
+    doc.add_text(
+        label=DocItemLabel.TEXT,
+        text="Profit   net  crescut",
+        prov=_prov(1, BoundingBox(l=200, t=200, r=210, b=210)),
+    )
+    return doc
+
+
+class FixPipelineTests(unittest.TestCase):
+    def test_default_chain_reports_counts_and_timings(self) -> None:
+        # Arrange
+        doc = _doc_with_chart()
+
+        # Act
+        report = run_fix_pipeline(doc, default_fixers(kpi_ocr=False))
+
+        # Assert
+        self.assertEqual(report.count("removed_dates"), 1)
+        self.assertEqual(report.count("normalized_text"), 1)
+        self.assertEqual(set(report.counts), set(report.timings))
+        self.assertEqual([item.text for item in doc.texts], ["Profit net crescut"])
+
+    def test_kpi_captions_are_normalized_by_later_text_fixers(self) -> None:
+        # Arrange
+        doc = _doc_with_chart()
+        # WHY: No tesseract in CI; the KPI collector returns what OCR would have read.
+        collected = mock.Mock(
+            side_effect=lambda _doc, pictures, *_args, **_kwargs: [
+                (pictures[0], "Indicator datorii 0,45 D E")
+            ]
+        )
+
+        # Act
+        with mock.patch.object(fix_pipeline, "collect_picture_kpi_captions", collected):
+            report = run_fix_pipeline(
+                doc, default_fixers(kpi_ocr=True), resources=mock.Mock()
+            )
+
+        # Assert
+        self.assertEqual(report.count("added_kpis"), 1)
+        self.assertEqual(report.count("normalized_text"), 2)
+        caption = doc.pictures[0].captions[0].resolve(doc)
+        self.assertEqual(caption.text, "Indicator datorii 0,45 D/E")
+
+    def test_removed_items_are_hidden_from_later_fixers(self) -> None:
+        # Arrange
+        doc = _doc_with_chart()
+        seen: list[str] = []
+        removal = [f for f in default_fixers(kpi_ocr=False) if f.name == "removed_dates"]
+        fixers = removal + [
+            ItemFixer("record", "text", lambda item, _context: seen.append(item.text) or 0)
+        ]
+
+        # Act
+        run_fix_pipeline(doc, fixers)
+
+        # Assert
+        self.assertEqual(seen, ["Profit   net  crescut"])
+
+    def test_unknown_kind_is_rejected(self) -> None:
+        # Arrange
+        fixers = [ItemFixer("bad", "shape", lambda _item, _context: 0)]
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            run_fix_pipeline(DoclingDocument(name="empty"), fixers)
+
+
+if __name__ == "__main__":
+    unittest.main()
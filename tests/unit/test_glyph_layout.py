@@ -0,0 +1,69 @@
+"""@fileoverview Unit tests for vectorized glyph line grouping and gap clustering."""
+
+from __future__ import annotations
+
+import unittest
+
+from pdf_to_markdown_docling.glyph_layout import glyph_array, reconstruct_runs
+
+
+def _spaced_line(
+    words: list[str], *, x: float, y: float, width: float = 5.0, kerning: float = 0.8
+) -> list[tuple[str, float, float, float, float]]:
+    glyphs = []
+    for word in words:
+        for char in word:
+            glyphs.append((char, x, y, x + width, y + 10))
+            x += width + kerning
+        x += width
+    return glyphs
+
+
+class ReconstructRunsTests(unittest.TestCase):
+    def test_clusters_gaps_into_words_and_orders_lines(self) -> None:
+        # Arrange
+        glyphs = _spaced_line(["9", "876"], x=20, y=40) + _spaced_line(
+            ["Venituri", "totale"], x=20, y=20
+        )
+        boxes, texts = glyph_array(glyphs)
+
+        # Act
+        [text] = reconstruct_runs(
+            boxes, texts, [0, len(texts)], gap_ratio=0.35, line_ratio=0.6
+        )
+
+        # Assert
+        self.assertEqual(text, "Venituri totale 9 876")
+
+    def test_batched_clips_match_single_clip_calls(self) -> None:
+        # Arrange
+        clips = [
+            _spaced_line(["Cheltuieli", "de", "exploatare"], x=10, y=5),
+            [],
+            _spaced_line(["12", "345"], x=200, y=5, kerning=0.2)
+            + [(" ", 214.0, 5.0, 218.0, 15.0)],
+            _spaced_line(["Total"], x=10, y=30) + _spaced_line(["2025"], x=10, y=42),
+        ]
+        bounds = [0]
+        for clip in clips:
+            bounds.append(bounds[-1] + len(clip))
+        boxes, texts = glyph_array(glyph for clip in clips for glyph in clip)
+        options = {"gap_ratio": 0.35, "line_ratio": 0.6, "space_width_ratio": 0.6}
+
+        # Act
+        batched = reconstruct_runs(boxes, texts, bounds, **options)
+        single = []
+        for clip in clips:
+            clip_boxes, clip_texts = glyph_array(clip)
+            single.extend(
+                reconstruct_runs(clip_boxes, clip_texts, [0, len(clip_texts)], **options)
+            )
+
+        # Assert
+        self.assertEqual(batched, single)
+        self.assertEqual(batched[1], "")
+        self.assertEqual(batched[3], "Total 2025")
+
+
+if __name__ == "__main__":
+    unittest.main()
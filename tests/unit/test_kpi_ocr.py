@@ -0,0 +1,69 @@
+"""@fileoverview Unit tests for batched Tesseract OCR of picture KPI crops."""
+
+from __future__ import annotations
+
+import io
+import unittest
+from typing import Optional
+from unittest import mock
+
+from PIL import Image, ImageSequence
+
+from pdf_to_markdown_docling import kpi_ocr
+
+
+def _images(widths: list[int]) -> list[Image.Image]:
+    return [Image.new("RGB", (width, 10), "white") for width in widths]
+
+
+def _fake_tesseract(image_bytes: bytes, _lang: str) -> Optional[str]:
+    # WHY: tesseract is not installed in CI; echo each TIFF page's width so the test can
+    # check that batched output is split and reordered correctly.
+    with Image.open(io.BytesIO(image_bytes)) as tiff:
+        widths = [str(frame.width) for frame in ImageSequence.Iterator(tiff)]
+    return "".join(f"{width}\n\f" for width in widths)
+
+
+class KpiOcrTests(unittest.TestCase):
+    def test_split_pages_drops_trailing_separator(self) -> None:
+        # Act
+        pages = kpi_ocr._split_pages("one\n\ftwo\n\f", 2)
+
+        # Assert
+        self.assertEqual(pages, ["one", "two"])
+
+    def test_split_pages_rejects_count_mismatch(self) -> None:
+        # Act
+        pages = kpi_ocr._split_pages("one two", 2)
+
+        # Assert
+        self.assertIsNone(pages)
+
+    def test_ocr_images_keeps_input_order_across_batches(self) -> None:
+        # Arrange
+        widths = [11, 12, 13, 14, 15]
+
+        # Act
+        with mock.patch.object(kpi_ocr, "_run_tesseract", side_effect=_fake_tesseract) as run:
+            texts = kpi_ocr.ocr_images(_images(widths), lang="eng", workers=2, batch_size=2)
+
+        # Assert
+        self.assertEqual(texts, [str(width) for width in widths])
+        self.assertEqual(run.call_count, 3)
+
+    def test_batch_falls_back_to_single_crops_without_separators(self) -> None:
+        # Arrange
+        def no_separator(image_bytes: bytes, lang: str) -> Optional[str]:
+            return _fake_tesseract(image_bytes, lang).replace("\f", "")
+
+        # Act
+        with mock.patch.object(kpi_ocr, "_run_tesseract", side_effect=no_separator) as run:
+            texts = kpi_ocr.ocr_images(_images([21, 22, 23]), lang="eng", workers=1)
+
+        # Assert
+        self.assertEqual(texts, ["21", "22", "23"])
+        self.assertEqual(run.call_count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,204 @@
+"""@fileoverview Unit tests for per-stage timing and counter instrumentation."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import fitz
+from docling.datamodel.document import ConversionStatus
+from docling_core.types.doc.base import BoundingBox, ImageRefMode, Size
+from docling_core.types.doc.document import DoclingDocument, ProvenanceItem
+from docling_core.types.doc.labels import DocItemLabel
+
+from pdf_to_markdown_docling.conversion_utils import convert_pdf_to_markdown_text
+from pdf_to_markdown_docling.export_utils import postprocess_markdown
+from pdf_to_markdown_docling import metrics as metrics_module
+from pdf_to_markdown_docling.metrics import (
+    collect_metrics,
+    merge_worker_spans,
+    stage,
+    worker_metrics,
+)
+
+
+class _PageTextConverter:
+    """Builds one text item per page from the PDF text layer."""
+
+    def convert(self, input_path: Path, page_range=None, **_kwargs):
+        doc = DoclingDocument(name=input_path.stem)
+        with fitz.open(input_path) as pdf:
+            first, last = page_range or (1, pdf.page_count)
+            for page_no in range(first, last + 1):
+                doc.add_page(page_no=page_no, size=Size(width=300, height=200))
+                text = pdf[page_no - 1].get_text().strip()
+                doc.add_text(
+                    label=DocItemLabel.TEXT,
+                    text=text,
+                    prov=ProvenanceItem(
+                        page_no=page_no,
+                        bbox=BoundingBox(l=10, t=10, r=20, b=20),
+                        charspan=(0, len(text)),
+                    ),
+                )
+            page_count = pdf.page_count
+        return SimpleNamespace(
+            status=ConversionStatus.SUCCESS,
+            document=doc,
+            input=SimpleNamespace(page_count=page_count),
+        )
+
+
+class StageMetricsTests(unittest.TestCase):
+    def test_nested_stages_record_parents_and_counters(self) -> None:
+        # Act
+        with collect_metrics() as metrics:
+            with stage("document", input="report.pdf"):
+                for count in (2, 3):
+                    with stage("fix.table_merge") as span:
+                        span.count("changed", count)
+
+        # Assert
+        parent, first, second = sorted(metrics.spans, key=lambda span: span.start_ns)
+        self.assertIsNone(parent.parent_id)
+        self.assertEqual({first.parent_id, second.parent_id}, {parent.span_id})
+        summary = metrics.summary()
+        self.assertEqual(summary["fix.table_merge"]["calls"], 2)
+        self.assertEqual(summary["fix.table_merge"]["counts"], {"changed": 5})
+        self.assertEqual(summary["document"]["calls"], 1)
+
+    def test_stage_without_collector_records_nothing(self) -> None:
+        # Act
+        with stage("orphan") as span:
+            span.count("changed", 1)
+        with collect_metrics() as metrics:
+            pass
+
+        # Assert
+        self.assertEqual(metrics.spans, [])
+
+    def test_failed_stage_keeps_error_attribute(self) -> None:
+        # Act
+        with collect_metrics() as metrics:
+            with self.assertRaises(RuntimeError):
+                with stage("run_conversion"):
+                    raise RuntimeError("boom")
+
+        # Assert
+        self.assertEqual(metrics.spans[0].attributes["error"], "RuntimeError: boom")
+
+    def test_failed_stage_passes_exception_to_opentelemetry(self) -> None:
+        # Arrange
+        otel_span = mock.MagicMock()
+        tracer = mock.Mock(start_as_current_span=mock.Mock(return_value=otel_span))
+        otel_trace = mock.Mock(get_tracer=mock.Mock(return_value=tracer))
+
+        # Act
+        with mock.patch.object(metrics_module, "_otel_trace", otel_trace):
+            with collect_metrics():
+                with stage("ok"):
+                    pass
+                with self.assertRaises(RuntimeError):
+                    with stage("run_conversion"):
+                        raise RuntimeError("boom")
+
+        # Assert
+        ok_exit, failed_exit = otel_span.__exit__.call_args_list
+        self.assertEqual(ok_exit.args, (None, None, None))
+        exc_type, exc, traceback = failed_exit.args
+        self.assertIs(exc_type, RuntimeError)
+        self.assertEqual(str(exc), "boom")
+        self.assertIsNotNone(traceback)
+
+    def test_worker_spans_merge_under_the_open_stage(self) -> None:
+        # Arrange
+        # WHY: What a worker process records; the list would be pickled back with its result.
+        with worker_metrics(True) as spans:
+            with stage("shard"):
+                with stage("run_conversion"):
+                    pass
+        with worker_metrics(False) as skipped:
+            with stage("shard"):
+                pass
+
+        # Act
+        with collect_metrics() as metrics:
+            with stage("document") as parent:
+                merge_worker_spans(spans)
+
+        # Assert
+        self.assertEqual(skipped, [])
+        by_name = {span.name: span for span in metrics.spans}
+        self.assertEqual(by_name["shard"].parent_id, parent.span_id)
+        self.assertEqual(by_name["run_conversion"].parent_id, by_name["shard"].span_id)
+        self.assertEqual(len(metrics.to_dict()["spans"]), 3)
+
+    def test_postprocess_reports_each_markdown_pass(self) -> None:
+        # Act
+        with collect_metrics() as metrics:
+            postprocess_markdown("# A\n\nBody\n<!-- pb -->\n# B\n\nMore\n", "<!-- pb -->")
+
+        # Assert
+        self.assertEqual(
+            list(metrics.summary()),
+            [
+                "markdown.markers",
+                "markdown.noise",
+                "markdown.kpi",
+                "markdown.orphan",
+                "markdown.axis",
+            ],
+        )
+
+    def test_conversion_writes_stage_report(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Arrange
+            pdf_path = Path(tmp_dir) / "report.pdf"
+            with fitz.open() as pdf:
+                for text in ("Revenue grew", "Costs fell"):
+                    pdf.new_page(width=300, height=200).insert_text((20, 40), text)
+                pdf.save(pdf_path)
+            # WHY: No ML models here; a fake converter echoes the text layer per page.
+            converters = SimpleNamespace(get=lambda *_args: _PageTextConverter())
+            report_path = Path(tmp_dir) / "metrics.json"
+
+            # Act
+            with collect_metrics() as metrics:
+                convert_pdf_to_markdown_text(
+                    input_path=pdf_path,
+                    image_mode=ImageRefMode.PLACEHOLDER,
+                    images_dir=None,
+                    max_pages=None,
+                    page_range=None,
+                    ocr_mode="off",
+                    ocr_engine="tesseract",
+                    ocr_lang="eng",
+                    force_full_page_ocr=False,
+                    spacing_fix="off",
+                    device="cpu",
+                    pdf_backend="pypdfium2",
+                    quiet=True,
+                    converters=converters,
+                )
+            metrics.write_json(report_path)
+            report = json.loads(report_path.read_text(encoding="utf-8"))
+
+        # Assert
+        stages = report["stages"]
+        self.assertEqual(stages["run_conversion"]["counts"], {"pages": 2})
+        for name in ("document", "fix.walk", "markdown.export", "markdown.axis"):
+            self.assertIn(name, stages)
+        root = report["spans"][0]
+        self.assertEqual(root["name"], "document")
+        self.assertEqual(root["attributes"]["backend"], "pypdfium2")
+        self.assertTrue(
+            all(span["trace_id"] == report["trace_id"] for span in report["spans"])
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""@fileoverview Unit tests for the shared per-document PDF resources."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import fitz
+
+from pdf_to_markdown_docling.pdf_resources import PdfResources, borrow_resources
+from pdf_to_markdown_docling.pymupdf_spacing_fix import page_glyph_index
+
+
+def _pdf_bytes(pages: int) -> bytes:
+    pdf = fitz.open()
+    for page_no in range(1, pages + 1):
+        page = pdf.new_page(width=300, height=200)
+        page.insert_text((20, 40), f"Pagina {page_no} venituri 12 345", fontsize=11)
+    data = pdf.tobytes()
+    pdf.close()
+    return data
+
+
+class PdfResourcesTests(unittest.TestCase):
+    def test_glyph_index_is_built_once_and_evicted_least_recently_used(self) -> None:
+        # Arrange
+        resources = PdfResources.from_bytes(_pdf_bytes(3), page_cache_size=2)
+        self.addCleanup(resources.close)
+
+        # Act
+        first = page_glyph_index(resources, 1)
+        again = page_glyph_index(resources, 1)
+        page_glyph_index(resources, 2)
+        page_glyph_index(resources, 3)
+        rebuilt = page_glyph_index(resources, 1)
+
+        # Assert
+        self.assertIs(first, again)
+        self.assertIsNot(first, rebuilt)
+        self.assertEqual((resources.hits, resources.misses), (1, 4))
+
+    def test_memory_mapped_file_serves_both_parsers(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "report.pdf"
+            pdf_path.write_bytes(_pdf_bytes(2))
+
+            # Act
+            with PdfResources(pdf_path, memory_map=True) as resources:
+                text = resources.page(2).get_text()
+                parsed_pages = resources.parsed_pdf.number_of_pages()
+
+        # Assert
+        self.assertIn("Pagina 2", text)
+        self.assertEqual(parsed_pages, 2)
+
+    def test_borrow_keeps_shared_resources_open(self) -> None:
+        # Arrange
+        resources = PdfResources.from_bytes(_pdf_bytes(1))
+        self.addCleanup(resources.close)
+
+        # Act
+        with borrow_resources(resources, Path("unused.pdf")) as borrowed:
+            borrowed.page(1)
+
+        # Assert
+        self.assertIs(borrowed, resources)
+        self.assertEqual(resources.page_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
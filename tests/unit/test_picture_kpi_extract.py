@@ -3,8 +3,37 @@
 from __future__ import annotations
 
 import unittest
-
-from pdf_to_markdown_docling.picture_kpi_extract import _is_axis_like, _is_kpi_text, _normalize_kpi_caption
+from unittest import mock
+
+import fitz
+from docling_core.types.doc.base import BoundingBox, CoordOrigin, Size
+from docling_core.types.doc.document import DoclingDocument, ProvenanceItem
+
+from pdf_to_markdown_docling import picture_kpi_extract
+from pdf_to_markdown_docling.pdf_resources import PdfResources
+from pdf_to_markdown_docling.picture_kpi_extract import (
+    _is_axis_like,
+    _is_kpi_text,
+    _normalize_kpi_caption,
+    collect_picture_kpi_captions,
+)
+
+
+def _chart_doc(pictures: int) -> DoclingDocument:
+    doc = DoclingDocument(name="test")
+    doc.add_page(page_no=1, size=Size(width=300, height=400))
+    for index in range(pictures):
+        top = 20 + index * 100
+        doc.add_picture(
+            prov=ProvenanceItem(
+                page_no=1,
+                bbox=BoundingBox(
+                    l=10, t=top, r=290, b=top + 60, coord_origin=CoordOrigin.TOPLEFT
+                ),
+                charspan=(0, 0),
+            )
+        )
+    return doc
 
 
 class PictureKpiExtractTests(unittest.TestCase):
@@ -71,6 +100,59 @@ class PictureKpiExtractTests(unittest.TestCase):
             "PROFIT NET RON 42,92 MIL. (EUR 8,45 MIL.) +103,61% vs 9L 2024",
         )
 
+    def test_collect_captions_batches_ocr_for_pictures_without_text(self) -> None:
+        # Arrange
+        doc = _chart_doc(3)
+        pdf = fitz.open()
+        self.addCleanup(pdf.close)
+        page = pdf.new_page(width=300, height=400)
+        page.insert_text((20, 50), "Profit net 43.000.000 RON", fontsize=11)
+        resources = PdfResources.from_bytes(pdf.tobytes())
+        self.addCleanup(resources.close)
+        ocr_calls: list[int] = []
+
+        def fake_ocr(images, **_kwargs):
+            crops = list(images)
+            ocr_calls.append(len(crops))
+            return ["Cifra de afaceri 158.065.856 RON", "Grafic 0 10 20"][: len(crops)]
+
+        # Act
+        # WHY: tesseract is not installed in CI; the fake stands in for one batched pass.
+        with mock.patch.object(picture_kpi_extract, "available_tesseract_lang", return_value="eng"), \
+                mock.patch.object(picture_kpi_extract, "ocr_images", side_effect=fake_ocr):
+            captions = collect_picture_kpi_captions(
+                doc, doc.pictures, resources, doc_text="", max_captions=5
+            )
+
+        # Assert
+        self.assertEqual(ocr_calls, [2])
+        self.assertEqual(
+            [caption for _item, caption in captions],
+            ["Profit net 43.000.000 RON", "Cifra de afaceri 158.065.856 RON"],
+        )
+
+    def test_collect_captions_skips_ocr_past_the_cap(self) -> None:
+        # Arrange
+        doc = _chart_doc(2)
+        pdf = fitz.open()
+        self.addCleanup(pdf.close)
+        page = pdf.new_page(width=300, height=400)
+        page.insert_text((20, 50), "Profit net 43.000.000 RON", fontsize=11)
+        resources = PdfResources.from_bytes(pdf.tobytes())
+        self.addCleanup(resources.close)
+
+        # Act
+        # WHY: The fake must never be called; the first picture already fills the cap.
+        with mock.patch.object(picture_kpi_extract, "available_tesseract_lang", return_value="eng"), \
+                mock.patch.object(picture_kpi_extract, "ocr_images") as ocr:
+            captions = collect_picture_kpi_captions(
+                doc, doc.pictures, resources, doc_text="", max_captions=1
+            )
+
+        # Assert
+        ocr.assert_not_called()
+        self.assertEqual(len(captions), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,7 +4,23 @@ from __future__ import annotations
 
 import unittest
 
-from pdf_to_markdown_docling.pymupdf_spacing_fix import _needs_suffix_completion, _should_replace_text
+import fitz
+
+from pdf_to_markdown_docling.pymupdf_spacing_fix import (
+    TEXT_FLAGS,
+    PageGlyphIndex,
+    _needs_suffix_completion,
+    _should_replace_text,
+)
+
+
+def _sample_page() -> tuple[fitz.Document, fitz.Page]:
+    pdf = fitz.open()
+    page = pdf.new_page(width=300, height=200)
+    page.insert_text((20, 40), "Venituri totale  12 345", fontsize=11)
+    page.insert_text((20, 80), "Cheltuieli de exploatare", fontsize=9)
+    page.insert_text((180, 80), "9 876", fontsize=9)
+    return pdf, page
 
 
 class PyMuPdfSpacingFixTests(unittest.TestCase):
@@ -62,5 +78,52 @@ class PyMuPdfSpacingFixTests(unittest.TestCase):
         self.assertTrue(result)
 
 
+class PageGlyphIndexTests(unittest.TestCase):
+    def test_index_matches_clipped_extraction(self) -> None:
+        # Arrange
+        pdf, page = _sample_page()
+        self.addCleanup(pdf.close)
+        index = PageGlyphIndex(page)
+        clips = [
+            fitz.Rect(15, 25, 120, 45),
+            fitz.Rect(60, 30, 75, 90),
+            fitz.Rect(170, 60, 300, 90),
+            fitz.Rect(0, 0, 300, 200),
+        ]
+
+        for clip in clips:
+            # Act
+            words = index.words(clip)
+            chars = [(text, tuple(rect)) for text, rect in index.chars(clip)]
+
+            # Assert
+            expected_words = [
+                (word[4], word[5], word[6], word[7])
+                for word in page.get_text("words", clip=clip, flags=TEXT_FLAGS)
+            ]
+            expected_chars = [
+                (ch["c"], tuple(ch["bbox"]))
+                for block in page.get_text("rawdict", clip=clip, flags=TEXT_FLAGS)["blocks"]
+                for line in block.get("lines", [])
+                for span in line["spans"]
+                for ch in span["chars"]
+            ]
+            self.assertEqual(words, expected_words)
+            self.assertEqual(chars, expected_chars)
+
+    def test_index_extracts_page_once(self) -> None:
+        # Arrange
+        pdf, page = _sample_page()
+        self.addCleanup(pdf.close)
+        index = PageGlyphIndex(page)
+
+        # Act
+        for y in range(0, 200, 10):
+            index.words(fitz.Rect(0, y, 300, y + 15))
+
+        # Assert
+        self.assertEqual(index.extractions, 1)
+
+
 if __name__ == "__main__":
     unittest.main()
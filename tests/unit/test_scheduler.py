@@ -0,0 +1,245 @@
+"""@fileoverview Unit tests for cost-based multi-process conversion scheduling."""
+
+from __future__ import annotations
+
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import fitz
+from docling.datamodel.document import ConversionStatus
+from docling_core.types.doc.base import BoundingBox, ImageRefMode, Size
+from docling_core.types.doc.document import DoclingDocument, ProvenanceItem
+from docling_core.types.doc.labels import DocItemLabel
+
+from pdf_to_markdown_docling import scheduler
+from pdf_to_markdown_docling.metrics import collect_metrics
+from pdf_to_markdown_docling.scheduler import (
+    DocumentCost,
+    convert_documents_scheduled,
+    convert_pdf_sharded,
+    estimate_document_cost,
+    plan_work_units,
+)
+
+
+def _write_pdf(path: Path, pages: int, *, lines_on: set[int] = frozenset()) -> None:
+    pdf = fitz.open()
+    for page_no in range(1, pages + 1):
+        page = pdf.new_page(width=300, height=200)
+        page.insert_text((20, 40), f"Page {page_no}", fontsize=11)
+        if page_no in lines_on:
+            for y in range(50, 190, 2):
+                page.draw_line((10, y), (290, y))
+    pdf.save(path)
+    pdf.close()
+
+
+def _fake_convert_pdf_to_doc(*, input_path: Path, page_range: tuple[int, int], **_options):
+    doc = DoclingDocument(name=input_path.stem)
+    for page_no in range(page_range[0], page_range[1] + 1):
+        doc.add_page(page_no=page_no, size=Size(width=100, height=100))
+        text = f"{input_path.stem} page {page_no}"
+        doc.add_text(
+            label=DocItemLabel.TEXT,
+            text=text,
+            prov=ProvenanceItem(
+                page_no=page_no,
+                bbox=BoundingBox(l=10, t=10, r=20, b=20),
+                charspan=(0, len(text)),
+            ),
+        )
+    result = SimpleNamespace(
+        status=ConversionStatus.SUCCESS,
+        document=doc,
+        input=SimpleNamespace(page_count=page_range[1]),
+    )
+    return result, "pypdfium2", set()
+
+
+class SchedulerTests(unittest.TestCase):
+    def test_cost_counts_vector_dense_pages_higher(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "report.pdf"
+            _write_pdf(pdf_path, pages=3, lines_on={2})
+
+            # Act
+            cost = estimate_document_cost(pdf_path, page_range=(2, 3))
+
+        # Assert
+        self.assertEqual(sorted(cost.page_costs), [2, 3])
+        self.assertGreater(cost.page_costs[2], cost.page_costs[3])
+
+    def test_plan_shards_long_documents_and_orders_by_cost(self) -> None:
+        # Arrange
+        long_doc = DocumentCost(Path("long.pdf"), {page: 1.0 for page in range(1, 6)})
+        dense_doc = DocumentCost(Path("dense.pdf"), {1: 4.0})
+
+        # Act
+        units = plan_work_units([long_doc, dense_doc], shard_pages=2)
+
+        # Assert
+        self.assertEqual(
+            [(unit.input_path.name, unit.page_range) for unit in units],
+            [
+                ("dense.pdf", (1, 1)),
+                ("long.pdf", (1, 2)),
+                ("long.pdf", (3, 4)),
+                ("long.pdf", (5, 5)),
+            ],
+        )
+
+    def test_plan_balances_windows_by_cost(self) -> None:
+        # Arrange
+        skewed = DocumentCost(
+            Path("skewed.pdf"), {1: 6.0, 2: 1.0, 3: 1.0, 4: 1.0, 5: 1.0, 6: 2.0}
+        )
+
+        # Act
+        units = plan_work_units([skewed], shard_pages=40, shards_per_document=2)
+
+        # Assert
+        self.assertEqual(sorted(unit.page_range for unit in units), [(1, 1), (2, 6)])
+
+    def test_unreadable_pdf_fails_alone_and_batch_continues(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            good_path = Path(tmp_dir) / "good.pdf"
+            bad_path = Path(tmp_dir) / "bad.pdf"
+            _write_pdf(good_path, pages=3)
+            bad_path.write_bytes(b"not a pdf")
+            # WHY: No models in CI; a fake pipeline echoes the page range it was given.
+            with (
+                mock.patch.object(scheduler, "convert_pdf_to_doc", _fake_convert_pdf_to_doc),
+                mock.patch.object(scheduler, "_init_worker", lambda *_args: None),
+            ):
+                # Act
+                items = list(
+                    convert_documents_scheduled(
+                        [bad_path, good_path],
+                        processes=1,
+                        shard_pages=2,
+                        quiet=True,
+                        pdf_backend="auto",
+                        image_mode=ImageRefMode.PLACEHOLDER,
+                        device="cpu",
+                        ocr_engine="tesseract",
+                        ocr_lang="eng",
+                    )
+                )
+
+        # Assert
+        by_name = {item.input_path.name: item for item in items}
+        self.assertIsNone(by_name["bad.pdf"].result)
+        self.assertTrue(by_name["bad.pdf"].error)
+        self.assertEqual(by_name["good.pdf"].status, ConversionStatus.SUCCESS)
+        self.assertEqual(sorted(by_name["good.pdf"].result.document.pages), [1, 2, 3])
+
+    def test_auto_backend_shards_default_probe_pages(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "annual.pdf"
+            _write_pdf(pdf_path, pages=5)
+            # WHY: No models in CI; a fake pipeline echoes the page range it was given.
+            with (
+                mock.patch.object(scheduler, "convert_pdf_to_doc", _fake_convert_pdf_to_doc),
+                mock.patch.object(scheduler, "_init_worker", lambda *_args: None),
+            ):
+                # Act
+                [item] = convert_documents_scheduled(
+                    [pdf_path],
+                    processes=1,
+                    shard_pages=2,
+                    quiet=True,
+                    pdf_backend="auto",
+                    image_mode=ImageRefMode.PLACEHOLDER,
+                    device="cpu",
+                    ocr_engine="tesseract",
+                    ocr_lang="eng",
+                )
+
+        # Assert
+        self.assertEqual(item.status, ConversionStatus.SUCCESS)
+        self.assertEqual(sorted(item.result.document.pages), [1, 2, 3, 4, 5])
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork",
+        "Worker processes only see the patched pipeline when forked.",
+    )
+    def test_shards_are_merged_back_in_page_order(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            long_path = Path(tmp_dir) / "long.pdf"
+            short_path = Path(tmp_dir) / "short.pdf"
+            _write_pdf(long_path, pages=5)
+            _write_pdf(short_path, pages=1)
+            # WHY: No models in CI; a fake pipeline echoes the page range it was given.
+            with (
+                mock.patch.object(scheduler, "convert_pdf_to_doc", _fake_convert_pdf_to_doc),
+                mock.patch.object(scheduler, "_init_worker", lambda *_args: None),
+            ):
+                # Act
+                items = list(
+                    convert_documents_scheduled(
+                        [long_path, short_path],
+                        processes=2,
+                        shard_pages=2,
+                        quiet=True,
+                        pdf_backend="pypdfium2",
+                    )
+                )
+
+        # Assert
+        by_name = {item.input_path.name: item for item in items}
+        merged = by_name["long.pdf"].result.document
+        self.assertEqual(sorted(merged.pages), [1, 2, 3, 4, 5])
+        self.assertEqual(
+            [item.text for item in merged.texts],
+            [f"long page {page_no}" for page_no in range(1, 6)],
+        )
+        self.assertEqual(by_name["short.pdf"].status, ConversionStatus.SUCCESS)
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork",
+        "Worker processes only see the patched pipeline when forked.",
+    )
+    def test_single_pdf_is_sharded_across_workers(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "annual.pdf"
+            _write_pdf(pdf_path, pages=8)
+            # WHY: No models in CI; a fake pipeline echoes the page range it was given.
+            with (
+                mock.patch.object(scheduler, "convert_pdf_to_doc", _fake_convert_pdf_to_doc),
+                mock.patch.object(scheduler, "_init_worker", lambda *_args: None),
+            ):
+                # Act
+                with collect_metrics() as metrics:
+                    item = convert_pdf_sharded(
+                        pdf_path, processes=2, quiet=True, pdf_backend="pypdfium2"
+                    )
+
+        # Assert
+        self.assertEqual(item.status, ConversionStatus.SUCCESS)
+        # WHY: Shard stages run in the workers and must still reach the parent's report.
+        shard_pages = sorted(
+            tuple(int(page) for page in span.attributes["pages"].split("-"))
+            for span in metrics.spans
+            if span.name == "shard"
+        )
+        self.assertEqual(shard_pages[0][0], 1)
+        self.assertEqual(shard_pages[-1][1], 8)
+        self.assertGreater(len(shard_pages), 1)
+        self.assertEqual(sorted(item.result.document.pages), list(range(1, 9)))
+        self.assertEqual(
+            [text.text for text in item.result.document.texts],
+            [f"annual page {page_no}" for page_no in range(1, 9)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+"""@fileoverview Unit tests for the asyncio HTTP conversion service."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from docling.datamodel.document import ConversionStatus
+
+from pdf_to_markdown_docling.conversion_cache import ConversionCache
+from pdf_to_markdown_docling.service import (
+    ConversionService,
+    Job,
+    JobOptionsError,
+    parse_job_options,
+)
+
+
+async def _request(
+    port: int, method: str, path: str, payload: object = None
+) -> tuple[int, bytes]:
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _sep, content = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), content
+
+
+class ParseJobOptionsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pdf_path = Path(self._tmp.name) / "report.pdf"
+        self.pdf_path.write_bytes(b"%PDF-1.4\n")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_maps_json_keys_onto_cli_flags(self) -> None:
+        # Act
+        args = parse_job_options(
+            {"input": str(self.pdf_path), "page_range": "2:4", "ocr": False, "workers": 2}
+        )
+
+        # Assert
+        self.assertEqual(args.page_range, (2, 4))
+        self.assertFalse(args.ocr)
+        self.assertEqual(args.workers, 2)
+
+    def test_values_never_parse_as_flags(self) -> None:
+        # Act
+        args = parse_job_options({"input": str(self.pdf_path), "ocr_lang": "--audit"})
+
+        # Assert
+        self.assertEqual(args.ocr_lang, "--audit")
+        self.assertFalse(args.audit)
+
+    def test_rejects_invalid_and_service_owned_options(self) -> None:
+        # Arrange
+        bodies = [
+            {"input": str(self.pdf_path), "page_range": "4:2"},
+            {"input": str(self.pdf_path), "output": "elsewhere.md"},
+            {"input": str(self.pdf_path), "unknown_flag": 1},
+            {"input": str(self.pdf_path), "help": True},
+            {"input": str(self.pdf_path), "quiet": True},
+            {"input": str(self.pdf_path), "cache_dir": "/etc"},
+            {"input": str(self.pdf_path), "no_cache": True},
+            {"input": str(self.pdf_path.with_name("missing.pdf"))},
+            ["not", "an", "object"],
+        ]
+
+        # Act / Assert
+        for body in bodies:
+            with self.assertRaises(JobOptionsError):
+                parse_job_options(body)
+
+
+class ConversionServiceTests(unittest.TestCase):
+    def test_jobs_flow_through_queue_with_backpressure(self) -> None:
+        # Arrange
+        release = threading.Event()
+        caches: list[object] = []
+
+        def fake_convert(*, input_path: Path, output_path: Path, **options: object):
+            # WHY: No models in CI; block until the test has filled the queue, then
+            # write Markdown the way the real conversion would.
+            release.wait(timeout=5)
+            caches.append(options["cache"])
+            output_path.write_text(f"# {input_path.stem}\n", encoding="utf-8")
+            return SimpleNamespace(status=ConversionStatus.SUCCESS), "pypdfium2"
+
+        async def scenario(tmp_dir: Path) -> dict[str, object]:
+            pdf_path = tmp_dir / "report.pdf"
+            pdf_path.write_bytes(b"%PDF-1.4\n")
+            service = ConversionService(
+                output_dir=tmp_dir / "out",
+                queue_size=1,
+                workers=1,
+                convert=fake_convert,
+                cache=cache,
+            )
+            await service.start()
+            server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            job = {"input": str(pdf_path)}
+            try:
+                first = await _request(port, "POST", "/jobs", job)
+                await asyncio.sleep(0.05)
+                second = await _request(port, "POST", "/jobs", job)
+                third = await _request(port, "POST", "/jobs", job)
+                job_id = json.loads(first[1])["id"]
+                early = await _request(port, "GET", f"/jobs/{job_id}/result")
+                release.set()
+                while service.jobs[job_id].status == "running":
+                    await asyncio.sleep(0.01)
+                status = await _request(port, "GET", f"/jobs/{job_id}")
+                result = await _request(port, "GET", f"/jobs/{job_id}/result")
+            finally:
+                server.close()
+                await server.wait_closed()
+                await service.close()
+            return {
+                "codes": [first[0], second[0], third[0], early[0], result[0]],
+                "status": json.loads(status[1])["status"],
+                "markdown": result[1],
+            }
+
+        # Act
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ConversionCache(Path(tmp_dir) / "cache")
+            outcome = asyncio.run(scenario(Path(tmp_dir)))
+
+        # Assert
+        self.assertEqual(outcome["codes"], [202, 202, 429, 409, 200])
+        self.assertEqual(caches, [cache, cache])
+        self.assertEqual(outcome["status"], "success")
+        self.assertEqual(outcome["markdown"], b"# report\n")
+
+    def test_help_option_is_rejected_and_service_keeps_running(self) -> None:
+        # Arrange
+        async def scenario(tmp_dir: Path) -> list[int]:
+            pdf_path = tmp_dir / "report.pdf"
+            pdf_path.write_bytes(b"%PDF-1.4\n")
+            service = ConversionService(output_dir=tmp_dir / "out")
+            await service.start()
+            server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                rejected = await _request(
+                    port, "POST", "/jobs", {"input": str(pdf_path), "help": True}
+                )
+                health = await _request(port, "GET", "/health")
+            finally:
+                server.close()
+                await server.wait_closed()
+                await service.close()
+            return [rejected[0], health[0]]
+
+        # Act
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            codes = asyncio.run(scenario(Path(tmp_dir)))
+
+        # Assert
+        self.assertEqual(codes, [400, 200])
+
+    def test_prune_drops_expired_and_excess_finished_jobs(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            out = Path(tmp_dir) / "out"
+            service = ConversionService(output_dir=out, job_ttl=60, max_finished_jobs=2)
+            args = SimpleNamespace(input="report.pdf")
+            for job_id, status, finished in (
+                ("expired", "success", 0.0),
+                ("old", "error", 50.0),
+                ("recent", "success", 90.0),
+                ("newest", "success", 95.0),
+                ("active", "running", None),
+            ):
+                (out / job_id).mkdir(parents=True)
+                service.jobs[job_id] = Job(
+                    job_id=job_id,
+                    args=args,
+                    output_path=out / job_id / "report.md",
+                    status=status,
+                    submitted=0.0,
+                    finished=finished,
+                )
+
+            # Act
+            evicted = service.prune_jobs(now=100.0)
+
+            # Assert
+            self.assertEqual(evicted, 2)
+            self.assertEqual(sorted(service.jobs), ["active", "newest", "recent"])
+            self.assertFalse((out / "old").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
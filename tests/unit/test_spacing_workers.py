@@ -0,0 +1,186 @@
+"""@fileoverview Unit tests for per-page spacing work units and parallel page repair."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import fitz
+from docling_core.types.doc.base import BoundingBox, CoordOrigin, Size
+from docling_core.types.doc.document import DoclingDocument, ProvenanceItem
+from docling_core.types.doc.labels import DocItemLabel
+
+from pdf_to_markdown_docling.audit_utils import needs_spacing_fix
+from pdf_to_markdown_docling.metrics import collect_metrics, stage
+from pdf_to_markdown_docling.pdf_resources import PdfResources
+from pdf_to_markdown_docling.pymupdf_spacing_fix import fix_spaced_items_with_pymupdf_glyphs
+from pdf_to_markdown_docling.spacing_workers import (
+    SpacingWorkUnit,
+    collect_spacing_work,
+    run_page_repairs,
+)
+
+_SPACED = "V e n i t u r i  t o t a l e"
+
+
+def _doc(texts: dict[int, str]) -> DoclingDocument:
+    doc = DoclingDocument(name="test")
+    for page_no, text in sorted(texts.items()):
+        doc.add_page(page_no=page_no, size=Size(width=300, height=200))
+        doc.add_text(
+            label=DocItemLabel.TEXT,
+            text=text,
+            prov=ProvenanceItem(
+                page_no=page_no,
+                bbox=BoundingBox(l=18, t=28, r=150, b=44, coord_origin=CoordOrigin.TOPLEFT),
+                charspan=(0, len(text)),
+            ),
+        )
+    return doc
+
+
+def _write_pdf(path: Path, pages: int) -> None:
+    pdf = fitz.open()
+    for _ in range(pages):
+        page = pdf.new_page(width=300, height=200)
+        page.insert_text((20, 40), "Venituri totale", fontsize=11)
+    pdf.save(path)
+    pdf.close()
+
+
+def _open_fake(pdf_path: Path) -> str:
+    return pdf_path.name
+
+
+def _close_fake(_handle: str) -> None:
+    return None
+
+
+def _upper_repair(handle: str, page_no: int, units: list[SpacingWorkUnit]) -> list[tuple[int, str]]:
+    return [(unit.target, f"{handle}:{page_no}:{unit.text.upper()}") for unit in units]
+
+
+class SpacingWorkTests(unittest.TestCase):
+    def test_collect_groups_candidates_by_page(self) -> None:
+        # Arrange
+        doc = _doc({1: _SPACED, 2: "Clean text", 3: _SPACED})
+
+        # Act
+        work = collect_spacing_work(
+            doc,
+            pages_to_fix={1, 2},
+            cell_predicate=needs_spacing_fix,
+            text_predicate=needs_spacing_fix,
+        )
+
+        # Assert
+        self.assertEqual(list(work.units_by_page), [1])
+        self.assertEqual(work.units_by_page[1][0].text, _SPACED)
+
+    def test_apply_writes_back_and_counts_items(self) -> None:
+        # Arrange
+        doc = _doc({1: _SPACED})
+        work = collect_spacing_work(
+            doc,
+            pages_to_fix=None,
+            cell_predicate=needs_spacing_fix,
+            text_predicate=needs_spacing_fix,
+        )
+
+        # Act
+        counts = work.apply([(0, "Venituri totale")])
+
+        # Assert
+        self.assertEqual(counts, (0, 1))
+        self.assertEqual(doc.texts[0].text, "Venituri totale")
+
+    def test_worker_pool_matches_in_process_repairs(self) -> None:
+        # Arrange
+        doc = _doc({1: _SPACED, 2: _SPACED, 3: _SPACED})
+        work = collect_spacing_work(
+            doc,
+            pages_to_fix=None,
+            cell_predicate=needs_spacing_fix,
+            text_predicate=needs_spacing_fix,
+        )
+        # WHY: A fake handle keeps the test about scheduling, not PDF parsing.
+        options = {
+            "open_handle": _open_fake,
+            "close_handle": _close_fake,
+            "repair_page": _upper_repair,
+        }
+
+        # Act
+        sequential = run_page_repairs(Path("a.pdf"), work.units_by_page, workers=1, **options)
+        parallel = run_page_repairs(Path("a.pdf"), work.units_by_page, workers=2, **options)
+
+        # Assert
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(sequential[2], (2, f"a.pdf:3:{_SPACED.upper()}"))
+
+    def test_worker_page_stages_reach_the_parent_report(self) -> None:
+        # Arrange
+        doc = _doc({1: _SPACED, 2: _SPACED, 3: _SPACED})
+        work = collect_spacing_work(
+            doc,
+            pages_to_fix=None,
+            cell_predicate=needs_spacing_fix,
+            text_predicate=needs_spacing_fix,
+        )
+
+        # Act
+        with collect_metrics() as metrics:
+            with stage("spacing_fix") as parent:
+                run_page_repairs(
+                    Path("a.pdf"),
+                    work.units_by_page,
+                    workers=2,
+                    open_handle=_open_fake,
+                    close_handle=_close_fake,
+                    repair_page=_upper_repair,
+                )
+
+        # Assert
+        pages = [span for span in metrics.spans if span.name == "spacing_fix.page"]
+        self.assertEqual(sorted(span.attributes["page"] for span in pages), [1, 2, 3])
+        self.assertTrue(all(span.parent_id == parent.span_id for span in pages))
+        self.assertEqual(metrics.summary()["spacing_fix.page"]["counts"]["replaced"], 3)
+
+    def test_pymupdf_fixer_repairs_pages_in_workers(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            _write_pdf(pdf_path, pages=2)
+            doc = _doc({1: _SPACED, 2: _SPACED})
+
+            # Act
+            report = fix_spaced_items_with_pymupdf_glyphs(doc, pdf_path, workers=2)
+
+        # Assert
+        self.assertEqual(report.text_items, 2)
+        self.assertEqual([item.text for item in doc.texts], ["Venituri totale"] * 2)
+
+    def test_pymupdf_fixer_reuses_shared_resources(self) -> None:
+        # Arrange
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = Path(tmp_dir) / "sample.pdf"
+            _write_pdf(pdf_path, pages=2)
+            doc = _doc({1: _SPACED, 2: _SPACED})
+
+            with PdfResources(pdf_path, memory_map=True) as resources:
+                # Act
+                report = fix_spaced_items_with_pymupdf_glyphs(doc, pdf_path, resources=resources)
+                rerun = fix_spaced_items_with_pymupdf_glyphs(
+                    _doc({1: _SPACED, 2: _SPACED}), pdf_path, resources=resources
+                )
+
+                # Assert
+                self.assertEqual(resources.page_count, 2)
+                self.assertEqual((resources.hits, resources.misses), (2, 2))
+        self.assertEqual((report.text_items, rerun.text_items), (2, 2))
+        self.assertEqual([item.text for item in doc.texts], ["Venituri totale"] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
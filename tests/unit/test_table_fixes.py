@@ -1,13 +1,22 @@
-"""@fileoverview Unit tests for table column-group collapsing helpers."""
+"""@fileoverview Unit tests for table column-group collapsing and OCR cell merge helpers."""
 
 from __future__ import annotations
 
 import unittest
 
-from docling_core.types.doc.document import TableCell, TableData, TableItem
+from docling_core.types.doc.base import BoundingBox, CoordOrigin, Size
+from docling_core.types.doc.document import (
+    DoclingDocument,
+    ProvenanceItem,
+    TableCell,
+    TableData,
+    TableItem,
+)
 
 from pdf_to_markdown_docling.table_fixes import (
     collapse_table_header_groups,
+    merge_spaced_table_cells,
+    merge_suspect_table_cells,
     normalize_table_header_text,
     normalize_table_currency_columns,
     _clean_table_cell_text,
@@ -157,6 +166,44 @@ def _cell_text(table: TableItem, row: int, col: int) -> str:
     return ""
 
 
+def _positioned_table_doc(texts: list[str], boxes: list[tuple[float, float, float, float]]):
+    doc = DoclingDocument(name="page")
+    doc.add_page(page_no=1, size=Size(width=600, height=800))
+    cells = [
+        TableCell(
+            bbox=BoundingBox(l=left, t=top, r=right, b=bottom),
+            start_row_offset_idx=0,
+            end_row_offset_idx=1,
+            start_col_offset_idx=col,
+            end_col_offset_idx=col + 1,
+            text=text,
+        )
+        for col, (text, (left, top, right, bottom)) in enumerate(zip(texts, boxes))
+    ]
+    doc.add_table(
+        data=TableData(num_rows=1, num_cols=len(cells), table_cells=cells),
+        prov=ProvenanceItem(page_no=1, bbox=BoundingBox(l=0, t=0, r=600, b=800), charspan=(0, 0)),
+    )
+    return doc
+
+
+def _add_single_cell_table(doc: DoclingDocument, text: str, top: float, origin: CoordOrigin):
+    table_bbox = BoundingBox(l=100, t=top, r=300, b=top + 100)
+    if origin is CoordOrigin.BOTTOMLEFT:
+        table_bbox = table_bbox.to_bottom_left_origin(doc.pages[1].size.height)
+    cell = TableCell(
+        start_row_offset_idx=0,
+        end_row_offset_idx=1,
+        start_col_offset_idx=0,
+        end_col_offset_idx=1,
+        text=text,
+    )
+    doc.add_table(
+        data=TableData(num_rows=1, num_cols=1, table_cells=[cell]),
+        prov=ProvenanceItem(page_no=1, bbox=table_bbox, charspan=(0, 0)),
+    )
+
+
 class TableFixesTests(unittest.TestCase):
     def test_collapse_reports_change(self) -> None:
         # Arrange
@@ -511,5 +558,67 @@ class TableFixesTests(unittest.TestCase):
         self.assertTrue(_should_replace_numeric_cell(base, ocr))
 
 
+class OcrCellMatchingTests(unittest.TestCase):
+    def test_spaced_cells_take_best_overlapping_ocr_text(self) -> None:
+        # Arrange
+        base = _positioned_table_doc(
+            ["1 2 3 . 4 5 6", "7 8 9 . 0 1 2"], [(100, 100, 160, 112), (400, 300, 460, 312)]
+        )
+        # WHY: A different column count defeats shape matching, forcing the bbox fallback.
+        ocr = _positioned_table_doc(
+            ["123.456", "9 9 9 . 9 9 9", "789.012", "123.000"],
+            [
+                (101, 101, 161, 113),
+                (400, 300, 460, 312),
+                (398, 299, 458, 311),
+                (150, 100, 210, 112),
+            ],
+        )
+
+        # Act
+        replaced, total = merge_spaced_table_cells(base, ocr)
+
+        # Assert
+        self.assertEqual((replaced, total), (2, 2))
+        self.assertEqual(
+            [cell.text for cell in base.tables[0].data.table_cells], ["123.456", "789.012"]
+        )
+
+    def test_suspect_cells_ignore_distant_ocr_cells(self) -> None:
+        # Arrange
+        base = _positioned_table_doc([".961.31"], [(100, 100, 160, 112)])
+        ocr = _positioned_table_doc(
+            ["1.000.000", "6.961.310"], [(500, 700, 560, 712), (99, 100, 159, 112)]
+        )
+
+        # Act
+        repaired = merge_suspect_table_cells(base, ocr)
+
+        # Assert
+        self.assertEqual(repaired, 1)
+        self.assertEqual(base.tables[0].data.table_cells[0].text, "6.961.310")
+
+    def test_same_shaped_tables_pair_by_position_not_order(self) -> None:
+        # Arrange
+        base = DoclingDocument(name="page")
+        base.add_page(page_no=1, size=Size(width=600, height=800))
+        _add_single_cell_table(base, "1 1 1 . 1 1 1", 100, CoordOrigin.TOPLEFT)
+        _add_single_cell_table(base, "2 2 2 . 2 2 2", 400, CoordOrigin.TOPLEFT)
+        ocr = DoclingDocument(name="page")
+        ocr.add_page(page_no=1, size=Size(width=600, height=800))
+        # WHY: OCR lists the tables in the opposite order, in the other coordinate origin.
+        _add_single_cell_table(ocr, "222.222", 400, CoordOrigin.BOTTOMLEFT)
+        _add_single_cell_table(ocr, "111.111", 100, CoordOrigin.BOTTOMLEFT)
+
+        # Act
+        replaced, _total = merge_spaced_table_cells(base, ocr)
+
+        # Assert
+        self.assertEqual(replaced, 2)
+        self.assertEqual(
+            [table.data.table_cells[0].text for table in base.tables], ["111.111", "222.222"]
+        )
+
+
 if __name__ == "__main__":
     unittest.main()